@@ -0,0 +1,97 @@
+"""
+라우트에 주입하는 서비스 인스턴스를 관리합니다.
+
+서비스는 모듈 import 시점이 아니라 처음 필요할 때 생성되며, 무거운 모듈(neo4j 드라이버, httpx)도 그때 import합니다.
+외부 연결은 main.py의 lifespan에서 열고 닫습니다.
+
+- neo4j_service(), upstage_service(), memo_queue(): 싱글톤을 생성하거나 반환 (lifespan, 백그라운드 작업용)
+  neo4j_service()는 GRAPH_BACKEND에 따라 GraphStore 구현(Neo4jService 또는 InMemoryGraphStore)을 반환
+- get_*(): FastAPI Depends용. 서비스를 사용할 수 없으면 503을 반환
+"""
+import os
+from fastapi import HTTPException
+from app.core import config, metrics
+
+_neo4j_service = None
+_upstage_service = None
+_memo_queue = None
+
+
+def neo4j_service():
+    """
+    그래프 저장소 싱글톤을 반환합니다. 연결은 connect()에서 수행합니다.
+    GRAPH_BACKEND=memory이면 Neo4j 대신 프로세스 내 저장소(InMemoryGraphStore)를 사용합니다.
+    """
+    global _neo4j_service
+    if _neo4j_service is None:
+        if config.GRAPH_BACKEND == "memory":
+            from app.services.memory_graph import InMemoryGraphStore
+            _neo4j_service = InMemoryGraphStore()
+        else:
+            from app.services.neo4j_service import Neo4jService
+            _neo4j_service = Neo4jService()
+    return _neo4j_service
+
+
+def upstage_service():
+    """Upstage 서비스 싱글톤을 반환합니다. UPSTAGE_API_KEY가 설정되지 않았으면 None을 반환합니다."""
+    global _upstage_service
+    if _upstage_service is None and os.getenv("UPSTAGE_API_KEY"):
+        from app.services.upstage import UpstageService
+        _upstage_service = UpstageService()
+        metrics.registry.register_collector("llm", _upstage_service.collect_metrics)
+        llm_cache = _upstage_service.llm_cache
+        if llm_cache:
+            metrics.registry.register_collector("cache", lambda: metrics.cache_samples("solar_pro", llm_cache.get_metrics()))
+    return _upstage_service
+
+
+def memo_queue():
+    """메모 수집 작업 큐 싱글톤을 반환합니다. (워커는 lifespan에서 start()로 실행)"""
+    global _memo_queue
+    if _memo_queue is None:
+        from app.services.memo_queue import MemoJobQueue
+        _memo_queue = MemoJobQueue(
+            config.MEMO_QUEUE_SQLITE_PATH,
+            concurrency=config.MEMO_QUEUE_CONCURRENCY,
+            max_attempts=config.MEMO_JOB_MAX_ATTEMPTS,
+            lease_seconds=config.MEMO_JOB_LEASE_SECONDS,
+            idempotency_window=config.MEMO_IDEMPOTENCY_WINDOW,
+            retention=config.MEMO_JOB_RETENTION,
+            retry_base_delay=config.MEMO_JOB_RETRY_BASE_DELAY,
+            retry_max_delay=config.MEMO_JOB_RETRY_MAX_DELAY,
+        )
+        metrics.registry.register_collector("queue", _memo_queue.collect_metrics)
+    return _memo_queue
+
+
+def get_neo4j_service():
+    """연결이 완료된 Neo4j 서비스를 반환합니다. 시작 직후 아직 연결 중이면 503을 반환합니다."""
+    service = neo4j_service()
+    if not service.connected:
+        raise HTTPException(status_code=503, detail="Neo4j is not connected yet.")
+    return service
+
+
+def get_upstage_service():
+    """Upstage 서비스를 반환합니다. API 키가 설정되지 않았으면 503을 반환합니다."""
+    service = upstage_service()
+    if service is None:
+        raise HTTPException(
+            status_code=503, detail="Upstage API Key is not configured. Please set UPSTAGE_API_KEY in .env file."
+        )
+    return service
+
+
+def get_memo_queue():
+    return memo_queue()
+
+
+async def close_services():
+    """생성된 서비스의 연결을 닫습니다."""
+    if _memo_queue is not None:
+        await _memo_queue.stop()
+    if _neo4j_service is not None:
+        await _neo4j_service.close()
+    if _upstage_service is not None:
+        await _upstage_service.close()
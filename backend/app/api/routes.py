@@ -1,19 +1,20 @@
-import re
-import shutil
 import json
 from datetime import datetime
-from fastapi import APIRouter, File, UploadFile, HTTPException
-from app.services.upstage import upstage_service
-from app.services.neo4j_service import neo4j_service
-from app.models.schemas import MemoInput, QueryInput, ContactInput
-from app.core.logger import get_logger
-import os
+from typing import List, Optional
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Query, Header
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from app.api.dependencies import get_memo_queue, get_neo4j_service, get_upstage_service
+from app.services import business_card, batch_import, graph_export, graph_query, memo_ingestion
+from app.services.answer_renderer import render_answer
+from app.models.schemas import MemoInput, QueryInput, ContactInput, ContactBatchInput
+from app.core import config
+from app.core.logger import get_logger, debug_payload
 
 router = APIRouter()
 logger = get_logger(__name__)
 
 @router.post("/extract-business-card")
-async def extract_business_card(file: UploadFile = File(...)):
+async def extract_business_card(file: UploadFile = File(...), upstage_service=Depends(get_upstage_service)):
     """
     명함 이미지 파일을 업로드하여 텍스트를 추출하고 구조화된 정보로 변환합니다.
 
@@ -24,87 +25,47 @@ async def extract_business_card(file: UploadFile = File(...)):
         person_data: 추출된 인물 정보 (이름, 직함, 전화번호, 이메일)
         company_data: 추출된 회사 정보
     """
-    temp_file_path = f"temp_{file.filename}"
-    try:
-        # 업로드된 파일을 임시 파일로 저장
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # Document Parse API를 사용하여 명함 텍스트 추출
-        parsed_document = upstage_service.document_parse(temp_file_path)
-
-        # HTML 태그를 제거하고 순수 텍스트만 추출
-        all_text_content = ""
-        for element in parsed_document.get("elements", []):
-            html_content = element.get("content", {}).get("html", "")
-            text_content = re.sub(r'<[^>]+>', '', html_content).replace('<br>', '\n').strip()
-            all_text_content += text_content + "\n"
-
-        # LLM을 사용하여 명함 정보 구조화
-        system_prompt = """You are an expert assistant that extracts key information from business card text.
-        The user will provide the text content of a business card.
-        Extract the following fields: name, title, company, phone, email.
-        Handle various phone number formats including international ones like '82 10-0000-0000'.
-        Return the output in a clean JSON format. For example:
-        {
-          "name": "김성길",
-          "title": "과장",
-          "company": "ABC상사",
-          "phone": "010-2222-1234",
-          "email": "kim@abc.com"
-        }
-        If a field is not found, omit it from the JSON. The name must be in Korean.
-        """
-        
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": all_text_content.strip()}
-        ]
-        
-        response = upstage_service.solar_pro(messages)
-        logger.info(f"Solar Pro for BizCard Raw Response: {response}")
+    # 임시 파일 없이 업로드 스트림을 그대로 Document Parse 요청에 전달하고,
+    # 이미지 해시로 동일한 명함의 OCR/LLM 결과를 재사용
+    content_hash = await business_card.hash_upload(file)
+    return await business_card.extract_business_card(upstage_service, file.file, file.filename, content_hash)
+
+@router.post("/extract-business-cards")
+async def extract_business_cards(
+    files: List[UploadFile] = File(...),
+    concurrency: Optional[int] = Query(None, ge=1, le=config.BATCH_IMPORT_MAX_CONCURRENCY),
+    upstage_service=Depends(get_upstage_service),
+):
+    """
+    여러 명함 이미지(또는 명함 이미지가 담긴 zip 파일)를 한 번에 처리합니다.
+    OCR과 LLM 추출은 동시성과 속도가 제한된 워커 풀에서 실행되며,
+    명함별 결과가 완료되는 순서대로 NDJSON 스트림으로 전송됩니다.
 
-        try:
-            extracted_data_content = response["choices"][0]["message"]["content"]
-
-            # Markdown 코드 블록 제거 (```json 또는 ``` 감싸진 부분 파싱)
-            if "```json" in extracted_data_content:
-                start = extracted_data_content.find("```json") + len("```json")
-                end = extracted_data_content.find("```", start)
-                if end != -1:
-                    extracted_data_content = extracted_data_content[start:end].strip()
-            elif "```" in extracted_data_content:
-                start = extracted_data_content.find("```") + len("```")
-                end = extracted_data_content.find("```", start)
-                if end != -1:
-                    extracted_data_content = extracted_data_content[start:end].strip()
-
-            extracted_data = json.loads(extracted_data_content)
-
-            # 인물 정보 추출 (값이 있는 필드만 포함)
-            person_data = {
-                "name": extracted_data.get("name"),
-                "title": extracted_data.get("title"),
-                "phone": extracted_data.get("phone"),
-                "email": extracted_data.get("email"),
-            }
-            person_data = {k: v for k, v in person_data.items() if v}
-
-            # 회사 정보 추출
-            company_data = {"name": extracted_data.get("company")} if extracted_data.get("company") else {}
-
-        except (KeyError, IndexError, json.JSONDecodeError) as e:
-            logger.error(f"Failed to parse LLM response for business card: {e}", exc_info=True)
-            raise HTTPException(status_code=500, detail="Failed to extract information from business card using LLM.")
-
-        return {"person_data": person_data, "company_data": company_data}
-    finally:
-        # 임시 파일 삭제
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+    Args:
+        files: 업로드된 명함 이미지 또는 zip 파일 목록
+        concurrency: 동시에 처리할 명함 수 (기본값: BATCH_IMPORT_CONCURRENCY)
+
+    Returns:
+        NDJSON 스트림
+        - 명함별: {"event": "card", "index", "filename", "status", "person_data", "company_data"}
+        - 마지막: {"event": "done", "total", "succeeded", "failed", "elapsed_seconds"}
+    """
+    cards = await batch_import.read_uploaded_cards(files)
+    results = batch_import.import_business_cards(
+        upstage_service,
+        cards,
+        concurrency=concurrency or config.BATCH_IMPORT_CONCURRENCY,
+        rate=config.BATCH_IMPORT_RATE_LIMIT,
+    )
+
+    async def stream():
+        async for result in results:
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 @router.post("/save-contact")
-async def save_contact(contact: ContactInput):
+async def save_contact(contact: ContactInput, neo4j_service=Depends(get_neo4j_service)):
     """
     추출된 연락처 정보를 Neo4j 그래프 데이터베이스에 저장합니다.
 
@@ -117,26 +78,29 @@ async def save_contact(contact: ContactInput):
     person_data = contact.person_data.dict()
     company_data = contact.company_data.dict() if contact.company_data else {}
 
-    logger.info(f"Saving Person Data: {json.dumps(person_data, indent=2, ensure_ascii=False)}")
-    logger.info(f"Saving Company Data: {json.dumps(company_data, indent=2, ensure_ascii=False)}")
+    logger.info(f"Saving contact: {person_data.get('name')} ({company_data.get('name') or 'no company'})")
+    debug_payload(logger, "Contact payload", person_data=person_data, company_data=company_data)
 
     if person_data.get("name"):
         # 일관된 검색을 위해 이름에서 공백 제거
         person_data["name"] = person_data["name"].replace(" ", "")
 
         # Person 노드 생성 또는 업데이트
-        neo4j_service.create_person(
+        await neo4j_service.create_person(
             name=person_data["name"],
             properties={k: v for k, v in person_data.items() if k != "name"}
         )
 
         # 회사 정보가 있으면 Company 노드 생성 및 관계 설정
         if company_data.get("name"):
-            neo4j_service.create_company(
+            # 법인 표기만 다른 기존 회사가 있으면 그 이름으로 저장 ("(주)ABC상사" -> "ABC상사")
+            resolved = await neo4j_service.resolve_entity_names([{"type": "Company", "name": company_data["name"]}])
+            company_data["name"] = resolved[company_data["name"]]["name"]
+            await neo4j_service.create_company(
                 name=company_data["name"],
                 properties={}
             )
-            neo4j_service.create_relationship(
+            await neo4j_service.create_relationship(
                 from_node_label="Person",
                 from_node_name=person_data["name"],
                 to_node_label="Company",
@@ -147,10 +111,44 @@ async def save_contact(contact: ContactInput):
 
     raise HTTPException(status_code=400, detail="Person name is required to save a contact.")
 
+@router.post("/save-contacts")
+async def save_contacts(batch: ContactBatchInput, neo4j_service=Depends(get_neo4j_service)):
+    """
+    확인된 여러 연락처를 단일 트랜잭션으로 Neo4j에 저장합니다.
+    명함 일괄 등록 결과를 사용자가 검토한 뒤 한 번에 저장할 때 사용합니다.
+
+    Args:
+        batch: 연락처 입력 목록
+
+    Returns:
+        저장된 연락처 수와 생성된 노드/관계 수
+    """
+    contacts = []
+    for contact in batch.contacts:
+        # 일관된 검색을 위해 이름에서 공백 제거
+        name = contact.person_data.name.replace(" ", "")
+        if not name:
+            raise HTTPException(status_code=400, detail="Person name is required to save a contact.")
+        properties = {k: v for k, v in contact.person_data.dict().items() if k != "name" and v is not None}
+        company = contact.company_data.name if contact.company_data and contact.company_data.name else None
+        contacts.append({"name": name, "properties": properties, "company": company})
+
+    # 법인 표기만 다른 기존 회사가 있으면 그 이름으로 저장
+    companies = [{"type": "Company", "name": contact["company"]} for contact in contacts if contact["company"]]
+    if companies:
+        resolved = await neo4j_service.resolve_entity_names(companies)
+        for contact in contacts:
+            if contact["company"]:
+                contact["company"] = resolved[contact["company"]]["name"]
+
+    summary = await neo4j_service.save_contacts(contacts)
+    return {"status": "Contacts successfully saved to Neo4j.", "saved": len(contacts), **summary}
+
 @router.post("/memo")
-async def create_memo(memo_input: MemoInput):
+async def create_memo(memo_input: MemoInput, upstage_service=Depends(get_upstage_service), neo4j_service=Depends(get_neo4j_service)):
     """
     메모 텍스트에서 엔티티와 관계를 추출하여 Neo4j에 저장합니다.
+    처리가 끝날 때까지 기다리지 않으려면 /memo/jobs를 사용합니다.
 
     Args:
         memo_input: 사용자가 입력한 메모 텍스트
@@ -158,273 +156,266 @@ async def create_memo(memo_input: MemoInput):
     Returns:
         처리 상태 및 추출된 데이터
     """
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    current_time = datetime.now().strftime("%H:%M")
-
-    # LLM을 사용하여 메모에서 엔티티와 관계 추출
-    messages = [
-        {"role": "system", "content": f"""You are a helpful assistant that extracts entities and relationships from a given memo.
-        The entities can be Person, Company, Event, Project.
-        The relationships can be WORKS_AT, ATTENDED, DISCUSSED.
-
-        IMPORTANT: Current date is {current_date} and current time is {current_time}.
-        When extracting dates and times, convert relative dates to absolute dates:
-        - "오늘" → {current_date}
-        - "내일" → add 1 day to {current_date}
-        - "모레" → add 2 days to {current_date}
-        - "다음주 월요일" → calculate next Monday from {current_date}
-
-        For times, convert to 24-hour format:
-        - "14시" → "14:00"
-        - "오후 3시" → "15:00"
-        - "오전 9시" → "09:00"
-
-        For Event entities, include both date and time in ISO format if available:
-        - If only date: "2026-02-02"
-        - If date and time: "2026-02-02T14:00:00"
-
-        Return the output in JSON format, following this schema:
-        {{
-          "entities": [
-            {{ "type": "Person", "name": "김성길", "title": "과장", "phone": "010-1234-5678", "email": "kim@abc.com" }},
-            {{ "type": "Company", "name": "ABC상사" }},
-            {{ "type": "Event", "name": "미팅", "date": "2026-02-02T14:00:00" }},
-            {{ "type": "Project", "name": "신규 프로젝트" }}
-          ],
-          "relationships": [
-            {{ "from": "김성길", "to": "ABC상사", "type": "WORKS_AT" }},
-            {{ "from": "김성길", "to": "미팅", "type": "ATTENDED" }},
-            {{ "from": "미팅", "to": "신규 프로젝트", "type": "DISCUSSED" }}
-          ],
-          "business_related": true
-        }}
-        If the memo is not business related, set "business_related" to false and return empty entities and relationships.
-        """},
-        {"role": "user", "content": memo_input.text}
-    ]
-
-
-    response = upstage_service.solar_pro(messages)
-    logger.info(f"Solar Pro raw response: {response}")
-
-    try:
-        extracted_data_content = response["choices"][0]["message"]["content"]
-
-        # Markdown 코드 블록 제거 (```json 또는 ``` 감싸진 부분 파싱)
-        if "```json" in extracted_data_content:
-            start = extracted_data_content.find("```json") + len("```json")
-            end = extracted_data_content.find("```", start)
-            if end != -1:
-                extracted_data_content = extracted_data_content[start:end].strip()
-        elif "```" in extracted_data_content:
-            start = extracted_data_content.find("```") + len("```")
-            end = extracted_data_content.find("```", start)
-            if end != -1:
-                extracted_data_content = extracted_data_content[start:end].strip()
-
-        extracted_data = json.loads(extracted_data_content)
-    except (KeyError, IndexError):
-        logger.error(f"LLM response structure not as expected: {response}", exc_info=True)
-        raise HTTPException(status_code=500, detail="LLM response structure not as expected.")
-    except json.JSONDecodeError:
-        logger.error(f"JSON decoding failed for content: '{extracted_data_content}'", exc_info=True)
-        raise HTTPException(status_code=500, detail="JSON decoding failed from LLM response.")
-    except Exception as e:
-        logger.error(f"An unexpected error occurred during LLM response parsing: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="An unexpected error occurred during LLM response parsing.")
-
-    business_related = extracted_data.get("business_related", False)
-
-    # 비즈니스 관련 메모가 아닌 경우 그래프에 저장하지 않음
-    if not business_related:
-        return {"status": "Non-business memo processed", "extracted_data": extracted_data}
-
-    # 고유한 메모 ID 생성
-    memo_id = f"memo_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
-    timestamp = datetime.now().isoformat()
-
-    # Memo 노드 생성
-    neo4j_service.create_memo(memo_id, memo_input.text, timestamp, business_related)
-
-    # 엔티티 이름 정규화 (특히 Person 이름)
-    # 중복 노드 생성 방지 (예: "인영", "인영님", "이인영" 등을 하나로 통합)
-    name_mapping = {}  # 원본 이름 -> 정규화된 이름 매핑
-    normalized_entities = []
-
-    for entity in extracted_data.get("entities", []):
-        entity_type = entity.get("type")
-        entity_name = entity.get("name")
-
-        if entity_type == "Person" and entity_name:
-            # 기존에 존재하는 유사한 이름의 Person 찾기
-            normalized_name = neo4j_service.find_best_matching_person(entity_name)
-            name_mapping[entity_name] = normalized_name
-            entity["name"] = normalized_name
-            logger.info(f"Person name normalized: '{entity_name}' -> '{normalized_name}'")
-
-        normalized_entities.append(entity)
-
-    # 정규화된 엔티티로 업데이트
-    extracted_data["entities"] = normalized_entities
-
-    # 관계에서도 이름 정규화 적용
-    for relationship in extracted_data.get("relationships", []):
-        from_name = relationship.get("from")
-        to_name = relationship.get("to")
-
-        # 매핑에 존재하면 정규화된 이름으로 교체
-        if from_name in name_mapping:
-            relationship["from"] = name_mapping[from_name]
-            logger.info(f"Relationship 'from' normalized: '{from_name}' -> '{name_mapping[from_name]}'")
-        if to_name in name_mapping:
-            relationship["to"] = name_mapping[to_name]
-            logger.info(f"Relationship 'to' normalized: '{to_name}' -> '{name_mapping[to_name]}'")
-
-    # 엔티티 처리 및 Neo4j 저장
-    for entity in normalized_entities:
-        entity_type = entity.get("type")
-        entity_name = entity.get("name")
-        if entity_type and entity_name:
-            # type과 name을 제외한 속성들만 저장
-            properties_to_save = {k: v for k, v in entity.items() if k not in ["type", "name"] and v is not None}
-            if entity_type == "Person":
-                neo4j_service.create_person(entity_name, properties_to_save)
-            elif entity_type == "Company":
-                neo4j_service.create_company(entity_name, properties_to_save)
-            elif entity_type == "Event":
-                neo4j_service.create_event(entity_name, properties_to_save)
-            elif entity_type == "Project":
-                neo4j_service.create_project(entity_name, properties_to_save)
-            # 메모와 엔티티 연결
-            neo4j_service.link_memo_to_entity(memo_id, entity_type, entity_name)
-
-    # 관계 처리 및 Neo4j 저장
-    for relationship in extracted_data.get("relationships", []):
-        from_name = relationship.get("from")
-        to_name = relationship.get("to")
-        rel_type = relationship.get("type")
-
-        if from_name and to_name and rel_type:
-            try:
-                success = neo4j_service.create_relationship_by_names(from_name, to_name, rel_type)
-                if success:
-                    logger.info(f"Created relationship: {from_name} -[{rel_type}]-> {to_name}")
-                else:
-                    logger.warning(f"Failed to create relationship: {from_name} -[{rel_type}]-> {to_name}")
-            except Exception as e:
-                logger.error(f"Error creating relationship {from_name} -[{rel_type}]-> {to_name}: {e}")
+    return await memo_ingestion.ingest_memo(upstage_service, neo4j_service, memo_input.text)
+
+@router.post("/memo/jobs", status_code=202)
+async def enqueue_memo(
+    memo_input: MemoInput,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    memo_queue=Depends(get_memo_queue),
+):
+    """
+    메모를 백그라운드 수집 큐에 추가하고 작업 ID를 즉시 반환합니다.
+    같은 메모(또는 같은 Idempotency-Key)를 다시 보내면 새 작업을 만들지 않고 기존 작업을 반환합니다.
+
+    Args:
+        memo_input: 사용자가 입력한 메모 텍스트
+        idempotency_key: 멱등성 키 헤더 (생략하면 메모 텍스트의 해시 사용)
 
-    return {"status": "Memo processed and saved to Neo4j", "extracted_data": extracted_data}
+    Returns:
+        작업 ID, 상태, 중복 제출 여부
+    """
+    job, created = await memo_queue.enqueue(memo_input.text, idempotency_key)
+    return {"job_id": job["job_id"], "status": job["status"], "memo_id": job["memo_id"], "duplicate": not created}
+
+@router.get("/memo/jobs/{job_id}")
+async def get_memo_job(job_id: str, memo_queue=Depends(get_memo_queue)):
+    """
+    메모 수집 작업의 상태를 조회합니다.
+
+    Returns:
+        작업 상태(queued/running/succeeded/failed), 시도 횟수, 처리 결과 또는 오류
+    """
+    job = await memo_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Memo job not found.")
+    job.pop("text")
+    return job
 
 @router.post("/query")
-async def query_graph(query_input: QueryInput):
+async def query_graph(query_input: QueryInput, upstage_service=Depends(get_upstage_service), neo4j_service=Depends(get_neo4j_service)):
     """
     자연어 질문을 받아 Cypher 쿼리로 변환하고 Neo4j에서 실행하여 자연어 답변을 생성합니다.
+    결과가 단순한 형태(단일 값, 이름/일정 목록)이면 두 번째 LLM 호출 없이 템플릿으로 답변합니다.
 
     Args:
         query_input: 사용자의 자연어 질문
 
     Returns:
-        자연어 답변, 쿼리 결과, 생성된 Cypher 쿼리
-    """
-    # Step 1: LLM을 사용하여 Cypher 쿼리 생성
-    system_message = """You are an expert in Cypher query language and Neo4j graph databases.
-    Given a user's natural language question, generate a Cypher query that answers the question based on the following graph schema:
-
-    Nodes:
-    - Person {name: string, title: string, phone: string, email: string}
-    - Company {name: string}
-    - Event {name: string, date: string}
-    - Project {name: string}
-    - Memo {id: string, text: string, timestamp: datetime, business_related: boolean}
-
-    Relationships:
-    - (Person)-[:WORKS_AT]->(Company)
-    - (Person)-[:ATTENDED]->(Event)
-    - (Person)-[:MENTIONED_IN]->(Memo)
-    - (Company)-[:MENTIONED_IN]->(Memo)
-    - (Event)-[:DISCUSSED]->(Project)
-    - (Person)-[:INTRODUCED_BY]->(Person)
-
-    IMPORTANT: For person names, use partial matching with CONTAINS to support both full names and given names.
-    Example: "최대련" and "대련" should both match. Use: WHERE p.name CONTAINS "대련"
-
-    Return ONLY the Cypher query, without any additional text or explanations.
-    Ensure the query is valid and executable.
-    Example queries:
-    - "김성길 전화번호?": MATCH (p:Person) WHERE p.name CONTAINS "김성길" RETURN p.phone;
-    - "대련님 전화번호?": MATCH (p:Person) WHERE p.name CONTAINS "대련" RETURN p.phone;
-    - "ABC상사에 누가 있지?": MATCH (p:Person)-[:WORKS_AT]->(c:Company {name:"ABC상사"}) RETURN p.name, p.title;
-    - "최근에 누구 만났지?": MATCH (p:Person)-[:MENTIONED_IN]->(m:Memo) WHERE m.timestamp > datetime() - duration('P7D') RETURN p.name, m.timestamp ORDER BY m.timestamp DESC;
-    - "내일 일정 뭐야?": MATCH (e:Event) WHERE e.date STARTS WITH "2026-02-02" RETURN e.name, e.date;
-    - "최대련님과 뭘 해야하지?": MATCH (p:Person)-[:ATTENDED]->(e:Event) WHERE p.name CONTAINS "대련" RETURN e.name, e.date ORDER BY e.date;
-    """
-    messages = [
-        {"role": "system", "content": system_message},
-        {"role": "user", "content": query_input.question}
-    ]
-    response = upstage_service.solar_pro(messages)
-
-    try:
-        cypher_query = response["choices"][0]["message"]["content"].strip()
-        # Markdown 코드 블록 제거
-        if cypher_query.startswith("```") and cypher_query.endswith("```"):
-            lines = cypher_query.split('\n')
-            cypher_query = '\n'.join(lines[1:-1]).strip()
-
-        # 기본적인 Cypher 쿼리 유효성 검증
-        if not cypher_query.upper().startswith("MATCH") and not cypher_query.upper().startswith("CALL"):
-            raise ValueError("Generated response is not a valid Cypher query.")
-    except (KeyError, IndexError, ValueError) as e:
-        logger.error(f"Failed to generate Cypher query: {e}")
-        raise HTTPException(status_code=500, detail="Failed to generate a valid Cypher query.")
-
-    # Step 2: Cypher 쿼리 실행
-    try:
-        query_results = neo4j_service.run_cypher_query(cypher_query)
-    except Exception as e:
-        logger.error(f"Failed to execute Cypher query: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to execute Cypher query: {str(e)}")
-
-    # Step 3: 쿼리 결과를 자연어로 변환
-    nl_system_message = """You are a helpful assistant that converts database query results into natural language responses.
-    Given the user's question and the query results, provide a clear, concise answer in Korean.
-    If there are no results, say "관련 정보를 찾을 수 없습니다."
-    Be conversational and friendly.
+        자연어 답변, 답변 생성 방식(template/llm), 쿼리 결과(최대 QUERY_MAX_ROWS행), 생성된 Cypher 쿼리와 파라미터,
+        결과 잘림 정보(row_limit, rows, truncated, limit_injected),
+        계획 캐시 사용 결과(hit/miss/uncacheable/disabled), 단계별 소요 시간
     """
-    nl_messages = [
-        {"role": "system", "content": nl_system_message},
-        {"role": "user", "content": f"Question: {query_input.question}\n\nQuery Results: {json.dumps(query_results, ensure_ascii=False, indent=2)}"}
-    ]
-
-    try:
-        nl_response = upstage_service.solar_pro(nl_messages)
-        natural_answer = nl_response["choices"][0]["message"]["content"].strip()
-    except (KeyError, IndexError) as e:
-        logger.error(f"Failed to generate natural language response: {e}")
-        # 자연어 생성 실패 시 원본 결과를 반환
-        natural_answer = f"검색 결과: {json.dumps(query_results, ensure_ascii=False, indent=2)}"
+    timings = graph_query.StageTimings()
+
+    # Step 1: Cypher 쿼리 생성 (계획 캐시에 없으면 LLM 사용)
+    with timings.stage("cypher_generation"):
+        query_plan = await graph_query.plan_cypher(upstage_service, query_input.question)
+
+    # Step 2: Cypher 쿼리 실행 (질문에서 추출한 값은 파라미터로 전달, 행 수와 실행 시간 제한)
+    with timings.stage("query_execution"):
+        query_results, truncation = await graph_query.execute_cypher(neo4j_service, query_plan)
+
+    # Step 3: 쿼리 결과를 자연어로 변환 (템플릿으로 표현할 수 없는 결과만 LLM 사용)
+    with timings.stage("answer_generation"):
+        natural_answer = render_answer(query_results, truncation["truncated"]) if config.QUERY_TEMPLATE_ANSWERS_ENABLED else None
+        answer_source = "template"
+        if natural_answer is None:
+            answer_source = "llm"
+            natural_answer = await graph_query.generate_answer(
+                upstage_service, query_input.question, query_results, truncation["truncated"]
+            )
 
     return {
         "status": "Query executed",
         "answer": natural_answer,
+        "answer_source": answer_source,
         "query_results": query_results,
-        "cypher_query": cypher_query
+        "cypher_query": query_plan.cypher_query,
+        "cypher_parameters": query_plan.parameters,
+        "truncation": truncation,
+        "plan_cache": query_plan.cache_status,
+        "timings": timings.as_dict(),
     }
 
+@router.post("/query/stream")
+async def query_graph_stream(query_input: QueryInput, upstage_service=Depends(get_upstage_service), neo4j_service=Depends(get_neo4j_service)):
+    """
+    /query와 같은 처리를 하되, 답변을 Server-Sent Events로 생성되는 즉시 전송합니다.
+    Cypher 생성과 실행은 응답 전에 끝나므로 이 단계의 오류는 일반 HTTP 오류로 반환됩니다.
+
+    Args:
+        query_input: 사용자의 자연어 질문
+
+    Returns:
+        text/event-stream
+        - event: result  {"cypher_query", "cypher_parameters", "plan_cache", "query_results", "truncation",
+                          "answer_source", "timings"}
+        - event: token   {"text"} (답변 조각, 템플릿 답변은 한 번에 전송)
+        - event: done    {"answer", "answer_source", "timings"}
+        - event: error   {"detail"} (답변 생성 중 오류)
+    """
+    timings = graph_query.StageTimings()
+
+    with timings.stage("cypher_generation"):
+        query_plan = await graph_query.plan_cypher(upstage_service, query_input.question)
+
+    with timings.stage("query_execution"):
+        query_results, truncation = await graph_query.execute_cypher(neo4j_service, query_plan)
+
+    template_answer = render_answer(query_results, truncation["truncated"]) if config.QUERY_TEMPLATE_ANSWERS_ENABLED else None
+    answer_source = "llm" if template_answer is None else "template"
+
+    async def stream():
+        yield _sse("result", {
+            "cypher_query": query_plan.cypher_query,
+            "cypher_parameters": query_plan.parameters,
+            "plan_cache": query_plan.cache_status,
+            "query_results": query_results,
+            "truncation": truncation,
+            "answer_source": answer_source,
+            "timings": timings.as_dict(),
+        })
+
+        answer = []
+        try:
+            with timings.stage("answer_generation"):
+                if template_answer is not None:
+                    answer.append(template_answer)
+                    yield _sse("token", {"text": template_answer})
+                else:
+                    messages = graph_query.answer_messages(query_input.question, query_results, truncation["truncated"])
+                    async for chunk in upstage_service.solar_pro_stream(messages):
+                        if not answer:
+                            timings.stages["time_to_first_token_ms"] = timings.as_dict()["total_ms"]
+                        answer.append(chunk)
+                        yield _sse("token", {"text": chunk})
+        except Exception as e:
+            logger.error(f"Failed to stream natural language response: {e}", exc_info=True)
+            yield _sse("error", {"detail": "Failed to generate natural language response."})
+            return
+
+        yield _sse("done", {"answer": "".join(answer).strip(), "answer_source": answer_source, "timings": timings.as_dict()})
+
+    # 프록시가 응답을 버퍼링하지 않도록 설정
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=headers)
+
+def _sse(event: str, data: dict) -> str:
+    """Server-Sent Events 메시지 한 건을 만듭니다."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
 @router.get("/memos")
-async def get_memos():
+async def get_memos(
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    business_related: Optional[bool] = None,
+    include_entities: bool = True,
+    neo4j_service=Depends(get_neo4j_service),
+):
     """
-    최근 메모 목록을 시간 역순으로 반환합니다.
+    메모 목록을 시간 역순으로 한 페이지씩 반환합니다.
+
+    Args:
+        limit: 페이지 크기 (최대 100)
+        cursor: 이전 응답의 next_cursor (생략하면 첫 페이지)
+        since: 이 시각 이후(포함)에 작성된 메모만
+        until: 이 시각 이전(미포함)에 작성된 메모만
+        business_related: 비즈니스 관련 여부로 필터링
+        include_entities: 메모에 언급된 엔티티(type, name)를 함께 반환할지 여부
 
     Returns:
-        최근 메모 목록 (최대 10개)
+        메모 목록, 다음 페이지 커서(next_cursor)와 다음 페이지 존재 여부(has_more)
     """
-    memos = neo4j_service.get_recent_memos()
+    page = await neo4j_service.list_memos(
+        limit=limit,
+        cursor=cursor,
+        since=since.isoformat() if since else None,
+        until=until.isoformat() if until else None,
+        business_related=business_related,
+        include_entities=include_entities,
+    )
     return {
         "success": True,
-        "data": memos,
-        "total": len(memos),
-        "page": 1,
+        "data": page["memos"],
+        "total": len(page["memos"]),
+        "next_cursor": page["next_cursor"],
+        "has_more": page["next_cursor"] is not None,
     }
 
+@router.get("/graph/neighborhood")
+async def get_graph_neighborhood(
+    name: str,
+    label: Optional[str] = Query(None, pattern="^(Person|Company|Event|Project)$"),
+    hops: int = Query(1, ge=1, le=config.GRAPH_NEIGHBORHOOD_MAX_HOPS),
+    max_degree: int = Query(config.GRAPH_MAX_DEGREE, ge=1),
+    max_nodes: int = Query(config.GRAPH_NEIGHBORHOOD_MAX_NODES, ge=1, le=config.GRAPH_NEIGHBORHOOD_MAX_NODES),
+    include_memos: bool = False,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    neo4j_service=Depends(get_neo4j_service),
+):
+    """
+    엔티티를 중심으로 한 N단계 이웃 그래프를 시각화용 열 단위 JSON으로 반환합니다.
+    그래프가 바뀌지 않았으면 ETag로 304를 반환합니다.
+
+    Args:
+        name: 중심 엔티티 이름
+        label: 중심 엔티티 레이블 (선택)
+        hops: 확장 단계 수
+        max_degree: 노드별 최대 연결 수
+        max_nodes: 최대 노드 수
+        include_memos: Memo 노드 포함 여부
+
+    Returns:
+        center: 중심 노드 인덱스
+        nodes: {"id", "label", "name", "hop"} 배열
+        edges: nodes 인덱스 쌍 {"source", "target"}과 관계 타입 "type" 배열
+        truncated: 제한에 걸려 일부가 생략되었는지 여부
+    """
+    etag = graph_export.graph_etag(
+        await neo4j_service.get_graph_version(), kind="neighborhood", name=name, label=label, hops=hops,
+        max_degree=max_degree, max_nodes=max_nodes, include_memos=include_memos,
+    )
+    if graph_export.etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    graph = await graph_export.get_neighborhood(
+        neo4j_service, name, label=label, hops=hops, max_degree=max_degree,
+        max_nodes=max_nodes, include_memos=include_memos,
+    )
+    return JSONResponse({"success": True, **graph}, headers={"ETag": etag})
+
+@router.get("/graph/export")
+async def export_graph(
+    max_degree: Optional[int] = Query(config.GRAPH_MAX_DEGREE, ge=1),
+    include_memos: bool = False,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    neo4j_service=Depends(get_neo4j_service),
+):
+    """
+    전체 그래프를 열 단위 청크의 NDJSON 스트림으로 내보냅니다.
+    그래프가 바뀌지 않았으면 ETag로 304를 반환합니다.
+
+    Args:
+        max_degree: 노드별 최대 연결 수
+        include_memos: Memo 노드 포함 여부
+
+    Returns:
+        NDJSON 스트림
+        - 노드 청크: {"event": "nodes", "offset", "id", "label", "name"}
+        - 엣지 청크: {"event": "edges", "source", "target", "type"} (source/target은 노드 전송 순서의 인덱스)
+        - 마지막: {"event": "done", "nodes", "edges", "skipped_edges"}
+    """
+    etag = graph_export.graph_etag(
+        await neo4j_service.get_graph_version(), kind="export", max_degree=max_degree, include_memos=include_memos,
+    )
+    if graph_export.etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    lines = graph_export.stream_graph_export(
+        neo4j_service, max_degree=max_degree, include_memos=include_memos,
+        chunk_size=config.GRAPH_EXPORT_CHUNK_SIZE,
+    )
+    return StreamingResponse(lines, media_type="application/x-ndjson", headers={"ETag": etag})
@@ -0,0 +1,169 @@
+import os
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def _get_int(name: str, default: int) -> int:
+    """정수형 환경 변수를 읽습니다."""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _get_float(name: str, default: float) -> float:
+    """실수형 환경 변수를 읽습니다."""
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    """불리언 환경 변수를 읽습니다. ("true", "1", "yes"를 참으로 간주)"""
+    value = os.getenv(name)
+    return value.lower() in ("true", "1", "yes") if value else default
+
+
+# Upstage API
+UPSTAGE_BASE_URL = os.getenv("UPSTAGE_BASE_URL", "https://api.upstage.ai/v1").rstrip("/")
+
+# Upstage HTTP 커넥션 풀 (keep-alive로 TCP/TLS 핸드셰이크 재사용)
+UPSTAGE_POOL_MAX_CONNECTIONS = _get_int("UPSTAGE_POOL_MAX_CONNECTIONS", 20)
+UPSTAGE_POOL_MAX_KEEPALIVE = _get_int("UPSTAGE_POOL_MAX_KEEPALIVE", 10)
+UPSTAGE_POOL_KEEPALIVE_EXPIRY = _get_float("UPSTAGE_POOL_KEEPALIVE_EXPIRY", 30.0)
+
+# Upstage 요청 타임아웃 (초). LLM 응답은 느리므로 읽기 타임아웃을 길게 둠
+UPSTAGE_CONNECT_TIMEOUT = _get_float("UPSTAGE_CONNECT_TIMEOUT", 5.0)
+UPSTAGE_READ_TIMEOUT = _get_float("UPSTAGE_READ_TIMEOUT", 60.0)
+
+# Upstage 재시도 정책 (429/5xx 및 네트워크 오류에 지수 백오프 + 지터 적용)
+UPSTAGE_MAX_RETRIES = _get_int("UPSTAGE_MAX_RETRIES", 3)
+UPSTAGE_RETRY_BACKOFF = _get_float("UPSTAGE_RETRY_BACKOFF", 0.5)
+UPSTAGE_RETRY_MAX_BACKOFF = _get_float("UPSTAGE_RETRY_MAX_BACKOFF", 20.0)
+
+# Solar Pro 호출 경로
+# - direct: 항상 직접 HTTP 호출 (메시지 변환 없음)
+# - langchain: 항상 ChatUpstage로 호출 (LangSmith 추적)
+# - sampled: LangSmith 추적이 켜져 있으면 LLM_TRACE_SAMPLE_RATE 비율만 ChatUpstage로, 나머지는 직접 호출
+LLM_TRANSPORT = os.getenv("LLM_TRANSPORT", "sampled").lower()
+LLM_TRACE_SAMPLE_RATE = _get_float("LLM_TRACE_SAMPLE_RATE", 0.1)
+
+# Solar Pro 응답 캐시 (모델 + 메시지의 해시를 키로 사용)
+LLM_CACHE_ENABLED = _get_bool("LLM_CACHE_ENABLED", True)
+LLM_CACHE_MAX_ENTRIES = _get_int("LLM_CACHE_MAX_ENTRIES", 1000)
+LLM_CACHE_MAX_BYTES = _get_int("LLM_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+LLM_CACHE_TTL = _get_float("LLM_CACHE_TTL", 24 * 60 * 60)
+# 지정하면 재시작 후에도 유지되는 SQLite 디스크 계층을 사용
+LLM_CACHE_SQLITE_PATH = os.getenv("LLM_CACHE_SQLITE_PATH") or None
+
+# 명함 OCR 결과 캐시 (이미지 내용 해시를 키로 사용)
+OCR_CACHE_ENABLED = _get_bool("OCR_CACHE_ENABLED", True)
+OCR_CACHE_MAX_ENTRIES = _get_int("OCR_CACHE_MAX_ENTRIES", 1000)
+OCR_CACHE_TTL = _get_float("OCR_CACHE_TTL", 7 * 24 * 60 * 60)
+OCR_CACHE_SQLITE_PATH = os.getenv("OCR_CACHE_SQLITE_PATH") or LLM_CACHE_SQLITE_PATH
+
+# 명함 일괄 등록 (동시 처리 수, 초당 시작 가능한 명함 수, 요청당 최대 명함 수)
+BATCH_IMPORT_CONCURRENCY = _get_int("BATCH_IMPORT_CONCURRENCY", 4)
+BATCH_IMPORT_MAX_CONCURRENCY = _get_int("BATCH_IMPORT_MAX_CONCURRENCY", 32)
+BATCH_IMPORT_RATE_LIMIT = _get_float("BATCH_IMPORT_RATE_LIMIT", 5.0)
+BATCH_IMPORT_MAX_FILES = _get_int("BATCH_IMPORT_MAX_FILES", 500)
+# 요청당 명함 이미지의 최대 총 크기 (바이트, zip은 압축 해제 후 크기 기준)
+BATCH_IMPORT_MAX_BYTES = _get_int("BATCH_IMPORT_MAX_BYTES", 256 * 1024 * 1024)
+
+# 그래프 저장소: neo4j (기본) 또는 memory (Neo4j 없이 실행하는 테스트/벤치마크용, 데이터가 저장되지 않음)
+GRAPH_BACKEND = os.getenv("GRAPH_BACKEND", "neo4j").lower()
+
+# Neo4j 드라이버 커넥션 풀 (클러스터에서 읽기를 분산하려면 NEO4J_URI를 neo4j:// 스킴으로 지정)
+NEO4J_MAX_CONNECTION_POOL_SIZE = _get_int("NEO4J_MAX_CONNECTION_POOL_SIZE", 100)
+# 풀에서 커넥션을 얻기까지 기다리는 최대 시간 (초)
+NEO4J_CONNECTION_ACQUISITION_TIMEOUT = _get_float("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", 60.0)
+# 관리형 트랜잭션(execute_read/execute_write)이 일시적 오류를 재시도하는 최대 시간 (초)
+NEO4J_MAX_TRANSACTION_RETRY_TIME = _get_float("NEO4J_MAX_TRANSACTION_RETRY_TIME", 30.0)
+# 시작 시 연결(connect()의 재시도 포함)이 실패한 뒤 다시 시도하기까지 기다리는 시간 (초)
+NEO4J_CONNECT_RETRY_INTERVAL = _get_float("NEO4J_CONNECT_RETRY_INTERVAL", 5.0)
+
+# 엔티티 이름 인덱스 (부분 이름 매칭을 Neo4j 전체 스캔 대신 프로세스 내에서 처리)
+ENTITY_INDEX_ENABLED = _get_bool("ENTITY_INDEX_ENABLED", True)
+# 다른 워커 프로세스의 쓰기를 반영하기 위해 전체 이름을 다시 불러오는 주기 (초)
+ENTITY_INDEX_REFRESH_SECONDS = _get_float("ENTITY_INDEX_REFRESH_SECONDS", 300.0)
+
+# 자연어 질의: 단순한 결과(단일 값, 이름/일정 목록)는 두 번째 LLM 호출 없이 템플릿으로 답변
+QUERY_TEMPLATE_ANSWERS_ENABLED = _get_bool("QUERY_TEMPLATE_ANSWERS_ENABLED", True)
+
+# 자연어 질의 Cypher 실행 제한
+# 결과 최대 행 수 (LIMIT이 없는 쿼리에는 LIMIT을 추가하고, 넘는 결과는 버림)
+QUERY_MAX_ROWS = _get_int("QUERY_MAX_ROWS", 1000)
+# 서버 측 트랜잭션 타임아웃 (초)
+QUERY_TIMEOUT = _get_float("QUERY_TIMEOUT", 10.0)
+# 드라이버가 서버에서 한 번에 가져오는 레코드 수
+CYPHER_FETCH_SIZE = _get_int("CYPHER_FETCH_SIZE", 500)
+# 답변 생성 LLM에 보내는 최대 행 수와 값(문자열/리스트)별 최대 길이. 넘으면 고르게 뽑은 일부만 보냄
+QUERY_LLM_MAX_ROWS = _get_int("QUERY_LLM_MAX_ROWS", 50)
+QUERY_LLM_MAX_VALUE_LENGTH = _get_int("QUERY_LLM_MAX_VALUE_LENGTH", 300)
+
+# 자연어 질의 Cypher 계획 캐시 (질문 속 이름 등을 파라미터로 바꿔 같은 형태의 질문에 재사용)
+QUERY_PLAN_CACHE_ENABLED = _get_bool("QUERY_PLAN_CACHE_ENABLED", True)
+QUERY_PLAN_CACHE_MAX_ENTRIES = _get_int("QUERY_PLAN_CACHE_MAX_ENTRIES", 500)
+
+# 메모 백그라운드 수집 큐 (SQLite에 저장되어 재시작 후에도 처리됨)
+MEMO_QUEUE_SQLITE_PATH = os.getenv("MEMO_QUEUE_SQLITE_PATH", "memo_jobs.db")
+# 메모 추출을 일괄 처리하려면 MEMO_BATCH_MAX_SIZE 이상이어야 함
+MEMO_QUEUE_CONCURRENCY = _get_int("MEMO_QUEUE_CONCURRENCY", 4)
+MEMO_JOB_MAX_ATTEMPTS = _get_int("MEMO_JOB_MAX_ATTEMPTS", 3)
+# 워커가 작업을 점유하는 시간 (초). 처리 중 종료된 작업은 이 시간이 지나면 다시 처리됨
+MEMO_JOB_LEASE_SECONDS = _get_float("MEMO_JOB_LEASE_SECONDS", 300.0)
+# 실패한 작업을 다시 처리하기 전 대기 시간 (초, 실패할 때마다 두 배로 늘어나며 최대값까지)
+MEMO_JOB_RETRY_BASE_DELAY = _get_float("MEMO_JOB_RETRY_BASE_DELAY", 5.0)
+MEMO_JOB_RETRY_MAX_DELAY = _get_float("MEMO_JOB_RETRY_MAX_DELAY", 300.0)
+# 같은 멱등성 키(기본값: 메모 텍스트 해시)를 중복 제출로 간주하는 기간 (초)
+MEMO_IDEMPOTENCY_WINDOW = _get_float("MEMO_IDEMPOTENCY_WINDOW", 24 * 60 * 60)
+MEMO_JOB_RETENTION = _get_float("MEMO_JOB_RETENTION", 7 * 24 * 60 * 60)
+
+# 메모 로컬 전처리 (LLM 호출 전 상대 날짜/시각을 절대값으로 바꾸고 알려진 엔티티 이름을 찾음)
+MEMO_PREPROCESS_ENABLED = _get_bool("MEMO_PREPROCESS_ENABLED", True)
+# 알려진 이름, 직함, 날짜, 만남을 나타내는 단어만으로 이루어진 메모는 LLM 없이 추출
+MEMO_LOCAL_EXTRACTION_ENABLED = _get_bool("MEMO_LOCAL_EXTRACTION_ENABLED", True)
+
+# 메모 추출 마이크로 배치 (max_wait초 안에 들어온 메모를 최대 max_size개까지 한 번의 LLM 호출로 추출)
+MEMO_BATCH_ENABLED = _get_bool("MEMO_BATCH_ENABLED", True)
+MEMO_BATCH_MAX_SIZE = _get_int("MEMO_BATCH_MAX_SIZE", 4)
+MEMO_BATCH_MAX_WAIT = _get_float("MEMO_BATCH_MAX_WAIT", 0.1)
+
+# 중복 엔티티 병합 작업 (python -m app.services.entity_dedup)
+# 진행 상태와 후보 블록을 저장하는 SQLite 파일 (같은 파일로 다시 실행하면 중단된 곳부터 이어서 진행)
+ENTITY_DEDUP_STATE_PATH = os.getenv("ENTITY_DEDUP_STATE_PATH", "entity_dedup.db")
+# 스캔 한 페이지에서 읽는 노드 수와 한 쓰기 트랜잭션에서 병합하는 중복 노드 수
+ENTITY_DEDUP_PAGE_SIZE = _get_int("ENTITY_DEDUP_PAGE_SIZE", 5000)
+ENTITY_DEDUP_MERGE_BATCH_SIZE = _get_int("ENTITY_DEDUP_MERGE_BATCH_SIZE", 200)
+# 이보다 큰 후보 블록(흔한 이름 등)은 쌍 비교 없이 건너뜀 (비교 횟수가 블록 크기의 제곱)
+ENTITY_DEDUP_MAX_BLOCK_SIZE = _get_int("ENTITY_DEDUP_MAX_BLOCK_SIZE", 50)
+# 이 점수 이상인 쌍을 같은 엔티티로 보고 병합
+ENTITY_DEDUP_THRESHOLD = _get_float("ENTITY_DEDUP_THRESHOLD", 0.7)
+
+# 그래프 시각화 API (/graph/neighborhood, /graph/export)
+# 노드별 최대 연결 수. 허브 노드(직원이 많은 회사 등)가 그래프를 뒤덮지 않도록 서버에서 제한
+GRAPH_MAX_DEGREE = _get_int("GRAPH_MAX_DEGREE", 50)
+GRAPH_NEIGHBORHOOD_MAX_HOPS = _get_int("GRAPH_NEIGHBORHOOD_MAX_HOPS", 3)
+GRAPH_NEIGHBORHOOD_MAX_NODES = _get_int("GRAPH_NEIGHBORHOOD_MAX_NODES", 500)
+# 전체 내보내기에서 NDJSON 한 줄에 담는 노드/엣지 수
+GRAPH_EXPORT_CHUNK_SIZE = _get_int("GRAPH_EXPORT_CHUNK_SIZE", 2000)
+
+# 지연/카운터 계측과 /metrics (Prometheus 텍스트 형식)
+METRICS_ENABLED = _get_bool("METRICS_ENABLED", True)
+# 계측을 끌 서브시스템 목록 (쉼표 구분: http, stages, neo4j, llm, cache, queue, logging)
+METRICS_DISABLED_SUBSYSTEMS = {
+    name.strip() for name in os.getenv("METRICS_DISABLED_SUBSYSTEMS", "").split(",") if name.strip()
+}
+
+# 로깅 (app/core/logger.py)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# json: 한 줄에 JSON 객체 하나, text: 사람이 읽기 위한 형식
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+# 출력 스레드로 넘기기 전 대기열 크기. 가득 차면 기록을 버림 (요청 처리를 막지 않음)
+LOG_QUEUE_SIZE = _get_int("LOG_QUEUE_SIZE", 10000)
+# 메시지/extra 필드 문자열의 최대 길이
+LOG_MAX_FIELD_LENGTH = _get_int("LOG_MAX_FIELD_LENGTH", 2000)
+# DEBUG 페이로드(LLM/OCR 응답 본문 등) 표본 비율 (0.0~1.0)
+LOG_PAYLOAD_SAMPLE_RATE = _get_float("LOG_PAYLOAD_SAMPLE_RATE", 0.1)
+
+# /ready에서 Neo4j 연결을 확인할 때의 제한 시간 (초)
+READY_CHECK_TIMEOUT = _get_float("READY_CHECK_TIMEOUT", 2.0)
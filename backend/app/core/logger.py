@@ -1,13 +1,173 @@
+"""
+애플리케이션 로깅 설정입니다.
+
+루트 로거에 큐 핸들러 하나만 붙이고, 실제 출력(포맷팅과 stderr 쓰기)은 백그라운드 스레드(QueueListener)가 합니다.
+이벤트 루프에서는 메시지를 잘라 큐에 넣는 비용만 들며, 출력이 막혀 큐가 가득 차면 기록을 버리고 개수를 셉니다.
+
+- LOG_FORMAT=json이면 한 줄에 JSON 객체 하나(ts, level, logger, message와 extra 필드)를 출력합니다.
+- 메시지와 extra 필드의 문자열은 LOG_MAX_FIELD_LENGTH자로 잘립니다.
+- LLM/OCR 응답 본문 같은 큰 페이로드는 debug_payload()로 DEBUG에서 LOG_PAYLOAD_SAMPLE_RATE 비율만 기록합니다.
+"""
+import sys
+import copy
+import json
+import queue
+import atexit
+import random
 import logging
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from app.core import config, metrics
+
+# LogRecord 기본 속성 (이 외의 속성은 extra로 전달된 구조화 필드로 간주)
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+# 요청마다 INFO 로그를 남기는 외부 라이브러리 (이전에는 루트 핸들러가 없어 출력되지 않았음)
+QUIET_LOGGERS = ("httpx", "httpcore", "neo4j")
+
+_configure_lock = threading.Lock()
+_listener = None
+_handler = None
+
+
+def truncate(value, max_length: int = None):
+    """문자열은 max_length자로 자르고, 딕셔너리/리스트는 내부 문자열을 재귀적으로 자릅니다."""
+    max_length = max_length or config.LOG_MAX_FIELD_LENGTH
+    if isinstance(value, str):
+        if len(value) <= max_length:
+            return value
+        return f"{value[:max_length]}...(truncated {len(value) - max_length} chars)"
+    if isinstance(value, dict):
+        return {key: truncate(item, max_length) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [truncate(item, max_length) for item in value]
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    return truncate(str(value), max_length)
+
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    """extra로 전달된 구조화 필드를 반환합니다."""
+    return {
+        key: value for key, value in vars(record).items()
+        if key not in _RECORD_ATTRIBUTES and not key.startswith("_")
+    }
+
+
+class TextFormatter(logging.Formatter):
+    """사람이 읽기 위한 한 줄 형식입니다. extra 필드는 메시지 뒤에 JSON으로 붙입니다."""
+
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extra = _extra_fields(record)
+        return f"{line} {json.dumps(extra, ensure_ascii=False, default=str)}" if extra else line
+
+
+class JsonFormatter(logging.Formatter):
+    """LogRecord를 한 줄짜리 JSON 객체로 출력합니다."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(_extra_fields(record))
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    호출한 스레드에서는 메시지 병합과 길이 제한만 하고 큐에 넣는 핸들러입니다.
+    큐가 가득 차면 기다리지 않고 기록을 버립니다.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 인자 객체와 traceback을 다른 스레드로 넘기지 않도록 여기서 문자열로 만듦
+        record = copy.copy(record)
+        record.msg = truncate(record.getMessage())
+        record.args = None
+        if record.exc_info:
+            traceback_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_text = truncate(traceback_text, config.LOG_MAX_FIELD_LENGTH * 4)
+            record.exc_info = None
+        for key, value in _extra_fields(record).items():
+            setattr(record, key, truncate(value))
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(stream=None):
+    """
+    루트 로거에 큐 핸들러와 백그라운드 출력 스레드를 설정합니다. 여러 번 호출해도 처음 한 번만 설정됩니다.
+
+    Args:
+        stream: 출력 스트림 (None이면 sys.stderr)
+    """
+    global _listener, _handler
+    with _configure_lock:
+        if _listener is not None:
+            return
+
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(JsonFormatter() if config.LOG_FORMAT == "json" else TextFormatter())
+
+        _handler = NonBlockingQueueHandler(queue.Queue(maxsize=config.LOG_QUEUE_SIZE))
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(_handler)
+        root.setLevel(config.LOG_LEVEL)
+        for name in QUIET_LOGGERS:
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+        _listener = QueueListener(_handler.queue, output, respect_handler_level=True)
+        _listener.start()
+        # 종료 시 큐에 남은 기록을 모두 출력
+        atexit.register(_listener.stop)
+        metrics.registry.register_collector("logging", _collect_metrics)
+
+
+def _collect_metrics():
+    yield "log_queue_size", "Log records waiting for the writer thread.", "gauge", {}, _handler.queue.qsize()
+    yield "log_records_dropped_total", "Log records dropped because the queue was full.", "counter", {}, _handler.dropped
+
 
 def get_logger(name):
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-
-    # 핸들러가 이미 추가되었는지 확인하여 중복 로깅 방지
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-    return logger
+    configure_logging()
+    return logging.getLogger(name)
+
+
+def get_dropped_count() -> int:
+    """큐가 가득 차서 버린 로그 기록 수를 반환합니다."""
+    return _handler.dropped if _handler else 0
+
+
+def debug_payload(logger: logging.Logger, message: str, **payload):
+    """
+    큰 페이로드(LLM 응답, OCR 결과 등)를 DEBUG 레벨에서 표본 추출하여 기록합니다.
+    DEBUG가 꺼져 있거나 표본에 뽑히지 않으면 페이로드를 직렬화하지 않습니다.
+
+    Args:
+        logger: 기록할 로거
+        message: 로그 메시지
+        payload: 구조화 필드로 기록할 값 (문자열은 LOG_MAX_FIELD_LENGTH자로 잘림)
+    """
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < config.LOG_PAYLOAD_SAMPLE_RATE:
+        logger.debug(message, extra={"payload": payload})
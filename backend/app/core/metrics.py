@@ -0,0 +1,209 @@
+"""
+프로세스 내 지연/카운터 계측과 Prometheus 텍스트 형식 출력을 제공합니다.
+
+- Histogram/Counter: 요청 경로에서 값을 직접 기록합니다. 기록 비용은 딕셔너리 조회와 bisect 한 번입니다.
+- 수집기(collector): 서비스가 이미 집계하고 있는 통계(캐시 히트율, 큐 길이 등)를 /metrics 요청 시점에만 읽습니다.
+
+모든 지표는 서브시스템(http, stages, neo4j, llm, cache, queue, logging)에 속하며,
+METRICS_DISABLED_SUBSYSTEMS에 포함된 서브시스템은 기록과 출력을 모두 건너뜁니다.
+모든 기록은 이벤트 루프 스레드에서 일어나므로 잠금을 사용하지 않습니다.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from app.core import config
+
+# 지표 이름 접두사 (business network agent)
+NAMESPACE = "bna"
+
+# 지연 히스토그램 버킷 (초). 캐시 히트(ms 미만)부터 LLM 호출(수십 초)까지 포함
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def enabled(subsystem: str) -> bool:
+    """서브시스템의 계측이 켜져 있는지 확인합니다."""
+    return config.METRICS_ENABLED and subsystem not in config.METRICS_DISABLED_SUBSYSTEMS
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """레이블별로 누적되는 카운터입니다."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help_text: str, subsystem: str, labels: tuple = ()):
+        self.name = f"{NAMESPACE}_{name}"
+        self.help = help_text
+        self.subsystem = subsystem
+        self.labels = labels
+        self.values = {}
+
+    def inc(self, *label_values, amount: float = 1):
+        if enabled(self.subsystem):
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self):
+        for label_values, value in self.values.items():
+            yield self.name, _format_labels(self.labels, label_values), value
+
+
+class Histogram:
+    """레이블별 누적 버킷 히스토그램입니다. (Prometheus histogram 형식)"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help_text: str, subsystem: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = f"{NAMESPACE}_{name}"
+        self.help = help_text
+        self.subsystem = subsystem
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.values = {}  # 레이블 값 -> [버킷별 개수(누적 아님)..., +Inf 개수, 합계]
+
+    def observe(self, value: float, *label_values):
+        if not enabled(self.subsystem):
+            return
+        series = self.values.get(label_values)
+        if series is None:
+            series = self.values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        """with 블록의 실행 시간(초)을 기록합니다. 예외가 발생해도 기록합니다."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def samples(self):
+        for label_values, series in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                labels = _format_labels(self.labels + ("le",), label_values + (_format_value(bound),))
+                yield f"{self.name}_bucket", labels, cumulative
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}_count", labels, cumulative
+            yield f"{self.name}_sum", labels, series[-1]
+
+
+class MetricsRegistry:
+    """지표와 수집기를 등록하고 Prometheus 텍스트 형식으로 출력합니다."""
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def counter(self, name: str, help_text: str, subsystem: str, labels: tuple = ()) -> Counter:
+        metric = Counter(name, help_text, subsystem, labels)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, subsystem: str, labels: tuple = (),
+                  buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help_text, subsystem, labels, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def register_collector(self, subsystem: str, collect):
+        """
+        출력 시점에 호출할 수집기를 등록합니다.
+
+        Args:
+            subsystem: 수집기가 속한 서브시스템
+            collect: (이름, 설명, 타입, 레이블 딕셔너리, 값)을 내보내는 함수. 이름에는 접두사가 붙음
+        """
+        self.collectors.append((subsystem, collect))
+
+    def render(self) -> str:
+        """등록된 모든 지표를 Prometheus 텍스트 형식(version 0.0.4)으로 출력합니다."""
+        lines = []
+        for metric in self.metrics:
+            if not enabled(metric.subsystem) or not metric.values:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in metric.samples())
+
+        # 여러 수집기가 같은 이름을 내보낼 수 있으므로 (예: cache_hit_ratio) 이름별로 모아서 출력
+        families = {}
+        for subsystem, collect in self.collectors:
+            if not enabled(subsystem):
+                continue
+            for name, help_text, metric_type, labels, value in collect():
+                if value is None:
+                    continue
+                name = f"{NAMESPACE}_{name}"
+                family = families.setdefault(name, (help_text, metric_type, []))
+                family[2].append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}")
+        for name, (help_text, metric_type, samples) in families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+# 지표 레지스트리 싱글톤
+registry = MetricsRegistry()
+
+# 처리 단계별 소요 시간 (ocr, llm_call, cypher_generation, query_execution, graph_write 등)
+stage_seconds = registry.histogram("stage_seconds", "Time spent in each processing stage.", "stages", ("stage",))
+
+# Neo4j 쿼리 지연 (쿼리 템플릿 이름, read/write)
+neo4j_query_seconds = registry.histogram(
+    "neo4j_query_seconds", "Neo4j query latency by query template.", "neo4j", ("query", "mode")
+)
+
+# Upstage API 호출 지연과 토큰 사용량
+llm_request_seconds = registry.histogram(
+    "llm_request_seconds", "Upstage API request latency including retries.", "llm", ("operation", "outcome")
+)
+llm_tokens_total = registry.counter("llm_tokens_total", "Solar Pro tokens reported by the API.", "llm", ("kind",))
+
+# HTTP 요청 지연 (라우트 경로 템플릿 기준)
+http_request_seconds = registry.histogram(
+    "http_request_seconds", "HTTP request latency by route.", "http", ("method", "route", "status")
+)
+
+
+def stage(name: str):
+    """처리 단계의 소요 시간을 stage_seconds에 기록하는 컨텍스트 매니저를 반환합니다."""
+    return stage_seconds.time(name)
+
+
+def record_llm_usage(usage: dict):
+    """Solar Pro 응답의 usage(prompt_tokens, completion_tokens)를 토큰 카운터에 더합니다."""
+    if not usage:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        if usage.get(kind):
+            llm_tokens_total.inc(kind.removesuffix("_tokens"), amount=usage[kind])
+
+
+def cache_samples(cache: str, cache_metrics: dict):
+    """ResponseCache/PlanCache의 get_metrics() 결과를 수집기 샘플로 변환합니다."""
+    labels = {"cache": cache}
+    hits = cache_metrics.get("hits", 0) + cache_metrics.get("disk_hits", 0)
+    yield "cache_hits_total", "Cache hits (memory and disk).", "counter", labels, hits
+    yield "cache_misses_total", "Cache misses.", "counter", labels, cache_metrics.get("misses", 0)
+    yield "cache_evictions_total", "Cache evictions.", "counter", labels, cache_metrics.get("evictions", 0)
+    yield "cache_hit_ratio", "Cache hit ratio since start.", "gauge", labels, cache_metrics.get("hit_ratio")
+    yield "cache_entries", "Entries currently held in memory.", "gauge", labels, cache_metrics.get("entries")
@@ -1,7 +1,14 @@
 import os
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
 from dotenv import load_dotenv
-from fastapi import FastAPI
-from app.api import routes
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.api import dependencies, routes
+from app.services import memo_ingestion
+from app.core import config, metrics
 from app.core.logger import get_logger
 
 # 환경 변수 로드
@@ -24,7 +31,36 @@ if tracing_enabled == "true" and langsmith_api_key:
 else:
     logger.warning("LangSmith tracing is disabled or API key is missing")
 
+async def process_memo_job(job: dict) -> dict:
+    """메모 수집 작업을 처리합니다. 상대 날짜와 Memo timestamp는 작업 생성 시각을 기준으로 합니다."""
+    return await memo_ingestion.ingest_memo(
+        dependencies.get_upstage_service(), dependencies.get_neo4j_service(), job["text"],
+        memo_id=job["memo_id"], now=datetime.fromtimestamp(job["created_at"])
+    )
+
+async def start_services():
+    """Neo4j에 연결(제약조건 생성 포함)한 뒤 메모 수집 워커를 시작합니다. 연결될 때까지 계속 재시도합니다."""
+    neo4j_service = dependencies.neo4j_service()
+    while True:
+        try:
+            await neo4j_service.connect()
+            break
+        except Exception as e:
+            logger.error(f"Failed to connect to Neo4j, retrying: {e}")
+            await asyncio.sleep(config.NEO4J_CONNECT_RETRY_INTERVAL)
+    dependencies.memo_queue().start(process_memo_job)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 연결을 기다리지 않고 바로 요청을 받음 (연결 전에는 /ready와 Neo4j를 쓰는 API가 503을 반환)
+    startup = asyncio.create_task(start_services())
+    yield
+    startup.cancel()
+    await asyncio.gather(startup, return_exceptions=True)
+    await dependencies.close_services()
+
 app = FastAPI(
+    lifespan=lifespan,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
@@ -35,10 +71,50 @@ app = FastAPI(
 
 app.include_router(routes.router, prefix="/api")
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """요청 지연을 라우트 경로 템플릿(/api/memos 등) 기준으로 기록합니다. 스트리밍 응답은 헤더 전송까지의 시간입니다."""
+    if not metrics.enabled("http"):
+        return await call_next(request)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # 경로 파라미터 값이 레이블로 들어가지 않도록 매칭된 라우트의 템플릿을 사용
+        route = request.scope.get("route")
+        metrics.http_request_seconds.observe(
+            time.perf_counter() - start, request.method, route.path if route else "unmatched", status
+        )
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus 텍스트 형식의 지표를 반환합니다."""
+    if not config.METRICS_ENABLED:
+        return PlainTextResponse("", status_code=404)
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 def health_check():
+    """프로세스가 살아 있는지만 확인합니다. (liveness)"""
     return {"status": "ok"}
 
+@app.get("/ready")
+async def readiness_check():
+    """요청을 처리할 준비가 되었는지 확인합니다. (readiness) 준비되지 않았으면 503을 반환합니다."""
+    checks = {
+        "neo4j": await dependencies.neo4j_service().check_connectivity(config.READY_CHECK_TIMEOUT),
+        "memo_queue": dependencies.memo_queue().running,
+        "upstage": dependencies.upstage_service() is not None,
+    }
+    ready = all(checks.values())
+    return JSONResponse(
+        {"status": "ready" if ready else "not_ready", "checks": checks},
+        status_code=200 if ready else 503,
+    )
+
 @app.get("/")
 def read_root():
     return {"Hello": "World"}
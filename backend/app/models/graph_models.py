@@ -0,0 +1,8 @@
+import re
+
+# 메모에서 추출되어 그래프에 저장되는 엔티티 레이블
+# (neo4j 드라이버를 import하지 않고도 쿼리 문자열을 만들 수 있도록 서비스 모듈과 분리)
+ENTITY_LABELS = ("Person", "Company", "Event", "Project")
+
+# 관계 타입은 Cypher 파라미터로 전달할 수 없으므로 이 형식에 맞는 타입만 저장
+RELATIONSHIP_TYPE_PATTERN = re.compile(r"^[A-Z][A-Z0-9_]*$")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class MemoInput(BaseModel):
     text: str
@@ -19,3 +19,6 @@ class CompanyData(BaseModel):
 class ContactInput(BaseModel):
     person_data: PersonData
     company_data: Optional[CompanyData] = None
+
+class ContactBatchInput(BaseModel):
+    contacts: List[ContactInput]
@@ -0,0 +1,132 @@
+"""
+자주 나오는 쿼리 결과 형태를 템플릿으로 한국어 답변으로 변환합니다.
+
+전화번호 조회처럼 결과가 단순한 질문은 두 번째 LLM 호출(결과 → 자연어) 없이 바로 답변합니다.
+템플릿으로 표현할 수 없는 결과는 None을 반환하며, 이 경우 LLM으로 답변을 생성합니다.
+"""
+
+NO_RESULTS_ANSWER = "관련 정보를 찾을 수 없습니다."
+
+# 결과 컬럼(예: "p.phone")의 마지막 속성 이름별 한국어 표시 이름
+FIELD_LABELS = {
+    "name": "이름",
+    "title": "직함",
+    "phone": "전화번호",
+    "email": "이메일",
+    "company": "회사",
+    "date": "일시",
+    "timestamp": "일시",
+}
+
+# 날짜/시간으로 표시하는 속성
+DATETIME_FIELDS = ("date", "timestamp")
+
+
+def render_answer(results: list, truncated: bool = False):
+    """
+    쿼리 결과를 템플릿 답변으로 변환합니다.
+
+    지원하는 결과 형태:
+    - 결과 없음
+    - 단일 값 (예: RETURN p.phone)
+    - 이름/직함/일정 목록 (예: RETURN p.name, p.title / RETURN e.name, e.date)
+
+    Args:
+        results: Cypher 쿼리 결과 (레코드 딕셔너리 리스트)
+        truncated: 행 수 제한으로 결과가 잘렸는지 여부 (목록 답변에 일부만 표시했다고 안내)
+
+    Returns:
+        답변 문자열. 템플릿으로 표현할 수 없으면 None
+    """
+    if not results:
+        return NO_RESULTS_ANSWER
+
+    columns = list(results[0].keys())
+    fields = [_field_name(column) for column in columns]
+    # 알려진 속성의 스칼라 값만 템플릿으로 처리 (노드, 집계, 중첩 값은 LLM이 설명)
+    if not columns or len(set(fields)) != len(fields) or any(field not in FIELD_LABELS for field in fields):
+        return None
+    if any(not _is_scalar(row.get(column)) for row in results for column in columns):
+        return None
+
+    rows = []
+    for row in results:
+        values = {field: _format_value(field, row.get(column)) for field, column in zip(fields, columns)}
+        if any(values.values()) and values not in rows:
+            rows.append(values)
+    if not rows:
+        return NO_RESULTS_ANSWER
+
+    if len(fields) == 1:
+        field = fields[0]
+        if len(rows) == 1:
+            return _describe([(FIELD_LABELS[field], rows[0][field])])
+        return _count_header(f"{FIELD_LABELS[field]} ", len(rows), truncated) + "\n".join(f"- {row[field]}" for row in rows)
+
+    if "name" not in fields:
+        if len(rows) > 1:
+            return None
+        return _describe([(FIELD_LABELS[field], rows[0][field]) for field in fields])
+
+    details = [field for field in fields if field != "name"]
+    if len(rows) == 1 and rows[0]["name"]:
+        row = rows[0]
+        return f"{row['name']}의 " + _describe([(FIELD_LABELS[field], row[field]) for field in details])
+
+    lines = []
+    for row in rows:
+        values = [row[field] for field in details if row[field]]
+        line = row["name"] or "(이름 없음)"
+        if values:
+            line += f" ({', '.join(values)})"
+        lines.append(f"- {line}")
+    return _count_header("총 ", len(rows), truncated) + "\n".join(lines)
+
+
+def _count_header(prefix: str, count: int, truncated: bool) -> str:
+    """목록 답변의 첫 줄을 만듭니다. 결과가 잘렸으면 일부만 표시했다고 안내합니다."""
+    if truncated:
+        return f"결과가 많아 {prefix}{count}건만 표시합니다.\n"
+    return f"{prefix}{count}건을 찾았습니다.\n"
+
+
+def _field_name(column: str) -> str:
+    """결과 컬럼 이름에서 속성 이름을 추출합니다. (예: "p.phone" -> "phone")"""
+    return column.rsplit(".", 1)[-1].lower()
+
+
+def _is_scalar(value) -> bool:
+    # Neo4j 시간 타입(DateTime, Date 등)은 iso_format()으로 표시할 수 있으므로 스칼라로 취급
+    return value is None or isinstance(value, (str, int, float, bool)) or hasattr(value, "iso_format")
+
+
+def _format_value(field: str, value) -> str:
+    """값을 답변에 표시할 문자열로 변환합니다. ISO 날짜/시간은 "YYYY-MM-DD HH:MM" 형식으로 표시합니다."""
+    if value is None:
+        return ""
+    text = value.iso_format() if hasattr(value, "iso_format") else str(value).strip()
+    if field in DATETIME_FIELDS and len(text) >= 16 and text[10] == "T":
+        text = f"{text[:10]} {text[11:16]}"
+        if text.endswith(" 00:00"):
+            text = text[:10]
+    return text
+
+
+def _topic_particle(word: str) -> str:
+    """단어의 받침 유무에 따라 주제 조사("은"/"는")를 고릅니다."""
+    last = word[-1]
+    if "가" <= last <= "힣" and (ord(last) - ord("가")) % 28:
+        return "은"
+    return "는"
+
+
+def _describe(items: list) -> str:
+    """(표시 이름, 값) 목록을 "전화번호는 010-1234-5678, 직함은 과장입니다." 형태의 문장으로 만듭니다."""
+    present = [f"{label}{_topic_particle(label)} {value}" for label, value in items if value]
+    missing = [label for label, value in items if not value]
+    sentences = []
+    if present:
+        sentences.append(", ".join(present) + "입니다.")
+    if missing:
+        sentences.append(", ".join(missing) + " 정보는 없습니다.")
+    return " ".join(sentences)
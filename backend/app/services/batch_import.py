@@ -0,0 +1,166 @@
+import io
+import time
+import asyncio
+import hashlib
+import zipfile
+from fastapi import HTTPException
+from app.core import config
+from app.core.logger import get_logger
+from app.services import business_card
+
+logger = get_logger(__name__)
+
+# 일괄 등록에서 명함 이미지로 취급하는 확장자
+CARD_FILE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".heic", ".webp", ".pdf")
+
+
+class RateLimiter:
+    """
+    작업 시작 간격을 일정하게 유지하는 비동기 레이트 리미터입니다.
+    초당 rate개를 넘지 않도록 acquire() 호출 시점을 1/rate초 간격으로 배정합니다.
+    """
+
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate: 초당 허용 작업 수 (0 이하이면 제한 없음)
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """다음 시작 가능 시점까지 대기합니다."""
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def _check_batch_limits(count: int, total_bytes: int):
+    """명함 수나 총 크기가 요청당 한도를 넘으면 400 오류를 발생시킵니다."""
+    if count > config.BATCH_IMPORT_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many business cards in one batch (max {config.BATCH_IMPORT_MAX_FILES})."
+        )
+    if total_bytes > config.BATCH_IMPORT_MAX_BYTES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Business card files are too large in total (max {config.BATCH_IMPORT_MAX_BYTES} bytes)."
+        )
+
+
+def _read_zip_cards(filename: str, content: bytes, count: int, total_bytes: int) -> list:
+    """
+    zip 파일 안의 명함 이미지들을 [(filename, bytes)] 목록으로 읽습니다.
+
+    Args:
+        count, total_bytes: 이 파일 전까지 읽은 명함 수와 총 크기 (한도 검사용)
+    """
+    try:
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            # 압축 폭탄을 막기 위해 내용을 읽기 전에 헤더의 개수와 압축 해제 크기로 먼저 검사
+            members = [
+                info for info in archive.infolist()
+                if not info.is_dir()
+                and not info.filename.startswith("__MACOSX/")
+                and info.filename.lower().endswith(CARD_FILE_EXTENSIONS)
+            ]
+            _check_batch_limits(count + len(members), total_bytes + sum(info.file_size for info in members))
+            # 헤더의 크기보다 많이 풀리는 항목은 zipfile이 BadZipFile로 거부함
+            return [(info.filename, archive.read(info)) for info in members]
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail=f"Invalid zip file: {filename}")
+    except NotImplementedError:
+        # deflate64 등 지원하지 않는 압축 방식 (RuntimeError의 하위 클래스이므로 먼저 처리)
+        raise HTTPException(status_code=400, detail=f"Unsupported zip compression method: {filename}")
+    except RuntimeError:
+        # 암호화된 항목
+        raise HTTPException(status_code=400, detail=f"Encrypted zip files are not supported: {filename}")
+
+
+async def read_uploaded_cards(files) -> list:
+    """
+    업로드된 파일들을 (파일 이름, 내용) 목록으로 읽습니다.
+    zip 파일은 내부의 명함 이미지들로 펼칩니다.
+
+    스트리밍 응답이 시작되면 업로드 파일이 닫히므로 처리 전에 내용을 메모리로 읽어 둡니다.
+
+    Args:
+        files: FastAPI UploadFile 목록
+
+    Returns:
+        [(filename, bytes)] 목록
+    """
+    cards = []
+    total_bytes = 0
+    for file in files:
+        content = await file.read()
+        if file.filename.lower().endswith(".zip"):
+            # 압축 해제는 CPU를 오래 쓰므로 이벤트 루프가 아닌 스레드에서 실행
+            members = await asyncio.to_thread(_read_zip_cards, file.filename, content, len(cards), total_bytes)
+            total_bytes += sum(len(data) for _, data in members)
+            cards.extend(members)
+        else:
+            total_bytes += len(content)
+            cards.append((file.filename, content))
+        _check_batch_limits(len(cards), total_bytes)
+    return cards
+
+
+async def import_business_cards(upstage_service, cards: list, concurrency: int, rate: float):
+    """
+    명함들을 제한된 동시성과 속도로 처리하면서, 완료되는 순서대로 결과를 내보내는 비동기 제너레이터입니다.
+
+    Args:
+        upstage_service: Upstage API 서비스
+        cards: [(filename, bytes)] 목록
+        concurrency: 동시에 처리할 최대 명함 수
+        rate: 초당 시작할 수 있는 최대 명함 수 (0 이하이면 제한 없음)
+
+    Yields:
+        명함별 결과 {"event": "card", "index", "filename", "status", ...}와
+        마지막 요약 {"event": "done", "total", "succeeded", "failed", "elapsed_seconds"}
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    rate_limiter = RateLimiter(rate)
+    start = time.perf_counter()
+
+    async def process(index: int, filename: str, content: bytes):
+        async with semaphore:
+            await rate_limiter.acquire()
+            content_hash = hashlib.sha256(content).hexdigest()
+            try:
+                result = await business_card.extract_business_card(upstage_service, content, filename, content_hash)
+                return {"event": "card", "index": index, "filename": filename, "status": "ok", **result}
+            except HTTPException as e:
+                error = e.detail
+            except Exception as e:
+                logger.error(f"Failed to process business card {filename}: {e}", exc_info=True)
+                error = str(e)
+            return {"event": "card", "index": index, "filename": filename, "status": "error", "error": error}
+
+    tasks = [asyncio.create_task(process(index, filename, content)) for index, (filename, content) in enumerate(cards)]
+    succeeded = 0
+    try:
+        for completed in asyncio.as_completed(tasks):
+            result = await completed
+            succeeded += result["status"] == "ok"
+            yield result
+    finally:
+        # 클라이언트 연결이 끊기면 남은 작업을 취소
+        for task in tasks:
+            task.cancel()
+
+    yield {
+        "event": "done",
+        "total": len(cards),
+        "succeeded": succeeded,
+        "failed": len(cards) - succeeded,
+        "elapsed_seconds": round(time.perf_counter() - start, 3),
+    }
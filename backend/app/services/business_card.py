@@ -0,0 +1,157 @@
+import re
+import json
+import hashlib
+from fastapi import HTTPException
+from app.core import config, metrics
+from app.core.logger import get_logger, debug_payload
+from app.services.cache import ResponseCache
+
+logger = get_logger(__name__)
+
+# 업로드 파일을 해시할 때 한 번에 읽는 크기
+HASH_CHUNK_SIZE = 64 * 1024
+
+BUSINESS_CARD_SYSTEM_PROMPT = """You are an expert assistant that extracts key information from business card text.
+        The user will provide the text content of a business card.
+        Extract the following fields: name, title, company, phone, email.
+        Handle various phone number formats including international ones like '82 10-0000-0000'.
+        Return the output in a clean JSON format. For example:
+        {
+          "name": "김성길",
+          "title": "과장",
+          "company": "ABC상사",
+          "phone": "010-2222-1234",
+          "email": "kim@abc.com"
+        }
+        If a field is not found, omit it from the JSON. The name must be in Korean.
+        """
+
+# 이미지 해시를 키로 하는 캐시
+# - ocr_cache: Document Parse 결과 (OCR 비용 절감)
+# - card_cache: 최종 person_data/company_data (중복 업로드는 OCR과 LLM 호출 없이 응답)
+ocr_cache = None
+card_cache = None
+if config.OCR_CACHE_ENABLED:
+    ocr_cache = ResponseCache(
+        "document_parse",
+        max_entries=config.OCR_CACHE_MAX_ENTRIES,
+        ttl=config.OCR_CACHE_TTL,
+        sqlite_path=config.OCR_CACHE_SQLITE_PATH,
+    )
+    card_cache = ResponseCache(
+        "business_card",
+        max_entries=config.OCR_CACHE_MAX_ENTRIES,
+        ttl=config.OCR_CACHE_TTL,
+        sqlite_path=config.OCR_CACHE_SQLITE_PATH,
+    )
+    metrics.registry.register_collector("cache", lambda: metrics.cache_samples("document_parse", ocr_cache.get_metrics()))
+    metrics.registry.register_collector("cache", lambda: metrics.cache_samples("business_card", card_cache.get_metrics()))
+
+
+async def hash_upload(file) -> str:
+    """
+    업로드된 파일 내용의 SHA-256 해시를 계산합니다.
+    파일을 청크 단위로 읽은 뒤 처음 위치로 되돌리므로, 이후 그대로 스트리밍할 수 있습니다.
+
+    Args:
+        file: FastAPI UploadFile
+
+    Returns:
+        16진수 해시 문자열
+    """
+    digest = hashlib.sha256()
+    while chunk := await file.read(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    await file.seek(0)
+    return digest.hexdigest()
+
+
+def parse_llm_json(content: str):
+    """
+    LLM 응답 본문에서 JSON을 파싱합니다.
+    Markdown 코드 블록(```json 또는 ```)으로 감싸진 경우 내부만 파싱합니다.
+    """
+    if "```json" in content:
+        start = content.find("```json") + len("```json")
+        end = content.find("```", start)
+        if end != -1:
+            content = content[start:end].strip()
+    elif "```" in content:
+        start = content.find("```") + len("```")
+        end = content.find("```", start)
+        if end != -1:
+            content = content[start:end].strip()
+    return json.loads(content)
+
+
+async def extract_business_card(upstage_service, document, filename: str, content_hash: str) -> dict:
+    """
+    명함 이미지에서 텍스트를 추출(OCR)하고 LLM으로 인물/회사 정보를 구조화합니다.
+    같은 이미지(content_hash)를 이미 처리한 경우 캐시된 결과를 반환합니다.
+
+    Args:
+        upstage_service: Upstage API 서비스
+        document: 명함 이미지 (파일 객체 또는 bytes, 멀티파트 요청으로 그대로 전송)
+        filename: 업로드된 파일 이름
+        content_hash: 이미지 내용의 SHA-256 해시 (hash_upload로 계산)
+
+    Returns:
+        person_data: 추출된 인물 정보 (이름, 직함, 전화번호, 이메일)
+        company_data: 추출된 회사 정보
+    """
+    if card_cache:
+        cached = await card_cache.get(content_hash)
+        if cached is not None:
+            logger.info(f"Business card {content_hash[:12]} served from cache")
+            return cached
+
+    # Document Parse API를 사용하여 명함 텍스트 추출
+    parsed_document = await ocr_cache.get(content_hash) if ocr_cache else None
+    if parsed_document is None:
+        parsed_document = await upstage_service.document_parse(document, filename)
+        if ocr_cache:
+            await ocr_cache.set(content_hash, parsed_document)
+
+    # HTML 태그를 제거하고 순수 텍스트만 추출
+    all_text_content = ""
+    for element in parsed_document.get("elements", []):
+        html_content = element.get("content", {}).get("html", "")
+        text_content = re.sub(r'<[^>]+>', '', html_content).replace('<br>', '\n').strip()
+        all_text_content += text_content + "\n"
+
+    # LLM을 사용하여 명함 정보 구조화
+    messages = [
+        {"role": "system", "content": BUSINESS_CARD_SYSTEM_PROMPT},
+        {"role": "user", "content": all_text_content.strip()}
+    ]
+
+    response = await upstage_service.solar_pro(messages)
+    debug_payload(logger, "Solar Pro business card response", response=response)
+
+    try:
+        extracted_data = parse_llm_json(response["choices"][0]["message"]["content"])
+        if not isinstance(extracted_data, dict):
+            raise ValueError(f"Expected a JSON object, got {type(extracted_data).__name__}")
+
+        # 인물 정보 추출 (값이 있는 필드만 포함)
+        person_data = {
+            "name": extracted_data.get("name"),
+            "title": extracted_data.get("title"),
+            "phone": extracted_data.get("phone"),
+            "email": extracted_data.get("email"),
+        }
+        person_data = {k: v for k, v in person_data.items() if v}
+
+        # 회사 정보 추출
+        company_data = {"name": extracted_data.get("company")} if extracted_data.get("company") else {}
+
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        # JSON이 아니거나(JSONDecodeError는 ValueError) 객체가 아닌 응답은 캐시에서도 제거
+        await upstage_service.evict_cached_response(messages)
+        logger.error(f"Failed to parse LLM response for business card: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to extract information from business card using LLM.")
+
+    result = {"person_data": person_data, "company_data": company_data}
+    if card_cache:
+        await card_cache.set(content_hash, result)
+    return result
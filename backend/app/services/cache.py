@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 만료된 디스크 항목을 정리하는 주기 (set 호출 횟수 기준)
+DISK_PRUNE_INTERVAL = 1000
+
+
+def make_cache_key(*parts) -> str:
+    """
+    임의의 JSON 직렬화 가능한 값들로부터 내용 기반 캐시 키(SHA-256)를 생성합니다.
+    딕셔너리 키 순서와 무관하게 같은 내용이면 같은 키가 생성됩니다.
+    """
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    JSON 직렬화 가능한 응답을 저장하는 2단계 캐시입니다.
+
+    - 메모리 계층: TTL이 있는 LRU. 항목 수와 직렬화된 크기(바이트) 상한을 넘으면 오래된 항목부터 제거합니다.
+    - 디스크 계층(선택): SQLite 파일에 저장되어 프로세스 재시작 후에도 유지됩니다.
+      메모리에서 찾지 못한 항목을 조회하고, 찾으면 메모리 계층으로 올립니다.
+      SQLite 호출은 이벤트 루프를 막지 않도록 asyncio.to_thread로 실행하므로 get/set/delete는 코루틴입니다.
+
+    값은 JSON 문자열로 저장되므로 조회할 때마다 새 객체가 반환되어,
+    호출자가 결과를 수정해도 캐시된 값에는 영향이 없습니다.
+    """
+
+    def __init__(self, name: str, max_entries: int = 1000, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: float = 24 * 60 * 60, sqlite_path: str = None):
+        """
+        Args:
+            name: 캐시 이름 (메트릭과 SQLite 테이블 이름에 사용)
+            max_entries: 메모리 계층 최대 항목 수
+            max_bytes: 메모리 계층 최대 크기 (직렬화된 값의 UTF-8 바이트 기준)
+            ttl: 항목 유효 시간 (초)
+            sqlite_path: 디스크 계층 SQLite 파일 경로 (None이면 메모리 계층만 사용)
+        """
+        if not re.match(r"^\w+$", name):
+            raise ValueError(f"Invalid cache name: {name}")
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (만료 시각, 직렬화된 값, UTF-8 바이트 수)
+        self._size = 0
+        self._lock = threading.Lock()  # 메모리 계층 (이벤트 루프에서 짧게만 잡음)
+        self._db_lock = threading.Lock()  # 디스크 계층
+        self._sets_since_prune = 0
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+        self._db = None
+        if sqlite_path:
+            self._table = f"cache_{name}"
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._prune_disk()
+            logger.info(f"Cache '{name}' persisted to {sqlite_path}")
+
+    async def get(self, key: str):
+        """
+        캐시된 값을 반환합니다. 없거나 만료된 경우 None을 반환합니다.
+        메모리 계층에 없으면 디스크 계층을 스레드에서 조회합니다.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value, _ = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return json.loads(value)
+                self._remove(key)
+                self.stats["expirations"] += 1
+
+        if self._db is not None:
+            row = await asyncio.to_thread(self._get_disk, key)
+            if row and row[1] > now:
+                with self._lock:
+                    self._store(key, row[0], row[1])
+                    self.stats["disk_hits"] += 1
+                return json.loads(row[0])
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value):
+        """값을 캐시에 저장합니다. 디스크 계층이 있으면 스레드에서 함께 기록합니다."""
+        serialized = json.dumps(value, ensure_ascii=False)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store(key, serialized, expires_at)
+        if self._db is not None:
+            await asyncio.to_thread(self._set_disk, key, serialized, expires_at)
+
+    async def delete(self, key: str):
+        """캐시 항목을 삭제합니다. (잘못된 응답이 재사용되지 않도록 무효화할 때 사용)"""
+        with self._lock:
+            self._remove(key)
+        if self._db is not None:
+            await asyncio.to_thread(self._delete_disk, key)
+
+    def get_metrics(self) -> dict:
+        """적중/실패/제거 횟수와 현재 메모리 사용량을 반환합니다."""
+        lookups = self.stats["hits"] + self.stats["disk_hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_ratio": (self.stats["hits"] + self.stats["disk_hits"]) / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "persistent": self._db is not None,
+        }
+
+    def _store(self, key: str, serialized: str, expires_at: float):
+        """메모리 계층에 저장하고 상한을 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다."""
+        self._remove(key)
+        size = len(serialized.encode("utf-8"))
+        self._entries[key] = (expires_at, serialized, size)
+        self._size += size
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.stats["evictions"] += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[2]
+
+    # 디스크 계층 (asyncio.to_thread로 실행되며 _db_lock으로 직렬화)
+    def _get_disk(self, key: str):
+        with self._db_lock:
+            return self._db.execute(f"SELECT value, expires_at FROM {self._table} WHERE key = ?", (key,)).fetchone()
+
+    def _set_disk(self, key: str, serialized: str, expires_at: float):
+        with self._db_lock:
+            with self._db:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self._table} (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, serialized, expires_at),
+                )
+            self._sets_since_prune += 1
+            if self._sets_since_prune >= DISK_PRUNE_INTERVAL:
+                self._prune_disk()
+
+    def _delete_disk(self, key: str):
+        with self._db_lock:
+            with self._db:
+                self._db.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+
+    def _prune_disk(self):
+        """디스크 계층에서 만료된 항목을 삭제합니다."""
+        with self._db:
+            self._db.execute(f"DELETE FROM {self._table} WHERE expires_at <= ?", (time.time(),))
+        self._sets_since_prune = 0
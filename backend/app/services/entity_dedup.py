@@ -0,0 +1,548 @@
+"""
+그래프에 쌓인 중복 Person/Company 노드를 찾아 병합하는 오프라인 작업입니다.
+
+메모 저장 시의 이름 정규화는 그 시점에 있던 노드만 보므로 "김성길님"/"김성길", "(주)ABC상사"/"ABC상사"처럼
+같은 대상의 노드가 여러 개 생길 수 있습니다. 이 작업은 전체 그래프를 다음 단계로 처리합니다.
+
+1. scan: 레이블별로 이름순 페이지를 읽어 노드 정보와 후보 블록 키를 SQLite에 기록
+   - Person: 호칭/직함을 뗀 이름, 성을 뺀 이름, 전화번호, 이메일, 이메일 도메인 + 성
+   - Company: company_name_key (법인 형태 표기/공백/대소문자 무시)
+2. score: 블록 키가 같은 노드 쌍만 점수를 매겨 임계값 이상인 쌍을 기록 (큰 블록은 건너뜀)
+3. plan: 여러 인물에 부분 일치하는 모호한 쌍과 전화번호가 충돌하는 묶음을 빼고, 연결된 쌍을 묶어 남길 노드를 정함
+4. merge: 병합 목록을 merge_batch_size개씩 GraphStore.merge_entities로 병합 (한 묶음이 한 쓰기 트랜잭션)
+
+그래프 전체를 메모리에 올리지 않습니다. 노드와 블록 키는 SQLite에 쓰고 비교는 블록 하나씩 하므로,
+메모리에 남는 것은 한 페이지/블록과 병합 대상 노드의 묶음 정보뿐입니다.
+단계와 커서를 SQLite에 기록하므로 중단된 작업은 같은 상태 파일로 다시 실행하면 이어서 진행합니다.
+병합 묶음은 그래프에 커밋된 뒤 완료로 표시하며, 다시 실행되어도 이미 없는 노드는 건너뜁니다.
+--dry-run으로 만든 계획은 상태 파일에 남으므로, 보고서를 검토한 뒤 같은 상태 파일로 실행하면 그 계획대로 병합합니다.
+
+실행 (backend 디렉터리에서):
+    python -m app.services.entity_dedup --dry-run --report dedup-report.json   # 병합하지 않고 후보만 보고
+    python -m app.services.entity_dedup --report dedup-report.json             # 병합 (중단되면 다시 실행해 이어서 진행)
+    python -m app.services.entity_dedup --restart --dry-run                    # 상태 파일을 비우고 처음부터
+"""
+import re
+import json
+import time
+import asyncio
+import argparse
+import sqlite3
+from collections import defaultdict
+from contextlib import contextmanager
+from app.core import config
+from app.core.logger import get_logger
+from app.services.entity_matcher import CONTACT_PROPERTIES, clean_person_name, company_name_key, strip_company_form
+from app.services.memo_preprocessor import TITLES
+
+logger = get_logger(__name__)
+
+# 중복을 찾는 레이블 (Event/Project는 이름에 날짜 등이 들어가 표기 차이가 곧 다른 대상인 경우가 많음)
+DEDUP_LABELS = ("Person", "Company")
+
+# 작업 단계 (상태 파일에 기록된 단계부터 이어서 실행)
+PHASES = ("scan", "score", "plan", "merge", "done")
+
+# 병합 상태
+PENDING = "pending"
+MERGED = "merged"
+
+# Person 쌍 점수. 합이 임계값 이상이면 같은 인물로 봄
+PERSON_SCORES = {
+    "same_name": 0.7,  # 호칭/직함/공백을 뗀 이름이 같음
+    "name_contained": 0.35,  # 한쪽 이름이 다른 쪽에 포함됨 ("인영" / "이인영")
+    "same_phone": 0.6,
+    "same_email": 0.6,
+    "shared_company": 0.25,  # 같은 Company에 WORKS_AT
+    "same_email_domain": 0.1,
+    "mention_only": 0.35,  # 이름이 겹치고 한쪽에 연락처 정보가 없음 (메모에서만 언급된 노드)
+    "phone_conflict": -0.6,  # 둘 다 전화번호가 있는데 다름 (동명이인)
+    "email_conflict": -0.3,
+}
+
+_TITLE_SUFFIX_PATTERN = re.compile("(?:" + "|".join(sorted(TITLES, key=len, reverse=True)) + ")$")
+_KOREAN_NAME_PATTERN = re.compile(r"[가-힣]{2,4}")
+
+
+def person_name_key(name: str) -> str:
+    """괄호 안 설명, 공백, "님", 이름 뒤 직함을 뗀 Person 이름입니다. ("김성길 과장님" -> "김성길")"""
+    key = clean_person_name(re.sub(r"\(.*?\)", "", name) if "(" in name else name)
+    match = _TITLE_SUFFIX_PATTERN.search(key)
+    # "김부장"처럼 직함을 떼면 한 글자만 남는 이름은 그대로 둠
+    if match and match.start() >= 2:
+        return key[:match.start()]
+    return key
+
+
+def phone_key(phone) -> str:
+    """비교용 전화번호 (숫자만, +82는 0으로). 번호가 아니면 빈 문자열"""
+    digits = re.sub(r"\D", "", str(phone or ""))
+    if digits.startswith("82"):
+        digits = "0" + digits[2:]
+    return digits if len(digits) >= 9 else ""
+
+
+def email_key(email) -> str:
+    email = str(email or "").strip().casefold()
+    return email if "@" in email else ""
+
+
+def block_keys(label: str, name: str, properties: dict) -> set:
+    """노드가 속하는 후보 블록 키들입니다. 같은 키를 가진 노드끼리만 비교합니다."""
+    if label == "Company":
+        return {f"Company|name:{company_name_key(name)}"}
+
+    key = person_name_key(name)
+    keys = set()
+    if key:
+        keys.add(f"name:{key}")
+        # 성을 뺀 이름으로 "인영"과 "이인영"을 같은 블록에 넣음
+        if _KOREAN_NAME_PATTERN.fullmatch(key):
+            keys.add(f"given:{key[-2:]}")
+    phone = phone_key(properties.get("phone"))
+    if phone:
+        keys.add(f"phone:{phone}")
+    email = email_key(properties.get("email"))
+    if email:
+        keys.add(f"email:{email}")
+        if key:
+            keys.add(f"domain:{email.partition('@')[2]}:{key[0]}")
+    return {f"Person|{key}" for key in keys}
+
+
+def score_person_pair(a: dict, b: dict):
+    """
+    두 Person 노드가 같은 인물일 점수를 매깁니다.
+    이름이 겹치지 않으면 이메일이 같을 때만 점수를 매깁니다. (전화번호만 같으면 대표번호 공유일 수 있음)
+
+    Returns:
+        (점수, 근거 목록, 다른 쪽 이름에 포함되는 노드의 이름 또는 None)
+    """
+    reasons = []
+    contained = None
+    key_a, key_b = person_name_key(a["name"]), person_name_key(b["name"])
+    shorter, longer = sorted((a, b), key=lambda node: len(person_name_key(node["name"])))
+    if key_a == key_b:
+        reasons.append("same_name")
+    elif len(person_name_key(shorter["name"])) >= 2 and person_name_key(shorter["name"]) in person_name_key(longer["name"]):
+        reasons.append("name_contained")
+        contained = shorter["name"]
+    name_related = bool(reasons)
+
+    props_a, props_b = a["properties"], b["properties"]
+    phone_a, phone_b = phone_key(props_a.get("phone")), phone_key(props_b.get("phone"))
+    if phone_a and phone_b:
+        reasons.append("same_phone" if phone_a == phone_b else "phone_conflict")
+    email_a, email_b = email_key(props_a.get("email")), email_key(props_b.get("email"))
+    if email_a and email_b:
+        if email_a == email_b:
+            reasons.append("same_email")
+        else:
+            reasons.append("email_conflict")
+            if email_a.partition("@")[2] == email_b.partition("@")[2]:
+                reasons.append("same_email_domain")
+    if set(a["companies"]) & set(b["companies"]):
+        reasons.append("shared_company")
+    if name_related and not (
+        any(props_a.get(key) for key in CONTACT_PROPERTIES) and any(props_b.get(key) for key in CONTACT_PROPERTIES)
+    ):
+        reasons.append("mention_only")
+
+    if not name_related and "same_email" not in reasons:
+        return 0.0, reasons, None
+    return round(sum(PERSON_SCORES[reason] for reason in reasons), 3), reasons, contained
+
+
+def score_company_pair(a: dict, b: dict):
+    """두 Company 노드가 같은 회사일 점수를 매깁니다. (법인 형태 표기만 다른 이름)"""
+    if company_name_key(a["name"]) == company_name_key(b["name"]):
+        return 1.0, ["same_company_key"], None
+    return 0.0, [], None
+
+
+def survivor_rank(label: str, node: dict) -> tuple:
+    """
+    묶음에서 남길 노드를 정하는 정렬 키입니다. (작을수록 우선)
+    - Person: 연락처 정보가 많은 노드, 호칭/직함이 없는 이름, 긴 이름, 관계가 많은 노드
+    - Company: 법인 형태 표기가 없는 이름, 관계가 많은 노드, 짧은 이름
+    """
+    name = node["name"]
+    if label == "Person":
+        key = person_name_key(name)
+        contacts = sum(bool(node["properties"].get(prop)) for prop in CONTACT_PROPERTIES)
+        return -contacts, name != key, -len(key), -node["degree"], name
+    return name != strip_company_form(name), -node["degree"], len(name), name
+
+
+class EntityDeduplicator:
+    """
+    중복 엔티티 병합 작업입니다. 진행 상태는 SQLite 상태 파일에 저장됩니다. (모듈 설명 참고)
+    """
+
+    def __init__(self, graph_store, state_path: str, page_size: int = 5000, merge_batch_size: int = 200,
+                 max_block_size: int = 50, threshold: float = 0.7):
+        """
+        Args:
+            graph_store: 중복을 찾고 병합할 그래프 저장소
+            state_path: 진행 상태를 저장할 SQLite 파일 경로
+            page_size: 스캔 한 페이지에서 읽는 노드 수
+            merge_batch_size: 한 쓰기 트랜잭션에서 병합하는 중복 노드 수
+            max_block_size: 이보다 큰 후보 블록은 비교하지 않음
+            threshold: 이 점수 이상인 쌍을 같은 엔티티로 봄
+        """
+        self.graph_store = graph_store
+        self.page_size = page_size
+        self.merge_batch_size = merge_batch_size
+        self.max_block_size = max_block_size
+        self.threshold = threshold
+
+        self._db = sqlite3.connect(state_path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")  # WAL에서는 커밋된 단계/커서가 프로세스 종료에도 유지됨
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS nodes (label TEXT NOT NULL, name TEXT NOT NULL, data TEXT NOT NULL, "
+            "PRIMARY KEY (label, name)) WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS block_keys (key TEXT NOT NULL, name TEXT NOT NULL, "
+            "PRIMARY KEY (key, name)) WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pairs (label TEXT NOT NULL, a TEXT NOT NULL, b TEXT NOT NULL, "
+            "score REAL NOT NULL, reasons TEXT NOT NULL, contained TEXT, ambiguous INTEGER NOT NULL DEFAULT 0, "
+            "PRIMARY KEY (label, a, b)) WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS merges (id INTEGER PRIMARY KEY AUTOINCREMENT, label TEXT NOT NULL, "
+            "keep TEXT NOT NULL, duplicate TEXT NOT NULL, score REAL NOT NULL, reasons TEXT NOT NULL, "
+            "properties TEXT NOT NULL, status TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS merges_status ON merges (status, id)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS skipped (label TEXT NOT NULL, kind TEXT NOT NULL, detail TEXT NOT NULL)"
+        )
+
+    def close(self):
+        self._db.close()
+
+    @contextmanager
+    def _transaction(self):
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def _get_state(self, key: str, default=None):
+        row = self._db.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_state(self, key: str, value):
+        self._db.execute(
+            "INSERT INTO state (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value, ensure_ascii=False)),
+        )
+
+    def _count(self, query: str, *params) -> int:
+        return self._db.execute(query, params).fetchone()[0]
+
+    def _increment(self, key: str, amount: int):
+        self._set_state(key, self._get_state(key, 0) + amount)
+
+    def reset(self):
+        """상태 파일을 비워 다음 실행이 스캔부터 시작하게 합니다."""
+        with self._transaction():
+            for table in ("state", "nodes", "block_keys", "pairs", "merges", "skipped"):
+                self._db.execute(f"DELETE FROM {table}")
+        logger.info("Entity dedup state cleared")
+
+    async def run(self, dry_run: bool = False) -> dict:
+        """
+        기록된 단계부터 작업을 이어서 실행합니다.
+
+        Args:
+            dry_run: True이면 병합 계획까지만 만들고 그래프는 바꾸지 않음
+
+        Returns:
+            summary()의 요약
+        """
+        phase = self._get_state("phase", PHASES[0])
+        steps = {"scan": self._scan, "score": self._score, "plan": self._plan, "merge": self._merge}
+        logger.info(f"Entity dedup started at phase '{phase}' (dry_run={dry_run})")
+        while phase in steps and not (dry_run and phase == "merge"):
+            start = time.perf_counter()
+            await steps[phase]()
+            next_phase = PHASES[PHASES.index(phase) + 1]
+            with self._transaction():
+                self._set_state("phase", next_phase)
+                self._increment(f"seconds:{phase}", round(time.perf_counter() - start, 3))
+            logger.info(f"Entity dedup phase '{phase}' finished in {time.perf_counter() - start:.1f}s")
+            phase = next_phase
+
+        summary = self.summary()
+        logger.info(f"Entity dedup stopped at phase '{phase}': {summary}")
+        return summary
+
+    async def _scan(self):
+        """레이블별로 이름순 페이지를 읽어 노드 정보와 블록 키를 기록합니다. (페이지마다 커서를 함께 커밋)"""
+        for label in DEDUP_LABELS:
+            if self._get_state(f"scan_done:{label}"):
+                continue
+            cursor = self._get_state(f"scan_cursor:{label}")
+            while True:
+                page = await self.graph_store.scan_entities(label, after=cursor, limit=self.page_size)
+                if not page:
+                    break
+                node_rows = [
+                    (label, node["name"], json.dumps(
+                        {"properties": node["properties"], "companies": node["companies"], "degree": node["degree"]},
+                        ensure_ascii=False, default=str,
+                    ))
+                    for node in page
+                ]
+                key_rows = [
+                    (key, node["name"]) for node in page for key in block_keys(label, node["name"], node["properties"])
+                ]
+                with self._transaction():
+                    self._db.executemany("INSERT OR REPLACE INTO nodes (label, name, data) VALUES (?, ?, ?)", node_rows)
+                    self._db.executemany("INSERT OR IGNORE INTO block_keys (key, name) VALUES (?, ?)", key_rows)
+                    cursor = page[-1]["name"]
+                    self._set_state(f"scan_cursor:{label}", cursor)
+                    self._increment(f"scanned:{label}", len(page))
+                logger.info(f"Entity dedup scanned {label} nodes up to '{cursor}'")
+            with self._transaction():
+                self._set_state(f"scan_done:{label}", True)
+
+    def _load_nodes(self, label: str, names: list) -> list:
+        nodes = []
+        for name in names:
+            row = self._db.execute("SELECT data FROM nodes WHERE label = ? AND name = ?", (label, name)).fetchone()
+            if row:
+                nodes.append({"name": name, **json.loads(row[0])})
+        return nodes
+
+    async def _score(self):
+        """2개 이상의 노드가 있는 블록을 키 순서로 하나씩 비교합니다. (블록 묶음마다 커서를 함께 커밋)"""
+        cursor = self._get_state("score_cursor", "")
+        while True:
+            blocks = self._db.execute(
+                "SELECT key, COUNT(*) FROM block_keys WHERE key > ? GROUP BY key HAVING COUNT(*) > 1 "
+                "ORDER BY key LIMIT 1000",
+                (cursor,),
+            ).fetchall()
+            if not blocks:
+                return
+            with self._transaction():
+                for key, size in blocks:
+                    label = key.partition("|")[0]
+                    if size > self.max_block_size:
+                        self._skip(label, "large_block", {"key": key, "size": size})
+                        continue
+                    names = [row[0] for row in self._db.execute("SELECT name FROM block_keys WHERE key = ?", (key,))]
+                    self._score_block(label, self._load_nodes(label, names))
+                cursor = blocks[-1][0]
+                self._set_state("score_cursor", cursor)
+                self._increment("blocks_compared", len(blocks))
+
+    def _score_block(self, label: str, nodes: list):
+        score_pair = score_person_pair if label == "Person" else score_company_pair
+        for i, a in enumerate(nodes):
+            for b in nodes[i + 1:]:
+                a, b = sorted((a, b), key=lambda node: node["name"])
+                score, reasons, contained = score_pair(a, b)
+                if score >= self.threshold:
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO pairs (label, a, b, score, reasons, contained) VALUES (?, ?, ?, ?, ?, ?)",
+                        (label, a["name"], b["name"], score, json.dumps(reasons), contained),
+                    )
+
+    def _skip(self, label: str, kind: str, detail: dict):
+        self._db.execute(
+            "INSERT INTO skipped (label, kind, detail) VALUES (?, ?, ?)",
+            (label, kind, json.dumps(detail, ensure_ascii=False)),
+        )
+
+    async def _plan(self):
+        """일치 쌍을 묶어 병합 목록을 만듭니다. 다시 실행하면 목록을 처음부터 다시 만듭니다."""
+        with self._transaction():
+            self._db.execute("DELETE FROM merges")
+            self._db.execute("DELETE FROM skipped WHERE kind != 'large_block'")
+            self._db.execute("UPDATE pairs SET ambiguous = 0")
+            self._mark_ambiguous_pairs()
+            for label in DEDUP_LABELS:
+                self._plan_label(label)
+
+    def _mark_ambiguous_pairs(self):
+        """
+        부분 일치로만 연결된 이름("인영")이 서로 다른 여러 인물("이인영", "박인영")에 연결되면
+        어느 쪽인지 알 수 없으므로 그 쌍들은 병합하지 않습니다.
+        """
+        rows = self._db.execute(
+            "SELECT label, contained, group_concat(CASE WHEN a = contained THEN b ELSE a END, char(31)) "
+            "FROM pairs WHERE contained IS NOT NULL GROUP BY label, contained HAVING COUNT(*) > 1"
+        ).fetchall()
+        for label, contained, partners in rows:
+            partners = partners.split("\x1f")
+            if len({person_name_key(partner) for partner in partners}) > 1:
+                self._db.execute("UPDATE pairs SET ambiguous = 1 WHERE label = ? AND contained = ?", (label, contained))
+                self._skip(label, "ambiguous", {"name": contained, "candidates": sorted(partners)})
+
+    def _plan_label(self, label: str):
+        parent = {}
+        best_pair = {}  # 이름 -> 그 이름이 포함된 가장 높은 점수의 쌍 (점수, 근거)
+
+        def find(name):
+            parent.setdefault(name, name)
+            while parent[name] != name:
+                parent[name] = parent[parent[name]]
+                name = parent[name]
+            return name
+
+        pairs = self._db.execute(
+            "SELECT a, b, score, reasons FROM pairs WHERE label = ? AND ambiguous = 0 ORDER BY a, b", (label,)
+        )
+        for a, b, score, reasons in pairs:
+            parent[find(a)] = find(b)
+            for name in (a, b):
+                if score > best_pair.get(name, (0.0,))[0]:
+                    best_pair[name] = (score, reasons)
+
+        clusters = defaultdict(list)
+        for name in list(parent):
+            clusters[find(name)].append(name)
+
+        for members in clusters.values():
+            nodes = self._load_nodes(label, sorted(members))
+            if len(nodes) < 2:
+                continue
+            phones = {phone_key(node["properties"].get("phone")) for node in nodes} - {""}
+            if len(phones) > 1:
+                # 쌍마다는 통과했어도 묶음 안에 다른 전화번호가 있으면 서로 다른 인물이 섞인 것
+                self._skip(label, "conflict", {"names": [node["name"] for node in nodes], "phones": sorted(phones)})
+                continue
+
+            nodes.sort(key=lambda node: survivor_rank(label, node))
+            keep = nodes[0]
+            filled = {key for key, value in keep["properties"].items() if value not in (None, "")}
+            for duplicate in nodes[1:]:
+                # 남길 노드에 없는 속성만 채움 (남길 노드의 값을 덮어쓰지 않음)
+                properties = {
+                    key: value for key, value in duplicate["properties"].items()
+                    if key not in filled and value not in (None, "")
+                }
+                filled |= properties.keys()
+                score, reasons = best_pair[duplicate["name"]]
+                self._db.execute(
+                    "INSERT INTO merges (label, keep, duplicate, score, reasons, properties, status) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (label, keep["name"], duplicate["name"], score, reasons,
+                     json.dumps(properties, ensure_ascii=False), PENDING),
+                )
+
+    async def _merge(self):
+        """병합 목록을 merge_batch_size개씩 병합합니다. 그래프에 커밋된 묶음만 완료로 표시합니다."""
+        while True:
+            rows = self._db.execute(
+                "SELECT id, label, keep, duplicate, properties FROM merges WHERE status = ? ORDER BY id LIMIT ?",
+                (PENDING, self.merge_batch_size),
+            ).fetchall()
+            if not rows:
+                return
+            by_label = defaultdict(list)
+            for merge_id, label, keep, duplicate, properties in rows:
+                by_label[label].append({"keep": keep, "duplicate": duplicate, "properties": json.loads(properties)})
+
+            merged = relationships_moved = 0
+            for label, merges in by_label.items():
+                result = await self.graph_store.merge_entities(label, merges)
+                merged += result["merged"]
+                relationships_moved += result["relationships_moved"]
+
+            with self._transaction():
+                self._db.executemany("UPDATE merges SET status = ? WHERE id = ?", [(MERGED, row[0]) for row in rows])
+                self._increment("nodes_merged", merged)
+                self._increment("relationships_moved", relationships_moved)
+
+    def summary(self) -> dict:
+        """현재 단계와 단계별 처리 수를 반환합니다."""
+        skipped = dict(self._db.execute("SELECT kind, COUNT(*) FROM skipped GROUP BY kind").fetchall())
+        return {
+            "phase": self._get_state("phase", PHASES[0]),
+            "scanned": {label: self._get_state(f"scanned:{label}", 0) for label in DEDUP_LABELS},
+            "blocks_compared": self._get_state("blocks_compared", 0),
+            "large_blocks_skipped": skipped.get("large_block", 0),
+            "matched_pairs": self._count("SELECT COUNT(*) FROM pairs"),
+            "ambiguous_names": skipped.get("ambiguous", 0),
+            "conflicting_groups": skipped.get("conflict", 0),
+            "planned_merges": self._count("SELECT COUNT(*) FROM merges"),
+            "pending_merges": self._count("SELECT COUNT(*) FROM merges WHERE status = ?", PENDING),
+            "nodes_merged": self._get_state("nodes_merged", 0),
+            "relationships_moved": self._get_state("relationships_moved", 0),
+            "seconds": {phase: self._get_state(f"seconds:{phase}", 0) for phase in PHASES[:-1]},
+        }
+
+    def write_report(self, path: str):
+        """요약, 병합 목록, 건너뛴 후보를 JSON 파일로 씁니다. (목록은 상태 파일에서 한 행씩 읽어 씀)"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"summary": ' + json.dumps(self.summary(), ensure_ascii=False) + ',\n"merges": [')
+            rows = self._db.execute(
+                "SELECT label, keep, duplicate, score, reasons, properties, status FROM merges ORDER BY id"
+            )
+            for index, (label, keep, duplicate, score, reasons, properties, status) in enumerate(rows):
+                merge = {
+                    "label": label, "keep": keep, "duplicate": duplicate, "score": score,
+                    "reasons": json.loads(reasons), "properties": json.loads(properties), "status": status,
+                }
+                f.write(("," if index else "") + "\n" + json.dumps(merge, ensure_ascii=False))
+            f.write('\n],\n"skipped": [')
+            for index, (label, kind, detail) in enumerate(self._db.execute("SELECT label, kind, detail FROM skipped")):
+                skipped = {"label": label, "kind": kind, **json.loads(detail)}
+                f.write(("," if index else "") + "\n" + json.dumps(skipped, ensure_ascii=False))
+            f.write("\n]}\n")
+        logger.info(f"Entity dedup report written to {path}")
+
+
+async def _run(args):
+    from app.api import dependencies
+
+    graph_store = dependencies.neo4j_service()
+    await graph_store.connect()
+    deduplicator = EntityDeduplicator(
+        graph_store,
+        args.state,
+        page_size=args.page_size,
+        merge_batch_size=args.merge_batch_size,
+        max_block_size=args.max_block_size,
+        threshold=args.threshold,
+    )
+    try:
+        if args.restart:
+            deduplicator.reset()
+        summary = await deduplicator.run(dry_run=args.dry_run)
+        if args.report:
+            deduplicator.write_report(args.report)
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    finally:
+        deduplicator.close()
+        await dependencies.close_services()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="병합 계획까지만 만들고 그래프는 바꾸지 않음")
+    parser.add_argument("--report", help="요약과 병합 목록을 쓸 JSON 파일")
+    parser.add_argument("--state", default=config.ENTITY_DEDUP_STATE_PATH, help="진행 상태를 저장할 SQLite 파일")
+    parser.add_argument("--restart", action="store_true", help="상태 파일을 비우고 스캔부터 다시 시작")
+    parser.add_argument("--page-size", type=int, default=config.ENTITY_DEDUP_PAGE_SIZE)
+    parser.add_argument("--merge-batch-size", type=int, default=config.ENTITY_DEDUP_MERGE_BATCH_SIZE)
+    parser.add_argument("--max-block-size", type=int, default=config.ENTITY_DEDUP_MAX_BLOCK_SIZE)
+    parser.add_argument("--threshold", type=float, default=config.ENTITY_DEDUP_THRESHOLD)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
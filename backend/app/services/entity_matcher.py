@@ -0,0 +1,427 @@
+import re
+import time
+import asyncio
+from collections import defaultdict
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 인덱싱 대상 레이블 (레이블 탐색 시 이 순서로 우선순위를 가짐)
+INDEXED_LABELS = ("Person", "Company", "Event", "Project")
+
+# 연락처 정보로 간주하는 Person 속성
+CONTACT_PROPERTIES = ("phone", "email", "title")
+
+
+def has_contact_info(properties: dict) -> bool:
+    """속성 중 연락처 정보(전화번호, 이메일, 직함)가 하나라도 있는지 확인합니다."""
+    return any(properties.get(key) for key in CONTACT_PROPERTIES)
+
+
+# 본문에서 찾을 이름의 최소 길이 (한 글자 이름은 조사/단어 일부와 구별할 수 없음)
+MIN_MENTION_LENGTH = 2
+
+
+# 회사 이름 앞뒤에 붙는 법인 형태 표기 ("(주)ABC상사", "ABC상사 주식회사", "ABC Co., Ltd." 등)
+COMPANY_FORMS = ("(주)", "㈜", "주식회사", "(유)", "유한회사", "(사)", "사단법인", "(재)", "재단법인", "(합)", "합자회사")
+COMPANY_FORM_PATTERN = re.compile(
+    r"^\s*(?:" + "|".join(re.escape(form) for form in COMPANY_FORMS) + r")\s*"
+    r"|\s*(?:" + "|".join(re.escape(form) for form in COMPANY_FORMS) + r")\s*$"
+    r"|[,\s]\s*(?:(?:co\.?,?\s*)?ltd|inc|corp)\.?\s*$",
+    re.IGNORECASE,
+)
+
+
+def clean_person_name(name: str) -> str:
+    """공백과 "님" 접미사를 제거하여 Person 이름을 정규화합니다."""
+    return name.replace("님", "").replace(" ", "")
+
+
+def strip_company_form(name: str) -> str:
+    """회사 이름에서 법인 형태 표기를 제거합니다. ("(주) ABC상사" -> "ABC상사")"""
+    while True:
+        stripped = COMPANY_FORM_PATTERN.sub("", name)
+        if stripped == name or not stripped:
+            return name.strip()
+        name = stripped
+
+
+def company_name_key(name: str) -> str:
+    """
+    같은 회사의 다른 표기를 하나로 묶는 키입니다. 법인 형태 표기와 공백을 제거하고 대소문자를 무시합니다.
+    ("(주)ABC상사", "ABC상사(주)", "abc 상사" -> "abc상사")
+    """
+    return re.sub(r"\s+", "", strip_company_form(name)).casefold()
+
+
+def company_name_variants(name: str) -> list:
+    """
+    회사 이름의 흔한 표기들을 만듭니다. 이름 인덱스 없이 Neo4j의 name 인덱스로 다른 표기를 찾을 때 사용합니다.
+    (키 비교와 달리 공백/대소문자가 다른 표기는 찾지 못함)
+    """
+    base = strip_company_form(name)
+    variants = [name, base]
+    for form in ("(주)", "㈜", "주식회사", "(유)", "유한회사"):
+        variants += [f"{form}{base}", f"{form} {base}", f"{base}{form}", f"{base} {form}"]
+    return list(dict.fromkeys(variants))
+
+
+class NameAutomaton:
+    """
+    등록된 모든 이름을 본문에서 한 번의 순회로 찾는 Aho-Corasick 오토마톤입니다.
+
+    실패 링크는 전체를 다시 계산해야 하므로, 마지막 빌드 이후 추가된 이름은 pending에 모아
+    str.find로 따로 찾고, 전체 이름 수에 비례해 쌓이면 다음 검색 때 전체를 다시 빌드합니다.
+    (10만 개 이름의 빌드에 약 0.7초가 걸리므로 쓰기마다 빌드하지 않고 비용을 나눠 냄)
+    """
+
+    def __init__(self, rebuild_threshold: int = 512, rebuild_ratio: float = 1 / 16):
+        """
+        Args:
+            rebuild_threshold: 다시 빌드하기 전까지 pending에 쌓을 최소 이름 수
+            rebuild_ratio: 전체 이름 수 대비 pending 비율이 이 값을 넘으면 다시 빌드
+        """
+        self.rebuild_threshold = rebuild_threshold
+        self.rebuild_ratio = rebuild_ratio
+        self._words = set()
+        self._pending = set()  # 마지막 빌드 이후 추가된 이름
+        self._removed = 0  # 마지막 빌드 이후 삭제된 이름 수 (트라이에 남아 있어 검색 결과에서 걸러냄)
+        self._goto = [{}]  # 노드 -> {문자: 자식 노드}
+        self._fail = [0]
+        self._word = [None]  # 노드에서 끝나는 이름
+        self._output_link = [0]  # 실패 링크를 따라 가장 가까운, 이름이 끝나는 노드 (0이면 없음)
+
+    def __len__(self):
+        return len(self._words)
+
+    def add(self, word: str):
+        if word and word not in self._words:
+            self._words.add(word)
+            self._pending.add(word)
+
+    def remove(self, word: str):
+        if word in self._pending:
+            self._pending.discard(word)
+            self._words.discard(word)
+        elif word in self._words:
+            self._words.discard(word)
+            self._removed += 1
+
+    def build(self):
+        """모든 이름으로 트라이와 실패 링크를 다시 만듭니다."""
+        goto, word_at = [{}], [None]
+        for word in self._words:
+            node = 0
+            for char in word:
+                child = goto[node].get(char)
+                if child is None:
+                    child = len(goto)
+                    goto[node][char] = child
+                    goto.append({})
+                    word_at.append(None)
+                node = child
+            word_at[node] = word
+
+        fail, output_link = [0] * len(goto), [0] * len(goto)
+        queue = list(goto[0].values())
+        for node in queue:  # 너비 우선 (queue는 순회 중에 늘어남)
+            for char, child in goto[node].items():
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(char, 0)
+                output_link[child] = fail[child] if word_at[fail[child]] else output_link[fail[child]]
+                queue.append(child)
+
+        self._goto, self._fail, self._word, self._output_link = goto, fail, word_at, output_link
+        self._pending = set()
+        self._removed = 0
+
+    def find_all(self, text: str) -> list:
+        """본문에 나오는 모든 이름을 (시작, 끝, 이름) 목록으로 반환합니다. (겹치는 결과 포함)"""
+        if len(self._pending) + self._removed >= max(self.rebuild_threshold, len(self._words) * self.rebuild_ratio):
+            self.build()
+
+        goto, fail, word_at, output_link = self._goto, self._fail, self._word, self._output_link
+        matches = []
+        node = 0
+        for end, char in enumerate(text, start=1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            match = node if word_at[node] else output_link[node]
+            while match:
+                matches.append((end - len(word_at[match]), end, word_at[match]))
+                match = output_link[match]
+        if self._removed:
+            matches = [match for match in matches if match[2] in self._words]
+
+        for word in self._pending:
+            start = text.find(word)
+            while start != -1:
+                matches.append((start, start + len(word), word))
+                start = text.find(word, start + 1)
+        return matches
+
+
+class EntityNameIndex:
+    """
+    Person/Company/Event/Project 이름에 대한 프로세스 내 인덱스입니다.
+
+    Neo4j의 `WHERE n.name CONTAINS $x OR $x CONTAINS n.name` 전체 스캔을 대체합니다.
+    - "이름이 검색어를 포함": 문자 bigram 역색인의 교집합으로 후보를 좁힌 뒤 부분 문자열을 확인
+    - "검색어가 이름을 포함": 검색어의 모든 부분 문자열을 이름 사전에서 조회 (검색어 길이의 제곱)
+
+    처음 조회할 때 Neo4j에서 전체 이름을 불러오고(ensure_loaded), 이후 쓰기마다 add()로 갱신합니다.
+    다른 프로세스의 쓰기를 반영하기 위해 refresh_interval마다 백그라운드에서 다시 불러옵니다.
+    """
+
+    def __init__(self, refresh_interval: float = None):
+        """
+        Args:
+            refresh_interval: 전체 재로딩 주기 (초, None이면 재로딩하지 않음)
+        """
+        self.refresh_interval = refresh_interval
+        self.loaded_at = None
+        self._lock = asyncio.Lock()
+        self._refresh_task = None  # 오래된 인덱스를 교체하는 백그라운드 재로딩 작업
+        self._recording = None  # 로딩 중에 발생한 쓰기 (로딩 완료 후 새 인덱스에 다시 적용하는 함수)
+        self._names = {label: {} for label in INDEXED_LABELS}  # label -> {name: has_contact}
+        self._grams = defaultdict(set)  # 문자 또는 bigram -> 이름 집합
+        self._automaton = NameAutomaton()  # 본문 속 이름 찾기 (find_mentions)
+        self._company_keys = {}  # company_name_key -> 처음 등록된 Company 이름
+
+    def __len__(self):
+        return sum(len(names) for names in self._names.values())
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def _needs_load(self) -> bool:
+        if self.loaded_at is None:
+            return True
+        return self.refresh_interval is not None and time.monotonic() - self.loaded_at > self.refresh_interval
+
+    async def ensure_loaded(self, fetch_entities):
+        """
+        인덱스가 아직 로드되지 않았으면 전체 이름을 불러올 때까지 기다립니다.
+        이미 로드된 인덱스가 오래된 경우에는 기다리지 않고, 현재 인덱스로 계속 응답하면서
+        백그라운드 작업 하나가 새 인덱스를 만들어 교체합니다.
+
+        Args:
+            fetch_entities: (label, name, has_contact) 튜플을 내보내는 비동기 이터러블을 반환하는 함수
+        """
+        if not self._needs_load():
+            return
+        if not self.loaded:
+            await self._reload(fetch_entities)
+        elif self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh(fetch_entities))
+
+    async def _refresh(self, fetch_entities):
+        """백그라운드 재로딩. 실패하면 기존 인덱스를 유지하고 다음 주기에 다시 시도합니다."""
+        try:
+            await self._reload(fetch_entities)
+        except Exception as e:
+            logger.warning(f"Entity name index refresh failed, keeping the current index: {e}")
+            self.loaded_at = time.monotonic()
+
+    async def _reload(self, fetch_entities):
+        """전체 이름으로 새 인덱스를 만든 뒤 한 번에 교체합니다. 로딩 중의 쓰기는 기록했다가 새 인덱스에 다시 적용합니다."""
+        async with self._lock:
+            if not self._needs_load():
+                return
+            start = time.perf_counter()
+            fresh = EntityNameIndex()
+            self._recording = []
+            try:
+                async for label, name, has_contact in fetch_entities():
+                    fresh.add(label, name, has_contact)
+                for apply in self._recording:
+                    apply(fresh)
+            finally:
+                self._recording = None
+            fresh._automaton.build()
+            self._names, self._grams, self._automaton = fresh._names, fresh._grams, fresh._automaton
+            self._company_keys = fresh._company_keys
+            self.loaded_at = time.monotonic()
+            logger.info(f"Entity name index loaded: {len(self)} names in {time.perf_counter() - start:.2f}s")
+
+    def cancel_refresh(self):
+        """진행 중인 백그라운드 재로딩을 취소합니다. (드라이버를 닫기 전에 호출)"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        self._refresh_task = None
+
+    def add(self, label: str, name: str, has_contact: bool = False):
+        """
+        이름을 인덱스에 추가하거나 연락처 정보 여부를 갱신합니다.
+        노드를 생성/수정하는 모든 쓰기 후에 호출합니다.
+        """
+        names = self._names.get(label)
+        if names is None or not name:
+            return
+        if self._recording is not None:
+            self._recording.append(lambda index: index.add(label, name, has_contact))
+        if name not in names:
+            for gram in self._name_grams(name):
+                self._grams[gram].add(name)
+            if len(name) >= MIN_MENTION_LENGTH:
+                self._automaton.add(name)
+            if label == "Company":
+                self._company_keys.setdefault(company_name_key(name), name)
+        names[name] = names.get(name, False) or bool(has_contact)
+
+    def remove(self, label: str, name: str, replacement: str = None):
+        """
+        이름을 인덱스에서 삭제합니다. 노드를 삭제하는 쓰기(중복 엔티티 병합 등) 후에 호출합니다.
+
+        Args:
+            replacement: 삭제된 노드가 병합된 노드의 이름 (같은 회사의 다른 표기 조회가 이 이름을 가리키게 함)
+        """
+        names = self._names.get(label)
+        if self._recording is not None:
+            self._recording.append(lambda index: index.remove(label, name, replacement))
+        if names is None or name not in names:
+            return
+        del names[name]
+        # 문자/bigram 색인과 오토마톤은 레이블 구분 없이 이름 단위이므로 다른 레이블에 같은 이름이 없을 때만 삭제
+        if not any(name in self._names[other] for other in INDEXED_LABELS):
+            for gram in self._name_grams(name):
+                self._grams[gram].discard(name)
+            self._automaton.remove(name)
+        key = company_name_key(name) if label == "Company" else None
+        if key is not None and self._company_keys.get(key) == name:
+            if replacement in names and company_name_key(replacement) == key:
+                self._company_keys[key] = replacement
+            else:
+                del self._company_keys[key]
+
+    def find_best_matching_person(self, partial_name: str) -> str:
+        """
+        부분 이름으로 가장 일치하는 Person 이름을 찾습니다.
+        Neo4jService.find_best_matching_person의 Cypher 경로와 같은 순위를 사용합니다.
+        (연락처 정보가 있는 이름 우선, 그다음 가장 긴 이름, 매칭 실패 시 원본 반환)
+        """
+        clean_name = clean_person_name(partial_name)
+        if not clean_name:
+            return partial_name
+
+        persons = self._names["Person"]
+        candidates = sorted(self._partial_matches(clean_name, persons), key=lambda name: (-len(name), name))
+        if not candidates:
+            return partial_name
+
+        for name in candidates:
+            if persons[name]:
+                return name
+        return candidates[0]
+
+    def find_node_label(self, name: str):
+        """
+        이름으로 노드의 레이블을 찾습니다.
+        정확히 일치하는 이름을 먼저 찾고, 없으면 부분 일치하는 가장 긴 이름의 레이블을 반환합니다.
+        """
+        for label in INDEXED_LABELS:
+            if name in self._names[label]:
+                return label
+
+        best = None
+        for label in INDEXED_LABELS:
+            for match in self._partial_matches(name, self._names[label]):
+                if best is None or (-len(match), match) < (-len(best[1]), best[1]):
+                    best = (label, match)
+        if best:
+            logger.info(f"Partial name match: '{name}' matched with '{best[1]}'")
+            return best[0]
+        return None
+
+    def find_company(self, name: str):
+        """표기가 달라도 같은 회사(company_name_key가 같은 회사)의 등록된 이름을 찾습니다. 없으면 None"""
+        return self._company_keys.get(company_name_key(name))
+
+    def resolve_names(self, entities: list, names: list = ()) -> dict:
+        """
+        추출된 페이로드 하나의 이름들을 한 번에 정규화합니다. (GraphStore.resolve_entity_names 참고)
+        - Person: find_best_matching_person과 같은 규칙
+        - Company: 표기가 다른 같은 회사가 있으면 그 이름
+        - names (페이로드에 없는 관계 끝점): 정확히 일치하는 이름의 레이블, 없으면 같은 회사의 다른 표기
+        """
+        resolved = {}
+        for entity in entities:
+            label, name = entity.get("type"), entity.get("name")
+            if not name or name in resolved:
+                continue
+            if label == "Person":
+                canonical = self.find_best_matching_person(name)
+            elif label == "Company":
+                canonical = self.find_company(name) or name
+            else:
+                canonical = name
+            resolved[name] = {"name": canonical, "label": label}
+
+        for name in names:
+            if not name or name in resolved:
+                continue
+            label = next((label for label in INDEXED_LABELS if name in self._names[label]), None)
+            if label:
+                resolved[name] = {"name": name, "label": label}
+            elif self.find_company(name):
+                resolved[name] = {"name": self.find_company(name), "label": "Company"}
+        return resolved
+
+    def find_mentions(self, text: str) -> list:
+        """
+        본문에 나오는 알려진 엔티티 이름을 찾습니다.
+        겹치는 이름은 가장 왼쪽에서 시작하는 가장 긴 이름만 남기며(예: "이인영" 안의 "인영"은 제외),
+        이름이 여러 레이블에 있으면 INDEXED_LABELS 순서로 첫 번째 레이블을 사용합니다.
+
+        Returns:
+            [{"start", "end", "name", "label", "has_contact"}] (본문 순서)
+        """
+        mentions = []
+        covered_until = 0
+        for start, end, name in sorted(self._automaton.find_all(text), key=lambda match: (match[0], -match[1])):
+            if start < covered_until:
+                continue
+            label = next(label for label in INDEXED_LABELS if name in self._names[label])
+            mentions.append({
+                "start": start, "end": end, "name": name, "label": label,
+                "has_contact": label == "Person" and self._names[label][name],
+            })
+            covered_until = end
+        return mentions
+
+    def _partial_matches(self, query: str, names: dict) -> set:
+        """names 중 query를 포함하거나 query에 포함되는 이름들을 반환합니다."""
+        if not query:
+            return set()
+
+        # 이름이 검색어를 포함하는 경우: 가장 작은 후보 집합부터 교집합
+        grams = sorted((self._grams.get(gram, frozenset()) for gram in self._query_grams(query)), key=len)
+        matches = set(grams[0]) if grams else set()
+        for gram_names in grams[1:]:
+            matches &= gram_names
+            if not matches:
+                break
+        matches = {name for name in matches if name in names and query in name}
+
+        # 검색어가 이름을 포함하는 경우: 검색어의 부분 문자열을 모두 조회
+        for start in range(len(query)):
+            for end in range(start + 1, len(query) + 1):
+                if query[start:end] in names:
+                    matches.add(query[start:end])
+        return matches
+
+    @staticmethod
+    def _name_grams(name: str) -> set:
+        """이름을 색인할 문자와 bigram 집합"""
+        return set(name) | {name[i:i + 2] for i in range(len(name) - 1)}
+
+    @staticmethod
+    def _query_grams(query: str) -> set:
+        """검색어 조회에 사용할 gram 집합 (한 글자면 문자, 그 외에는 bigram)"""
+        if len(query) == 1:
+            return {query}
+        return {query[i:i + 2] for i in range(len(query) - 1)}
@@ -0,0 +1,253 @@
+import json
+import hashlib
+from contextlib import aclosing
+from fastapi import HTTPException
+from app.core import metrics
+from app.core.logger import get_logger
+from app.models.graph_models import ENTITY_LABELS
+
+logger = get_logger(__name__)
+
+# 엔티티 이름으로 중심 노드를 찾는 쿼리 (레이블별 인덱스를 각각 조회)
+CENTER_LOOKUP_QUERY = (
+    "CALL { "
+    + " UNION ALL ".join(
+        f"MATCH (n:{label} {{name: $name}}) WHERE $label IS NULL OR $label = '{label}' "
+        f"RETURN elementId(n) AS id, '{label}' AS label, n.name AS name"
+        for label in ENTITY_LABELS
+    )
+    + " } RETURN id, label, name LIMIT 1"
+)
+
+# 프런티어 노드들의 이웃을 한 번에 가져오는 쿼리. 노드마다 max_degree + 1개까지만 읽어 허브 노드에서도 읽는 양이 제한됨
+NEIGHBOR_QUERY = (
+    "UNWIND $ids AS id MATCH (n) WHERE elementId(n) = id "
+    "CALL { WITH n MATCH (n)-[r]-(m) WHERE any(label IN labels(m) WHERE label IN $labels) "
+    "RETURN r, m LIMIT $limit } "
+    "RETURN id, elementId(r) AS rel_id, type(r) AS type, elementId(startNode(r)) = id AS outgoing, "
+    "elementId(m) AS neighbor_id, labels(m)[0] AS label, coalesce(m.name, m.id) AS name"
+)
+
+
+def graph_labels(include_memos: bool) -> list:
+    """그래프 조회/내보내기에 포함할 노드 레이블 목록을 반환합니다."""
+    return [*ENTITY_LABELS, "Memo"] if include_memos else list(ENTITY_LABELS)
+
+
+def graph_etag(version: str, **params) -> str:
+    """그래프 버전과 요청 파라미터로 ETag를 만듭니다. 같은 그래프에 같은 요청이면 같은 값입니다."""
+    payload = json.dumps([version, params], sort_keys=True, ensure_ascii=False)
+    return '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더 값이 ETag와 일치하는지 확인합니다 (약한 비교, 여러 값, * 허용)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+class ColumnarGraph:
+    """
+    노드/엣지를 열 단위 배열로 모읍니다.
+
+    nodes는 {"id", "label", "name"} 배열, edges는 nodes 배열의 인덱스 쌍 {"source", "target"}과 "type" 배열입니다.
+    노드별 연결 수가 max_degree에 도달하면 그 노드에 닿는 엣지는 더 추가하지 않습니다.
+    drain_*()로 모인 열을 꺼내면 노드 인덱스는 유지한 채 배열만 비우므로 큰 그래프를 청크 단위로 보낼 수 있습니다.
+    """
+
+    def __init__(self, max_degree: int = None):
+        self.max_degree = max_degree
+        self.node_index = {}  # elementId -> 노드 인덱스
+        self.degree = []
+        self.node_count = 0
+        self.edge_count = 0
+        self.skipped_edges = 0
+        self.nodes = {"id": [], "label": [], "name": []}
+        self.edges = {"source": [], "target": [], "type": []}
+
+    def add_node(self, node_id: str, label: str, name: str) -> int:
+        """노드를 추가하고 인덱스를 반환합니다. 이미 있으면 기존 인덱스를 반환합니다."""
+        index = self.node_index.get(node_id)
+        if index is None:
+            index = self.node_index[node_id] = self.node_count
+            self.node_count += 1
+            self.degree.append(0)
+            self.nodes["id"].append(node_id)
+            self.nodes["label"].append(label)
+            self.nodes["name"].append(name)
+        return index
+
+    def has_capacity(self, node_id: str) -> bool:
+        """노드에 엣지를 더 연결할 수 있는지 확인합니다."""
+        return self.max_degree is None or self.degree[self.node_index[node_id]] < self.max_degree
+
+    def add_edge(self, source_id: str, target_id: str, rel_type: str) -> bool:
+        """두 노드가 모두 있고 연결 수 제한을 넘지 않으면 엣지를 추가합니다."""
+        source = self.node_index.get(source_id)
+        target = self.node_index.get(target_id)
+        if source is None or target is None:
+            return False
+        if self.max_degree is not None and max(self.degree[source], self.degree[target]) >= self.max_degree:
+            self.skipped_edges += 1
+            return False
+        self.degree[source] += 1
+        self.degree[target] += 1
+        self.edge_count += 1
+        self.edges["source"].append(source)
+        self.edges["target"].append(target)
+        self.edges["type"].append(rel_type)
+        return True
+
+    def drain_nodes(self) -> dict:
+        nodes, self.nodes = self.nodes, {"id": [], "label": [], "name": []}
+        return nodes
+
+    def drain_edges(self) -> dict:
+        edges, self.edges = self.edges, {"source": [], "target": [], "type": []}
+        return edges
+
+
+async def get_neighborhood(neo4j_service, name: str, label: str = None, hops: int = 1, max_degree: int = 50,
+                           max_nodes: int = 500, include_memos: bool = False) -> dict:
+    """
+    엔티티를 중심으로 hops 단계까지의 이웃 그래프(ego network)를 열 단위 형식으로 반환합니다.
+
+    단계마다 프런티어 전체를 한 번의 쿼리로 확장하므로 왕복 횟수는 hops번이며,
+    노드별 이웃은 max_degree개, 전체 노드는 max_nodes개로 제한됩니다. 제한에 걸리면 truncated가 true입니다.
+
+    Args:
+        neo4j_service: Neo4j 서비스
+        name: 중심 엔티티 이름
+        label: 중심 엔티티 레이블 (같은 이름이 여러 레이블에 있을 때 지정)
+        hops: 확장 단계 수
+        max_degree: 노드별 최대 연결 수
+        max_nodes: 최대 노드 수
+        include_memos: Memo 노드와 MENTIONED_IN 관계 포함 여부
+
+    Returns:
+        {"center": 0, "nodes": {"id", "label", "name", "hop"}, "edges": {"source", "target", "type"}, "truncated"}
+    """
+    labels = graph_labels(include_memos)
+
+    # 모든 단계를 하나의 읽기 트랜잭션에서 실행하여 일관된 스냅샷을 반환
+    async def work(tx):
+        result = await tx.run(CENTER_LOOKUP_QUERY, name=name, label=label)
+        center = await result.single()
+        if center is None:
+            raise HTTPException(status_code=404, detail=f"Entity not found: {name}")
+
+        graph = ColumnarGraph(max_degree)
+        graph.add_node(center["id"], center["label"], center["name"])
+        node_hops = [0]
+        seen_relationships = set()
+        truncated = False
+        frontier = [center["id"]]
+
+        for hop in range(1, hops + 1):
+            if not frontier:
+                break
+            result = await tx.run(NEIGHBOR_QUERY, ids=frontier, labels=labels, limit=max_degree + 1)
+            next_frontier = []
+            neighbor_counts = {}
+            async for record in result:
+                node_id = record["id"]
+                neighbor_counts[node_id] = neighbor_counts.get(node_id, 0) + 1
+                if neighbor_counts[node_id] > max_degree:
+                    truncated = True
+                    continue
+                if record["rel_id"] in seen_relationships:
+                    continue
+                neighbor_id = record["neighbor_id"]
+                if neighbor_id not in graph.node_index:
+                    # 엣지 없이 노드만 추가되지 않도록 연결 가능 여부를 먼저 확인
+                    if graph.node_count >= max_nodes or not graph.has_capacity(node_id):
+                        truncated = True
+                        continue
+                    graph.add_node(neighbor_id, record["label"], record["name"])
+                    node_hops.append(hop)
+                    next_frontier.append(neighbor_id)
+                source, target = (node_id, neighbor_id) if record["outgoing"] else (neighbor_id, node_id)
+                if graph.add_edge(source, target, record["type"]):
+                    seen_relationships.add(record["rel_id"])
+                else:
+                    truncated = True
+            frontier = next_frontier
+
+        return {
+            "center": 0,
+            "nodes": {**graph.drain_nodes(), "hop": node_hops},
+            "edges": graph.drain_edges(),
+            "truncated": truncated,
+        }
+
+    with metrics.neo4j_query_seconds.time("graph_neighborhood", "read"):
+        async with neo4j_service.session(read=True) as session:
+            return await session.execute_read(work)
+
+
+async def stream_graph_export(neo4j_service, max_degree: int = None, include_memos: bool = False,
+                              chunk_size: int = 2000):
+    """
+    전체 그래프를 열 단위 청크의 NDJSON 스트림으로 내보냅니다.
+
+    노드를 먼저 모두 보낸 뒤 엣지를 보내며, 엣지의 source/target은 노드가 전송된 순서의 인덱스입니다.
+    결과를 리스트로 모으지 않고 드라이버에서 받는 대로 청크 단위로 전송하므로
+    서버 메모리는 노드 인덱스(elementId -> 번호)와 청크 하나 크기로 제한됩니다.
+
+    Yields:
+        NDJSON 줄
+        - {"event": "nodes", "offset", "id": [...], "label": [...], "name": [...]}
+        - {"event": "edges", "source": [...], "target": [...], "type": [...]}
+        - 마지막: {"event": "done", "nodes", "edges", "skipped_edges"} (실패 시 {"event": "error", "detail"})
+    """
+    labels = graph_labels(include_memos)
+    nodes_query = " UNION ALL ".join(
+        f"MATCH (n:{label}) RETURN elementId(n) AS id, '{label}' AS label, coalesce(n.name, n.id) AS name"
+        for label in labels
+    )
+    edges_query = (
+        "MATCH (a)-[r]->(b) "
+        "WHERE any(label IN labels(a) WHERE label IN $labels) AND any(label IN labels(b) WHERE label IN $labels) "
+        "RETURN elementId(a) AS source, elementId(b) AS target, type(r) AS type"
+    )
+
+    def line(event: str, columns: dict, **extra) -> str:
+        return json.dumps({"event": event, **extra, **columns}, ensure_ascii=False) + "\n"
+
+    graph = ColumnarGraph(max_degree)
+    try:
+        # 클라이언트가 연결을 끊으면 aclosing이 스트림을 닫아 남은 결과를 서버에서 버림
+        offset = 0
+        nodes = neo4j_service.stream_cypher_query(nodes_query, fetch_size=chunk_size, template="graph_export_nodes")
+        async with aclosing(nodes) as records:
+            async for record in records:
+                graph.add_node(record["id"], record["label"], record["name"])
+                if len(graph.nodes["id"]) >= chunk_size:
+                    yield line("nodes", graph.drain_nodes(), offset=offset)
+                    offset = graph.node_count
+        if graph.nodes["id"]:
+            yield line("nodes", graph.drain_nodes(), offset=offset)
+
+        edges = neo4j_service.stream_cypher_query(
+            edges_query, {"labels": labels}, fetch_size=chunk_size, template="graph_export_edges"
+        )
+        async with aclosing(edges) as records:
+            async for record in records:
+                graph.add_edge(record["source"], record["target"], record["type"])
+                if len(graph.edges["source"]) >= chunk_size:
+                    yield line("edges", graph.drain_edges())
+        if graph.edges["source"]:
+            yield line("edges", graph.drain_edges())
+    except Exception as e:
+        logger.error(f"Graph export failed after {graph.node_count} nodes, {graph.edge_count} edges: {e}", exc_info=True)
+        yield json.dumps({"event": "error", "detail": "Graph export failed."}) + "\n"
+        return
+
+    yield json.dumps({
+        "event": "done",
+        "nodes": graph.node_count,
+        "edges": graph.edge_count,
+        "skipped_edges": graph.skipped_edges,
+    }) + "\n"
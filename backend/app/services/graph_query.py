@@ -0,0 +1,289 @@
+import re
+import json
+import time
+from contextlib import contextmanager
+from fastapi import HTTPException
+from app.core import config, metrics
+from app.core.logger import get_logger
+from app.services.plan_cache import CypherPlanCache
+
+logger = get_logger(__name__)
+
+# 쿼리 끝의 숫자 LIMIT (예: "... RETURN p.name LIMIT 10")
+TRAILING_LIMIT_PATTERN = re.compile(r"\bLIMIT\s+(\d+)\s*$", re.IGNORECASE)
+
+CYPHER_SYSTEM_PROMPT = """You are an expert in Cypher query language and Neo4j graph databases.
+    Given a user's natural language question, generate a Cypher query that answers the question based on the following graph schema:
+
+    Nodes:
+    - Person {name: string, title: string, phone: string, email: string}
+    - Company {name: string}
+    - Event {name: string, date: string}
+    - Project {name: string}
+    - Memo {id: string, text: string, timestamp: datetime, business_related: boolean}
+
+    Relationships:
+    - (Person)-[:WORKS_AT]->(Company)
+    - (Person)-[:ATTENDED]->(Event)
+    - (Person)-[:MENTIONED_IN]->(Memo)
+    - (Company)-[:MENTIONED_IN]->(Memo)
+    - (Event)-[:DISCUSSED]->(Project)
+    - (Person)-[:INTRODUCED_BY]->(Person)
+
+    IMPORTANT: For person names, use partial matching with CONTAINS to support both full names and given names.
+    Example: "최대련" and "대련" should both match. Use: WHERE p.name CONTAINS "대련"
+
+    Return ONLY the Cypher query, without any additional text or explanations.
+    Ensure the query is valid and executable.
+    Example queries:
+    - "김성길 전화번호?": MATCH (p:Person) WHERE p.name CONTAINS "김성길" RETURN p.phone;
+    - "대련님 전화번호?": MATCH (p:Person) WHERE p.name CONTAINS "대련" RETURN p.phone;
+    - "ABC상사에 누가 있지?": MATCH (p:Person)-[:WORKS_AT]->(c:Company {name:"ABC상사"}) RETURN p.name, p.title;
+    - "최근에 누구 만났지?": MATCH (p:Person)-[:MENTIONED_IN]->(m:Memo) WHERE m.timestamp > datetime() - duration('P7D') RETURN p.name, m.timestamp ORDER BY m.timestamp DESC;
+    - "내일 일정 뭐야?": MATCH (e:Event) WHERE e.date STARTS WITH "2026-02-02" RETURN e.name, e.date;
+    - "최대련님과 뭘 해야하지?": MATCH (p:Person)-[:ATTENDED]->(e:Event) WHERE p.name CONTAINS "대련" RETURN e.name, e.date ORDER BY e.date;
+    """
+
+ANSWER_SYSTEM_PROMPT = """You are a helpful assistant that converts database query results into natural language responses.
+    Given the user's question and the query results, provide a clear, concise answer in Korean.
+    If there are no results, say "관련 정보를 찾을 수 없습니다."
+    Be conversational and friendly.
+    """
+
+
+# 질문 → 파라미터화된 Cypher 계획 캐시 (같은 형태의 질문은 LLM 호출 없이 Cypher를 재사용)
+plan_cache = CypherPlanCache(max_entries=config.QUERY_PLAN_CACHE_MAX_ENTRIES) if config.QUERY_PLAN_CACHE_ENABLED else None
+if plan_cache is not None:
+    metrics.registry.register_collector("cache", lambda: metrics.cache_samples("cypher_plan", plan_cache.get_metrics()))
+
+
+class QueryPlan:
+    """실행할 Cypher 쿼리와 파라미터, 그리고 계획 캐시 사용 결과입니다."""
+
+    def __init__(self, cypher_query: str, parameters: dict, cache_status: str, cacheable_plan=None):
+        """
+        Args:
+            cypher_query: 실행할 Cypher 쿼리 (계획 캐시를 사용하면 $q0 등의 파라미터 포함)
+            parameters: 쿼리 파라미터
+            cache_status: "hit", "miss", "uncacheable", "disabled" 중 하나
+            cacheable_plan: 실행에 성공하면 캐시에 저장할 CypherPlan (미스일 때만)
+        """
+        self.cypher_query = cypher_query
+        self.parameters = parameters
+        self.cache_status = cache_status
+        self.cacheable_plan = cacheable_plan
+
+
+class StageTimings:
+    """질의 처리 단계별 소요 시간(ms)을 기록합니다. 같은 값이 stage_seconds 지표에도 기록됩니다."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """with 블록의 실행 시간을 "{name}_ms"로 기록합니다."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[f"{name}_ms"] = round(elapsed * 1000, 1)
+            metrics.stage_seconds.observe(elapsed, name)
+
+    def as_dict(self) -> dict:
+        return {**self.stages, "total_ms": round((time.perf_counter() - self.start) * 1000, 1)}
+
+
+async def generate_cypher(upstage_service, question: str) -> str:
+    """
+    LLM으로 자연어 질문을 Cypher 쿼리로 변환합니다.
+
+    Args:
+        upstage_service: Upstage API 서비스
+        question: 사용자의 자연어 질문
+
+    Returns:
+        실행할 Cypher 쿼리
+    """
+    messages = [
+        {"role": "system", "content": CYPHER_SYSTEM_PROMPT},
+        {"role": "user", "content": question}
+    ]
+    response = await upstage_service.solar_pro(messages)
+
+    try:
+        cypher_query = response["choices"][0]["message"]["content"].strip()
+        # Markdown 코드 블록 제거
+        if cypher_query.startswith("```") and cypher_query.endswith("```"):
+            lines = cypher_query.split('\n')
+            cypher_query = '\n'.join(lines[1:-1]).strip()
+
+        # 기본적인 Cypher 쿼리 유효성 검증
+        if not cypher_query.upper().startswith("MATCH") and not cypher_query.upper().startswith("CALL"):
+            raise ValueError("Generated response is not a valid Cypher query.")
+    except (KeyError, IndexError, ValueError) as e:
+        await upstage_service.evict_cached_response(messages)
+        logger.error(f"Failed to generate Cypher query: {e}")
+        raise HTTPException(status_code=500, detail="Failed to generate a valid Cypher query.")
+    return cypher_query
+
+
+async def plan_cypher(upstage_service, question: str) -> QueryPlan:
+    """
+    질문에 대한 Cypher 실행 계획을 만듭니다.
+    계획 캐시에 같은 형태의 질문이 있으면 LLM을 호출하지 않고 질문에서 추출한 값을 파라미터로 사용합니다.
+    """
+    if plan_cache is None:
+        return QueryPlan(await generate_cypher(upstage_service, question), {}, "disabled")
+
+    cached = plan_cache.lookup(question)
+    if cached:
+        cypher_query, parameters = cached
+        logger.info(f"Cypher plan cache hit for question: {question} (parameters: {parameters})")
+        return QueryPlan(cypher_query, parameters, "hit")
+
+    cypher_query = await generate_cypher(upstage_service, question)
+    parameterized = plan_cache.parameterize(question, cypher_query)
+    if parameterized is None:
+        plan_cache.record_uncacheable()
+        return QueryPlan(cypher_query, {}, "uncacheable")
+    plan, parameters = parameterized
+    return QueryPlan(plan.cypher_template, parameters, "miss", plan)
+
+
+def enforce_limit(cypher_query: str, limit: int):
+    """
+    쿼리의 마지막 RETURN에 LIMIT이 없으면 추가하고, limit보다 큰 숫자 LIMIT은 limit으로 줄입니다.
+
+    UNION이나 서브쿼리로 끝나는 쿼리, 파라미터 LIMIT처럼 안전하게 고칠 수 없는 쿼리는 그대로 두며,
+    이 경우에도 실행 시 행 수 제한(run_bounded_query)은 적용됩니다.
+
+    Returns:
+        (실행할 쿼리, LIMIT을 추가하거나 줄였는지 여부)
+    """
+    query = cypher_query.strip().rstrip(";").rstrip()
+    returns = list(re.finditer(r"\bRETURN\b", query, re.IGNORECASE))
+    if not returns or re.search(r"\bUNION\b", query, re.IGNORECASE):
+        return cypher_query, False
+    tail = query[returns[-1].end():]
+    if "}" in tail:
+        return cypher_query, False
+
+    match = TRAILING_LIMIT_PATTERN.search(tail)
+    if match:
+        if int(match.group(1)) <= limit:
+            return cypher_query, False
+        return query[:len(query) - len(match.group(0))] + f"LIMIT {limit}", True
+    if re.search(r"\bLIMIT\b", tail, re.IGNORECASE):
+        return cypher_query, False
+    return f"{query} LIMIT {limit}", True
+
+
+async def execute_cypher(neo4j_service, query_plan: QueryPlan, max_rows: int = None, timeout: float = None):
+    """
+    Cypher 계획을 최대 max_rows행, timeout초로 제한하여 실행합니다.
+    실행 오류는 HTTPException(500), 타임아웃은 HTTPException(504)으로 변환합니다.
+    새 계획은 실행에 성공한 경우에만 캐시에 저장하고, 캐시된 계획이 실패하면 캐시에서 제거합니다.
+
+    Returns:
+        (쿼리 결과, 잘림 정보 {"row_limit", "rows", "truncated", "limit_injected"})
+    """
+    max_rows = max_rows or config.QUERY_MAX_ROWS
+    timeout = timeout or config.QUERY_TIMEOUT
+    # max_rows + 1행까지 받아야 결과가 잘렸는지 알 수 있음
+    cypher_query, limit_injected = enforce_limit(query_plan.cypher_query, max_rows + 1)
+    try:
+        results, truncated = await neo4j_service.run_bounded_query(
+            cypher_query, query_plan.parameters, max_rows=max_rows, timeout=timeout
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        if query_plan.cache_status == "hit":
+            plan_cache.evict(query_plan.cypher_query)
+        if "TransactionTimedOut" in (getattr(e, "code", None) or ""):
+            logger.error(f"Cypher query timed out after {timeout}s: {cypher_query}")
+            raise HTTPException(status_code=504, detail=f"Cypher query timed out after {timeout} seconds.")
+        logger.error(f"Failed to execute Cypher query: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to execute Cypher query: {str(e)}")
+
+    if query_plan.cacheable_plan:
+        plan_cache.store(query_plan.cacheable_plan)
+    if truncated:
+        logger.warning(f"Cypher query results truncated to {max_rows} rows: {cypher_query}")
+    truncation = {"row_limit": max_rows, "rows": len(results), "truncated": truncated, "limit_injected": limit_injected}
+    return results, truncation
+
+
+def summarize_results(query_results: list, truncated: bool = False, max_rows: int = None,
+                      max_value_length: int = None):
+    """
+    LLM에 보낼 쿼리 결과를 제한된 크기로 줄입니다.
+
+    행이 max_rows개를 넘으면 처음과 끝을 포함해 고르게 뽑은 max_rows개만 남기고,
+    긴 문자열(메모 원문 등)과 리스트(collect 결과 등)는 max_value_length로 자릅니다.
+
+    Returns:
+        (LLM에 보낼 행 목록, 생략 사실을 알리는 안내 문구 또는 None)
+    """
+    max_rows = max_rows or config.QUERY_LLM_MAX_ROWS
+    max_value_length = max_value_length or config.QUERY_LLM_MAX_VALUE_LENGTH
+    total = len(query_results)
+    if total > max_rows:
+        step = (total - 1) / max(max_rows - 1, 1)
+        rows = [query_results[round(i * step)] for i in range(max_rows)]
+    else:
+        rows = query_results
+    rows = [_clip_value(row, max_value_length) for row in rows]
+
+    if len(rows) == total and not truncated:
+        return rows, None
+    total_text = f"more than {total}" if truncated else str(total)
+    return rows, (
+        f"The query returned {total_text} rows; only {len(rows)} evenly sampled rows are shown. "
+        "Summarize them and mention that the list is partial."
+    )
+
+
+def _clip_value(value, max_length: int):
+    """긴 문자열과 리스트를 max_length로 자릅니다. 딕셔너리와 리스트 안의 값도 재귀적으로 처리합니다."""
+    if isinstance(value, str) and len(value) > max_length:
+        return value[:max_length] + "…"
+    if isinstance(value, dict):
+        return {key: _clip_value(item, max_length) for key, item in value.items()}
+    if isinstance(value, list):
+        clipped = [_clip_value(item, max_length) for item in value[:max_length]]
+        if len(value) > max_length:
+            clipped.append(f"... ({len(value) - max_length} more)")
+        return clipped
+    return value
+
+
+def answer_messages(question: str, query_results: list, truncated: bool = False) -> list:
+    """쿼리 결과를 자연어 답변으로 변환하기 위한 LLM 메시지를 생성합니다. 결과가 크면 일부만 보냅니다."""
+    rows, note = summarize_results(query_results, truncated)
+    content = f"Question: {question}\n\nQuery Results: {format_results(rows)}"
+    if note:
+        content += f"\n\nNote: {note}"
+    return [
+        {"role": "system", "content": ANSWER_SYSTEM_PROMPT},
+        {"role": "user", "content": content}
+    ]
+
+
+def format_results(query_results: list) -> str:
+    """쿼리 결과를 JSON 문자열로 변환합니다. (Neo4j 시간 타입 등은 문자열로 표시)"""
+    return json.dumps(query_results, ensure_ascii=False, indent=2, default=str)
+
+
+async def generate_answer(upstage_service, question: str, query_results: list, truncated: bool = False) -> str:
+    """LLM으로 쿼리 결과를 자연어 답변으로 변환합니다. 실패 시 원본 결과를 담은 답변을 반환합니다."""
+    try:
+        nl_response = await upstage_service.solar_pro(answer_messages(question, query_results, truncated))
+        return nl_response["choices"][0]["message"]["content"].strip()
+    except (KeyError, IndexError) as e:
+        logger.error(f"Failed to generate natural language response: {e}")
+        # 자연어 생성 실패 시 원본 결과(의 일부)를 반환
+        return f"검색 결과: {format_results(summarize_results(query_results, truncated)[0])}"
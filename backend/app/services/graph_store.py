@@ -0,0 +1,192 @@
+"""
+그래프 저장소 인터페이스입니다.
+
+라우트와 서비스는 이 인터페이스의 메서드만 사용하며, 구현은 GRAPH_BACKEND 설정으로 선택합니다.
+- neo4j: Neo4jService (운영 환경)
+- memory: InMemoryGraphStore (Neo4j 없이 실행하는 테스트와 벤치마크용, 프로세스 종료 시 데이터 삭제)
+
+Cypher를 직접 실행하는 기능(/query, 그래프 내보내기)은 Neo4j에서만 지원하며,
+다른 구현에서는 501 오류를 반환합니다.
+"""
+import json
+import base64
+from datetime import datetime
+from abc import ABC, abstractmethod
+from fastapi import HTTPException
+
+
+def encode_memo_cursor(timestamp: str, memo_id: str) -> str:
+    """메모 목록의 마지막 항목 (timestamp, id)를 불투명한 커서 문자열로 인코딩합니다."""
+    payload = json.dumps([timestamp, memo_id], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_memo_cursor(cursor: str):
+    """커서를 (timestamp, id)로 디코딩합니다. 잘못된 커서는 HTTPException(400)을 발생시킵니다."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, memo_id = json.loads(payload)
+        if not isinstance(timestamp, str) or not isinstance(memo_id, str):
+            raise ValueError
+        # 데이터베이스의 datetime()에 넘기기 전에 시각 형식을 확인
+        datetime.fromisoformat(timestamp)
+        return timestamp, memo_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+
+class GraphStore(ABC):
+    """
+    인물/회사/이벤트/프로젝트와 메모를 저장하는 그래프 저장소의 공통 인터페이스입니다.
+    각 메서드의 자세한 동작은 Neo4jService의 같은 이름 메서드를 기준으로 합니다.
+    """
+
+    # 시작이 끝나 요청을 처리할 수 있는지 여부 (/ready와 요청 의존성에서 확인)
+    connected = False
+
+    @abstractmethod
+    async def connect(self):
+        """저장소를 사용할 수 있도록 준비합니다. 실패하면 예외를 발생시킵니다."""
+
+    @abstractmethod
+    async def close(self):
+        """저장소 연결을 종료합니다."""
+
+    @abstractmethod
+    async def check_connectivity(self, timeout: float) -> bool:
+        """timeout 안에 저장소를 사용할 수 있는지 확인합니다. (준비 상태 확인용)"""
+
+    @abstractmethod
+    async def create_person(self, name: str, properties: dict = None):
+        """Person 노드를 생성하거나 속성을 업데이트합니다."""
+
+    @abstractmethod
+    async def create_company(self, name: str, properties: dict = None):
+        """Company 노드를 생성하거나 속성을 업데이트합니다."""
+
+    @abstractmethod
+    async def create_event(self, name: str, properties: dict = None):
+        """Event 노드를 생성하거나 속성을 업데이트합니다."""
+
+    @abstractmethod
+    async def create_project(self, name: str, properties: dict = None):
+        """Project 노드를 생성하거나 속성을 업데이트합니다."""
+
+    @abstractmethod
+    async def create_memo(self, memo_id: str, text: str, timestamp: str, business_related: bool, entities: list = None):
+        """Memo 노드를 생성합니다. 이미 있으면 그대로 둡니다."""
+
+    @abstractmethod
+    async def create_relationship(self, from_node_label: str, from_node_name: str, to_node_label: str,
+                                  to_node_name: str, relationship_type: str):
+        """레이블과 이름으로 찾은 두 노드 간 관계를 생성합니다. (이미 있으면 생성하지 않음)"""
+
+    @abstractmethod
+    async def link_memo_to_entity(self, memo_id: str, entity_type: str, entity_name: str):
+        """메모와 엔티티를 MENTIONED_IN 관계로 연결합니다."""
+
+    @abstractmethod
+    async def get_person_phone(self, name: str):
+        """특정 인물의 전화번호를 조회합니다."""
+
+    @abstractmethod
+    async def get_company_people(self, company_name: str):
+        """특정 회사에 근무하는 사람들의 [{"name", "title"}] 목록을 반환합니다."""
+
+    @abstractmethod
+    async def list_memos(self, limit: int = 10, cursor: str = None, since: str = None, until: str = None,
+                         business_related: bool = None, include_entities: bool = True) -> dict:
+        """메모 목록을 시간 역순으로 한 페이지씩 반환합니다. ({"memos", "next_cursor"})"""
+
+    @abstractmethod
+    async def get_graph_version(self) -> str:
+        """그래프가 바뀌면 달라지는 버전 문자열을 반환합니다. (ETag 계산용)"""
+
+    @abstractmethod
+    async def find_node_label(self, name: str):
+        """이름으로 노드의 레이블을 찾습니다. (정확히 일치하는 이름 우선, 없으면 부분 일치)"""
+
+    @abstractmethod
+    async def find_best_matching_person(self, partial_name: str) -> str:
+        """부분 이름으로 가장 일치하는 Person 이름을 찾습니다. 매칭 실패 시 원본을 반환합니다."""
+
+    @abstractmethod
+    async def resolve_entity_names(self, entities: list, names: list = ()) -> dict:
+        """
+        추출된 페이로드 하나의 이름들을 한 번에 기존 노드 이름으로 정규화합니다.
+
+        Args:
+            entities: 엔티티 목록 [{"type", "name"}] (Person은 부분 이름 매칭, Company는 법인 표기가 다른 같은 회사)
+            names: 페이로드에 없는 관계 끝점 이름 (정확히 일치하는 노드의 레이블을 찾음)
+
+        Returns:
+            {원본 이름: {"name": 정규화된 이름, "label": 레이블}} (찾지 못한 names는 포함하지 않음)
+        """
+
+    @abstractmethod
+    async def find_mentions(self, text: str) -> list:
+        """본문에 나오는 알려진 엔티티 이름을 찾습니다. ([{"start", "end", "name", "label", "has_contact"}])"""
+
+    @abstractmethod
+    async def create_relationship_by_names(self, from_name: str, to_name: str, relationship_type: str):
+        """노드 이름만으로 두 노드 간 관계를 생성합니다. 노드를 찾지 못하면 False를 반환합니다."""
+
+    @abstractmethod
+    async def save_memo_graph(self, memo: dict, entities: list, relationships: list, labels: dict = None):
+        """
+        메모 하나의 Memo/엔티티/관계를 한 번에 저장하고 {"nodes_created", "relationships_created"}를 반환합니다.
+        labels는 페이로드에 없는 관계 끝점의 {이름: 레이블}입니다. (없으면 모든 엔티티 레이블에서 찾음)
+        """
+
+    @abstractmethod
+    async def save_contacts(self, contacts: list):
+        """여러 연락처(Person, 소속 Company, WORKS_AT 관계)를 한 번에 저장합니다."""
+
+    @abstractmethod
+    async def scan_entities(self, label: str, after: str = None, limit: int = 1000) -> list:
+        """
+        label 노드를 이름순으로 한 페이지씩 읽습니다. (중복 엔티티 병합 작업의 전체 스캔용)
+
+        Args:
+            after: 이전 페이지의 마지막 이름 (None이면 처음부터)
+            limit: 페이지 크기
+
+        Returns:
+            [{"name", "properties", "companies": WORKS_AT으로 연결된 Company 이름 목록, "degree": 관계 수}]
+        """
+
+    @abstractmethod
+    async def merge_entities(self, label: str, merges: list) -> dict:
+        """
+        같은 레이블의 중복 노드를 남길 노드로 병합합니다. 모든 병합은 하나의 트랜잭션으로 실행됩니다.
+        중복 노드의 모든 관계를 남길 노드로 옮기고(같은 관계가 이미 있으면 합침), 속성을 덮어쓴 뒤 삭제합니다.
+        이미 병합되어 없는 노드는 건너뛰므로 같은 목록을 다시 실행해도 안전합니다.
+
+        Args:
+            merges: [{"keep": 남길 이름, "duplicate": 삭제할 이름, "properties": 남길 노드에 설정할 속성}]
+
+        Returns:
+            {"merged": 삭제된 노드 수, "relationships_moved": 새로 연결된 관계 수}
+        """
+
+    # Cypher를 직접 실행하는 기능 (Neo4j 전용)
+
+    def _cypher_unsupported(self):
+        return HTTPException(
+            status_code=501,
+            detail=f"Cypher queries are not supported by the {type(self).__name__} graph backend. Use GRAPH_BACKEND=neo4j.",
+        )
+
+    def session(self, read: bool = False, **kwargs):
+        raise self._cypher_unsupported()
+
+    async def run_cypher_query(self, query: str, parameters: dict = None):
+        raise self._cypher_unsupported()
+
+    async def run_bounded_query(self, query: str, parameters: dict = None, max_rows: int = 1000,
+                                timeout: float = None, template: str = "llm_cypher"):
+        raise self._cypher_unsupported()
+
+    def stream_cypher_query(self, query: str, parameters: dict = None, timeout: float = None,
+                            fetch_size: int = None, template: str = "stream"):
+        raise self._cypher_unsupported()
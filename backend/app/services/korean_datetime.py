@@ -0,0 +1,163 @@
+"""
+메모 속 한국어 날짜/시각 표현을 작성 시각 기준의 절대 날짜/시각으로 바꾸는 규칙 기반 정규화기입니다.
+
+메모 추출 프롬프트가 LLM에게 맡기던 변환("오늘", "다음주 월요일", "오후 3시" 등)을 결정적으로 처리합니다.
+뜻이 모호한 표현(요일만 있는 "월요일", 오전/오후 없는 "3시" 등)은 바꾸지 않고 LLM에 맡기며,
+has_relative_expression()으로 남아 있는지 확인할 수 있습니다.
+"""
+import re
+from datetime import date, datetime, timedelta
+
+WEEKDAYS = "월화수목금토일"
+
+RELATIVE_DAYS = {
+    "그저께": -2, "그제": -2, "어제": -1,
+    "오늘": 0, "금일": 0,
+    "내일": 1, "명일": 1,
+    "모레": 2, "내일모레": 2, "글피": 3,
+}
+RELATIVE_WEEKS = {"지난": -1, "저번": -1, "이번": 0, "다음": 1, "다다음": 2}
+RELATIVE_MONTHS = {"지난": -1, "저번": -1, "이번": 0, "다음": 1}
+
+# 오전/오후 등 시간대 -> 12시간제 시각을 24시간제로 바꾸는 함수
+DAY_PERIODS = {
+    "오전": lambda hour: 0 if hour == 12 else hour,
+    "새벽": lambda hour: hour,
+    "아침": lambda hour: hour,
+    "낮": lambda hour: hour + 12 if hour < 6 else hour,
+    "오후": lambda hour: hour + 12 if hour < 12 else hour,
+    "저녁": lambda hour: hour + 12 if hour < 12 else hour,
+    "밤": lambda hour: hour + 12 if 6 <= hour < 12 else hour,
+}
+# 시간대 없이 "N시"만 있을 때 그대로 쓰는 시각 (1~7시는 오전/오후가 모호하므로 바꾸지 않음)
+# "24시"는 다음 날 0시이므로 날짜와 함께 LLM에 맡김
+UNAMBIGUOUS_HOURS = range(8, 24)
+# "시" 뒤에 오면 시각이 아닌 단어 ("10시간", "12시즌", "3시작" 등)
+_HOUR_END = r"시(?![간즌작장청])"
+
+_NOT_HANGUL = r"(?<![가-힣])"
+# 상대 날짜 단어 뒤에 올 수 있는 것 (다른 단어의 일부인 "오늘날" 등은 제외)
+_WORD_END = r"(?=$|[^가-힣]|은|는|이|에|까지|부터|도|의|로|중|쯤|께|" + "|".join(DAY_PERIODS) + ")"
+
+DATE_PATTERN = re.compile(
+    "|".join([
+        r"(?P<iso>(?P<iso_year>\d{4})[-./](?P<iso_month>\d{1,2})[-./](?P<iso_day>\d{1,2}))",
+        r"(?P<md>(?:(?P<md_year>\d{4})년\s*)?(?P<md_month>\d{1,2})월\s*(?P<md_day>\d{1,2})일)",
+        _NOT_HANGUL + r"(?P<week>(?P<week_ref>" + "|".join(sorted(RELATIVE_WEEKS, key=len, reverse=True))
+        + r")\s*주\s*(?P<weekday>[" + WEEKDAYS + r"])요일)",
+        _NOT_HANGUL + r"(?P<month>(?P<month_ref>" + "|".join(RELATIVE_MONTHS) + r")\s*달\s*(?P<month_day>\d{1,2})일)",
+        _NOT_HANGUL + r"(?P<day>" + "|".join(sorted(RELATIVE_DAYS, key=len, reverse=True)) + ")" + _WORD_END,
+    ])
+)
+TIME_PATTERN = re.compile(
+    r"(?:(?P<period>" + "|".join(DAY_PERIODS) + r")\s*)?"
+    r"(?<!\d)(?P<hour>\d{1,2})\s*" + _HOUR_END + r"(?:\s*(?P<minute>\d{1,2})\s*분|\s*(?P<half>반))?"
+    r"|(?<!\d)(?P<clock_hour>\d{1,2}):(?P<clock_minute>\d{2})(?!\d)"
+)
+# 정규화 후에도 남아 있으면 LLM의 날짜 변환 규칙이 필요한 표현
+RELATIVE_EXPRESSION_PATTERN = re.compile(
+    r"\d+\s*" + _HOUR_END + r"|요일|주말|월말|월초|정오|자정|" + "|".join(RELATIVE_DAYS) + "|" + "|".join(DAY_PERIODS)
+    + r"|(?:지난|저번|이번|다음|다다음)\s*(?:주|달)|\d+\s*일\s*(?:뒤|후|전)"
+)
+
+
+def _shift_month(day: date, months: int, day_of_month: int):
+    month_index = day.year * 12 + day.month - 1 + months
+    try:
+        return date(month_index // 12, month_index % 12 + 1, day_of_month)
+    except ValueError:
+        return None
+
+
+def _resolve_date(match: re.Match, today: date):
+    """날짜 표현을 date로 바꿉니다. 존재하지 않는 날짜면 None"""
+    try:
+        if match.group("iso"):
+            return date(int(match.group("iso_year")), int(match.group("iso_month")), int(match.group("iso_day")))
+        if match.group("md"):
+            year = int(match.group("md_year") or today.year)
+            return date(year, int(match.group("md_month")), int(match.group("md_day")))
+    except ValueError:
+        return None
+    if match.group("week"):
+        monday = today - timedelta(days=today.weekday()) + timedelta(weeks=RELATIVE_WEEKS[match.group("week_ref")])
+        return monday + timedelta(days=WEEKDAYS.index(match.group("weekday")))
+    if match.group("month"):
+        return _shift_month(today, RELATIVE_MONTHS[match.group("month_ref")], int(match.group("month_day")))
+    return today + timedelta(days=RELATIVE_DAYS[match.group("day")])
+
+
+def _resolve_time(match: re.Match):
+    """시각 표현을 (시, 분)으로 바꿉니다. 모호하거나 잘못된 시각이면 None"""
+    if match.group("clock_hour"):
+        hour, minute = int(match.group("clock_hour")), int(match.group("clock_minute"))
+    else:
+        hour = int(match.group("hour"))
+        minute = 30 if match.group("half") else int(match.group("minute") or 0)
+        period = match.group("period")
+        if period:
+            if not 1 <= hour <= 12:
+                return None
+            hour = DAY_PERIODS[period](hour)
+        elif hour not in UNAMBIGUOUS_HOURS:
+            return None
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        return None
+    return hour, minute
+
+
+def find_datetimes(text: str, now: datetime) -> list:
+    """
+    메모에서 날짜/시각 표현을 찾아 now 기준의 절대값으로 바꿉니다.
+
+    Returns:
+        [{"start", "end", "kind": "date" | "time", "value"}] (본문 순서)
+        value는 날짜면 "YYYY-MM-DD", 시각이면 "HH:MM"
+    """
+    today = now.date()
+    found = []
+    for match in DATE_PATTERN.finditer(text):
+        resolved = _resolve_date(match, today)
+        if resolved:
+            found.append({"start": match.start(), "end": match.end(), "kind": "date", "value": resolved.isoformat()})
+
+    taken = [(item["start"], item["end"]) for item in found]
+    for match in TIME_PATTERN.finditer(text):
+        if any(start < match.end() and match.start() < end for start, end in taken):
+            continue
+        resolved = _resolve_time(match)
+        if resolved:
+            found.append({
+                "start": match.start(), "end": match.end(), "kind": "time", "value": "%02d:%02d" % resolved,
+            })
+    return sorted(found, key=lambda item: item["start"])
+
+
+def replace_datetimes(text: str, datetimes: list) -> str:
+    """find_datetimes()로 찾은 표현을 절대값으로 바꾼 본문을 반환합니다. ("오늘 오후 3시" -> "2026-02-02 15:00")"""
+    parts = []
+    position = 0
+    for item in datetimes:
+        # 붙어 있던 표현("어제저녁 8시")은 값 사이에 공백을 넣음
+        parts.append(text[position:item["start"]] if item["start"] > position or not position else " ")
+        parts.append(item["value"])
+        position = item["end"]
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def has_relative_expression(text: str) -> bool:
+    """정규화하지 못한 상대 날짜/시각 표현이 남아 있는지 확인합니다."""
+    return RELATIVE_EXPRESSION_PATTERN.search(text) is not None
+
+
+def event_datetime(datetimes: list, now: datetime):
+    """
+    메모의 첫 날짜와 첫 시각으로 Event 날짜를 만듭니다. (메모 추출 프롬프트와 같은 ISO 형식)
+    시각만 있으면 메모 작성일을 사용하고, 둘 다 없으면 None을 반환합니다.
+    """
+    day = next((item["value"] for item in datetimes if item["kind"] == "date"), None)
+    time = next((item["value"] for item in datetimes if item["kind"] == "time"), None)
+    if time:
+        return f"{day or now.date().isoformat()}T{time}:00"
+    return day
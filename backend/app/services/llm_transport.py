@@ -0,0 +1,122 @@
+"""
+Solar Pro 호출 경로(transport)와 Upstage API 오류 분류입니다.
+
+- DirectTransport: OpenAI 호환 메시지를 그대로 Upstage API에 보냅니다. 객체 변환이 없어 호출당 오버헤드가 가장 작습니다.
+- LangChainTransport: ChatUpstage로 호출하여 LangSmith에 추적됩니다. 메시지/응답 변환과 콜백 비용이 듭니다.
+
+재시도는 UpstageService의 재시도 정책 한 곳에서만 합니다. ChatUpstage(내부 openai 클라이언트)의 자체 재시도는 끄고,
+classify_error()로 어느 경로에서 난 오류든 같은 기준으로 재시도/실패/폴백을 결정합니다.
+"""
+import httpx
+from app.core.logger import get_logger, debug_payload
+
+logger = get_logger(__name__)
+
+# 재시도 대상 HTTP 상태 코드 (Rate limit 및 일시적인 서버 오류)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 오류 분류
+TRANSIENT = "transient"  # 429/5xx, 타임아웃, 연결 오류: 같은 경로로 재시도
+PERMANENT = "permanent"  # 그 외 HTTP 오류(400, 401 등): 재시도하거나 다른 경로로 다시 보내도 결과가 같음
+LOCAL = "local"  # 요청이 API에 도달하기 전 클라이언트 라이브러리에서 난 오류: 직접 호출로 폴백 가능
+
+# ChatUpstage가 사용하는 openai 클라이언트의 네트워크 오류 (openai를 import하지 않고 이름으로 판별)
+_CLIENT_TRANSPORT_ERRORS = {"APIConnectionError", "APITimeoutError"}
+
+
+def error_status(exception: BaseException):
+    """오류에 포함된 HTTP 응답의 상태 코드를 반환합니다. (httpx.HTTPStatusError, openai.APIStatusError)"""
+    if isinstance(exception, httpx.HTTPStatusError):
+        return exception.response.status_code
+    return getattr(exception, "status_code", None)
+
+
+def error_response(exception: BaseException):
+    """오류에 포함된 httpx 응답을 반환합니다. (Retry-After 헤더 조회용)"""
+    response = getattr(exception, "response", None)
+    return response if isinstance(response, httpx.Response) else None
+
+
+def classify_error(exception: BaseException) -> str:
+    """Upstage 호출 오류를 TRANSIENT, PERMANENT, LOCAL 중 하나로 분류합니다."""
+    status = error_status(exception)
+    if isinstance(status, int):
+        return TRANSIENT if status in RETRYABLE_STATUS_CODES else PERMANENT
+    if isinstance(exception, httpx.TransportError):
+        return TRANSIENT
+    if any(cls.__name__ in _CLIENT_TRANSPORT_ERRORS for cls in type(exception).__mro__):
+        return TRANSIENT
+    return LOCAL
+
+
+class DirectTransport:
+    """Upstage Chat Completions API를 공유 httpx 클라이언트로 직접 호출합니다."""
+
+    name = "direct"
+
+    def __init__(self, service):
+        self.service = service
+
+    async def send(self, messages: list, model: str) -> dict:
+        """한 번 호출합니다. 재시도는 호출하는 쪽의 재시도 정책이 담당합니다."""
+        response = await self.service.client.post(
+            f"{self.service.base_url}/solar/chat/completions",
+            headers=self.service._get_headers("application/json"),
+            json={"model": model, "messages": messages},
+        )
+        response.raise_for_status()
+        # 응답 본문에는 사용자 메모/명함 내용이 포함되므로 INFO에는 크기만 남김
+        logger.info(f"Solar Pro API Response Status: {response.status_code}, {len(response.content)} bytes")
+        debug_payload(logger, "Solar Pro API response body", body=response.text)
+        return response.json()
+
+
+class LangChainTransport:
+    """ChatUpstage로 호출하여 LangSmith에 추적되는 경로입니다."""
+
+    name = "langchain"
+
+    def __init__(self, chat_upstage, message_classes: dict):
+        self.chat_upstage = chat_upstage
+        # OpenAI 메시지 역할 -> LangChain 메시지 클래스 (import는 load()에서 한 번만)
+        self.message_classes = message_classes
+
+    @classmethod
+    def load(cls, api_key: str, base_url: str, model: str, timeout: float):
+        """
+        ChatUpstage를 생성합니다. langchain-upstage가 없거나 생성에 실패하면 None을 반환합니다.
+        재시도는 UpstageService가 하므로 ChatUpstage의 자체 재시도는 끕니다.
+        """
+        try:
+            from langchain_upstage import ChatUpstage
+            from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+        except ImportError:
+            logger.warning("langchain-upstage not available, LangSmith tracing will not work")
+            return None
+        try:
+            chat_upstage = ChatUpstage(
+                api_key=api_key,
+                model=model,
+                base_url=f"{base_url}/solar",
+                timeout=timeout,
+                max_retries=0,
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize ChatUpstage: {e}")
+            return None
+        logger.info("ChatUpstage initialized for LangSmith tracing")
+        return cls(chat_upstage, {"system": SystemMessage, "user": HumanMessage, "assistant": AIMessage})
+
+    def convert_messages(self, messages: list) -> list:
+        """OpenAI 형식 메시지를 LangChain 메시지로 변환합니다. (알 수 없는 역할은 제외)"""
+        classes = self.message_classes
+        return [classes[m["role"]](content=m["content"]) for m in messages if m.get("role") in classes]
+
+    async def send(self, messages: list, model: str) -> dict:
+        """한 번 호출하고 응답을 OpenAI 호환 형식으로 변환합니다."""
+        response = await self.chat_upstage.ainvoke(self.convert_messages(messages))
+        result = {"choices": [{"message": {"content": response.content, "role": "assistant"}}]}
+        usage = (getattr(response, "response_metadata", None) or {}).get("token_usage")
+        if usage:
+            result["usage"] = usage
+        return result
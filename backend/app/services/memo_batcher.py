@@ -0,0 +1,232 @@
+import json
+import asyncio
+from app.core.logger import get_logger
+from app.services.business_card import parse_llm_json
+
+logger = get_logger(__name__)
+
+BATCH_DATE_RULES = """
+        IMPORTANT: Convert relative dates to absolute dates using the memo's own written_at:
+        - "오늘" → the date of written_at
+        - "내일" → add 1 day to the date of written_at
+        - "모레" → add 2 days to the date of written_at
+        - "다음주 월요일" → calculate next Monday from the date of written_at
+
+        For times, convert to 24-hour format:
+        - "14시" → "14:00"
+        - "오후 3시" → "15:00"
+        - "오전 9시" → "09:00"
+"""
+
+BATCH_EXTRACTION_SYSTEM_PROMPT = """You are a helpful assistant that extracts entities and relationships from multiple independent memos.
+        The entities can be Person, Company, Event, Project.
+        The relationships can be WORKS_AT, ATTENDED, DISCUSSED.
+
+        The user message is a JSON array of memos: [{"id": 0, "written_at": "2026-02-02T09:30", "text": "..."}]
+        Each memo is independent. Never mix entities or relationships between memos.
+{date_rules}
+        For Event entities, include both date and time in ISO format if available:
+        - If only date: "2026-02-02"
+        - If date and time: "2026-02-02T14:00:00"
+
+        Return the output in JSON format with exactly one item per input memo id, following this schema:
+        {
+          "memos": [
+            {
+              "id": 0,
+              "entities": [
+                { "type": "Person", "name": "김성길", "title": "과장", "phone": "010-1234-5678", "email": "kim@abc.com" },
+                { "type": "Company", "name": "ABC상사" },
+                { "type": "Event", "name": "미팅", "date": "2026-02-02T14:00:00" },
+                { "type": "Project", "name": "신규 프로젝트" }
+              ],
+              "relationships": [
+                { "from": "김성길", "to": "ABC상사", "type": "WORKS_AT" },
+                { "from": "김성길", "to": "미팅", "type": "ATTENDED" },
+                { "from": "미팅", "to": "신규 프로젝트", "type": "DISCUSSED" }
+              ],
+              "business_related": true
+            }
+          ]
+        }
+        If a memo is not business related, set its "business_related" to false and return empty entities and relationships.
+        """
+
+
+def build_batch_messages(batch: list) -> list:
+    """
+    (text, now, date_rules) 목록으로 일괄 추출 LLM 메시지를 생성합니다. 각 메모의 id는 목록 내 위치입니다.
+    상대 날짜 변환 규칙은 규칙이 필요한 메모가 하나라도 있을 때만 포함합니다.
+    """
+    memos = [
+        {"id": i, "written_at": now.strftime("%Y-%m-%dT%H:%M"), "text": text}
+        for i, (text, now, _) in enumerate(batch)
+    ]
+    date_rules = BATCH_DATE_RULES if any(rules for _, _, rules in batch) else ""
+    return [
+        {"role": "system", "content": BATCH_EXTRACTION_SYSTEM_PROMPT.replace("{date_rules}", date_rules)},
+        {"role": "user", "content": json.dumps(memos, ensure_ascii=False)}
+    ]
+
+
+def is_valid_extraction(item) -> bool:
+    """메모 하나의 추출 결과가 단일 메모 추출과 같은 형태인지 확인합니다."""
+    return (
+        isinstance(item, dict)
+        and isinstance(item.get("entities", []), list)
+        and all(isinstance(entity, dict) for entity in item.get("entities", []))
+        and isinstance(item.get("relationships", []), list)
+        and all(isinstance(relationship, dict) for relationship in item.get("relationships", []))
+        and isinstance(item.get("business_related", False), bool)
+    )
+
+
+class MemoExtractionBatcher:
+    """
+    짧은 시간 안에 들어온 메모들을 하나의 Solar Pro 호출로 묶어 추출합니다.
+
+    extract()는 메모를 대기열에 넣고 결과를 기다립니다. 대기열은 max_wait초가 지나거나
+    max_batch_size개가 모이면 한 번의 LLM 호출로 처리되고, 결과는 메모별로 각 호출자에게 돌아갑니다.
+    긴 시스템 프롬프트를 메모마다 반복해서 보내지 않으므로 입력 토큰과 호출 수가 줄어듭니다.
+
+    일괄 응답 전체 또는 일부 메모의 결과가 형식 검증에 실패하면 해당 메모만 단일 호출로 다시 추출합니다.
+    """
+
+    def __init__(self, single_extract, max_batch_size: int = 4, max_wait: float = 0.1):
+        """
+        Args:
+            single_extract: 메모 하나를 추출하는 코루틴 함수 (upstage_service, text, now, date_rules) -> dict
+            max_batch_size: 한 번의 호출로 묶을 최대 메모 수 (1이면 묶지 않음)
+            max_wait: 첫 메모가 들어온 후 다른 메모를 기다리는 최대 시간 (초)
+        """
+        self.single_extract = single_extract
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending = []  # (upstage_service, text, now, date_rules, future)
+        self._timer = None
+        self._tasks = set()
+        self.stats = {
+            "batches": 0,
+            "batched_memos": 0,
+            "single_calls": 0,
+            "fallbacks": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "batch_sizes": {},
+        }
+
+    async def extract(self, upstage_service, text: str, now, date_rules: bool = True) -> dict:
+        """
+        메모에서 엔티티와 관계를 추출합니다. 다른 메모와 함께 일괄 처리될 수 있습니다.
+
+        Args:
+            date_rules: 상대 날짜/시각 변환 규칙이 필요한지 여부 (전처리에서 모두 절대값으로 바꿨으면 False)
+
+        Returns:
+            {"entities": [...], "relationships": [...], "business_related": bool}
+        """
+        if self.max_batch_size <= 1:
+            self.stats["single_calls"] += 1
+            return await self.single_extract(upstage_service, text, now, date_rules)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((upstage_service, text, now, date_rules, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        """대기 중인 메모들을 하나의 배치로 처리하기 시작합니다."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list):
+        size = len(batch)
+        self.stats["batch_sizes"][size] = self.stats["batch_sizes"].get(size, 0) + 1
+
+        if size == 1:
+            results = [None]
+        else:
+            try:
+                results = await self._extract_batch(batch)
+            except Exception as e:
+                logger.error(f"Batched memo extraction failed for {size} memos: {e}", exc_info=True)
+                results = [None] * size
+
+        # 검증에 실패한 메모는 단일 호출로 다시 추출
+        retry_indexes = [i for i, result in enumerate(results) if result is None]
+        if size > 1 and retry_indexes:
+            self.stats["fallbacks"] += len(retry_indexes)
+            logger.warning(f"Falling back to single-memo extraction for {len(retry_indexes)} of {size} memos")
+        self.stats["single_calls"] += len(retry_indexes)
+        retried = await asyncio.gather(
+            *(self.single_extract(*batch[i][:4]) for i in retry_indexes),
+            return_exceptions=True,
+        )
+        for i, result in zip(retry_indexes, retried):
+            results[i] = result
+
+        for (*_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _extract_batch(self, batch: list) -> list:
+        """
+        한 번의 LLM 호출로 여러 메모를 추출합니다.
+
+        Returns:
+            batch와 같은 순서의 결과 목록. 검증에 실패한 메모는 None
+        """
+        upstage_service = batch[0][0]
+        messages = build_batch_messages([(text, now, date_rules) for _, text, now, date_rules, _ in batch])
+        response = await upstage_service.solar_pro(messages)
+        usage = response.get("usage") or {}
+        self.stats["prompt_tokens"] += usage.get("prompt_tokens", 0)
+        self.stats["completion_tokens"] += usage.get("completion_tokens", 0)
+
+        results = [None] * len(batch)
+        try:
+            items = parse_llm_json(response["choices"][0]["message"]["content"])["memos"]
+        except (KeyError, IndexError, TypeError, json.JSONDecodeError) as e:
+            await upstage_service.evict_cached_response(messages)
+            logger.error(f"Failed to parse batched memo extraction response: {e}")
+            return results
+
+        for item in items if isinstance(items, list) else []:
+            index = item.get("id") if isinstance(item, dict) else None
+            if isinstance(index, int) and 0 <= index < len(batch) and results[index] is None and is_valid_extraction(item):
+                results[index] = {
+                    "entities": item.get("entities", []),
+                    "relationships": item.get("relationships", []),
+                    "business_related": item.get("business_related", False),
+                }
+
+        if any(result is None for result in results):
+            # 일부라도 잘못된 응답은 캐시에 남기지 않음
+            await upstage_service.evict_cached_response(messages)
+        self.stats["batches"] += 1
+        self.stats["batched_memos"] += sum(result is not None for result in results)
+        return results
+
+    def get_metrics(self) -> dict:
+        """배치 수, 배치로 처리된 메모 수, 단일 호출/폴백 수, 배치 크기 분포를 반환합니다."""
+        return {**self.stats, "batch_sizes": dict(self.stats["batch_sizes"]), "pending": len(self._pending)}
+
+    def collect_metrics(self):
+        """/metrics 출력용 수집기입니다."""
+        yield "memo_batch_pending", "Memos waiting for the next extraction batch.", "gauge", {}, len(self._pending)
+        for key in ("batches", "batched_memos", "single_calls", "fallbacks"):
+            yield f"memo_batch_{key}_total", f"Memo extraction {key.replace('_', ' ')}.", "counter", {}, self.stats[key]
@@ -0,0 +1,215 @@
+import json
+from datetime import datetime
+from fastapi import HTTPException
+from app.core import config, metrics
+from app.core.logger import get_logger, debug_payload
+from app.services.memo_batcher import MemoExtractionBatcher
+from app.services.memo_preprocessor import MemoPreprocessor
+
+logger = get_logger(__name__)
+
+
+def build_extraction_messages(text: str, now: datetime, date_rules: bool = True) -> list:
+    """
+    메모에서 엔티티와 관계를 추출하기 위한 LLM 메시지를 생성합니다.
+
+    Args:
+        text: 메모 텍스트
+        now: 상대 날짜("오늘", "내일" 등)를 계산할 기준 시각 (메모 작성 시각)
+        date_rules: 상대 날짜/시각 변환 규칙을 포함할지 여부 (전처리에서 모두 절대값으로 바꿨으면 False)
+    """
+    current_date = now.strftime("%Y-%m-%d")
+    current_time = now.strftime("%H:%M")
+    if date_rules:
+        date_rules = f"""
+        When extracting dates and times, convert relative dates to absolute dates:
+        - "오늘" → {current_date}
+        - "내일" → add 1 day to {current_date}
+        - "모레" → add 2 days to {current_date}
+        - "다음주 월요일" → calculate next Monday from {current_date}
+
+        For times, convert to 24-hour format:
+        - "14시" → "14:00"
+        - "오후 3시" → "15:00"
+        - "오전 9시" → "09:00"
+"""
+    else:
+        date_rules = "\n"
+    return [
+        {"role": "system", "content": f"""You are a helpful assistant that extracts entities and relationships from a given memo.
+        The entities can be Person, Company, Event, Project.
+        The relationships can be WORKS_AT, ATTENDED, DISCUSSED.
+
+        IMPORTANT: Current date is {current_date} and current time is {current_time}.{date_rules}
+        For Event entities, include both date and time in ISO format if available:
+        - If only date: "2026-02-02"
+        - If date and time: "2026-02-02T14:00:00"
+
+        Return the output in JSON format, following this schema:
+        {{
+          "entities": [
+            {{ "type": "Person", "name": "김성길", "title": "과장", "phone": "010-1234-5678", "email": "kim@abc.com" }},
+            {{ "type": "Company", "name": "ABC상사" }},
+            {{ "type": "Event", "name": "미팅", "date": "2026-02-02T14:00:00" }},
+            {{ "type": "Project", "name": "신규 프로젝트" }}
+          ],
+          "relationships": [
+            {{ "from": "김성길", "to": "ABC상사", "type": "WORKS_AT" }},
+            {{ "from": "김성길", "to": "미팅", "type": "ATTENDED" }},
+            {{ "from": "미팅", "to": "신규 프로젝트", "type": "DISCUSSED" }}
+          ],
+          "business_related": true
+        }}
+        If the memo is not business related, set "business_related" to false and return empty entities and relationships.
+        """},
+        {"role": "user", "content": text}
+    ]
+
+
+async def extract_memo(upstage_service, text: str, now: datetime, date_rules: bool = True) -> dict:
+    """
+    LLM을 사용하여 메모에서 엔티티와 관계를 추출합니다.
+
+    Returns:
+        {"entities": [...], "relationships": [...], "business_related": bool}
+    """
+    messages = build_extraction_messages(text, now, date_rules)
+    response = await upstage_service.solar_pro(messages)
+    debug_payload(logger, "Solar Pro memo extraction response", response=response)
+
+    try:
+        extracted_data_content = response["choices"][0]["message"]["content"]
+
+        # Markdown 코드 블록 제거 (```json 또는 ``` 감싸진 부분 파싱)
+        if "```json" in extracted_data_content:
+            start = extracted_data_content.find("```json") + len("```json")
+            end = extracted_data_content.find("```", start)
+            if end != -1:
+                extracted_data_content = extracted_data_content[start:end].strip()
+        elif "```" in extracted_data_content:
+            start = extracted_data_content.find("```") + len("```")
+            end = extracted_data_content.find("```", start)
+            if end != -1:
+                extracted_data_content = extracted_data_content[start:end].strip()
+
+        return json.loads(extracted_data_content)
+    except (KeyError, IndexError):
+        await upstage_service.evict_cached_response(messages)
+        logger.error(f"LLM response structure not as expected: {response}", exc_info=True)
+        raise HTTPException(status_code=500, detail="LLM response structure not as expected.")
+    except json.JSONDecodeError:
+        await upstage_service.evict_cached_response(messages)
+        logger.error(f"JSON decoding failed for content: '{extracted_data_content}'", exc_info=True)
+        raise HTTPException(status_code=500, detail="JSON decoding failed from LLM response.")
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during LLM response parsing: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="An unexpected error occurred during LLM response parsing.")
+
+
+async def ingest_memo(upstage_service, neo4j_service, text: str, memo_id: str = None, now: datetime = None) -> dict:
+    """
+    메모 텍스트에서 엔티티와 관계를 추출하여 Neo4j에 저장합니다.
+
+    같은 memo_id로 다시 실행하면 Memo 노드를 MERGE하므로 중복 노드가 생기지 않습니다.
+    (백그라운드 작업이 재시작 후 다시 실행되는 경우)
+
+    Args:
+        upstage_service: Upstage API 서비스
+        neo4j_service: Neo4j 서비스
+        text: 메모 텍스트
+        memo_id: 저장할 Memo 노드 ID (None이면 현재 시각으로 생성)
+        now: 메모 작성 시각 (None이면 현재 시각). 상대 날짜 계산과 Memo timestamp에 사용
+
+    Returns:
+        처리 상태, 추출된 데이터, 저장된 memo_id (비즈니스 메모인 경우)
+    """
+    now = now or datetime.now()
+    with metrics.stage("memo_extraction"):
+        # 날짜/시각을 절대값으로 바꾸고, 알려진 이름만 나오는 단순한 메모는 LLM 없이 추출
+        annotation = await memo_preprocessor.annotate(neo4j_service, text, now) if memo_preprocessor else None
+        llm_text = annotation["text"] if annotation else text
+        if annotation and annotation["extraction"]:
+            extracted_data = annotation["extraction"]
+        else:
+            date_rules = annotation["date_rules"] if annotation else True
+            if memo_batcher:
+                extracted_data = await memo_batcher.extract(upstage_service, llm_text, now, date_rules)
+            else:
+                extracted_data = await extract_memo(upstage_service, llm_text, now, date_rules)
+
+    business_related = extracted_data.get("business_related", False)
+
+    # 비즈니스 관련 메모가 아닌 경우 그래프에 저장하지 않음
+    if not business_related:
+        return {"status": "Non-business memo processed", "extracted_data": extracted_data}
+
+    # 고유한 메모 ID 생성
+    memo_id = memo_id or f"memo_{now.strftime('%Y%m%d_%H%M%S_%f')}"
+    timestamp = now.isoformat()
+
+    # 엔티티와 관계 끝점의 이름을 한 번에 정규화하여 중복 노드 생성 방지
+    # (예: "인영", "인영님", "이인영"을 하나로, "(주)ABC상사"와 "ABC상사"를 하나로 통합)
+    normalized_entities = extracted_data.get("entities", [])
+    relationships = extracted_data.get("relationships", [])
+    entity_names = {entity.get("name") for entity in normalized_entities}
+    endpoint_names = [
+        name
+        for relationship in relationships
+        for name in (relationship.get("from"), relationship.get("to"))
+        if name and name not in entity_names
+    ]
+    name_mapping = await neo4j_service.resolve_entity_names(normalized_entities, endpoint_names)
+
+    for entity in normalized_entities:
+        if entity.get("name") in name_mapping:
+            entity["name"] = name_mapping[entity["name"]]["name"]
+    for relationship in relationships:
+        for key in ("from", "to"):
+            if relationship.get(key) in name_mapping:
+                relationship[key] = name_mapping[relationship[key]]["name"]
+    # 페이로드에 없는 관계 끝점은 찾은 레이블로 조회 (정규화된 이름 기준)
+    endpoint_labels = {
+        match["name"]: match["label"] for name, match in name_mapping.items() if name not in entity_names
+    }
+
+    # 메모, 엔티티, MENTIONED_IN 연결, 관계를 단일 트랜잭션으로 저장
+    entities_to_save = [
+        {
+            "type": entity.get("type"),
+            "name": entity.get("name"),
+            # type과 name을 제외한 속성들만 저장
+            "properties": {k: v for k, v in entity.items() if k not in ["type", "name"] and v is not None},
+        }
+        for entity in normalized_entities
+        if entity.get("type") and entity.get("name")
+    ]
+    memo = {
+        "id": memo_id,
+        "text": text,
+        "timestamp": timestamp,
+        "business_related": business_related,
+    }
+    try:
+        await neo4j_service.save_memo_graph(memo, entities_to_save, relationships, endpoint_labels)
+    except Exception as e:
+        logger.error(f"Failed to save memo graph {memo_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to save memo to Neo4j.")
+
+    return {"status": "Memo processed and saved to Neo4j", "extracted_data": extracted_data, "memo_id": memo_id}
+
+
+# LLM 호출 전 로컬 전처리 (날짜/시각 정규화, 알려진 엔티티 찾기, 단순한 메모의 로컬 추출)
+memo_preprocessor = None
+if config.MEMO_PREPROCESS_ENABLED:
+    memo_preprocessor = MemoPreprocessor(local_extraction=config.MEMO_LOCAL_EXTRACTION_ENABLED)
+    metrics.registry.register_collector("llm", memo_preprocessor.collect_metrics)
+
+# 동시에 들어온 메모들을 하나의 LLM 호출로 묶어 추출 (검증 실패 시 extract_memo로 폴백)
+memo_batcher = None
+if config.MEMO_BATCH_ENABLED:
+    memo_batcher = MemoExtractionBatcher(
+        extract_memo,
+        max_batch_size=config.MEMO_BATCH_MAX_SIZE,
+        max_wait=config.MEMO_BATCH_MAX_WAIT,
+    )
+    metrics.registry.register_collector("llm", memo_batcher.collect_metrics)
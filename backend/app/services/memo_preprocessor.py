@@ -0,0 +1,169 @@
+import re
+from datetime import datetime
+from app.core.logger import get_logger
+from app.services import korean_datetime
+
+logger = get_logger(__name__)
+
+# 인물 이름 뒤에 오는 직함 (Person의 title 속성으로 저장)
+TITLES = (
+    "대표이사", "부사장", "본부장", "센터장", "지점장", "연구원", "변호사", "회계사", "세무사",
+    "사원", "주임", "대리", "과장", "차장", "부장", "팀장", "실장", "이사", "상무", "전무", "대표", "사장", "회장",
+    "소장", "원장", "매니저", "책임", "선임", "수석", "교수", "박사",
+)
+# 만남을 나타내는 단어 -> Event 이름에 쓰는 이름
+MEETING_KEYWORDS = {
+    "미팅": "미팅", "만남": "미팅", "만났음": "미팅", "만났다": "미팅", "만나기로": "미팅",
+    "회의": "회의", "면담": "면담", "통화": "통화", "방문": "방문", "약속": "약속",
+    "식사": "식사", "점심": "식사", "점심식사": "식사",
+}
+# 로컬 추출에서 무시하는 서술어
+FILLER_WORDS = {"함", "했음", "했다", "예정", "진행", "있음", "잡음", "완료", "하기로", "하고", "및"}
+# 이름/직함/단어 뒤에 붙는 조사 (긴 것부터 제거)
+PARTICLES = ("으로", "에서", "에게", "이랑", "하고", "님", "과", "와", "랑", "께", "을", "를", "은", "는", "이", "가", "의", "도", "에", "로")
+
+TOKEN_PATTERN = re.compile(r"[^\s.,!?~/()\[\]]+")
+TITLE_PATTERN = re.compile(r"\s*(" + "|".join(TITLES) + ")")
+
+
+def _classify_word(word: str):
+    """
+    이름과 날짜를 지운 뒤 남은 단어를 분류합니다. 조사를 하나씩 떼어 가며 확인합니다.
+
+    Returns:
+        ("keyword", Event 이름), ("title", None), ("filler", None) 또는 알 수 없는 단어면 None
+    """
+    while word:
+        if word in MEETING_KEYWORDS:
+            return "keyword", MEETING_KEYWORDS[word]
+        if word in TITLES:
+            return "title", None
+        if word in FILLER_WORDS:
+            return "filler", None
+        particle = next((particle for particle in PARTICLES if word.endswith(particle)), None)
+        if particle is None:
+            return None
+        word = word[:-len(particle)]
+    return "filler", None
+
+
+class MemoPreprocessor:
+    """
+    메모를 LLM에 보내기 전에 로컬에서 처리하는 단계입니다.
+
+    1. 날짜/시각 정규화: "오늘", "다음주 월요일", "오후 3시" 등을 작성 시각 기준의 절대값으로 바꿉니다.
+       모든 상대 표현이 바뀌면 추출 프롬프트에서 날짜 변환 규칙을 뺍니다.
+    2. 엔티티 찾기: 그래프 저장소의 이름 인덱스(Aho-Corasick 오토마톤)로 본문에 나오는 알려진 이름을 찾습니다.
+    3. 로컬 추출: 이름, 직함, 날짜/시각, 만남을 나타내는 단어("만남", "미팅" 등)와 조사만으로 이루어진 메모
+       ("오늘 김성길 과장 만남")는 LLM을 호출하지 않고 추출 결과를 만듭니다.
+       모르는 단어가 하나라도 남으면 LLM에 맡깁니다.
+    """
+
+    def __init__(self, local_extraction: bool = True):
+        """
+        Args:
+            local_extraction: 단순한 메모를 LLM 없이 추출할지 여부
+        """
+        self.local_extraction = local_extraction
+        self.stats = {
+            "memos": 0,
+            "local_extractions": 0,
+            "datetimes_normalized": 0,
+            "date_rules_omitted": 0,
+        }
+
+    async def annotate(self, graph_store, text: str, now: datetime) -> dict:
+        """
+        메모를 전처리합니다.
+
+        Args:
+            graph_store: 알려진 엔티티 이름을 찾을 그래프 저장소
+            text: 메모 텍스트
+            now: 메모 작성 시각 (상대 날짜 계산 기준)
+
+        Returns:
+            text: LLM에 보낼 메모 (상대 날짜/시각을 절대값으로 바꾼 본문)
+            date_rules: 추출 프롬프트에 날짜 변환 규칙이 필요한지 여부
+            mentions: 본문에 나오는 알려진 엔티티 (GraphStore.find_mentions 형식)
+            extraction: 로컬에서 추출한 결과 (LLM 추출과 같은 형식, 로컬로 처리할 수 없으면 None)
+        """
+        self.stats["memos"] += 1
+        datetimes = korean_datetime.find_datetimes(text, now)
+        annotated = korean_datetime.replace_datetimes(text, datetimes)
+        date_rules = korean_datetime.has_relative_expression(annotated)
+        self.stats["datetimes_normalized"] += bool(datetimes)
+        self.stats["date_rules_omitted"] += not date_rules
+
+        mentions = await graph_store.find_mentions(text)
+        extraction = None
+        if self.local_extraction and not date_rules:
+            extraction = self._extract_locally(text, mentions, datetimes, now)
+        if extraction:
+            self.stats["local_extractions"] += 1
+            logger.info(f"Memo extracted locally: {len(extraction['entities'])} entities")
+        return {"text": annotated, "date_rules": date_rules, "mentions": mentions, "extraction": extraction}
+
+    def _extract_locally(self, text: str, mentions: list, datetimes: list, now: datetime):
+        """알려진 이름과 정해진 단어만으로 이루어진 메모의 추출 결과를 만듭니다. 처리할 수 없으면 None"""
+        if not mentions or any(mention["label"] == "Event" for mention in mentions):
+            return None
+
+        # 이름, 이름 바로 뒤의 직함, 날짜/시각을 지운 나머지 단어를 확인
+        residual = list(text)
+        titles = {}
+        for span in mentions + datetimes:
+            residual[span["start"]:span["end"]] = " " * (span["end"] - span["start"])
+        for mention in mentions:
+            match = TITLE_PATTERN.match(text, mention["end"])
+            if mention["label"] == "Person" and match:
+                titles.setdefault(mention["name"], match.group(1))
+
+        keyword = None
+        for word in TOKEN_PATTERN.findall("".join(residual)):
+            kind = _classify_word(word)
+            if kind is None:
+                return None
+            if kind[0] == "keyword":
+                keyword = keyword or kind[1]
+        if keyword is None:
+            return None
+
+        names = {label: [] for label in ("Person", "Company", "Project")}
+        for mention in mentions:
+            if mention["name"] not in names[mention["label"]]:
+                names[mention["label"]].append(mention["name"])
+        if not names["Person"] and not names["Company"]:
+            return None
+
+        counterpart = (names["Company"] or names["Person"])[0]
+        date = korean_datetime.event_datetime(datetimes, now)
+        # 같은 상대와의 다른 날 만남이 하나의 Event로 합쳐지지 않도록 날짜(없으면 작성일)를 이름에 포함
+        event = {"type": "Event", "name": f"{counterpart} {keyword} {(date or now.date().isoformat())[:10]}"}
+        if date:
+            event["date"] = date
+
+        entities = [
+            {"type": "Person", "name": name, **({"title": titles[name]} if name in titles else {})}
+            for name in names["Person"]
+        ]
+        entities += [{"type": "Company", "name": name} for name in names["Company"]]
+        entities += [{"type": "Project", "name": name} for name in names["Project"]]
+        entities.append(event)
+
+        relationships = [{"from": name, "to": event["name"], "type": "ATTENDED"} for name in names["Person"]]
+        relationships += [{"from": event["name"], "to": name, "type": "DISCUSSED"} for name in names["Project"]]
+        # "ABC상사 김성길 과장"처럼 회사 이름 바로 뒤에 나오는 인물만 소속으로 간주
+        for company, person in zip(mentions, mentions[1:]):
+            if (company["label"], person["label"]) == ("Company", "Person") and not text[company["end"]:person["start"]].strip():
+                relationships.append({"from": person["name"], "to": company["name"], "type": "WORKS_AT"})
+
+        return {"entities": entities, "relationships": relationships, "business_related": True}
+
+    def get_metrics(self) -> dict:
+        """전처리한 메모 수, 로컬 추출 수, 날짜를 정규화한 메모 수, 날짜 규칙을 뺀 프롬프트 수를 반환합니다."""
+        return dict(self.stats)
+
+    def collect_metrics(self):
+        """/metrics 출력용 수집기입니다."""
+        for key, value in self.stats.items():
+            yield f"memo_preprocess_{key}_total", f"Preprocessed memo {key.replace('_', ' ')}.", "counter", {}, value
@@ -0,0 +1,281 @@
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from fastapi import HTTPException
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def memo_idempotency_key(text: str, key: str = None) -> str:
+    """
+    멱등성 키를 생성합니다.
+    클라이언트가 키를 지정하지 않으면 메모 텍스트의 해시를 사용하므로,
+    타임아웃 후 같은 메모를 다시 보내도 새 작업(과 새 Memo 노드)이 생기지 않습니다.
+    """
+    if key:
+        return f"key:{key}"
+    return "text:" + hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+class MemoJobQueue:
+    """
+    SQLite에 저장되는 메모 수집 작업 큐입니다.
+
+    - enqueue: 작업을 저장하고 즉시 반환합니다. 멱등성 키가 같은 작업이 유효 기간 내에 있으면 그 작업을 반환합니다.
+    - 워커: concurrency개의 asyncio 태스크가 작업을 하나씩 점유(lease)하여 처리합니다.
+      점유는 단일 UPDATE ... RETURNING 문으로 이루어지므로 여러 프로세스가 같은 파일을 공유해도 안전합니다.
+    - 재시도: 실패한 작업은 시도할 때마다 두 배로 늘어나는 대기 시간(run_after)이 지난 뒤 다시 처리됩니다.
+    - 재시작: 처리 중에 프로세스가 종료된 작업은 점유 기간(lease)이 지나면 다시 처리됩니다.
+      Memo ID는 작업 생성 시 정해지므로 다시 처리해도 같은 Memo 노드에 MERGE됩니다.
+    SQLite 호출은 이벤트 루프를 막지 않도록 asyncio.to_thread로 실행합니다.
+    """
+
+    def __init__(self, sqlite_path: str, concurrency: int = 2, max_attempts: int = 3,
+                 lease_seconds: float = 300.0, idempotency_window: float = 24 * 60 * 60,
+                 retention: float = 7 * 24 * 60 * 60, poll_interval: float = 1.0,
+                 retry_base_delay: float = 5.0, retry_max_delay: float = 300.0):
+        """
+        Args:
+            sqlite_path: 작업을 저장할 SQLite 파일 경로
+            concurrency: 동시에 처리할 작업 수 (워커 수)
+            max_attempts: 작업당 최대 시도 횟수
+            lease_seconds: 워커가 작업을 점유하는 시간. 지나면 다른 워커가 다시 처리할 수 있음
+            idempotency_window: 같은 멱등성 키를 중복으로 간주하는 기간 (초)
+            retention: 완료된 작업을 보관하는 기간 (초)
+            poll_interval: 새 작업 알림이 없을 때 큐를 확인하는 주기 (초)
+            retry_base_delay: 첫 실패 후 다시 시도하기까지의 대기 시간 (초, 실패할 때마다 두 배)
+            retry_max_delay: 재시도 대기 시간의 상한 (초)
+        """
+        self.sqlite_path = sqlite_path
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.idempotency_window = idempotency_window
+        self.retention = retention
+        self.poll_interval = poll_interval
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._workers = []
+        self._wakeup = None
+        self._lock = threading.Lock()
+        self.stats = {"enqueued": 0, "deduplicated": 0, "succeeded": 0, "retried": 0, "failed": 0}
+
+        # 트랜잭션을 직접 관리 (BEGIN IMMEDIATE로 다른 프로세스와의 경쟁 방지)
+        self._db = sqlite3.connect(sqlite_path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS memo_jobs ("
+            "id TEXT PRIMARY KEY, idempotency_key TEXT NOT NULL, text TEXT NOT NULL, memo_id TEXT NOT NULL, "
+            "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, lease_expires_at REAL, run_after REAL)"
+        )
+        # run_after 열이 없던 이전 버전의 파일에 열 추가
+        columns = {row["name"] for row in self._db.execute("PRAGMA table_info(memo_jobs)")}
+        if "run_after" not in columns:
+            self._db.execute("ALTER TABLE memo_jobs ADD COLUMN run_after REAL")
+        self._db.execute("CREATE INDEX IF NOT EXISTS memo_jobs_idempotency ON memo_jobs (idempotency_key, created_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS memo_jobs_status ON memo_jobs (status, created_at)")
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    async def enqueue(self, text: str, idempotency_key: str = None):
+        """
+        메모 수집 작업을 큐에 추가합니다.
+
+        Args:
+            text: 메모 텍스트
+            idempotency_key: 클라이언트가 지정한 멱등성 키 (None이면 텍스트 해시 사용)
+
+        Returns:
+            (작업, 새로 생성되었는지 여부). 유효 기간 내에 같은 키의 작업이 있으면 (기존 작업, False)
+        """
+        job, created = await asyncio.to_thread(self._insert, text, idempotency_key)
+        self.stats["enqueued" if created else "deduplicated"] += 1
+        if created and self._wakeup is not None:
+            self._wakeup.set()
+        return job, created
+
+    def _insert(self, text: str, idempotency_key: str = None):
+        key = memo_idempotency_key(text, idempotency_key)
+        now = time.time()
+        with self._transaction():
+            row = self._db.execute(
+                "SELECT * FROM memo_jobs WHERE idempotency_key = ? AND created_at > ? AND status != ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (key, now - self.idempotency_window, FAILED),
+            ).fetchone()
+            if row is None:
+                job_id = uuid.uuid4().hex
+                memo_id = f"memo_{datetime.fromtimestamp(now).strftime('%Y%m%d_%H%M%S_%f')}"
+                self._db.execute(
+                    "INSERT INTO memo_jobs (id, idempotency_key, text, memo_id, status, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, key, text, memo_id, QUEUED, now, now),
+                )
+                row = self._db.execute("SELECT * FROM memo_jobs WHERE id = ?", (job_id,)).fetchone()
+                created = True
+            else:
+                created = False
+        return self._to_job(row), created
+
+    async def get(self, job_id: str):
+        """작업 상태를 조회합니다. 없으면 None을 반환합니다."""
+        return await asyncio.to_thread(self._get, job_id)
+
+    def _get(self, job_id: str):
+        with self._lock:
+            row = self._db.execute("SELECT * FROM memo_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def start(self, handler):
+        """
+        워커들을 시작합니다. 이벤트 루프 안에서 호출해야 합니다.
+
+        Args:
+            handler: 작업 딕셔너리(text, memo_id, created_at 포함)를 받아 결과 딕셔너리를 반환하는 코루틴 함수
+        """
+        self._prune()
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._worker(handler)) for _ in range(self.concurrency)]
+        logger.info(f"Memo job queue started with {self.concurrency} workers ({self.sqlite_path})")
+
+    @property
+    def running(self) -> bool:
+        """워커가 실행 중인지 여부"""
+        return bool(self._workers)
+
+    async def stop(self):
+        """워커들을 중지합니다. 처리 중이던 작업은 점유 기간이 지난 뒤 다시 처리됩니다."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _worker(self, handler):
+        while True:
+            self._wakeup.clear()
+            job = await asyncio.to_thread(self._claim)
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                result = await handler(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e.detail if isinstance(e, HTTPException) else str(e)
+                logger.error(f"Memo job {job['job_id']} failed (attempt {job['attempts']}): {error}", exc_info=True)
+                await asyncio.to_thread(self._fail, job, error)
+            else:
+                await asyncio.to_thread(self._complete, job, result)
+
+    def _claim(self):
+        """재시도 대기 시간이 지난 대기 작업이나 점유 기간이 지난 작업 중 가장 오래된 작업을 점유합니다."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "UPDATE memo_jobs SET status = ?, attempts = attempts + 1, updated_at = ?, lease_expires_at = ?, "
+                "run_after = NULL WHERE id = (SELECT id FROM memo_jobs "
+                "WHERE (status = ? AND (run_after IS NULL OR run_after <= ?)) OR (status = ? AND lease_expires_at < ?) "
+                "ORDER BY created_at LIMIT 1) RETURNING *",
+                (RUNNING, now, now + self.lease_seconds, QUEUED, now, RUNNING, now),
+            ).fetchone()
+        return self._to_job(row) if row else None
+
+    def _complete(self, job: dict, result: dict):
+        with self._lock:
+            self._db.execute(
+                "UPDATE memo_jobs SET status = ?, result = ?, error = NULL, updated_at = ?, lease_expires_at = NULL "
+                "WHERE id = ?",
+                (SUCCEEDED, json.dumps(result, ensure_ascii=False, default=str), time.time(), job["job_id"]),
+            )
+        self.stats["succeeded"] += 1
+
+    def _fail(self, job: dict, error: str):
+        """
+        최대 시도 횟수 전이면 지수적으로 늘어나는 대기 시간 뒤에 다시 처리되도록 대기 상태로, 아니면 실패로 기록합니다.
+        """
+        now = time.time()
+        if job["attempts"] < self.max_attempts:
+            status = QUEUED
+            run_after = now + min(self.retry_max_delay, self.retry_base_delay * 2 ** (job["attempts"] - 1))
+        else:
+            status, run_after = FAILED, None
+        with self._lock:
+            self._db.execute(
+                "UPDATE memo_jobs SET status = ?, error = ?, updated_at = ?, lease_expires_at = NULL, run_after = ? "
+                "WHERE id = ?",
+                (status, error, now, run_after, job["job_id"]),
+            )
+        self.stats["retried" if status == QUEUED else "failed"] += 1
+
+    def _prune(self):
+        """보관 기간이 지난 완료/실패 작업을 삭제합니다."""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM memo_jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (SUCCEEDED, FAILED, time.time() - self.retention),
+            )
+
+    def get_metrics(self) -> dict:
+        """상태별 작업 수와 처리 통계를 반환합니다."""
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM memo_jobs GROUP BY status").fetchall())
+        return {
+            "workers": len(self._workers),
+            "jobs": {status: counts.get(status, 0) for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)},
+            **self.stats,
+        }
+
+    def collect_metrics(self):
+        """/metrics 출력용 수집기입니다. 상태별 작업 수는 SQLite를 조회하므로 요청 경로가 아닌 /metrics에서만 읽습니다."""
+        queue_metrics = self.get_metrics()
+        yield "memo_queue_workers", "Memo queue worker tasks.", "gauge", {}, queue_metrics["workers"]
+        for status, count in queue_metrics["jobs"].items():
+            yield "memo_queue_jobs", "Memo jobs by status.", "gauge", {"status": status}, count
+        for key in self.stats:
+            yield f"memo_queue_{key}_total", f"Memo jobs {key} since start.", "counter", {}, self.stats[key]
+
+    @staticmethod
+    def _to_job(row) -> dict:
+        return {
+            "job_id": row["id"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "memo_id": row["memo_id"],
+            "text": row["text"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "run_after": row["run_after"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+        }
+
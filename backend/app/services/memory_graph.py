@@ -0,0 +1,332 @@
+"""
+프로세스 메모리에 그래프를 저장하는 GraphStore 구현입니다. (GRAPH_BACKEND=memory)
+
+Neo4j 없이 API 전체를 실행하는 테스트, 부하 테스트, 벤치마크용이며 데이터는 프로세스가 끝나면 사라집니다.
+- 노드: 레이블별 {이름: 속성} 딕셔너리 (Neo4j의 레이블별 name 유니크 제약조건과 같은 조회)
+- 관계: 노드 키별 나가는/들어오는 (관계 타입, 상대 노드 키) 집합 (인접 리스트)
+- 메모: (timestamp, id) 순으로 정렬된 목록 (timestamp 인덱스의 keyset 페이지네이션과 같은 순서)
+- 부분 이름 검색: EntityNameIndex (Neo4jService의 프로세스 내 인덱스와 같은 순위)
+
+모든 변경은 await 없이 이루어지므로 이벤트 루프 안에서 원자적입니다.
+"""
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime, timezone
+from app.core import metrics
+from app.core.logger import get_logger
+from app.models.graph_models import ENTITY_LABELS, RELATIONSHIP_TYPE_PATTERN
+from app.services.entity_matcher import EntityNameIndex, has_contact_info
+from app.services.graph_store import GraphStore, encode_memo_cursor, decode_memo_cursor
+
+logger = get_logger(__name__)
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """ISO 형식 시각을 datetime으로 변환합니다. 시간대가 없으면 Neo4j datetime()처럼 UTC로 간주합니다."""
+    timestamp = datetime.fromisoformat(value)
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+
+
+class InMemoryGraphStore(GraphStore):
+    """
+    인접 딕셔너리와 이름 인덱스로 그래프를 메모리에 저장합니다.
+    노드 키는 엔티티는 (레이블, 이름), 메모는 ("Memo", id)입니다.
+    """
+
+    def __init__(self):
+        self.connected = False
+        self.nodes = {label: {} for label in ENTITY_LABELS}  # 레이블 -> {이름: 속성}
+        self.memos = {}  # id -> {"id", "text", "timestamp", "business_related"}
+        self.memo_order = []  # (timestamp, id) 오름차순
+        self.out_edges = defaultdict(set)  # 노드 키 -> {(관계 타입, 대상 노드 키)}
+        self.in_edges = defaultdict(set)  # 노드 키 -> {(관계 타입, 시작 노드 키)}
+        self.relationship_count = 0
+        self.name_index = EntityNameIndex()
+        self.graph_revision = 0
+        self.instance_id = uuid.uuid4().hex
+        self._sorted_names = {}  # 레이블 -> (graph_revision, 정렬된 이름 목록) (scan_entities 페이지용)
+
+    async def connect(self):
+        self.connected = True
+        logger.info("Using in-memory graph store (data is not persisted).")
+
+    async def close(self):
+        self.connected = False
+
+    async def check_connectivity(self, timeout: float) -> bool:
+        return self.connected
+
+    def _merge_node(self, label: str, name: str, properties: dict = None):
+        """노드를 생성하거나 속성을 합칩니다. (SET n += $properties와 같이 None 값은 속성을 삭제) 생성 여부를 반환합니다."""
+        nodes = self.nodes[label]
+        created = name not in nodes
+        node = nodes.setdefault(name, {})
+        for key, value in (properties or {}).items():
+            if value is None:
+                node.pop(key, None)
+            else:
+                node[key] = value
+        self.name_index.add(label, name, label == "Person" and has_contact_info(node))
+        return created
+
+    def _merge_edge(self, from_key: tuple, relationship_type: str, to_key: tuple) -> bool:
+        """관계가 없으면 추가합니다. 생성 여부를 반환합니다."""
+        edge = (relationship_type, to_key)
+        if edge in self.out_edges[from_key]:
+            return False
+        self.out_edges[from_key].add(edge)
+        self.in_edges[to_key].add((relationship_type, from_key))
+        self.relationship_count += 1
+        return True
+
+    def _merge_memo(self, memo_id: str, text: str, timestamp: str, business_related: bool) -> bool:
+        """Memo를 생성합니다. 이미 있으면 그대로 둡니다 (ON CREATE SET). 생성 여부를 반환합니다."""
+        if memo_id in self.memos:
+            return False
+        parsed = _parse_timestamp(timestamp)
+        self.memos[memo_id] = {"id": memo_id, "text": text, "timestamp": parsed, "business_related": business_related}
+        insort(self.memo_order, (parsed, memo_id))
+        return True
+
+    def _find_entity(self, name: str, label: str = None):
+        """이름으로 엔티티 노드 키를 찾습니다. 레이블을 모르면 ENTITY_LABELS 순서로 첫 번째 일치 노드를 사용합니다."""
+        for candidate in ((label,) if label else ENTITY_LABELS):
+            if name in self.nodes.get(candidate, ()):
+                return candidate, name
+        return None
+
+    def _node(self, label: str, name: str) -> dict:
+        return {"name": name, **self.nodes[label][name]}
+
+    async def _create_entity(self, label: str, name: str, properties: dict = None):
+        self._merge_node(label, name, properties)
+        self.graph_revision += 1
+        return self._node(label, name)
+
+    async def create_person(self, name: str, properties: dict = None):
+        return await self._create_entity("Person", name, properties)
+
+    async def create_company(self, name: str, properties: dict = None):
+        return await self._create_entity("Company", name, properties)
+
+    async def create_event(self, name: str, properties: dict = None):
+        return await self._create_entity("Event", name, properties)
+
+    async def create_project(self, name: str, properties: dict = None):
+        return await self._create_entity("Project", name, properties)
+
+    async def create_memo(self, memo_id: str, text: str, timestamp: str, business_related: bool, entities: list = None):
+        self._merge_memo(memo_id, text, timestamp, business_related)
+        self.graph_revision += 1
+        memo = self.memos[memo_id]
+        return {**memo, "timestamp": memo["timestamp"].isoformat()}
+
+    async def create_relationship(self, from_node_label: str, from_node_name: str, to_node_label: str,
+                                  to_node_name: str, relationship_type: str):
+        from_key = self._find_entity(from_node_name, from_node_label)
+        to_key = self._find_entity(to_node_name, to_node_label)
+        if from_key and to_key:
+            self._merge_edge(from_key, relationship_type, to_key)
+        self.graph_revision += 1
+
+    async def link_memo_to_entity(self, memo_id: str, entity_type: str, entity_name: str):
+        entity_key = self._find_entity(entity_name, entity_type)
+        if memo_id in self.memos and entity_key:
+            self._merge_edge(entity_key, "MENTIONED_IN", ("Memo", memo_id))
+        self.graph_revision += 1
+
+    async def get_person_phone(self, name: str):
+        person = self.nodes["Person"].get(name)
+        return person.get("phone") if person else None
+
+    async def get_company_people(self, company_name: str):
+        return [
+            {"name": name, "title": self.nodes["Person"][name].get("title")}
+            for rel_type, (label, name) in self.in_edges.get(("Company", company_name), ())
+            if rel_type == "WORKS_AT" and label == "Person"
+        ]
+
+    async def list_memos(self, limit: int = 10, cursor: str = None, since: str = None, until: str = None,
+                         business_related: bool = None, include_entities: bool = True) -> dict:
+        """
+        메모 목록을 시간 역순으로 한 페이지씩 반환합니다. (Neo4jService.list_memos와 같은 커서 형식)
+        정렬된 목록에서 커서/until 위치를 이분 탐색한 뒤 거꾸로 limit + 1개까지만 읽습니다.
+        """
+        end = len(self.memo_order)
+        if cursor:
+            cursor_timestamp, cursor_id = decode_memo_cursor(cursor)
+            end = min(end, bisect_left(self.memo_order, (_parse_timestamp(cursor_timestamp), cursor_id)))
+        if until:
+            end = min(end, bisect_left(self.memo_order, (_parse_timestamp(until),)))
+        since_timestamp = _parse_timestamp(since) if since else None
+
+        memos = []
+        for index in range(end - 1, -1, -1):
+            timestamp, memo_id = self.memo_order[index]
+            if since_timestamp and timestamp < since_timestamp:
+                break
+            memo = self.memos[memo_id]
+            if business_related is not None and memo["business_related"] != business_related:
+                continue
+            memos.append({
+                **memo,
+                "timestamp": timestamp.isoformat(),
+                "entities": [
+                    {"type": label, "name": name}
+                    for rel_type, (label, name) in self.in_edges.get(("Memo", memo_id), ())
+                    if rel_type == "MENTIONED_IN"
+                ] if include_entities else [],
+            })
+            if len(memos) > limit:
+                break
+
+        next_cursor = None
+        if len(memos) > limit:
+            memos = memos[:limit]
+            next_cursor = encode_memo_cursor(memos[-1]["timestamp"], memos[-1]["id"])
+        return {"memos": memos, "next_cursor": next_cursor}
+
+    async def get_graph_version(self) -> str:
+        counts = [f"{label}={len(self.nodes[label])}" for label in ENTITY_LABELS]
+        counts += [f"Memo={len(self.memos)}", f"relationships={self.relationship_count}"]
+        return f"{self.instance_id}:{self.graph_revision}:{','.join(counts)}"
+
+    async def find_node_label(self, name: str):
+        return self.name_index.find_node_label(name)
+
+    async def find_best_matching_person(self, partial_name: str) -> str:
+        best_match = self.name_index.find_best_matching_person(partial_name)
+        if best_match != partial_name:
+            logger.info(f"Name normalization: '{partial_name}' -> '{best_match}'")
+        return best_match
+
+    async def resolve_entity_names(self, entities: list, names: list = ()) -> dict:
+        resolved = self.name_index.resolve_names(entities, names)
+        for original, match in resolved.items():
+            if match["name"] != original:
+                logger.info(f"Name normalization: '{original}' -> '{match['name']}' ({match['label']})")
+        return resolved
+
+    async def find_mentions(self, text: str) -> list:
+        return self.name_index.find_mentions(text)
+
+    async def create_relationship_by_names(self, from_name: str, to_name: str, relationship_type: str):
+        from_label = self.name_index.find_node_label(from_name)
+        to_label = self.name_index.find_node_label(to_name)
+        from_key = self._find_entity(from_name, from_label) if from_label else None
+        to_key = self._find_entity(to_name, to_label) if to_label else None
+        if not from_key or not to_key:
+            logger.warning(f"Could not find nodes: {from_name} ({from_label}) or {to_name} ({to_label})")
+            return False
+
+        self._merge_edge(from_key, relationship_type, to_key)
+        self.graph_revision += 1
+        logger.info(f"Created relationship: ({from_name})-[:{relationship_type}]->({to_name})")
+        return True
+
+    async def save_memo_graph(self, memo: dict, entities: list, relationships: list, labels: dict = None):
+        """Neo4jService.save_memo_graph와 같은 규칙으로 저장합니다. (지원하지 않는 레이블/관계 타입은 건너뜀)"""
+        nodes_created = relationships_created = 0
+        with metrics.stage("graph_write"):
+            nodes_created += self._merge_memo(memo["id"], memo["text"], memo["timestamp"], memo["business_related"])
+            memo_key = ("Memo", memo["id"])
+
+            entity_labels = {}
+            for entity in entities:
+                label, name = entity.get("type"), entity.get("name")
+                if label not in ENTITY_LABELS or not name:
+                    logger.warning(f"Skipping entity with unsupported type or empty name: {entity}")
+                    continue
+                entity_labels.setdefault(name, label)
+                nodes_created += self._merge_node(label, name, entity.get("properties"))
+                relationships_created += self._merge_edge((label, name), "MENTIONED_IN", memo_key)
+
+            endpoint_labels = {**(labels or {}), **entity_labels}
+            for relationship in relationships:
+                from_name, to_name = relationship.get("from"), relationship.get("to")
+                rel_type = relationship.get("type")
+                if not from_name or not to_name or not rel_type:
+                    continue
+                if not RELATIONSHIP_TYPE_PATTERN.match(rel_type):
+                    logger.warning(f"Skipping relationship with invalid type: {relationship}")
+                    continue
+                from_key = self._find_entity(from_name, endpoint_labels.get(from_name))
+                to_key = self._find_entity(to_name, endpoint_labels.get(to_name))
+                if from_key and to_key:
+                    relationships_created += self._merge_edge(from_key, rel_type, to_key)
+            self.graph_revision += 1
+
+        logger.info(
+            f"Saved memo graph {memo['id']}: {nodes_created} nodes, {relationships_created} relationships created"
+        )
+        return {"nodes_created": nodes_created, "relationships_created": relationships_created}
+
+    async def save_contacts(self, contacts: list):
+        nodes_created = relationships_created = 0
+        with metrics.stage("graph_write"):
+            for contact in contacts:
+                nodes_created += self._merge_node("Person", contact["name"], contact["properties"])
+                if contact.get("company"):
+                    nodes_created += self._merge_node("Company", contact["company"])
+                    relationships_created += self._merge_edge(
+                        ("Person", contact["name"]), "WORKS_AT", ("Company", contact["company"])
+                    )
+            self.graph_revision += 1
+
+        logger.info(
+            f"Saved {len(contacts)} contacts: {nodes_created} nodes, {relationships_created} relationships created"
+        )
+        return {"nodes_created": nodes_created, "relationships_created": relationships_created}
+
+    async def scan_entities(self, label: str, after: str = None, limit: int = 1000) -> list:
+        """이름순으로 정렬한 목록에서 after 다음 위치를 이분 탐색해 한 페이지를 읽습니다. (그래프가 바뀌면 다시 정렬)"""
+        cached = self._sorted_names.get(label)
+        if cached is None or cached[0] != self.graph_revision:
+            cached = (self.graph_revision, sorted(self.nodes[label]))
+            self._sorted_names[label] = cached
+        names = cached[1]
+        start = bisect_right(names, after) if after is not None else 0
+        page = []
+        for name in names[start:start + limit]:
+            key = (label, name)
+            page.append({
+                "name": name,
+                "properties": dict(self.nodes[label][name]),
+                "companies": [
+                    target[1] for rel_type, target in self.out_edges.get(key, ())
+                    if rel_type == "WORKS_AT" and target[0] == "Company"
+                ],
+                "degree": len(self.out_edges.get(key, ())) + len(self.in_edges.get(key, ())),
+            })
+        return page
+
+    async def merge_entities(self, label: str, merges: list) -> dict:
+        """Neo4jService.merge_entities와 같은 규칙으로 병합합니다. (남길 노드와 중복 노드 사이의 관계는 삭제)"""
+        nodes = self.nodes[label]
+        merged = relationships_moved = 0
+        with metrics.stage("graph_write"):
+            for merge in merges:
+                keep, duplicate = merge["keep"], merge["duplicate"]
+                if keep == duplicate or keep not in nodes or duplicate not in nodes:
+                    continue
+                keep_key, duplicate_key = (label, keep), (label, duplicate)
+                for rel_type, target in self.out_edges.pop(duplicate_key, set()):
+                    self.in_edges[target].discard((rel_type, duplicate_key))
+                    self.relationship_count -= 1
+                    if target != keep_key:
+                        relationships_moved += self._merge_edge(keep_key, rel_type, target)
+                for rel_type, source in self.in_edges.pop(duplicate_key, set()):
+                    self.out_edges[source].discard((rel_type, duplicate_key))
+                    self.relationship_count -= 1
+                    if source != keep_key:
+                        relationships_moved += self._merge_edge(source, rel_type, keep_key)
+
+                self._merge_node(label, keep, merge.get("properties"))
+                del nodes[duplicate]
+                self.name_index.remove(label, duplicate, keep)
+                merged += 1
+            self.graph_revision += 1
+
+        logger.info(f"Merged {merged} duplicate {label} nodes: {relationships_moved} relationships moved")
+        return {"merged": merged, "relationships_moved": relationships_moved}
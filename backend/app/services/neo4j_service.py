@@ -1,108 +1,293 @@
 import os
-from neo4j import GraphDatabase
+import re
+import asyncio
+from neo4j import AsyncGraphDatabase, Query, READ_ACCESS, WRITE_ACCESS, unit_of_work
+from neo4j.exceptions import ClientError
 from dotenv import load_dotenv
 from tenacity import retry, wait_fixed, stop_after_attempt, before_log, after_log
 import logging
+from app.core import config, metrics
+from app.core.logger import get_logger
+from app.models.graph_models import ENTITY_LABELS, RELATIONSHIP_TYPE_PATTERN
+from app.services.graph_store import GraphStore, encode_memo_cursor, decode_memo_cursor
+from app.services.entity_matcher import EntityNameIndex, clean_person_name, company_name_variants, has_contact_info
 
 load_dotenv()
 
-# 로깅 설정
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
-
-
-class Neo4jService:
+logger = get_logger(__name__)
+
+# 그래프 스키마 버전. SCHEMA_STATEMENTS를 변경하면 값을 올려야 기존 데이터베이스에도 적용됨
+SCHEMA_VERSION = 2
+
+# 스키마 부트스트랩 구문 (구문, 실패 시 대체 구문). 모두 IF NOT EXISTS로 멱등
+# 기존 데이터에 중복 이름이 있어 유니크 제약조건을 만들 수 없으면 일반 범위 인덱스로 대체
+SCHEMA_STATEMENTS = [
+    ("CREATE CONSTRAINT person_name IF NOT EXISTS FOR (p:Person) REQUIRE p.name IS UNIQUE",
+     "CREATE INDEX person_name_range IF NOT EXISTS FOR (p:Person) ON (p.name)"),
+    ("CREATE CONSTRAINT company_name IF NOT EXISTS FOR (c:Company) REQUIRE c.name IS UNIQUE",
+     "CREATE INDEX company_name_range IF NOT EXISTS FOR (c:Company) ON (c.name)"),
+    ("CREATE CONSTRAINT event_name IF NOT EXISTS FOR (e:Event) REQUIRE e.name IS UNIQUE",
+     "CREATE INDEX event_name_range IF NOT EXISTS FOR (e:Event) ON (e.name)"),
+    ("CREATE CONSTRAINT project_name IF NOT EXISTS FOR (p:Project) REQUIRE p.name IS UNIQUE",
+     "CREATE INDEX project_name_range IF NOT EXISTS FOR (p:Project) ON (p.name)"),
+    ("CREATE CONSTRAINT memo_id IF NOT EXISTS FOR (m:Memo) REQUIRE m.id IS UNIQUE",
+     "CREATE INDEX memo_id_range IF NOT EXISTS FOR (m:Memo) ON (m.id)"),
+    # 메모 목록의 ORDER BY m.timestamp DESC와 기간 필터를 인덱스 순서로 처리 (정렬 없이 LIMIT만큼만 읽음)
+    ("CREATE INDEX memo_timestamp IF NOT EXISTS FOR (m:Memo) ON (m.timestamp)", None),
+    # 부분 이름 검색용 전문 검색 인덱스 (CJK 분석기로 한국어를 bigram 단위로 색인)
+    ("CREATE FULLTEXT INDEX entity_name_fulltext IF NOT EXISTS FOR (n:Person|Company|Event|Project) ON EACH [n.name] "
+     "OPTIONS {indexConfig: {`fulltext.analyzer`: 'cjk'}}", None),
+]
+
+# 이름으로 레이블을 찾는 쿼리. 레이블별 인덱스를 각각 조회하도록 레이블마다 MATCH를 나눔
+LABEL_LOOKUP_QUERY = (
+    "CALL { "
+    + " UNION ALL ".join(f"MATCH (n:{label} {{name: $name}}) RETURN '{label}' AS label" for label in ENTITY_LABELS)
+    + " } RETURN label LIMIT 1"
+)
+
+# 페이로드 하나의 이름들을 한 번에 정규화 (이름 인덱스를 사용하지 않을 때)
+# 행마다 kind에 해당하는 UNION 분기 하나만 결과를 내며, 찾지 못한 행은 결과에서 빠짐
+RESOLVE_NAMES_QUERY = (
+    "UNWIND $rows AS row "
+    "CALL { "
+    # Person: 부분 이름 매칭 (연락처 정보가 있는 이름, 긴 이름 우선)
+    "WITH row WITH row WHERE row.kind = 'person' "
+    "CALL db.index.fulltext.queryNodes('entity_name_fulltext', row.search) YIELD node AS n "
+    "WITH row, n WHERE n:Person AND (n.name CONTAINS row.clean OR row.clean CONTAINS n.name) "
+    "WITH n, coalesce(n.phone, '') <> '' OR coalesce(n.email, '') <> '' OR coalesce(n.title, '') <> '' AS has_contact "
+    "ORDER BY has_contact DESC, size(n.name) DESC, n.name "
+    "RETURN n.name AS name, 'Person' AS label LIMIT 1 "
+    "UNION "
+    # Company: 법인 표기가 다른 같은 회사 (원래 표기 우선)
+    "WITH row WITH row WHERE row.kind = 'company' "
+    "MATCH (n:Company) WHERE n.name IN row.variants "
+    "WITH n, n.name = row.name AS exact ORDER BY exact DESC, n.name "
+    "RETURN n.name AS name, 'Company' AS label LIMIT 1 "
+    "UNION "
+    # 관계 끝점: 정확히 일치하는 이름의 레이블, 없으면 같은 회사의 다른 표기
+    "WITH row WITH row WHERE row.kind = 'endpoint' "
+    "CALL { "
+    + " UNION ALL ".join(
+        f"WITH row MATCH (n:{label} {{name: row.name}}) RETURN n.name AS name, '{label}' AS label, {priority} AS priority"
+        for priority, label in enumerate(ENTITY_LABELS)
+    )
+    + " UNION ALL WITH row MATCH (n:Company) WHERE n.name IN row.variants "
+    f"RETURN n.name AS name, 'Company' AS label, {len(ENTITY_LABELS)} AS priority }} "
+    "WITH name, label, priority ORDER BY priority, name "
+    "RETURN name, label LIMIT 1 "
+    "} "
+    "RETURN row.name AS original, name, label"
+)
+
+# 전문 검색 쿼리에서 이스케이프해야 하는 Lucene 특수 문자
+LUCENE_SPECIAL_CHARACTERS = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def fulltext_search_term(name: str) -> str:
+    """이름을 Lucene 특수 문자를 이스케이프한 전문 검색어로 변환합니다."""
+    return LUCENE_SPECIAL_CHARACTERS.sub(r"\\\1", name)
+
+
+class Neo4jService(GraphStore):
     """
     Neo4j 그래프 데이터베이스와의 상호작용을 관리하는 서비스 클래스입니다.
     연결, CRUD 작업, 쿼리 실행 등의 기능을 제공합니다.
+    비동기 드라이버(AsyncGraphDatabase)를 사용하므로 모든 메서드는 이벤트 루프를 막지 않습니다.
     """
 
+    def __init__(self):
+        """연결 정보를 로드합니다. 실제 연결은 connect()에서 수행합니다."""
+        self.uri = os.getenv("NEO4J_URI", "bolt://neo4j:7687")  # Docker Compose에서 neo4j 서비스명 기본값
+        self.user = os.getenv("NEO4J_USER", "neo4j")
+        self.password = os.getenv("NEO4J_PASSWORD", "password")
+        self.driver = None
+        # connect()가 연결 확인과 스키마 생성까지 마쳤는지 여부 (/ready와 요청 의존성에서 확인)
+        self.connected = False
+        # 모든 세션이 공유하는 북마크 관리자 (이 프로세스에서 커밋한 쓰기를 이후 읽기가 항상 보도록 보장)
+        self.bookmark_manager = AsyncGraphDatabase.bookmark_manager()
+
+        # 이름 부분 매칭을 위한 프로세스 내 인덱스 (CONTAINS 전체 스캔 대체)
+        self.entity_index = None
+        if config.ENTITY_INDEX_ENABLED:
+            self.entity_index = EntityNameIndex(refresh_interval=config.ENTITY_INDEX_REFRESH_SECONDS)
+
     @retry(wait=wait_fixed(2), stop=stop_after_attempt(10),
            before=before_log(logger, logging.INFO),
            after=after_log(logger, logging.INFO))
-    def __init__(self):
+    async def connect(self):
         """Neo4j 데이터베이스 연결을 초기화하고 제약조건을 생성합니다."""
-        uri = os.getenv("NEO4J_URI", "bolt://neo4j:7687")  # Docker Compose에서 neo4j 서비스명 기본값
-        user = os.getenv("NEO4J_USER", "neo4j")
-        password = os.getenv("NEO4J_PASSWORD", "password")
-
-        logger.info(f"Attempting to connect to Neo4j at {uri} as user {user}")
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
-        self.driver.verify_connectivity()  # 연결 확인
+        logger.info(f"Attempting to connect to Neo4j at {self.uri} as user {self.user}")
+        if self.driver is None:
+            self.driver = AsyncGraphDatabase.driver(
+                self.uri,
+                auth=(self.user, self.password),
+                max_connection_pool_size=config.NEO4J_MAX_CONNECTION_POOL_SIZE,
+                connection_acquisition_timeout=config.NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+                max_transaction_retry_time=config.NEO4J_MAX_TRANSACTION_RETRY_TIME,
+            )
+        await self.driver.verify_connectivity()  # 연결 확인
         logger.info("Successfully connected to Neo4j.")
-        self._create_constraints()
+        await self._ensure_schema()
+        self.connected = True
 
-    def close(self):
+    async def close(self):
         """데이터베이스 연결을 종료합니다."""
-        self.driver.close()
+        self.connected = False
+        if self.entity_index:
+            self.entity_index.cancel_refresh()
+        if self.driver is not None:
+            await self.driver.close()
+            self.driver = None
+
+    async def check_connectivity(self, timeout: float) -> bool:
+        """연결된 상태에서 timeout 안에 서버에 닿을 수 있는지 확인합니다. (준비 상태 확인용, 재시도 없음)"""
+        if not self.connected:
+            return False
+        try:
+            await asyncio.wait_for(self.driver.verify_connectivity(), timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"Neo4j connectivity check failed: {e}")
+            return False
 
-    def _create_constraints(self):
-        """Person과 Company 노드의 name 속성에 유니크 제약조건을 생성합니다."""
-        with self.driver.session() as session:
-            session.run("CREATE CONSTRAINT person_name IF NOT EXISTS FOR (p:Person) REQUIRE p.name IS UNIQUE")
-            session.run("CREATE CONSTRAINT company_name IF NOT EXISTS FOR (c:Company) REQUIRE c.name IS UNIQUE")
+    def session(self, read: bool = False, **kwargs):
+        """
+        세션을 엽니다. neo4j:// URI로 클러스터에 연결하면 읽기 세션은 읽기 멤버로, 쓰기 세션은 리더로 라우팅됩니다.
+        모든 세션이 같은 북마크 관리자를 공유하므로 쓰기 이후의 읽기는 다른 멤버에서도 그 쓰기를 봅니다.
 
-    def create_person(self, name: str, properties: dict = None):
+        Args:
+            read: 읽기 전용 세션 여부
+            kwargs: driver.session()에 전달할 추가 설정 (fetch_size 등)
         """
-        Person 노드를 생성하거나 업데이트합니다.
-        이미 존재하는 경우 속성을 업데이트합니다.
+        return self.driver.session(
+            default_access_mode=READ_ACCESS if read else WRITE_ACCESS,
+            bookmark_manager=self.bookmark_manager,
+            **kwargs,
+        )
+
+    async def _read(self, query: str, parameters: dict = None, template: str = "adhoc") -> list:
+        """
+        읽기 트랜잭션(execute_read)으로 쿼리를 실행하고 레코드 목록을 반환합니다. 일시적 오류는 드라이버가 재시도합니다.
+        소요 시간은 template 이름으로 neo4j_query_seconds에 기록됩니다 (재시도 포함).
+        """
+        async def work(tx):
+            result = await tx.run(query, parameters)
+            return [record async for record in result]
+
+        with metrics.neo4j_query_seconds.time(template, "read"):
+            async with self.session(read=True) as session:
+                return await session.execute_read(work)
+
+    async def _write(self, query: str, parameters: dict = None, template: str = "adhoc"):
+        """
+        쓰기 트랜잭션(execute_write)으로 쿼리를 실행합니다. 일시적 오류는 드라이버가 재시도합니다.
+        소요 시간은 template 이름으로 neo4j_query_seconds에 기록됩니다 (재시도 포함).
+
+        Returns:
+            (레코드 목록, 변경 카운터)
+        """
+        async def work(tx):
+            result = await tx.run(query, parameters)
+            records = [record async for record in result]
+            summary = await result.consume()
+            return records, summary.counters
+
+        with metrics.neo4j_query_seconds.time(template, "write"):
+            async with self.session() as session:
+                return await session.execute_write(work)
+
+    async def _ensure_schema(self):
+        """
+        엔티티/메모 조회에 필요한 제약조건과 인덱스를 생성합니다.
+        데이터베이스에 기록된 스키마 버전이 최신이면 조회 한 번으로 끝나므로 시작 시간이 늘지 않습니다.
         """
-        with self.driver.session() as session:
-            query = (
-                "MERGE (p:Person {name: $name}) "
-                "ON CREATE SET p += $properties "
-                "ON MATCH SET p += $properties "
-                "RETURN p"
+        # 스키마 구문은 관리형 트랜잭션에서 실행할 수 없으므로 쓰기 세션의 자동 커밋으로 실행
+        async with self.session() as session:
+            result = await session.run("MATCH (s:_SchemaVersion {name: 'graph'}) RETURN s.version AS version")
+            record = await result.single()
+            if record and record["version"] >= SCHEMA_VERSION:
+                logger.info(f"Graph schema is up to date (version {record['version']})")
+                return
+
+            for statement, fallback in SCHEMA_STATEMENTS:
+                try:
+                    await (await session.run(statement)).consume()
+                except ClientError as e:
+                    if not fallback:
+                        raise
+                    logger.warning(f"Schema statement failed, using fallback index: {statement} ({e.message})")
+                    await (await session.run(fallback)).consume()
+
+            # 인덱스가 채워질 때까지 기다린 뒤 버전을 기록
+            await (await session.run("CALL db.awaitIndexes(300)")).consume()
+            await session.run(
+                "MERGE (s:_SchemaVersion {name: 'graph'}) SET s.version = $version, s.updated_at = datetime()",
+                version=SCHEMA_VERSION
             )
-            return session.run(query, name=name, properties=properties).single().get("p")
+            logger.info(f"Graph schema bootstrapped to version {SCHEMA_VERSION}")
 
-    def create_company(self, name: str, properties: dict = None):
+    async def create_person(self, name: str, properties: dict = None):
+        """
+        Person 노드를 생성하거나 업데이트합니다.
+        이미 존재하는 경우 속성을 업데이트합니다.
+        """
+        query = (
+            "MERGE (p:Person {name: $name}) "
+            "ON CREATE SET p += $properties "
+            "ON MATCH SET p += $properties "
+            "RETURN p"
+        )
+        records, _ = await self._write(query, {"name": name, "properties": properties}, "create_person")
+        self._index_entity("Person", name, properties)
+        return records[0].get("p")
+
+    async def create_company(self, name: str, properties: dict = None):
         """
         Company 노드를 생성하거나 업데이트합니다.
         이미 존재하는 경우 속성을 업데이트합니다.
         """
-        with self.driver.session() as session:
-            query = (
-                "MERGE (c:Company {name: $name}) "
-                "ON CREATE SET c += $properties "
-                "ON MATCH SET c += $properties "
-                "RETURN c"
-            )
-            return session.run(query, name=name, properties=properties).single().get("c")
-
-    def create_event(self, name: str, properties: dict = None):
+        query = (
+            "MERGE (c:Company {name: $name}) "
+            "ON CREATE SET c += $properties "
+            "ON MATCH SET c += $properties "
+            "RETURN c"
+        )
+        records, _ = await self._write(query, {"name": name, "properties": properties}, "create_company")
+        self._index_entity("Company", name, properties)
+        return records[0].get("c")
+
+    async def create_event(self, name: str, properties: dict = None):
         """
         Event 노드를 생성하거나 업데이트합니다.
         이미 존재하는 경우 속성을 업데이트합니다.
         """
-        with self.driver.session() as session:
-            query = (
-                "MERGE (e:Event {name: $name}) "
-                "ON CREATE SET e += $properties "
-                "ON MATCH SET e += $properties "
-                "RETURN e"
-            )
-            return session.run(query, name=name, properties=properties).single().get("e")
-
-    def create_project(self, name: str, properties: dict = None):
+        query = (
+            "MERGE (e:Event {name: $name}) "
+            "ON CREATE SET e += $properties "
+            "ON MATCH SET e += $properties "
+            "RETURN e"
+        )
+        records, _ = await self._write(query, {"name": name, "properties": properties}, "create_event")
+        self._index_entity("Event", name, properties)
+        return records[0].get("e")
+
+    async def create_project(self, name: str, properties: dict = None):
         """
         Project 노드를 생성하거나 업데이트합니다.
         이미 존재하는 경우 속성을 업데이트합니다.
         """
-        with self.driver.session() as session:
-            query = (
-                "MERGE (p:Project {name: $name}) "
-                "ON CREATE SET p += $properties "
-                "ON MATCH SET p += $properties "
-                "RETURN p"
-            )
-            return session.run(query, name=name, properties=properties).single().get("p")
-
-    def create_memo(self, memo_id: str, text: str, timestamp: str, business_related: bool, entities: list = None):
+        query = (
+            "MERGE (p:Project {name: $name}) "
+            "ON CREATE SET p += $properties "
+            "ON MATCH SET p += $properties "
+            "RETURN p"
+        )
+        records, _ = await self._write(query, {"name": name, "properties": properties}, "create_project")
+        self._index_entity("Project", name, properties)
+        return records[0].get("p")
+
+    async def create_memo(self, memo_id: str, text: str, timestamp: str, business_related: bool, entities: list = None):
         """
         Memo 노드를 생성합니다.
 
@@ -113,15 +298,18 @@ class Neo4jService:
             business_related: 비즈니스 관련 여부
             entities: 메모에 포함된 엔티티 목록 (선택)
         """
-        with self.driver.session() as session:
-            query = (
-                "MERGE (m:Memo {id: $memo_id}) "
-                "ON CREATE SET m.text = $text, m.timestamp = datetime($timestamp), m.business_related = $business_related "
-                "RETURN m"
-            )
-            return session.run(query, memo_id=memo_id, text=text, timestamp=timestamp, business_related=business_related).single().get("m")
-
-    def create_relationship(self, from_node_label: str, from_node_name: str, to_node_label: str, to_node_name: str, relationship_type: str):
+        query = (
+            "MERGE (m:Memo {id: $memo_id}) "
+            "ON CREATE SET m.text = $text, m.timestamp = datetime($timestamp), m.business_related = $business_related "
+            "RETURN m"
+        )
+        records, _ = await self._write(
+            query, {"memo_id": memo_id, "text": text, "timestamp": timestamp, "business_related": business_related},
+            "create_memo",
+        )
+        return records[0].get("m")
+
+    async def create_relationship(self, from_node_label: str, from_node_name: str, to_node_label: str, to_node_name: str, relationship_type: str):
         """
         두 노드 간 관계를 생성합니다.
 
@@ -132,14 +320,13 @@ class Neo4jService:
             to_node_name: 대상 노드의 name 속성값
             relationship_type: 관계 타입 (예: WORKS_AT, ATTENDED)
         """
-        with self.driver.session() as session:
-            query = (
-                f"MATCH (a:{from_node_label} {{name: $from_node_name}}), (b:{to_node_label} {{name: $to_node_name}}) "
-                f"MERGE (a)-[:{relationship_type}]->(b)"
-            )
-            session.run(query, from_node_name=from_node_name, to_node_name=to_node_name)
+        query = (
+            f"MATCH (a:{from_node_label} {{name: $from_node_name}}), (b:{to_node_label} {{name: $to_node_name}}) "
+            f"MERGE (a)-[:{relationship_type}]->(b)"
+        )
+        await self._write(query, {"from_node_name": from_node_name, "to_node_name": to_node_name}, "create_relationship")
 
-    def link_memo_to_entity(self, memo_id: str, entity_type: str, entity_name: str):
+    async def link_memo_to_entity(self, memo_id: str, entity_type: str, entity_name: str):
         """
         메모와 엔티티를 MENTIONED_IN 관계로 연결합니다.
 
@@ -148,31 +335,27 @@ class Neo4jService:
             entity_type: 엔티티 타입 (Person, Company, Event, Project)
             entity_name: 엔티티 이름
         """
-        with self.driver.session() as session:
-            query = (
-                f"MATCH (m:Memo {{id: $memo_id}}), (e:{entity_type} {{name: $entity_name}}) "
-                f"MERGE (e)-[:MENTIONED_IN]->(m)"
-            )
-            session.run(query, memo_id=memo_id, entity_type=entity_type, entity_name=entity_name)
+        query = (
+            f"MATCH (m:Memo {{id: $memo_id}}), (e:{entity_type} {{name: $entity_name}}) "
+            f"MERGE (e)-[:MENTIONED_IN]->(m)"
+        )
+        await self._write(query, {"memo_id": memo_id, "entity_name": entity_name}, "link_memo_to_entity")
 
-    def get_person_phone(self, name: str):
+    async def get_person_phone(self, name: str):
         """특정 인물의 전화번호를 조회합니다."""
-        with self.driver.session() as session:
-            query = "MATCH (p:Person {name: $name}) RETURN p.phone AS phone"
-            result = session.run(query, name=name).single()
-            return result["phone"] if result else None
+        records = await self._read("MATCH (p:Person {name: $name}) RETURN p.phone AS phone", {"name": name}, "get_person_phone")
+        return records[0]["phone"] if records else None
 
-    def get_company_people(self, company_name: str):
+    async def get_company_people(self, company_name: str):
         """특정 회사에 근무하는 사람들의 목록을 반환합니다."""
-        with self.driver.session() as session:
-            query = (
-                "MATCH (p:Person)-[:WORKS_AT]->(c:Company {name: $company_name}) "
-                "RETURN p.name AS name, p.title AS title"
-            )
-            results = session.run(query, company_name=company_name)
-            return [{"name": record["name"], "title": record["title"]} for record in results]
-
-    def run_cypher_query(self, query: str, parameters: dict = None):
+        query = (
+            "MATCH (p:Person)-[:WORKS_AT]->(c:Company {name: $company_name}) "
+            "RETURN p.name AS name, p.title AS title"
+        )
+        records = await self._read(query, {"company_name": company_name}, "get_company_people")
+        return [{"name": record["name"], "title": record["title"]} for record in records]
+
+    async def run_cypher_query(self, query: str, parameters: dict = None):
         """
         임의의 Cypher 쿼리를 실행하고 결과를 반환합니다.
 
@@ -183,38 +366,136 @@ class Neo4jService:
         Returns:
             쿼리 결과를 딕셔너리 리스트로 반환
         """
-        with self.driver.session() as session:
-            result = session.run(query, parameters)
-            return [record.data() for record in result]
+        return [record.data() for record in await self._read(query, parameters, "run_cypher_query")]
 
-    def get_recent_memos(self, limit: int = 10):
+    async def stream_cypher_query(self, query: str, parameters: dict = None, timeout: float = None,
+                                  fetch_size: int = None, template: str = "stream"):
         """
-        최근 메모 목록을 시간 역순으로 반환합니다.
+        읽기 세션에서 Cypher 쿼리를 실행하고 결과 레코드를 하나씩 딕셔너리로 내보냅니다.
+
+        드라이버는 fetch_size개씩 서버에서 가져오므로 결과 전체가 메모리에 올라가지 않습니다.
+        이미 내보낸 레코드는 되돌릴 수 없으므로 관리형 트랜잭션과 달리 일시적 오류를 재시도하지 않습니다.
+        반복을 중간에 멈추려면 contextlib.aclosing으로 감싸야 나머지 결과가 서버에서 즉시 버려집니다.
 
         Args:
-            limit: 반환할 메모 개수 (기본값: 10)
+            query: 실행할 Cypher 쿼리 문자열
+            parameters: 쿼리에 전달할 파라미터 (선택)
+            timeout: 서버 측 트랜잭션 타임아웃 (초, None이면 서버 기본값)
+            fetch_size: 한 번에 가져올 레코드 수 (None이면 CYPHER_FETCH_SIZE)
+            template: 지연 지표에 기록할 쿼리 이름. 소비자가 레코드를 처리하는 시간도 포함됩니다
+        """
+        with metrics.neo4j_query_seconds.time(template, "stream"):
+            async with self.session(read=True, fetch_size=fetch_size or config.CYPHER_FETCH_SIZE) as session:
+                result = await session.run(Query(query, timeout=timeout), parameters)
+                async for record in result:
+                    yield record.data()
+
+    async def run_bounded_query(self, query: str, parameters: dict = None, max_rows: int = 1000,
+                                timeout: float = None, template: str = "llm_cypher"):
+        """
+        읽기 트랜잭션(execute_read)으로 Cypher 쿼리를 실행하고 최대 max_rows개의 결과만 반환합니다.
+        LLM이 생성한 쿼리처럼 결과 크기를 알 수 없는 쿼리에 사용합니다.
+        읽기 트랜잭션이므로 쓰기 구문이 포함된 쿼리는 서버에서 거부됩니다.
 
         Returns:
-            메모 목록 (id, text, timestamp, business_related, entities)
+            (결과 딕셔너리 리스트, max_rows를 넘는 결과가 더 있었는지 여부)
         """
-        with self.driver.session() as session:
-            query = (
-                "MATCH (m:Memo) "
-                "RETURN m.id AS id, m.text AS text, m.timestamp AS timestamp, m.business_related AS business_related "
-                "ORDER BY m.timestamp DESC LIMIT $limit"
-            )
-            results = session.run(query, limit=limit)
-            return [
-                {
-                    "id": record["id"],
-                    "text": record["text"],
-                    "timestamp": record["timestamp"].isoformat(),
-                    "business_related": record["business_related"],
-                    "entities": []  # 향후 메모에 연결된 엔티티 추출 예정
-                } for record in results
-            ]
-
-    def find_node_label(self, name: str):
+        @unit_of_work(timeout=timeout)
+        async def work(tx):
+            result = await tx.run(query, parameters)
+            # max_rows + 1번째 레코드로 잘림 여부를 판단하고, 나머지는 서버에서 버림
+            records = await result.fetch(max_rows + 1)
+            await result.consume()
+            return [record.data() for record in records[:max_rows]], len(records) > max_rows
+
+        with metrics.neo4j_query_seconds.time(template, "read"):
+            async with self.session(read=True, fetch_size=min(max_rows + 1, config.CYPHER_FETCH_SIZE)) as session:
+                return await session.execute_read(work)
+
+    async def list_memos(self, limit: int = 10, cursor: str = None, since: str = None, until: str = None,
+                         business_related: bool = None, include_entities: bool = True) -> dict:
+        """
+        메모 목록을 시간 역순으로 한 페이지씩 반환합니다.
+
+        (timestamp, id) 기준 keyset 페이지네이션을 사용하므로 페이지 깊이와 전체 메모 수에 관계없이
+        timestamp 인덱스에서 limit개만 읽습니다. 연결된 엔티티는 같은 쿼리의 COLLECT 서브쿼리로 가져옵니다.
+
+        Args:
+            limit: 페이지 크기
+            cursor: 이전 페이지의 next_cursor (None이면 첫 페이지)
+            since: 이 시각 이후(포함)의 메모만 (ISO 형식)
+            until: 이 시각 이전(미포함)의 메모만 (ISO 형식)
+            business_related: 지정하면 해당 값의 메모만
+            include_entities: MENTIONED_IN으로 연결된 엔티티를 함께 반환할지 여부
+
+        Returns:
+            memos: 메모 목록 (id, text, timestamp, business_related, entities)
+            next_cursor: 다음 페이지 커서 (마지막 페이지이면 None)
+        """
+        # 파라미터가 없는 조건은 쿼리에서 빼서, 인덱스 범위 탐색이 가능한 형태로 유지
+        conditions = ["m.timestamp IS NOT NULL"]
+        parameters = {"limit": limit + 1}
+        if cursor:
+            cursor_timestamp, cursor_id = decode_memo_cursor(cursor)
+            conditions.append("m.timestamp <= datetime($cursor_timestamp)")
+            conditions.append("NOT (m.timestamp = datetime($cursor_timestamp) AND m.id >= $cursor_id)")
+            parameters.update(cursor_timestamp=cursor_timestamp, cursor_id=cursor_id)
+        if since:
+            conditions.append("m.timestamp >= datetime($since)")
+            parameters["since"] = since
+        if until:
+            conditions.append("m.timestamp < datetime($until)")
+            parameters["until"] = until
+        if business_related is not None:
+            conditions.append("m.business_related = $business_related")
+            parameters["business_related"] = business_related
+
+        entities = (
+            "COLLECT { MATCH (e)-[:MENTIONED_IN]->(m) RETURN {type: labels(e)[0], name: e.name} }"
+            if include_entities else "[]"
+        )
+        query = (
+            f"MATCH (m:Memo) WHERE {' AND '.join(conditions)} "
+            "WITH m ORDER BY m.timestamp DESC, m.id DESC LIMIT $limit "
+            "RETURN m.id AS id, m.text AS text, m.timestamp AS timestamp, m.business_related AS business_related, "
+            f"{entities} AS entities"
+        )
+        records = await self._read(query, parameters, "list_memos")
+        memos = [
+            {
+                "id": record["id"],
+                "text": record["text"],
+                "timestamp": record["timestamp"].isoformat(),
+                "business_related": record["business_related"],
+                "entities": record["entities"],
+            }
+            for record in records[:limit]
+        ]
+        next_cursor = None
+        if len(records) > limit:
+            last = memos[-1]
+            next_cursor = encode_memo_cursor(last["timestamp"], last["id"])
+        return {"memos": memos, "next_cursor": next_cursor}
+
+    async def get_graph_version(self) -> str:
+        """
+        그래프 변경 여부를 판단하기 위한 버전 문자열을 반환합니다.
+
+        빈 읽기 트랜잭션이 돌려주는 북마크는 데이터베이스에서 마지막으로 커밋된 트랜잭션을 가리키므로
+        다른 워커의 쓰기와 속성만 바뀐 쓰기도 반영되며, 쓰기 트랜잭션에 추가 작업이 필요 없습니다.
+        공유 북마크 관리자를 사용하므로 이 프로세스의 쓰기 이후에는 항상 그 쓰기를 포함한 버전이 나옵니다.
+        (클러스터에서는 읽기 멤버의 복제 지연만큼 버전이 늦게 바뀔 수 있음)
+        """
+        with metrics.neo4j_query_seconds.time("get_graph_version", "read"):
+            async with self.session(read=True) as session:
+                await (await session.run("RETURN 1")).consume()
+                bookmarks = await session.last_bookmarks()
+        if not bookmarks.raw_values:
+            # 서버가 북마크를 돌려주지 않으면 오래된 응답으로 304를 보내지 않도록 매번 다른 버전을 사용
+            return f"unversioned:{os.urandom(8).hex()}"
+        return ",".join(sorted(bookmarks.raw_values))
+
+    async def find_node_label(self, name: str):
         """
         노드의 이름으로 레이블(타입)을 찾습니다.
         정확한 매칭을 먼저 시도하고, 실패하면 부분 매칭을 시도합니다.
@@ -225,29 +506,30 @@ class Neo4jService:
         Returns:
             노드의 레이블 (Person, Company, Event, Project 등) 또는 None
         """
-        with self.driver.session() as session:
-            # 먼저 정확한 이름으로 매칭 시도
-            query = (
-                "MATCH (n) WHERE n.name = $name "
-                "RETURN labels(n) AS labels LIMIT 1"
-            )
-            result = session.run(query, name=name).single()
-            if result and result["labels"]:
-                return result["labels"][0]
-
-            # 부분 매칭 시도 (이름이 검색어를 포함하거나 검색어가 이름을 포함)
-            query = (
-                "MATCH (n) WHERE n.name CONTAINS $name OR $name CONTAINS n.name "
-                "RETURN labels(n) AS labels, n.name AS matched_name LIMIT 1"
-            )
-            result = session.run(query, name=name).single()
-            if result and result["labels"]:
-                logger.info(f"Partial name match: '{name}' matched with '{result['matched_name']}'")
-                return result["labels"][0]
-
-            return None
-
-    def find_best_matching_person(self, partial_name: str) -> str:
+        if self.entity_index:
+            await self._ensure_entity_index()
+            return self.entity_index.find_node_label(name)
+
+        # 먼저 정확한 이름으로 매칭 시도 (레이블별 유니크 인덱스 조회)
+        records = await self._read(LABEL_LOOKUP_QUERY, {"name": name}, "label_lookup")
+        if records:
+            return records[0]["label"]
+
+        # 부분 매칭 시도 (이름이 검색어를 포함하거나 검색어가 이름을 포함)
+        # 전문 검색 인덱스로 bigram이 겹치는 후보만 가져온 뒤 정확한 포함 관계를 확인
+        query = (
+            "CALL db.index.fulltext.queryNodes('entity_name_fulltext', $search) YIELD node AS n "
+            "WHERE n.name CONTAINS $name OR $name CONTAINS n.name "
+            "RETURN labels(n) AS labels, n.name AS matched_name LIMIT 1"
+        )
+        records = await self._read(query, {"name": name, "search": fulltext_search_term(name)}, "label_fulltext")
+        if records and records[0]["labels"]:
+            logger.info(f"Partial name match: '{name}' matched with '{records[0]['matched_name']}'")
+            return records[0]["labels"][0]
+
+        return None
+
+    async def find_best_matching_person(self, partial_name: str) -> str:
         """
         부분 이름으로 가장 일치하는 Person 노드를 찾습니다.
         중복 노드 생성을 방지하기 위해 기존 노드를 찾아 정규화합니다.
@@ -270,35 +552,102 @@ class Neo4jService:
         Returns:
             정규화된 전체 이름
         """
+        if self.entity_index:
+            await self._ensure_entity_index()
+            best_match = self.entity_index.find_best_matching_person(partial_name)
+            if best_match != partial_name:
+                logger.info(f"Name normalization: '{partial_name}' -> '{best_match}'")
+            return best_match
+
         # 공백과 접미사 제거하여 이름 정규화
         clean_name = partial_name.replace("님", "").replace(" ", "")
+        if not clean_name:
+            return partial_name
+
+        # 전문 검색 인덱스로 후보를 찾은 뒤 부분 매칭으로 Person 노드 검색
+        query = (
+            "CALL db.index.fulltext.queryNodes('entity_name_fulltext', $search) YIELD node AS p "
+            "WHERE p:Person AND (p.name CONTAINS $clean_name OR $clean_name CONTAINS p.name) "
+            "RETURN p.name AS name, p.phone AS phone, p.email AS email, p.title AS title "
+            "ORDER BY size(p.name) DESC"  # 긴 이름 우선 (더 구체적인 이름)
+        )
+        results = await self._read(query, {"clean_name": clean_name, "search": fulltext_search_term(clean_name)}, "person_match")
+
+        if not results:
+            return partial_name  # 매칭 실패 시 원본 반환
+
+        # 연락처 정보(전화번호, 이메일, 직함)가 있는 노드 우선 선택
+        for result in results:
+            if result['phone'] or result['email'] or result['title']:
+                logger.info(f"Name normalization: '{partial_name}' -> '{result['name']}' (has contact info)")
+                return result['name']
+
+        # 연락처 정보가 없으면 가장 긴 이름 선택
+        best_match = results[0]['name']
+        if best_match != partial_name:
+            logger.info(f"Name normalization: '{partial_name}' -> '{best_match}'")
+        return best_match
+
+    async def resolve_entity_names(self, entities: list, names: list = ()) -> dict:
+        """
+        추출된 페이로드 하나의 이름들을 한 번에 기존 노드 이름으로 정규화합니다.
+        엔티티마다 find_best_matching_person/find_node_label을 따로 호출하지 않고,
+        이름 인덱스를 사용하면 프로세스 안에서, 아니면 단일 UNWIND 쿼리 한 번으로 처리합니다.
 
-        with self.driver.session() as session:
-            # 부분 매칭으로 Person 노드 검색
-            query = (
-                "MATCH (p:Person) "
-                "WHERE p.name CONTAINS $clean_name OR $clean_name CONTAINS p.name "
-                "RETURN p.name AS name, p.phone AS phone, p.email AS email, p.title AS title "
-                "ORDER BY size(p.name) DESC"  # 긴 이름 우선 (더 구체적인 이름)
-            )
-            results = session.run(query, clean_name=clean_name).data()
-
-            if not results:
-                return partial_name  # 매칭 실패 시 원본 반환
+        Args:
+            entities: 엔티티 목록 [{"type", "name"}]
+                      Person은 부분 이름 매칭 ("인영님" -> "이인영"),
+                      Company는 법인 표기가 다른 같은 회사 ("(주)ABC상사" -> "ABC상사")
+            names: 페이로드에 없는 관계 끝점 이름 (정확히 일치하는 노드의 레이블을 찾음)
 
-            # 연락처 정보(전화번호, 이메일, 직함)가 있는 노드 우선 선택
-            for result in results:
-                if result['phone'] or result['email'] or result['title']:
-                    logger.info(f"Name normalization: '{partial_name}' -> '{result['name']}' (has contact info)")
-                    return result['name']
+        Returns:
+            {원본 이름: {"name": 정규화된 이름, "label": 레이블}} (찾지 못한 names는 포함하지 않음)
+        """
+        if self.entity_index:
+            await self._ensure_entity_index()
+            resolved = self.entity_index.resolve_names(entities, names)
+        else:
+            resolved = {}
+            rows = []
+            for entity in entities:
+                label, name = entity.get("type"), entity.get("name")
+                if not name or name in resolved:
+                    continue
+                resolved[name] = {"name": name, "label": label}
+                clean_name = clean_person_name(name)
+                if label == "Person" and clean_name:
+                    rows.append({
+                        "name": name, "kind": "person", "clean": clean_name, "search": fulltext_search_term(clean_name),
+                    })
+                elif label == "Company":
+                    rows.append({"name": name, "kind": "company", "variants": company_name_variants(name)})
+            for name in dict.fromkeys(names):
+                if name and name not in resolved:
+                    rows.append({"name": name, "kind": "endpoint", "variants": company_name_variants(name)})
+
+            if rows:
+                for record in await self._read(RESOLVE_NAMES_QUERY, {"rows": rows}, "resolve_names"):
+                    resolved[record["original"]] = {"name": record["name"], "label": record["label"]}
+
+        for original, match in resolved.items():
+            if match["name"] != original:
+                logger.info(f"Name normalization: '{original}' -> '{match['name']}' ({match['label']})")
+        return resolved
+
+    async def find_mentions(self, text: str) -> list:
+        """
+        본문에 나오는 알려진 엔티티 이름을 이름 인덱스의 Aho-Corasick 오토마톤으로 찾습니다.
+        이름 인덱스를 사용하지 않으면(ENTITY_INDEX_ENABLED=false) 빈 목록을 반환합니다.
 
-            # 연락처 정보가 없으면 가장 긴 이름 선택
-            best_match = results[0]['name']
-            if best_match != partial_name:
-                logger.info(f"Name normalization: '{partial_name}' -> '{best_match}'")
-            return best_match
+        Returns:
+            [{"start", "end", "name", "label", "has_contact"}] (본문 순서, 겹치는 이름은 가장 긴 것만)
+        """
+        if not self.entity_index:
+            return []
+        await self._ensure_entity_index()
+        return self.entity_index.find_mentions(text)
 
-    def create_relationship_by_names(self, from_name: str, to_name: str, relationship_type: str):
+    async def create_relationship_by_names(self, from_name: str, to_name: str, relationship_type: str):
         """
         노드 이름만으로 두 노드 간 관계를 생성합니다.
         노드의 레이블(타입)을 자동으로 찾아서 관계를 생성합니다.
@@ -312,23 +661,257 @@ class Neo4jService:
             성공 시 True, 실패 시 False
         """
         # 노드 이름으로 레이블(타입) 찾기
-        from_label = self.find_node_label(from_name)
-        to_label = self.find_node_label(to_name)
+        from_label = await self.find_node_label(from_name)
+        to_label = await self.find_node_label(to_name)
 
         if not from_label or not to_label:
             logger.warning(f"Could not find nodes: {from_name} ({from_label}) or {to_name} ({to_label})")
             return False
 
         # 관계 생성
-        with self.driver.session() as session:
-            query = (
-                f"MATCH (a:{from_label} {{name: $from_name}}), (b:{to_label} {{name: $to_name}}) "
-                f"MERGE (a)-[:{relationship_type}]->(b)"
+        query = (
+            f"MATCH (a:{from_label} {{name: $from_name}}), (b:{to_label} {{name: $to_name}}) "
+            f"MERGE (a)-[:{relationship_type}]->(b)"
+        )
+        await self._write(query, {"from_name": from_name, "to_name": to_name}, "create_relationship_by_names")
+        logger.info(f"Created relationship: ({from_name})-[:{relationship_type}]->({to_name})")
+        return True
+
+    async def save_memo_graph(self, memo: dict, entities: list, relationships: list, labels: dict = None):
+        """
+        메모 하나에서 추출된 전체 페이로드를 단일 트랜잭션으로 저장합니다.
+        Memo 노드, 엔티티 노드, MENTIONED_IN 연결, 엔티티 간 관계를
+        레이블/관계 타입별로 묶은 UNWIND 문으로 만들어 한 번의 쿼리로 실행하므로
+        메모당 왕복 횟수가 엔티티 수와 무관하게 일정하며, 실패 시 전체가 롤백됩니다.
+
+        Args:
+            memo: 메모 정보 {"id", "text", "timestamp", "business_related"}
+            entities: 엔티티 목록 [{"type", "name", "properties"}]
+            relationships: 관계 목록 [{"from", "to", "type"}]
+            labels: 페이로드에 없는 관계 끝점의 {이름: 레이블} (resolve_entity_names 결과).
+                    레이블을 모르는 끝점은 엔티티 레이블 전체에서 찾음
+
+        Returns:
+            생성된 노드/관계 수 {"nodes_created", "relationships_created"}
+        """
+        query, parameters = self._build_memo_graph_query(memo, entities, relationships, labels)
+        with metrics.stage("graph_write"):
+            _, counters = await self._write(query, parameters, "save_memo_graph")
+
+        for entity in entities:
+            self._index_entity(entity.get("type"), entity.get("name"), entity.get("properties"))
+
+        logger.info(
+            f"Saved memo graph {memo['id']}: {counters.nodes_created} nodes, "
+            f"{counters.relationships_created} relationships created"
+        )
+        return {
+            "nodes_created": counters.nodes_created,
+            "relationships_created": counters.relationships_created,
+        }
+
+    async def save_contacts(self, contacts: list):
+        """
+        여러 연락처(Person, 소속 Company, WORKS_AT 관계)를 단일 트랜잭션으로 저장합니다.
+        명함 일괄 등록에서 사용자가 확인한 연락처들을 한 번에 저장할 때 사용합니다.
+
+        Args:
+            contacts: 연락처 목록 [{"name", "properties", "company"}]
+                      company가 없으면 Person 노드만 저장
+
+        Returns:
+            생성된 노드/관계 수 {"nodes_created", "relationships_created"}
+        """
+        query = (
+            "UNWIND $contacts AS row "
+            "MERGE (p:Person {name: row.name}) SET p += row.properties "
+            "WITH p, row WHERE row.company IS NOT NULL "
+            "MERGE (c:Company {name: row.company}) "
+            "MERGE (p)-[:WORKS_AT]->(c)"
+        )
+        with metrics.stage("graph_write"):
+            _, counters = await self._write(query, {"contacts": contacts}, "save_contacts")
+
+        for contact in contacts:
+            self._index_entity("Person", contact["name"], contact["properties"])
+            self._index_entity("Company", contact["company"])
+
+        logger.info(
+            f"Saved {len(contacts)} contacts: {counters.nodes_created} nodes, "
+            f"{counters.relationships_created} relationships created"
+        )
+        return {
+            "nodes_created": counters.nodes_created,
+            "relationships_created": counters.relationships_created,
+        }
+
+    async def scan_entities(self, label: str, after: str = None, limit: int = 1000) -> list:
+        """
+        label 노드를 name 인덱스 순서로 한 페이지씩 읽습니다. (keyset 페이지네이션)
+        인덱스 범위 검색으로 after 다음 위치부터 limit개만 읽으므로 그래프 크기와 무관하게 페이지 비용이 일정합니다.
+        """
+        if label not in ENTITY_LABELS:
+            raise ValueError(f"Unsupported label: {label}")
+        query = (
+            f"MATCH (n:{label}) WHERE n.name > $after "
+            "WITH n ORDER BY n.name LIMIT $limit "
+            "RETURN n.name AS name, properties(n) AS properties, "
+            "[(n)-[:WORKS_AT]->(c:Company) | c.name] AS companies, COUNT { (n)--() } AS degree"
+        )
+        records = await self._read(query, {"after": after or "", "limit": limit}, "scan_entities")
+        return [
+            {
+                "name": record["name"],
+                "properties": {k: v for k, v in record["properties"].items() if k != "name"},
+                "companies": record["companies"],
+                "degree": record["degree"],
+            }
+            for record in records
+        ]
+
+    async def merge_entities(self, label: str, merges: list) -> dict:
+        """
+        중복 노드들을 단일 쓰기 트랜잭션으로 병합합니다.
+        관계 타입은 파라미터화할 수 없으므로 데이터베이스의 관계 타입마다 나가는/들어오는 관계를 옮기는
+        CALL 서브쿼리를 만듭니다. (APOC 없이 실행, 관계 속성은 옮기지 않음)
+        """
+        if label not in ENTITY_LABELS:
+            raise ValueError(f"Unsupported label: {label}")
+        records = await self._read(
+            "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType", template="relationship_types"
+        )
+        rel_types = [
+            record["relationshipType"] for record in records
+            if RELATIONSHIP_TYPE_PATTERN.match(record["relationshipType"])
+        ]
+        clauses = [
+            "UNWIND $merges AS merge "
+            f"MATCH (keep:{label} {{name: merge.keep}}) "
+            f"MATCH (dup:{label} {{name: merge.duplicate}}) WHERE dup <> keep"
+        ]
+        for rel_type in rel_types:
+            clauses.append(
+                f"CALL {{ WITH keep, dup MATCH (dup)-[r:{rel_type}]->(t) WHERE t <> keep "
+                f"MERGE (keep)-[:{rel_type}]->(t) DELETE r }}"
+            )
+            clauses.append(
+                f"CALL {{ WITH keep, dup MATCH (s)-[r:{rel_type}]->(dup) WHERE s <> keep "
+                f"MERGE (s)-[:{rel_type}]->(keep) DELETE r }}"
+            )
+        clauses.append("SET keep += merge.properties DETACH DELETE dup")
+
+        with metrics.stage("graph_write"):
+            _, counters = await self._write("\n".join(clauses), {"merges": merges}, "merge_entities")
+
+        if self.entity_index:
+            for merge in merges:
+                self.entity_index.remove(label, merge["duplicate"], merge["keep"])
+                self._index_entity(label, merge["keep"], merge.get("properties"))
+
+        logger.info(
+            f"Merged {counters.nodes_deleted} duplicate {label} nodes: "
+            f"{counters.relationships_created} relationships moved"
+        )
+        return {"merged": counters.nodes_deleted, "relationships_moved": counters.relationships_created}
+
+    async def _ensure_entity_index(self):
+        """이름 인덱스가 로드되지 않았거나 오래된 경우 Neo4j에서 전체 이름을 불러옵니다."""
+        await self.entity_index.ensure_loaded(self._iter_entity_names)
+
+    async def _iter_entity_names(self):
+        """이름 인덱스 로딩용으로 모든 엔티티의 (레이블, 이름, 연락처 정보 여부)를 스트리밍합니다."""
+        query = " UNION ALL ".join(
+            f"MATCH (n:{label}) WHERE n.name IS NOT NULL "
+            f"RETURN '{label}' AS label, n.name AS name, "
+            "coalesce(n.phone, '') <> '' OR coalesce(n.email, '') <> '' OR coalesce(n.title, '') <> '' AS has_contact"
+            for label in ENTITY_LABELS
+        )
+        async for record in self.stream_cypher_query(query, template="entity_names"):
+            yield record["label"], record["name"], record["has_contact"]
+
+    def _index_entity(self, label: str, name: str, properties: dict = None):
+        """쓰기가 성공한 엔티티를 이름 인덱스에 반영합니다."""
+        if self.entity_index and name:
+            self.entity_index.add(label, name, label == "Person" and has_contact_info(properties or {}))
+
+    @staticmethod
+    def _build_memo_graph_query(memo: dict, entities: list, relationships: list, labels: dict = None):
+        """
+        save_memo_graph에서 실행할 Cypher 문과 파라미터를 생성합니다.
+        레이블과 관계 타입은 파라미터화할 수 없으므로 그룹별 CALL 서브쿼리로 나누고,
+        각 그룹의 행 데이터는 UNWIND 파라미터로 전달합니다.
+        """
+        parameters = {"memo": memo}
+        clauses = [
+            "MERGE (m:Memo {id: $memo.id}) "
+            "ON CREATE SET m.text = $memo.text, m.timestamp = datetime($memo.timestamp), "
+            "m.business_related = $memo.business_related "
+            "WITH m"
+        ]
+
+        # 레이블별로 엔티티를 묶고, 같은 이름이 중복되면 속성을 합침
+        entities_by_label = {}
+        entity_labels = {}
+        for entity in entities:
+            label, name = entity.get("type"), entity.get("name")
+            if label not in ENTITY_LABELS or not name:
+                logger.warning(f"Skipping entity with unsupported type or empty name: {entity}")
+                continue
+            rows = entities_by_label.setdefault(label, {})
+            rows.setdefault(name, {}).update(entity.get("properties") or {})
+            entity_labels.setdefault(name, label)
+
+        for label, rows in entities_by_label.items():
+            param = f"entities_{label.lower()}"
+            parameters[param] = [{"name": name, "properties": props} for name, props in rows.items()]
+            clauses.append(
+                f"CALL {{ WITH m UNWIND ${param} AS row "
+                f"MERGE (n:{label} {{name: row.name}}) SET n += row.properties "
+                f"MERGE (n)-[:MENTIONED_IN]->(m) }}"
+            )
+
+        # (시작 레이블, 대상 레이블, 관계 타입)별로 관계를 묶음
+        # 페이로드에 없는 노드는 labels에 레이블이 없으면 엔티티 레이블 전체에서 이름으로 찾음
+        relationships_by_key = {}
+        endpoint_labels = {**(labels or {}), **entity_labels}
+        for relationship in relationships:
+            from_name, to_name = relationship.get("from"), relationship.get("to")
+            rel_type = relationship.get("type")
+            if not from_name or not to_name or not rel_type:
+                continue
+            if not RELATIONSHIP_TYPE_PATTERN.match(rel_type):
+                logger.warning(f"Skipping relationship with invalid type: {relationship}")
+                continue
+            key = (endpoint_labels.get(from_name), endpoint_labels.get(to_name), rel_type)
+            rows = relationships_by_key.setdefault(key, [])
+            if {"from": from_name, "to": to_name} not in rows:
+                rows.append({"from": from_name, "to": to_name})
+
+        for index, ((from_label, to_label, rel_type), rows) in enumerate(relationships_by_key.items()):
+            param = f"relationships_{index}"
+            parameters[param] = rows
+            clauses.append(
+                f"CALL {{ UNWIND ${param} AS row "
+                f"{Neo4jService._match_entity_by_name('a', from_label, 'row.from')} "
+                f"{Neo4jService._match_entity_by_name('b', to_label, 'row.to')} "
+                f"MERGE (a)-[:{rel_type}]->(b) }}"
             )
-            session.run(query, from_name=from_name, to_name=to_name)
-            logger.info(f"Created relationship: ({from_name})-[:{relationship_type}]->({to_name})")
-            return True
 
+        # 엔티티와 관계가 모두 없어도 WITH로 끝나지 않도록 항상 RETURN으로 마무리
+        clauses.append("RETURN m.id AS memo_id")
+        return "\n".join(clauses), parameters
+
+    @staticmethod
+    def _match_entity_by_name(variable: str, label: str, name_expression: str) -> str:
+        """
+        이름으로 엔티티 노드를 찾는 MATCH 절을 생성합니다.
+        레이블을 모르면 레이블별 인덱스를 차례로 조회해 첫 번째 일치 노드를 사용합니다.
+        """
+        if label:
+            return f"MATCH ({variable}:{label} {{name: {name_expression}}})"
+        lookups = " UNION ALL ".join(
+            f"WITH row MATCH ({variable}:{entity_label} {{name: {name_expression}}}) RETURN {variable}"
+            for entity_label in ENTITY_LABELS
+        )
+        return f"CALL {{ WITH row CALL {{ {lookups} }} RETURN {variable} LIMIT 1 }}"
 
-# Neo4j 서비스 싱글톤 인스턴스
-neo4j_service = Neo4jService()
@@ -0,0 +1,199 @@
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Cypher 문자열 리터럴 ("..." 또는 '...')
+CYPHER_STRING_LITERAL = re.compile(r'"((?:[^"\\]|\\.)*)"|\'((?:[^\'\\]|\\.)*)\'')
+
+# 질문과 무관하게 항상 같은 의미를 갖는 리터럴 (예: duration('P7D'))
+# 그 외에 질문에 없는 리터럴(예: "내일"에서 계산된 날짜)이 있으면 재사용할 수 없으므로 캐시하지 않음
+ISO_DURATION = re.compile(r"^P(?=\d|T\d)(\d+Y)?(\d+M)?(\d+W)?(\d+D)?(T(\d+H)?(\d+M)?(\d+S)?)?$")
+
+# 질문 끝의 문장 부호
+TRAILING_PUNCTUATION = re.compile(r"[\s?？!.。~]+$")
+
+# 이름 뒤의 호칭 "님" (생성된 Cypher도 이름에서 호칭을 제거하므로 질문에서도 제거)
+HONORIFIC_SUFFIX = re.compile(r"(?<=\S)님(?=\s|$)")
+
+# 질문 템플릿에서 슬롯 위치를 표시하는 문자 (질문에 나올 수 없는 문자)
+SLOT_MARKER = "\x00"
+
+
+def normalize_question(question: str) -> str:
+    """공백을 하나로 합치고 끝의 문장 부호와 이름 뒤의 "님"을 제거합니다."""
+    return HONORIFIC_SUFFIX.sub("", TRAILING_PUNCTUATION.sub("", " ".join(question.split())))
+
+
+class CypherPlan:
+    """질문 템플릿 하나와 그에 대응하는 파라미터화된 Cypher 쿼리입니다."""
+
+    def __init__(self, question_template: str, cypher_template: str):
+        """
+        Args:
+            question_template: 슬롯 위치를 SLOT_MARKER로 표시한 정규화된 질문
+            cypher_template: 슬롯 리터럴을 $q0, $q1, ... 파라미터로 바꾼 Cypher 쿼리
+        """
+        self.question_template = question_template
+        self.cypher_template = cypher_template
+        parts = question_template.split(SLOT_MARKER)
+        # 슬롯은 공백이 없는 한 덩어리(이름, 회사명 등)로 매칭
+        self.pattern = re.compile("^" + r"(\S+?)".join(re.escape(part) for part in parts) + "$")
+        # 슬롯이 포함되지 않은 단어 (어휘 인덱스의 키)
+        self.fixed_tokens = frozenset(token for token in question_template.split() if SLOT_MARKER not in token)
+
+    def match(self, question: str):
+        """정규화된 질문이 이 템플릿과 일치하면 파라미터 딕셔너리를, 아니면 None을 반환합니다."""
+        match = self.pattern.match(question)
+        if not match:
+            return None
+        return {f"q{i}": value for i, value in enumerate(match.groups())}
+
+
+class CypherPlanCache:
+    """
+    질문 → Cypher 계획 캐시입니다.
+
+    LLM이 생성한 Cypher의 문자열 리터럴 중 질문에 그대로 나오는 것(이름, 회사명 등)을 파라미터로 바꾸고,
+    질문의 해당 위치를 슬롯으로 바꾼 템플릿으로 저장합니다.
+    "김성길 전화번호?"로 만든 계획은 "이효주 전화번호?"에도 LLM 호출 없이 재사용되며,
+    파라미터로 실행하므로 Neo4j도 쿼리 실행 계획을 재사용합니다.
+
+    조회는 슬롯이 아닌 단어의 역색인으로 후보 템플릿을 좁힌 뒤 정규식으로 확인합니다.
+    """
+
+    def __init__(self, max_entries: int = 500):
+        self.max_entries = max_entries
+        self._plans = OrderedDict()  # question_template -> CypherPlan (LRU 순서)
+        self._token_index = defaultdict(set)  # 고정 단어 -> question_template 집합
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "uncacheable": 0, "evictions": 0}
+
+    def __len__(self):
+        return len(self._plans)
+
+    def lookup(self, question: str):
+        """
+        질문과 일치하는 계획을 찾습니다.
+
+        Returns:
+            (cypher_template, parameters). 일치하는 계획이 없으면 None
+        """
+        normalized = normalize_question(question)
+        tokens = set(normalized.split())
+        with self._lock:
+            counts = defaultdict(int)
+            for token in tokens:
+                for template in self._token_index.get(token, ()):
+                    counts[template] += 1
+            # 고정 단어가 모두 질문에 있는 템플릿만 정규식으로 확인 (고정 단어가 많은 템플릿 우선)
+            candidates = sorted(
+                (template for template, count in counts.items() if count == len(self._plans[template].fixed_tokens)),
+                key=lambda template: (-len(self._plans[template].fixed_tokens), -len(template)),
+            )
+            for template in candidates:
+                plan = self._plans[template]
+                parameters = plan.match(normalized)
+                if parameters is not None:
+                    self._plans.move_to_end(template)
+                    self.stats["hits"] += 1
+                    return plan.cypher_template, parameters
+            self.stats["misses"] += 1
+            return None
+
+    def parameterize(self, question: str, cypher_query: str):
+        """
+        LLM이 생성한 Cypher 쿼리를 질문 템플릿과 파라미터화된 쿼리로 변환합니다.
+
+        Returns:
+            (CypherPlan, parameters). 재사용할 수 없는 쿼리이면 None
+        """
+        normalized = normalize_question(question)
+        slots = {}  # 리터럴 값 -> 파라미터 이름
+        cacheable = True
+
+        def replace(match):
+            nonlocal cacheable
+            value = match.group(1) if match.group(1) is not None else match.group(2)
+            if value in slots:
+                return f"${slots[value]}"
+            if value and value in normalized and not any(c.isspace() for c in value):
+                slots[value] = f"q{len(slots)}"
+                return f"${slots[value]}"
+            if not ISO_DURATION.match(value):
+                cacheable = False
+            return match.group(0)
+
+        cypher_template = CYPHER_STRING_LITERAL.sub(replace, cypher_query)
+        if not cacheable:
+            return None
+
+        # 질문에서 슬롯 값의 위치를 찾아 표시 (겹치거나 두 번 이상 나오면 어느 쪽인지 알 수 없으므로 캐시하지 않음)
+        spans = []
+        for value, name in slots.items():
+            if normalized.count(value) != 1:
+                return None
+            start = normalized.index(value)
+            spans.append((start, start + len(value), name))
+        spans.sort()
+        if any(prev[1] > cur[0] for prev, cur in zip(spans, spans[1:])):
+            return None
+
+        # 슬롯 순서(q0, q1, ...)가 질문에 나오는 순서와 같도록 파라미터 이름을 다시 매김
+        renames = {name: f"q{i}" for i, (_, _, name) in enumerate(spans)}
+        cypher_template = re.sub(r"\$(q\d+)\b", lambda m: f"$__{renames.get(m.group(1), m.group(1))}", cypher_template).replace("$__", "$")
+        question_template, parameters, position = "", {}, 0
+        for start, end, name in spans:
+            question_template += normalized[position:start] + SLOT_MARKER
+            parameters[renames[name]] = normalized[start:end]
+            position = end
+        question_template += normalized[position:]
+
+        plan = CypherPlan(question_template, cypher_template)
+        # 고정 단어가 없으면 거의 모든 질문과 일치하므로 캐시하지 않음
+        if not plan.fixed_tokens or plan.match(normalized) != parameters:
+            return None
+        return plan, parameters
+
+    def store(self, plan: CypherPlan):
+        """실행에 성공한 계획을 캐시에 저장합니다."""
+        with self._lock:
+            template = plan.question_template
+            if template in self._plans:
+                self._remove(template)
+            self._plans[template] = plan
+            for token in plan.fixed_tokens:
+                self._token_index[token].add(template)
+            while len(self._plans) > self.max_entries:
+                self._remove(next(iter(self._plans)))
+                self.stats["evictions"] += 1
+
+    def record_uncacheable(self):
+        with self._lock:
+            self.stats["uncacheable"] += 1
+
+    def evict(self, cypher_template: str):
+        """실행에 실패한 계획을 캐시에서 제거합니다."""
+        with self._lock:
+            for template in [t for t, plan in self._plans.items() if plan.cypher_template == cypher_template]:
+                self._remove(template)
+
+    def _remove(self, template: str):
+        plan = self._plans.pop(template)
+        for token in plan.fixed_tokens:
+            templates = self._token_index[token]
+            templates.discard(template)
+            if not templates:
+                del self._token_index[token]
+
+    def get_metrics(self) -> dict:
+        """히트/미스/캐시 불가 횟수, 히트율, 저장된 계획 수를 반환합니다."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_ratio": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._plans),
+            }
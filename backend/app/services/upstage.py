@@ -1,29 +1,86 @@
 import os
-import requests
+import json
+import time
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import httpx
 from dotenv import load_dotenv
-from app.core.logger import get_logger
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+from tenacity.wait import wait_base
+from app.core import config, metrics
+from app.services.cache import ResponseCache, make_cache_key
+from app.services.llm_transport import (
+    DirectTransport, LangChainTransport, TRANSIENT, LOCAL,
+    classify_error, error_status, error_response,
+)
+from app.core.logger import get_logger, debug_payload
 from fastapi import HTTPException
 
-# LangSmith 추적을 위한 LangChain import
-try:
-    from langchain_upstage import ChatUpstage
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
-    logger = get_logger(__name__)
-    logger.warning("langchain-upstage not available, LangSmith tracing will not work")
-
 load_dotenv()
 logger = get_logger(__name__)
 
+# ChatUpstage를 아직 만들지 않았음을 나타내는 값 (None은 LangChain을 사용하지 않음을 의미)
+_NOT_LOADED = object()
+
+def _langsmith_tracing_enabled() -> bool:
+    """LangSmith 추적이 설정되어 있는지 확인합니다. (main.py가 LANGSMITH_* 값을 LANGCHAIN_*으로 옮김)"""
+    return os.getenv("LANGCHAIN_TRACING_V2", "").lower() == "true" and bool(os.getenv("LANGCHAIN_API_KEY"))
+
+
+# 직접 API 호출에 사용하는 Solar Pro 모델 (응답 캐시 키에도 포함)
+SOLAR_PRO_MODEL = "solar-pro3-260126"
+
+
+def _is_retryable(exception: BaseException) -> bool:
+    """재시도할 수 있는 오류(429/5xx 응답, 타임아웃 및 연결 오류)인지 판별합니다."""
+    return classify_error(exception) == TRANSIENT
+
+
+def _parse_retry_after(value: str):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환합니다."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class wait_retry_after(wait_base):
+    """
+    응답에 Retry-After 헤더가 있으면 그 값만큼 대기하고,
+    없으면 fallback 대기 전략(지터가 적용된 지수 백오프)을 사용합니다.
+    """
+
+    def __init__(self, fallback: wait_base, max_wait: float):
+        self.fallback = fallback
+        self.max_wait = max_wait
+
+    def __call__(self, retry_state) -> float:
+        response = error_response(retry_state.outcome.exception())
+        if response is not None:
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_wait)
+        return self.fallback(retry_state)
+
+
 class UpstageService:
     """
     Upstage API와 상호작용하는 서비스 클래스입니다.
     Solar Pro (LLM), Document Parse (OCR), Information Extraction 기능을 제공합니다.
+    모든 호출은 비동기이며, 하나의 httpx.AsyncClient를 공유해 커넥션을 재사용합니다.
+    429/5xx 응답과 네트워크 오류는 Retry-After를 존중하는 지수 백오프로 재시도합니다.
     """
 
     def __init__(self):
-        """Upstage API 키를 로드하고 LangChain ChatUpstage를 초기화합니다."""
+        """Upstage API 키를 로드하고 공유 HTTP 클라이언트와 Solar Pro 호출 경로를 설정합니다."""
         self.api_key = os.getenv("UPSTAGE_API_KEY")
         if not self.api_key:
             logger.warning("UPSTAGE_API_KEY is not set in environment variables. Upstage API calls will fail.")
@@ -32,19 +89,167 @@ class UpstageService:
             "Authorization": f"Bearer {self.api_key}",
         }
 
-        # LangSmith 추적을 위한 ChatUpstage 초기화
-        if LANGCHAIN_AVAILABLE and self.api_key:
-            try:
-                self.chat_upstage = ChatUpstage(
-                    api_key=self.api_key,
-                    model="solar-pro"
-                )
-                logger.info("ChatUpstage initialized for LangSmith tracing")
-            except Exception as e:
-                logger.error(f"Failed to initialize ChatUpstage: {e}")
-                self.chat_upstage = None
+        self.base_url = config.UPSTAGE_BASE_URL
+
+        # 모든 Upstage API 호출이 공유하는 커넥션 풀 (keep-alive로 핸드셰이크 재사용)
+        self.limits = httpx.Limits(
+            max_connections=config.UPSTAGE_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=config.UPSTAGE_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=config.UPSTAGE_POOL_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = httpx.Timeout(config.UPSTAGE_READ_TIMEOUT, connect=config.UPSTAGE_CONNECT_TIMEOUT)
+        self.client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+
+        # 커넥션 풀 및 재시도 통계
+        self.in_flight = 0
+        self.stats = {
+            "requests": 0,
+            "attempts": 0,
+            "retries": 0,
+            "retry_after_honored": 0,
+            "failures": 0,
+            "retries_by_reason": {},
+        }
+
+        # Solar Pro 응답 캐시 (동일한 프롬프트는 네트워크 호출 없이 응답)
+        self.llm_cache = None
+        if config.LLM_CACHE_ENABLED:
+            self.llm_cache = ResponseCache(
+                "solar_pro",
+                max_entries=config.LLM_CACHE_MAX_ENTRIES,
+                max_bytes=config.LLM_CACHE_MAX_BYTES,
+                ttl=config.LLM_CACHE_TTL,
+                sqlite_path=config.LLM_CACHE_SQLITE_PATH,
+            )
+
+        # Solar Pro 호출 경로. LangChain 경로는 trace_sample_rate 비율의 호출만 사용 (나머지는 직접 호출)
+        self.direct_transport = DirectTransport(self)
+        if not self.api_key or config.LLM_TRANSPORT == "direct":
+            self.trace_sample_rate = 0.0
+        elif config.LLM_TRANSPORT == "langchain":
+            self.trace_sample_rate = 1.0
+        else:
+            self.trace_sample_rate = config.LLM_TRACE_SAMPLE_RATE if _langsmith_tracing_enabled() else 0.0
+        # langchain import가 무거우므로 처음 표본에 뽑힌 호출 때 생성
+        self.traced_transport = _NOT_LOADED if self.trace_sample_rate > 0 else None
+
+    async def close(self):
+        """공유 HTTP 커넥션 풀을 종료합니다."""
+        await self.client.aclose()
+
+    def get_metrics(self) -> dict:
+        """
+        커넥션 풀 상태와 재시도 통계를 반환합니다.
+
+        Returns:
+            pool: 풀 설정값, 현재 열린/유휴 커넥션 수, 진행 중인 요청 수
+            retries: 요청/시도/재시도 횟수, 사유별 재시도 횟수, 최종 실패 횟수
+        """
+        # httpx는 풀 상태를 공개 API로 노출하지 않으므로 가능한 경우에만 조회
+        connections = getattr(getattr(self.client._transport, "_pool", None), "connections", None)
+        return {
+            "pool": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry,
+                "connect_timeout": self.timeout.connect,
+                "read_timeout": self.timeout.read,
+                "open_connections": len(connections) if connections is not None else None,
+                "idle_connections": sum(1 for c in connections if c.is_idle()) if connections is not None else None,
+                "in_flight": self.in_flight,
+            },
+            "retries": {
+                **self.stats,
+                "retries_by_reason": dict(self.stats["retries_by_reason"]),
+            },
+            "llm_cache": self.llm_cache.get_metrics() if self.llm_cache else None,
+        }
+
+    def collect_metrics(self):
+        """/metrics 출력용 수집기입니다. 진행 중인 요청 수와 재시도 통계를 내보냅니다."""
+        yield "llm_in_flight_requests", "Upstage API requests in flight.", "gauge", {}, self.in_flight
+        for key in ("requests", "attempts", "retries", "failures"):
+            yield f"llm_{key}_total", f"Upstage API {key}.", "counter", {}, self.stats[key]
+        for reason, count in self.stats["retries_by_reason"].items():
+            yield "llm_retries_by_reason_total", "Upstage API retries by reason.", "counter", {"reason": reason}, count
+
+    def _record_retry(self, retry_state):
+        """재시도 직전에 호출되어 사유별 재시도 횟수를 기록합니다."""
+        exception = retry_state.outcome.exception()
+        status = error_status(exception)
+        if status is not None:
+            reason = str(status)
+            response = error_response(exception)
+            if response is not None and response.headers.get("Retry-After"):
+                self.stats["retry_after_honored"] += 1
         else:
-            self.chat_upstage = None
+            reason = type(exception).__name__
+        self.stats["retries"] += 1
+        self.stats["retries_by_reason"][reason] = self.stats["retries_by_reason"].get(reason, 0) + 1
+        logger.warning(
+            f"Upstage request failed ({reason}), retrying in {retry_state.next_action.sleep:.2f}s "
+            f"(attempt {retry_state.attempt_number}/{config.UPSTAGE_MAX_RETRIES + 1})"
+        )
+
+    def _retrying(self) -> AsyncRetrying:
+        """Upstage API 호출에 공통으로 적용하는 재시도 정책을 생성합니다."""
+        return AsyncRetrying(
+            retry=retry_if_exception(_is_retryable),
+            wait=wait_retry_after(
+                wait_random_exponential(multiplier=config.UPSTAGE_RETRY_BACKOFF, max=config.UPSTAGE_RETRY_MAX_BACKOFF),
+                max_wait=config.UPSTAGE_RETRY_MAX_BACKOFF,
+            ),
+            stop=stop_after_attempt(config.UPSTAGE_MAX_RETRIES + 1),
+            before_sleep=self._record_retry,
+            reraise=True,
+        )
+
+    async def _request(self, method: str, path: str, operation: str, **kwargs) -> httpx.Response:
+        """
+        공유 커넥션 풀로 Upstage API를 호출합니다.
+        재시도 가능한 오류는 지터가 적용된 지수 백오프(또는 Retry-After 값)만큼 기다린 후 재시도합니다.
+
+        Args:
+            method: HTTP 메서드
+            path: base_url 이후의 API 경로 (예: "/solar/chat/completions")
+            operation: 지연 지표(llm_request_seconds)에 기록할 호출 이름
+            **kwargs: httpx 요청 인자 (headers, json, files, data 등)
+
+        Returns:
+            성공한 HTTP 응답
+        """
+        async def send():
+            response = await self.client.request(method, f"{self.base_url}{path}", **kwargs)
+            response.raise_for_status()
+            return response
+
+        return await self._with_retries(operation, send)
+
+    async def _with_retries(self, operation: str, send):
+        """
+        send()를 재시도 정책에 따라 실행하고 요청/시도/실패 통계와 지연 지표를 기록합니다.
+
+        Args:
+            operation: 지연 지표(llm_request_seconds)에 기록할 호출 이름
+            send: 한 번 호출하는 코루틴 함수. 실패는 예외로 알림
+        """
+        self.stats["requests"] += 1
+        self.in_flight += 1
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            async for attempt in self._retrying():
+                with attempt:
+                    self.stats["attempts"] += 1
+                    result = await send()
+                    outcome = "ok"
+                    return result
+        except Exception:
+            self.stats["failures"] += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            metrics.llm_request_seconds.observe(time.perf_counter() - start, operation, outcome)
 
     def _get_headers(self, content_type: str = None):
         """
@@ -64,88 +269,176 @@ class UpstageService:
             headers["Content-Type"] = content_type
         return headers
 
-    def solar_pro(self, messages):
+    async def solar_pro(self, messages, use_cache: bool = True):
         """
         Solar Pro LLM을 호출합니다.
-        LangChain을 통해 호출하여 LangSmith 추적을 지원하며,
-        실패 시 직접 API 호출로 폴백합니다.
+        동일한 모델과 메시지로 이미 호출한 적이 있으면 캐시된 응답을 네트워크 호출 없이 반환합니다.
+        기본적으로 직접 API를 호출하고, LLM_TRANSPORT 설정에 따라 일부(또는 전부)를
+        LangChain을 통해 호출하여 LangSmith에 추적합니다.
 
         Args:
             messages: OpenAI 형식의 메시지 리스트
                       [{"role": "system|user|assistant", "content": "..."}]
+            use_cache: False이면 캐시를 조회하거나 저장하지 않음
 
         Returns:
             OpenAI 호환 형식의 응답 딕셔너리
         """
-        # LangChain이 사용 가능한 경우 LangSmith 추적과 함께 호출
-        if self.chat_upstage:
-            try:
-                from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
-
-                # OpenAI 형식 메시지를 LangChain 형식으로 변환
-                lc_messages = []
-                for msg in messages:
-                    role = msg.get("role")
-                    content = msg.get("content")
-                    if role == "system":
-                        lc_messages.append(SystemMessage(content=content))
-                    elif role == "user":
-                        lc_messages.append(HumanMessage(content=content))
-                    elif role == "assistant":
-                        lc_messages.append(AIMessage(content=content))
-
-                # ChatUpstage 호출 (LangSmith에서 추적됨)
-                logger.info(f"Calling Solar Pro via LangChain with {len(lc_messages)} messages")
-                response = self.chat_upstage.invoke(lc_messages)
-
-                # LangChain 응답을 OpenAI 형식으로 변환하여 호환성 유지
-                return {
-                    "choices": [
-                        {
-                            "message": {
-                                "content": response.content,
-                                "role": "assistant"
-                            }
-                        }
-                    ]
-                }
-            except Exception as e:
-                logger.error(f"LangChain call failed, falling back to direct API: {e}")
-                # 직접 API 호출로 폴백
-
-        # LangChain 사용 불가 또는 실패 시 직접 API 호출
+        cache_key = None
+        if use_cache and self.llm_cache:
+            cache_key = make_cache_key(SOLAR_PRO_MODEL, messages)
+            cached = await self.llm_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Solar Pro response served from cache")
+                return cached
+
+        with metrics.stage("llm_call"):
+            response = await self._call_solar_pro(messages)
+        if cache_key:
+            await self.llm_cache.set(cache_key, response)
+        return response
+
+    async def solar_pro_stream(self, messages, use_cache: bool = True):
+        """
+        Solar Pro LLM을 스트리밍 모드로 호출하여, 생성되는 답변 조각을 차례로 내보내는 비동기 제너레이터입니다.
+        캐시된 응답이 있으면 한 번에 내보내고, 스트림이 끝나면 전체 응답을 캐시에 저장합니다.
+
+        첫 응답을 받기 전의 오류만 재시도합니다. (이미 전송한 조각은 되돌릴 수 없음)
+        LangSmith 추적 없이 직접 API를 호출합니다.
+
+        Args:
+            messages: OpenAI 형식의 메시지 리스트
+            use_cache: False이면 캐시를 조회하거나 저장하지 않음
+
+        Yields:
+            답변 텍스트 조각
+        """
+        cache_key = None
+        if use_cache and self.llm_cache:
+            cache_key = make_cache_key(SOLAR_PRO_MODEL, messages)
+            cached = await self.llm_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Solar Pro response served from cache")
+                yield cached["choices"][0]["message"]["content"]
+                return
+
         headers = self._get_headers("application/json")
-        url = "https://api.upstage.ai/v1/solar/chat/completions"
         data = {
-            "model": "solar-pro3-260126",
-            "messages": messages
+            "model": SOLAR_PRO_MODEL,
+            "messages": messages,
+            "stream": True
         }
-        response = requests.post(url, headers=headers, json=data)
-        logger.info(f"Solar Pro API Response Status: {response.status_code}, Body: {response.text}")
-        response.raise_for_status()
-        return response.json()
+        content = []
+        self.stats["requests"] += 1
+        self.in_flight += 1
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            async for attempt in self._retrying():
+                with attempt:
+                    self.stats["attempts"] += 1
+                    request = self.client.build_request(
+                        "POST", f"{self.base_url}/solar/chat/completions", headers=headers, json=data
+                    )
+                    response = await self.client.send(request, stream=True)
+                    if response.is_error:
+                        await response.aread()
+                        await response.aclose()
+                        response.raise_for_status()
+
+            try:
+                # Server-Sent Events: "data: {...}" 줄마다 delta 조각, 마지막은 "data: [DONE]"
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    payload = line[len("data:"):].strip()
+                    if payload == "[DONE]":
+                        break
+                    for choice in json.loads(payload).get("choices", []):
+                        delta = (choice.get("delta") or {}).get("content")
+                        if delta:
+                            content.append(delta)
+                            yield delta
+            finally:
+                await response.aclose()
+            outcome = "ok"
+        except Exception:
+            self.stats["failures"] += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            # 클라이언트가 중간에 끊은 스트림(GeneratorExit)은 error로 기록됨
+            metrics.llm_request_seconds.observe(time.perf_counter() - start, "solar_pro_stream", outcome)
+
+        if cache_key:
+            await self.llm_cache.set(cache_key, {
+                "choices": [{"message": {"content": "".join(content), "role": "assistant"}}]
+            })
+
+    async def evict_cached_response(self, messages):
+        """
+        캐시된 Solar Pro 응답을 삭제합니다.
+        응답이 형식 검증에 실패했을 때 같은 잘못된 응답이 재사용되지 않도록 호출합니다.
+        """
+        if self.llm_cache:
+            await self.llm_cache.delete(make_cache_key(SOLAR_PRO_MODEL, messages))
+
+    def _select_transport(self):
+        """이번 호출의 경로를 고릅니다. 표본에 뽑히고 ChatUpstage를 사용할 수 있을 때만 LangChain 경로입니다."""
+        if self.traced_transport is None or random.random() >= self.trace_sample_rate:
+            return self.direct_transport
+        if self.traced_transport is _NOT_LOADED:
+            self.traced_transport = LangChainTransport.load(
+                self.api_key, self.base_url, SOLAR_PRO_MODEL, config.UPSTAGE_READ_TIMEOUT
+            )
+        return self.traced_transport or self.direct_transport
+
+    async def _call_solar_pro(self, messages):
+        """
+        Solar Pro를 실제로 호출합니다. (캐시를 거치지 않음)
 
-    def document_parse(self, file_path):
+        재시도는 어느 경로든 _with_retries 한 곳에서만 합니다.
+        LangChain 경로는 요청이 API에 도달하기 전 실패(LOCAL)한 경우에만 직접 호출로 폴백하며,
+        API가 응답한 오류는 이미 재시도를 마친 결과이므로 다시 보내지 않고 그대로 전달합니다.
+        """
+        transport = self._select_transport()
+        operation = "solar_pro" if transport is self.direct_transport else f"solar_pro_{transport.name}"
+        try:
+            result = await self._with_retries(operation, lambda: transport.send(messages, SOLAR_PRO_MODEL))
+        except Exception as e:
+            if transport is self.direct_transport or classify_error(e) != LOCAL:
+                raise
+            logger.error(f"LangChain call failed before reaching the API, falling back to direct API: {e}")
+            transport = self.direct_transport
+            result = await self._with_retries("solar_pro", lambda: transport.send(messages, SOLAR_PRO_MODEL))
+        metrics.record_llm_usage(result.get("usage"))
+        return result
+
+    async def document_parse(self, document, filename: str):
         """
         Document Parse API를 사용하여 문서(명함, PDF 등)에서 텍스트를 추출합니다.
 
         Args:
-            file_path: 파싱할 문서 파일 경로
+            document: 파싱할 문서 (파일 객체 또는 bytes). 파일 객체는 디스크에 저장하지 않고
+                      멀티파트 요청으로 바로 스트리밍되며, 재시도 시 처음부터 다시 읽힙니다.
+            filename: 문서 파일 이름
 
         Returns:
             파싱 결과 JSON (elements 리스트 포함)
         """
-        headers = self._get_headers()  # requests가 multipart/form-data 헤더를 자동으로 설정
-        url = "https://api.upstage.ai/v1/document-digitization"
-        files = {'document': open(file_path, 'rb')}
+        headers = self._get_headers()  # httpx가 multipart/form-data 헤더를 자동으로 설정
+        files = {'document': (filename, document)}
         data = {"ocr": "force", "model": "document-parse"}
 
-        response = requests.post(url, headers=headers, files=files, data=data)
-        logger.info(f"Document Digitization API Response Status: {response.status_code}, Body: {response.text}")
-        response.raise_for_status()
+        with metrics.stage("ocr"):
+            response = await self._request(
+                "POST", "/document-digitization", "document_parse", headers=headers, files=files, data=data
+            )
+        logger.info(f"Document Digitization API Response Status: {response.status_code}, {len(response.content)} bytes")
+        debug_payload(logger, "Document Digitization API response body", body=response.text)
         return response.json()
 
-    def information_extraction(self, document_id):
+    async def information_extraction(self, document_id):
         """
         Information Extraction API를 사용하여 문서에서 구조화된 정보를 추출합니다.
 
@@ -156,19 +449,10 @@ class UpstageService:
             추출된 정보 JSON
         """
         headers = self._get_headers()
-        url = f"https://api.upstage.ai/v1/document-ai/information-extraction/{document_id}"
-        response = requests.get(url, headers=headers)
-        logger.info(f"Information Extraction API Response Status: {response.status_code}, Body: {response.text}")
-        response.raise_for_status()
+        response = await self._request(
+            "GET", f"/document-ai/information-extraction/{document_id}", "information_extraction", headers=headers
+        )
+        logger.info(f"Information Extraction API Response Status: {response.status_code}, {len(response.content)} bytes")
+        debug_payload(logger, "Information Extraction API response body", body=response.text)
         return response.json()
 
-
-# Upstage 서비스 싱글톤 인스턴스
-# UPSTAGE_API_KEY 환경 변수가 설정되어 있을 때만 생성
-upstage_service = None
-if os.getenv("UPSTAGE_API_KEY"):
-    try:
-        upstage_service = UpstageService()
-    except Exception as e:
-        logger.error(f"Failed to initialize UpstageService: {e}")
-        upstage_service = None
\ No newline at end of file
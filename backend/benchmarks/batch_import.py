@@ -0,0 +1,88 @@
+"""
+명함 일괄 등록(/api/extract-business-cards)의 처리량(cards/minute)을 측정합니다.
+
+가짜 Upstage 서버가 OCR과 LLM 호출에 실제와 비슷한 지연(정규분포)을 주입하며,
+동시 처리 수별로 NDJSON 스트림이 끝날 때까지의 시간을 측정합니다.
+캐시 효과를 배제하기 위해 명함 이미지는 모두 다르고 LLM 캐시는 끕니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.batch_import --cards 100 --concurrency 1 4 8 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+import httpx
+
+from benchmarks.fake_upstage import chat_response, start_fake_upstage
+
+CARD_JSON = json.dumps({"name": "김성길", "title": "과장", "company": "ABC상사", "phone": "010-2222-1234"},
+                       ensure_ascii=False)
+
+
+def make_latency_fn(ocr_latency: float, llm_latency: float, seed: int = 0):
+    """경로별 평균 지연에 ±25% 표준편차의 정규분포 지터를 더한 지연 함수를 만듭니다."""
+    rng = random.Random(seed)
+
+    def latency(path: str) -> float:
+        mean = ocr_latency if path.endswith("/document-digitization") else llm_latency
+        return max(0.0, rng.gauss(mean, mean * 0.25))
+
+    return latency
+
+
+async def run_batch(app, cards: int, concurrency: int) -> float:
+    """명함 cards장을 한 번의 일괄 요청으로 보내고 스트림이 끝날 때까지 걸린 시간을 반환합니다."""
+    files = [("files", (f"card_{i}.png", f"fake card image {i} {time.time_ns()}".encode())) for i in range(cards)]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        async with client.stream("POST", "/api/extract-business-cards", files=files,
+                                 params={"concurrency": concurrency}) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                event = json.loads(line)
+                if event["event"] == "done":
+                    assert event["succeeded"] == cards, event
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--ocr-latency", type=float, default=1.2, help="Document Parse 평균 지연 (초)")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="Solar Pro 평균 지연 (초)")
+    parser.add_argument("--rate-limit", type=float, default=0, help="초당 시작 명함 수 (0이면 제한 없음)")
+    args = parser.parse_args()
+
+    server, base_url = start_fake_upstage(
+        latency_fn=make_latency_fn(args.ocr_latency, args.llm_latency),
+        chat_response_fn=lambda request: chat_response(CARD_JSON),
+    )
+    # 설정은 import 시점에 읽으므로 앱 import 전에 환경 변수를 지정
+    os.environ["UPSTAGE_BASE_URL"] = base_url
+    os.environ.setdefault("UPSTAGE_API_KEY", "fake-key")
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.environ["BATCH_IMPORT_RATE_LIMIT"] = str(args.rate_limit)
+    os.environ["BATCH_IMPORT_MAX_CONCURRENCY"] = str(max(args.concurrency))
+    from app.main import app
+    from app.api import dependencies
+    dependencies.upstage_service().traced_transport = None
+
+    async def run_all():
+        # 공유 커넥션 풀이 하나의 이벤트 루프에 묶이므로 모든 측정을 같은 루프에서 실행
+        print(f"{'concurrency':>12}{'seconds':>10}{'cards/min':>12}")
+        for concurrency in args.concurrency:
+            elapsed = await run_batch(app, args.cards, concurrency)
+            print(f"{concurrency:>12}{elapsed:>10.2f}{args.cards / elapsed * 60:>12.1f}")
+
+    asyncio.run(run_all())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
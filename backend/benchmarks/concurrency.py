@@ -0,0 +1,141 @@
+"""
+/query 엔드포인트의 동시 처리 성능을 측정하는 부하 벤치마크입니다.
+
+Upstage와 Neo4j를 지연 시간만 흉내 내는 스텁으로 대체한 뒤,
+동시 클라이언트 N개가 요청을 보낼 때의 p50/p99 지연 시간을 비교합니다.
+
+- blocking: 동기 호출(time.sleep)을 async 핸들러에서 실행하던 기존 방식
+- async: 비동기 서비스(await asyncio.sleep)로 포팅한 현재 방식
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.concurrency --clients 50 --requests 200
+"""
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import time
+
+import httpx
+import uvicorn
+
+from app.main import app
+from app.api import dependencies
+
+
+class StubUpstageService:
+    """Solar Pro 호출을 고정 지연 후 미리 정한 응답으로 대체합니다."""
+
+    def __init__(self, latency: float, blocking: bool):
+        self.latency = latency
+        self.blocking = blocking
+
+    async def solar_pro(self, messages, **kwargs):
+        if self.blocking:
+            time.sleep(self.latency)
+        else:
+            await asyncio.sleep(self.latency)
+        if "Cypher" in messages[0]["content"]:
+            content = 'MATCH (p:Person) WHERE p.name CONTAINS "김성길" RETURN p.phone'
+        else:
+            content = "김성길님의 전화번호는 010-1234-5678입니다."
+        return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+class StubNeo4jService:
+    """Cypher 실행을 고정 지연 후 미리 정한 결과로 대체합니다."""
+
+    def __init__(self, latency: float, blocking: bool):
+        self.latency = latency
+        self.blocking = blocking
+
+    async def run_bounded_query(self, query, parameters=None, **kwargs):
+        if self.blocking:
+            time.sleep(self.latency)
+        else:
+            await asyncio.sleep(self.latency)
+        return [{"p.phone": "010-1234-5678"}], False
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def serve(port: int, llm_latency: float, db_latency: float, blocking: bool):
+    """스텁 서비스를 주입한 뒤 uvicorn 서버를 실행합니다. (서버 프로세스에서 실행)"""
+    upstage_service = StubUpstageService(llm_latency, blocking)
+    neo4j_service = StubNeo4jService(db_latency, blocking)
+    app.dependency_overrides[dependencies.get_upstage_service] = lambda: upstage_service
+    app.dependency_overrides[dependencies.get_neo4j_service] = lambda: neo4j_service
+    # lifespan을 끄면 실제 Neo4j/Upstage 연결 없이 스텁만으로 실행됨
+    uvicorn.run(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning")
+
+
+def start_server(llm_latency: float, db_latency: float, blocking: bool):
+    """
+    별도 프로세스에서 서버를 실행합니다.
+    부하 생성기와 서버가 이벤트 루프(및 GIL)를 공유하지 않아야 서버 루프가 막힌 시간이 지연 시간에 반영됩니다.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    process = multiprocessing.Process(target=serve, args=(port, llm_latency, db_latency, blocking), daemon=True)
+    process.start()
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(500):
+        try:
+            httpx.get(f"{base_url}/health")
+            break
+        except httpx.TransportError:
+            time.sleep(0.02)
+    return process, base_url
+
+
+async def run_load(base_url: str, clients: int, total_requests: int):
+    """동시 클라이언트 수만큼 워커를 띄워 /api/query를 호출하고 요청별 지연 시간을 반환합니다."""
+    latencies = []
+    counter = iter(range(total_requests))
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=None) as client:
+        async def worker():
+            for _ in counter:
+                start = time.perf_counter()
+                response = await client.post("/api/query", json={"question": "김성길 전화번호?"})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Solar Pro 호출당 지연 (초)")
+    parser.add_argument("--db-latency", type=float, default=0.005, help="Cypher 실행당 지연 (초)")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'p50 (ms)':>12}{'p99 (ms)':>12}{'req/s':>10}")
+    for mode in ("blocking", "async"):
+        process, base_url = start_server(args.llm_latency, args.db_latency, blocking=mode == "blocking")
+        try:
+            latencies, elapsed = asyncio.run(run_load(base_url, args.clients, args.requests))
+        finally:
+            process.terminate()
+            process.join()
+        print(
+            f"{mode:<10}{percentile(latencies, 50) * 1000:>12.1f}{percentile(latencies, 99) * 1000:>12.1f}"
+            f"{len(latencies) / elapsed:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+/memo, /query, /extract-business-card, /save-contact의 종단 간 처리량과 지연을 측정합니다.
+
+1. 워크로드를 생성(또는 --workload 파일에서 로드)합니다. 그래프 크기는 1k/10k/100k 연락처 또는 임의의 수입니다.
+2. 가짜 Upstage 서버가 워크로드에 녹화된 Solar Pro/Document Parse 응답을 지정한 지연 분포로 재생합니다.
+3. 그래프 저장소(GRAPH_BACKEND)에 연락처를 미리 저장한 뒤, 실제 UpstageService와 저장소로 앱에 동시 요청을 보냅니다.
+4. 시나리오별 req/s, p50/p95/p99, 요청당 Neo4j 왕복 수와 Upstage 호출 수를 출력하고 --output JSON 파일에 기록합니다.
+   --compare로 이전 커밋의 결과 파일을 지정하면 시나리오별 변화율을 함께 출력합니다.
+
+부하 생성기와 앱이 같은 이벤트 루프에서 실행되므로 절대값보다 커밋 간 비교에 사용합니다.
+LLM/OCR 응답 캐시는 기본으로 끕니다 (--cache로 켬). memory 저장소는 Cypher를 실행할 수 없어 /query를 건너뜁니다.
+neo4j 저장소는 실제로 데이터를 쓰므로 버려도 되는 데이터베이스에서 실행하세요.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.e2e --graph-size 1k --requests 200 --backend memory --output before.json
+    python -m benchmarks.e2e --graph-size 1k --requests 200 --backend memory --compare before.json
+    NEO4J_URI=bolt://localhost:7687 python -m benchmarks.e2e --graph-size 10k --backend neo4j \\
+        --llm-latency lognormal:0.8:0.4 --ocr-latency lognormal:1.5:0.3 --output neo4j-10k.json
+    python -m benchmarks.e2e --graph-size 100k --save-workload workload-100k.json --requests 0   # 워크로드만 기록
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from benchmarks.fake_upstage import RecordedResponses, parse_latency, start_fake_upstage
+from benchmarks.workloads import GRAPH_SIZES, build_workload, card_image, load_workload, save_workload
+
+SCENARIOS = ("memo", "query", "business-card", "save-contact")
+
+# 그래프 미리 저장 시 트랜잭션 하나에 담는 연락처 수
+SEED_BATCH_SIZE = 1000
+
+
+def percentile(ordered: list, pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def neo4j_round_trips() -> int:
+    """지금까지 기록된 Neo4j 쿼리(트랜잭션) 수입니다. (neo4j_query_seconds의 관측 수 합계)"""
+    from app.core import metrics
+    return sum(sum(series[:-1]) for series in metrics.neo4j_query_seconds.values.values())
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--", "app"], capture_output=True, text=True).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def scenario_requests(name: str, workload: dict) -> list:
+    """시나리오의 요청 목록을 (method, path, kwargs)로 만듭니다."""
+    if name == "memo":
+        return [("POST", "/api/memo", {"json": {"text": memo["text"]}}) for memo in workload["memos"]]
+    if name == "query":
+        return [("POST", "/api/query", {"json": {"question": q["question"]}}) for q in workload["questions"]]
+    if name == "business-card":
+        return [
+            ("POST", "/api/extract-business-card", {"files": {"file": (card["filename"], card_image(card["card_id"]), "image/png")}})
+            for card in workload["cards"]
+        ]
+    return [("POST", "/api/save-contact", {"json": contact}) for contact in workload["new_contacts"]]
+
+
+async def seed_graph(store, contacts: list) -> float:
+    """연락처(Person, Company, WORKS_AT)를 저장소에 미리 저장하고 걸린 시간(초)을 반환합니다."""
+    start = time.perf_counter()
+    for offset in range(0, len(contacts), SEED_BATCH_SIZE):
+        await store.save_contacts([
+            {
+                "name": contact["name"],
+                "properties": {key: contact[key] for key in ("title", "phone", "email")},
+                "company": contact["company"],
+            }
+            for contact in contacts[offset:offset + SEED_BATCH_SIZE]
+        ])
+    return time.perf_counter() - start
+
+
+async def run_scenario(client, upstage_service, requests: list, warmup: int, concurrency: int) -> dict:
+    for method, path, kwargs in requests[:warmup]:
+        await client.request(method, path, **kwargs)
+    measured = requests[warmup:]
+    if not measured:
+        return None
+
+    latencies = []
+    errors = {}
+    pending = iter(measured)
+    round_trips_before = neo4j_round_trips()
+    upstage_before = upstage_service.stats["requests"]
+
+    async def worker():
+        for method, path, kwargs in pending:
+            start = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors[response.status_code] = errors.get(response.status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": {str(status): n for status, n in sorted(errors.items())},
+        "req_per_s": round(count / elapsed, 2),
+        "mean_ms": round(sum(latencies) / count * 1000, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "neo4j_round_trips_per_request": round((neo4j_round_trips() - round_trips_before) / count, 2),
+        "upstage_calls_per_request": round((upstage_service.stats["requests"] - upstage_before) / count, 2),
+    }
+
+
+async def connect_store(store):
+    """저장소에 연결합니다. Neo4j는 connect()의 재시도를 기다리지 않고 한 번만 시도합니다."""
+    retry_with = getattr(type(store).connect, "retry_with", None)
+    if retry_with:
+        await asyncio.wait_for(retry_with(stop=lambda state: True, reraise=True)(store), timeout=30)
+    else:
+        await store.connect()
+
+
+async def run(args, workload: dict) -> dict:
+    import httpx
+    from app.main import app
+    from app.api import dependencies
+
+    store = dependencies.neo4j_service()
+    upstage_service = dependencies.upstage_service()
+    await connect_store(store)
+
+    result = {"seed_seconds": None, "scenarios": {}}
+    try:
+        if not args.no_seed:
+            result["seed_seconds"] = round(await seed_graph(store, workload["contacts"]), 2)
+            print(f"seeded {len(workload['contacts'])} contacts in {result['seed_seconds']}s")
+
+        limits = httpx.Limits(max_connections=args.concurrency)
+        # lifespan을 실행하지 않으므로 위에서 연결한 저장소와 Upstage 서비스만으로 처리됨
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench",
+                                     limits=limits, timeout=None) as client:
+            for name in args.scenarios:
+                if name == "query" and args.backend != "neo4j":
+                    print(f"[{name}] skipped: Cypher queries need the neo4j backend")
+                    continue
+                requests = scenario_requests(name, workload)
+                result["scenarios"][name] = await run_scenario(
+                    client, upstage_service, requests, args.warmup, args.concurrency
+                )
+    finally:
+        await dependencies.close_services()
+    return result
+
+
+def print_results(results: dict, baseline: dict = None):
+    header = f"{'scenario':<15}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'neo4j rt':>10}{'upstage':>9}{'errors':>8}"
+    print(header)
+    for name, scenario in results["scenarios"].items():
+        if scenario is None:
+            continue
+        print(
+            f"{name:<15}{scenario['req_per_s']:>9.1f}{scenario['p50_ms']:>10.1f}{scenario['p95_ms']:>10.1f}"
+            f"{scenario['p99_ms']:>10.1f}{scenario['neo4j_round_trips_per_request']:>10.2f}"
+            f"{scenario['upstage_calls_per_request']:>9.2f}{sum(scenario['errors'].values()):>8}"
+        )
+
+    if not baseline:
+        return
+    print(f"\nchange vs {baseline.get('commit', 'baseline')} (negative latency / positive req/s is better)")
+    print(f"{'scenario':<15}{'req/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'neo4j rt':>10}")
+    for name, scenario in results["scenarios"].items():
+        before = (baseline.get("scenarios") or {}).get(name)
+        if scenario is None or before is None:
+            continue
+
+        def change(key):
+            return f"{(scenario[key] - before[key]) / before[key]:+.1%}" if before[key] else "n/a"
+
+        round_trips = scenario["neo4j_round_trips_per_request"] - before["neo4j_round_trips_per_request"]
+        print(f"{name:<15}{change('req_per_s'):>9}{change('p50_ms'):>10}{change('p95_ms'):>10}{change('p99_ms'):>10}"
+              f"{round_trips:>+10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graph-size", default="1k", help="미리 저장할 연락처 수 (1k, 10k, 100k 또는 숫자)")
+    parser.add_argument("--requests", type=int, default=200, help="시나리오별 측정 요청 수")
+    parser.add_argument("--warmup", type=int, default=10, help="시나리오별 측정 전 요청 수")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--backend", default=os.getenv("GRAPH_BACKEND", "memory"), choices=["memory", "neo4j"])
+    parser.add_argument("--llm-latency", default="lognormal:0.05:0.5", help="Solar Pro 지연 분포 (fake_upstage.parse_latency 형식)")
+    parser.add_argument("--ocr-latency", default="lognormal:0.1:0.3", help="Document Parse 지연 분포")
+    parser.add_argument("--cache", action="store_true", help="LLM/OCR 응답 캐시를 켬")
+    parser.add_argument("--no-seed", action="store_true", help="이미 저장된 그래프를 사용 (neo4j)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workload", help="save-workload로 기록한 워크로드 파일")
+    parser.add_argument("--save-workload", help="생성한 워크로드를 기록할 파일")
+    parser.add_argument("--output", help="결과를 기록할 JSON 파일")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args()
+
+    if args.workload:
+        workload = load_workload(args.workload)
+    else:
+        graph_size = GRAPH_SIZES.get(args.graph_size) or int(args.graph_size)
+        workload = build_workload(graph_size, args.requests + args.warmup, args.seed)
+    if args.save_workload:
+        save_workload(workload, args.save_workload)
+        print(f"workload saved to {args.save_workload}")
+    if not args.requests:
+        return
+
+    llm_latency = parse_latency(args.llm_latency, args.seed)
+    ocr_latency = parse_latency(args.ocr_latency, args.seed + 1)
+    recorded = RecordedResponses(workload)
+    server, base_url = start_fake_upstage(
+        latency_fn=lambda path: ocr_latency() if "document-digitization" in path else llm_latency(),
+        chat_response_fn=recorded.chat, document_parse_fn=recorded.document_parse, seed=args.seed,
+    )
+
+    # 설정은 import 시점에 읽으므로 앱 import 전에 환경 변수를 지정
+    os.environ["UPSTAGE_BASE_URL"] = base_url
+    os.environ["UPSTAGE_API_KEY"] = "fake-key"
+    os.environ["GRAPH_BACKEND"] = args.backend
+    os.environ["LLM_TRANSPORT"] = "direct"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if not args.cache:
+        os.environ["LLM_CACHE_ENABLED"] = "false"
+        os.environ["OCR_CACHE_ENABLED"] = "false"
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {
+            "backend": args.backend,
+            "graph_size": workload["graph_size"],
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "llm_latency": args.llm_latency,
+            "ocr_latency": args.ocr_latency,
+            "cache": args.cache,
+            "seed": workload["seed"],
+        },
+    }
+    try:
+        results.update(asyncio.run(run(args, workload)))
+    finally:
+        server.shutdown()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != results["config"]:
+            print(f"warning: configuration differs from {args.compare}")
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+중복 엔티티 병합 작업(app.services.entity_dedup)의 정확도, 단계별 시간, 메모리 사용량을 측정합니다.
+
+메모리 그래프 저장소에 연락처를 저장한 뒤 종류별로 알려진 중복을 넣고 작업을 실행합니다.
+- honorific: "이인영님" (메모에서만 언급된 노드, 이벤트 참석 관계 포함)
+- title: "이인영 과장" (원본과 같은 전화번호/이메일)
+- given: "인영" (성을 뺀 이름. 같은 이름의 인물이 여럿이면 모호하므로 병합하지 않는 것이 정상)
+- company: "(주)ABC상사" (소속 직원 한 명이 연결됨)
+- homonym: "이인영 부장" (전화번호가 다른 동명이인, 병합되면 안 됨)
+재현율은 종류별로 원본에 병합된 비율, 정밀도는 계획된 병합 중 원본으로 올바르게 병합된 비율입니다.
+메모리는 작업 전후 최대 RSS 차이(그래프 저장소 제외)와 상태 파일 크기로 보고합니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.entity_dedup --graph-size 10k
+    python -m benchmarks.entity_dedup --graph-size 250000 --duplicate-ratio 0.05 --page-size 5000
+"""
+import argparse
+import asyncio
+import os
+import random
+import resource
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.workloads import GRAPH_SIZES, generate_contacts
+
+DUPLICATE_KINDS = ("honorific", "title", "given", "company", "homonym")
+
+
+def inject_duplicates(contacts: list, ratio: float, seed: int = 0):
+    """
+    연락처 일부에 대한 중복 노드를 만듭니다.
+
+    Returns:
+        (연락처 목록, 메모로 저장할 [(인물 이름, 이벤트 이름)], {(레이블, 중복 이름): (종류, 원본 이름)})
+    """
+    rng = random.Random(seed)
+    extra_contacts, mentions, expected = [], [], {}
+    companies = sorted({contact["company"] for contact in contacts})
+    duplicated_companies = set(rng.sample(companies, int(len(companies) * ratio)))
+    for index, contact in enumerate(contacts):
+        name = contact["name"]
+        if contact["company"] in duplicated_companies:
+            duplicated_companies.discard(contact["company"])
+            variant = f"(주){contact['company']}"
+            extra_contacts.append({"name": name, "properties": {}, "company": variant})
+            expected[("Company", variant)] = ("company", contact["company"])
+        if rng.random() >= ratio:
+            continue
+        kind = rng.choice(DUPLICATE_KINDS[:3] + DUPLICATE_KINDS[4:])
+        if kind == "honorific":
+            mentions.append((f"{name}님", f"{contact['company']} 미팅 {index}"))
+            expected[("Person", f"{name}님")] = (kind, name)
+        elif kind == "title":
+            variant = f"{name} {contact['title']}"
+            extra_contacts.append({
+                "name": variant,
+                "properties": {"phone": contact["phone"], "email": contact["email"].upper()},
+                "company": contact["company"],
+            })
+            expected[("Person", variant)] = (kind, name)
+        elif kind == "given":
+            mentions.append((name[1:], f"{contact['company']} 통화 {index}"))
+            expected[("Person", name[1:])] = (kind, name)
+        else:
+            variant = f"{name} 부장"
+            extra_contacts.append({"name": variant, "properties": {"phone": "010-9" + contact["phone"][5:]}, "company": None})
+            expected[("Person", variant)] = (kind, None)
+    return extra_contacts, mentions, expected
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run(args, contacts: list):
+    from app.services.entity_dedup import EntityDeduplicator
+    from app.services.memory_graph import InMemoryGraphStore
+
+    store = InMemoryGraphStore()
+    await store.connect()
+    extra_contacts, mentions, expected = inject_duplicates(contacts, args.duplicate_ratio, args.seed)
+    base = [
+        {
+            "name": contact["name"],
+            "properties": {"title": contact["title"], "phone": contact["phone"], "email": contact["email"]},
+            "company": contact["company"],
+        }
+        for contact in contacts
+    ]
+    for start in range(0, len(base), 1000):
+        await store.save_contacts(base[start:start + 1000])
+    await store.save_contacts(extra_contacts)
+    for index, (name, event) in enumerate(mentions):
+        await store.save_memo_graph(
+            {"id": f"memo_{index}", "text": f"{name} {event}", "timestamp": "2026-02-04T10:00:00", "business_related": True},
+            [{"type": "Person", "name": name, "properties": {}}, {"type": "Event", "name": event, "properties": {}}],
+            [{"from": name, "to": event, "type": "ATTENDED"}],
+        )
+    nodes = sum(len(names) for names in store.nodes.values()) + len(store.memos)
+    print(f"graph: {nodes} nodes ({len(store.nodes['Person'])} Person, {len(store.nodes['Company'])} Company), "
+          f"{store.relationship_count} relationships")
+    print("injected: " + ", ".join(
+        f"{kind} {sum(1 for k, _ in expected.values() if k == kind)}" for kind in DUPLICATE_KINDS
+    ))
+
+    state_path = args.state or os.path.join(tempfile.mkdtemp(), "entity_dedup.db")
+    rss_before = peak_rss_mb()
+    deduplicator = EntityDeduplicator(
+        store, state_path, page_size=args.page_size, merge_batch_size=args.merge_batch_size,
+        max_block_size=args.max_block_size, threshold=args.threshold,
+    )
+    start = time.perf_counter()
+    summary = await deduplicator.run(dry_run=args.dry_run)
+    elapsed = time.perf_counter() - start
+    deduplicator.close()
+
+    db = sqlite3.connect(state_path)
+    merges = db.execute("SELECT label, keep, duplicate FROM merges").fetchall()
+    db.close()
+    correct = sum(1 for label, keep, duplicate in merges if expected.get((label, duplicate), (None, None))[1] == keep)
+    merged = {(label, duplicate): keep for label, keep, duplicate in merges}
+
+    print(f"\ntotal {elapsed:.1f}s (" + ", ".join(f"{phase} {seconds:.1f}s" for phase, seconds in summary["seconds"].items()) + ")")
+    print(f"blocks compared: {summary['blocks_compared']}, large blocks skipped: {summary['large_blocks_skipped']}, "
+          f"matched pairs: {summary['matched_pairs']}, ambiguous names: {summary['ambiguous_names']}, "
+          f"conflicting groups: {summary['conflicting_groups']}")
+    print(f"planned merges: {len(merges)}, precision {correct / len(merges) if merges else 1:.1%}")
+    for kind in DUPLICATE_KINDS:
+        keys = [key for key, (k, _) in expected.items() if k == kind]
+        hits = sum(1 for key in keys if merged.get(key) == expected[key][1] and expected[key][1])
+        if kind == "homonym":
+            print(f"  {kind:<10} wrongly merged {sum(1 for key in keys if key in merged)}/{len(keys)}")
+        elif keys:
+            print(f"  {kind:<10} recall {hits / len(keys):.1%} ({hits}/{len(keys)})")
+    if not args.dry_run:
+        print(f"graph after merge: {len(store.nodes['Person'])} Person, {len(store.nodes['Company'])} Company, "
+              f"{store.relationship_count} relationships ({summary['relationships_moved']} moved)")
+    print(f"peak RSS increase during job: {peak_rss_mb() - rss_before:.0f} MB, "
+          f"state file: {os.path.getsize(state_path) / 1e6:.1f} MB ({state_path})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graph-size", default="10k", help="원본 연락처 수 (1k, 10k, 100k 또는 숫자)")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.05, help="중복을 만들 연락처/회사 비율")
+    parser.add_argument("--page-size", type=int, default=5000)
+    parser.add_argument("--merge-batch-size", type=int, default=200)
+    parser.add_argument("--max-block-size", type=int, default=50)
+    parser.add_argument("--threshold", type=float, default=0.7)
+    parser.add_argument("--dry-run", action="store_true", help="병합 계획까지만 실행")
+    parser.add_argument("--state", help="상태 파일 경로 (기본값: 임시 파일)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    graph_size = GRAPH_SIZES.get(args.graph_size) or int(args.graph_size)
+    asyncio.run(run(args, generate_contacts(graph_size, args.seed)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+프로세스 내 이름 인덱스(EntityNameIndex)와 기존 CONTAINS 스캔의 부분 이름 매칭 성능을 비교합니다.
+
+- index: EntityNameIndex.find_best_matching_person
+- scan: 기존 Cypher와 같은 조건(`name CONTAINS q OR q CONTAINS name`)을 Python으로 전체 스캔
+        (네트워크와 DB 오버헤드가 없는 하한값이며, 두 결과가 모두 같은지도 검증)
+- cypher (--neo4j 지정 시): 실제 Neo4j에 Person 노드를 적재한 뒤 기존 Cypher 경로를 측정
+        (주의: 대상 데이터베이스에 Person 노드를 생성합니다)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.entity_matcher --persons 100000 --queries 2000
+    NEO4J_URI=bolt://localhost:7687 python -m benchmarks.entity_matcher --neo4j --queries 200
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.services.entity_matcher import EntityNameIndex, clean_person_name
+from benchmarks.workloads import generate_korean_names
+
+
+def scan_best_matching_person(partial_name: str, persons: dict) -> str:
+    """기존 Cypher 쿼리와 같은 조건과 순위로 전체 Person을 스캔합니다."""
+    clean_name = clean_person_name(partial_name)
+    if not clean_name:
+        return partial_name
+    results = sorted(
+        (name for name in persons if clean_name in name or name in clean_name),
+        key=lambda name: (-len(name), name),
+    )
+    if not results:
+        return partial_name
+    for name in results:
+        if persons[name]:
+            return name
+    return results[0]
+
+
+def make_queries(names: list, count: int, seed: int = 1) -> list:
+    """전체 이름, 이름(성 제외), "님" 접미사, 존재하지 않는 이름을 섞은 질의를 만듭니다."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        name = rng.choice(names)
+        queries.append(rng.choice([name, name[1:], name[1:] + "님", name + " 님", "없는이름" + name[-1]]))
+    return queries
+
+
+def report(label: str, latencies: list):
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2] * 1e6
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e6
+    print(f"{label:<8}{p50:>12.1f}{p99:>12.1f}")
+
+
+async def run_cypher(persons: dict, queries: list):
+    """Neo4j에 Person 노드를 적재하고 기존 Cypher 경로(인덱스 비활성화)로 질의합니다."""
+    from app.services.neo4j_service import Neo4jService
+
+    service = Neo4jService()
+    service.entity_index = None
+    await service.connect()
+    rows = [{"name": name, "properties": {"phone": "010-0000-0000"} if contact else {}}
+            for name, contact in persons.items()]
+    async with service.driver.session() as session:
+        for start in range(0, len(rows), 10000):
+            await session.run("UNWIND $rows AS row MERGE (p:Person {name: row.name}) SET p += row.properties",
+                              rows=rows[start:start + 10000])
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        await service.find_best_matching_person(query)
+        latencies.append(time.perf_counter() - start)
+    await service.close()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--persons", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--contact-ratio", type=float, default=0.3)
+    parser.add_argument("--neo4j", action="store_true", help="실제 Neo4j로 Cypher 경로도 측정")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = generate_korean_names(args.persons)
+    persons = {name: rng.random() < args.contact_ratio for name in names}
+    queries = make_queries(names, args.queries)
+
+    index = EntityNameIndex()
+    start = time.perf_counter()
+    for name, contact in persons.items():
+        index.add("Person", name, contact)
+    print(f"index build: {args.persons} persons in {time.perf_counter() - start:.2f}s")
+
+    index_latencies, scan_latencies, mismatches = [], [], 0
+    for query in queries:
+        start = time.perf_counter()
+        indexed = index.find_best_matching_person(query)
+        index_latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        scanned = scan_best_matching_person(query, persons)
+        scan_latencies.append(time.perf_counter() - start)
+        mismatches += indexed != scanned
+
+    print(f"ranking mismatches vs scan: {mismatches}/{len(queries)}")
+    print(f"{'path':<8}{'p50 (us)':>12}{'p99 (us)':>12}")
+    report("index", index_latencies)
+    report("scan", scan_latencies)
+    if args.neo4j:
+        report("cypher", asyncio.run(run_cypher(persons, queries)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+로컬 테스트용 가짜 Upstage API 서버입니다.
+
+Solar Pro(스트리밍 포함), Document Parse, Information Extraction 엔드포인트를 흉내 내며,
+응답 지연과 429(Retry-After 포함)/503 오류를 설정한 비율로 주입합니다.
+지연은 고정값 또는 분포(parse_latency 형식)로 지정하고, RecordedResponses로 워크로드에 녹화된 응답을 재생할 수 있습니다.
+
+단독 실행 (backend 디렉터리에서):
+    python -m benchmarks.fake_upstage --port 8001 --latency 0.2 --rate-limit-ratio 0.2
+    UPSTAGE_BASE_URL=http://127.0.0.1:8001/v1 UPSTAGE_API_KEY=fake uvicorn app.main:app
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAT_CONTENT = 'MATCH (p:Person) WHERE p.name CONTAINS "김성길" RETURN p.phone'
+
+# 스트리밍 응답에서 청크 하나에 담는 글자 수
+STREAM_CHUNK_SIZE = 4
+
+DOCUMENT_PARSE_RESPONSE = {
+    "elements": [
+        {"category": "paragraph", "content": {"html": "<p>김성길</p>"}},
+        {"category": "paragraph", "content": {"html": "<p>과장 | ABC상사</p>"}},
+        {"category": "paragraph", "content": {"html": "<p>010-2222-1234<br>kim@abc.com</p>"}},
+    ]
+}
+
+
+class FakeUpstageHandler(BaseHTTPRequestHandler):
+    """설정된 지연과 오류 비율에 따라 Upstage API 응답을 흉내 냅니다."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive 지원
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict, headers: dict = None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _handle(self, respond):
+        """respond(request_json)로 만든 응답 본문을 설정된 지연과 오류 비율에 따라 전송합니다."""
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+        # 요청 본문은 항상 읽어야 keep-alive 커넥션이 유지됨
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        self.raw_body = raw
+        request = json.loads(raw) if self.headers.get("Content-Type") == "application/json" and raw else {}
+
+        time.sleep(server.latency_fn(self.path))
+        body = respond(request)
+
+        roll = server.random.random()
+        if roll < server.rate_limit_ratio:
+            with server.lock:
+                server.injected["429"] += 1
+            self._send_json(429, {"error": "rate limited"}, {"Retry-After": str(server.retry_after)})
+        elif roll < server.rate_limit_ratio + server.error_ratio:
+            with server.lock:
+                server.injected["503"] += 1
+            self._send_json(503, {"error": "unavailable"})
+        elif request.get("stream"):
+            self._send_stream(body)
+        else:
+            self._send_json(200, body)
+
+    def _send_stream(self, body: dict):
+        """응답 본문을 몇 글자씩 나눠 Server-Sent Events 청크로 전송합니다."""
+        content = body["choices"][0]["message"]["content"]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for i in range(0, len(content), STREAM_CHUNK_SIZE):
+            chunk = {"choices": [{"delta": {"content": content[i:i + STREAM_CHUNK_SIZE]}}]}
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(self.server.stream_chunk_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+    def do_POST(self):
+        if self.path.endswith("/solar/chat/completions"):
+            self._handle(self.server.chat_response_fn)
+        elif self.path.endswith("/document-digitization"):
+            self._handle(lambda request: self.server.document_parse_fn(self.raw_body))
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_GET(self):
+        if "/document-ai/information-extraction/" in self.path:
+            self._handle(lambda request: {"fields": []})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+
+def chat_response(content: str = CHAT_CONTENT) -> dict:
+    """OpenAI 호환 형식의 Solar Pro 응답을 만듭니다."""
+    return {
+        "choices": [{"message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+    }
+
+
+def parse_latency(spec: str, seed: int = 0):
+    """
+    지연 분포 문자열을 지연 시간(초)을 뽑는 함수로 변환합니다.
+
+    형식:
+        "0.2" 또는 "fixed:0.2"      고정값
+        "uniform:0.1:0.5"           균등 분포 (최소, 최대)
+        "normal:0.8:0.2"            정규 분포 (평균, 표준편차, 0 미만은 0)
+        "lognormal:0.8:0.5"         로그정규 분포 (중앙값, sigma). LLM 응답 시간처럼 꼬리가 긴 지연
+    """
+    kind, _, rest = spec.partition(":")
+    if not rest:
+        kind, rest = "fixed", spec
+    params = [float(value) for value in rest.split(":")]
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    if kind == "fixed":
+        return lambda: params[0]
+    samplers = {
+        "uniform": lambda: rng.uniform(params[0], params[1]),
+        "normal": lambda: max(0.0, rng.gauss(params[0], params[1])),
+        "lognormal": lambda: rng.lognormvariate(math.log(params[0]), params[1]),
+    }
+    if kind not in samplers:
+        raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample():
+        with lock:
+            return samplers[kind]()
+    return sample
+
+
+def memo_fingerprint(text: str) -> str:
+    """
+    날짜/시각 표현과 숫자를 뺀 메모 텍스트입니다.
+    메모 전처리가 "내일 오후 3시"를 "2026-02-05 15:00"으로 바꿔 보내도 녹화된 메모를 찾을 수 있게 합니다.
+    """
+    from app.services.korean_datetime import DATE_PATTERN, TIME_PATTERN
+    return re.sub(r"[\d\s:.\-]", "", TIME_PATTERN.sub("", DATE_PATTERN.sub("", text)))
+
+
+class RecordedResponses:
+    """
+    워크로드(benchmarks.workloads.build_workload)에 녹화된 응답을 요청 내용으로 찾아 재생합니다.
+    - 메모 추출: 메모 텍스트 또는 memo_fingerprint (일괄 추출은 메모마다 찾아 합침)
+    - Cypher 생성: 질문 텍스트 / 답변 생성: 질문 텍스트
+    - 명함 추출: OCR 텍스트에 포함된 전화번호 / Document Parse: 이미지에 포함된 card_id
+    녹화되지 않은 요청에는 기본 응답을 돌려줍니다.
+    """
+
+    def __init__(self, workload: dict):
+        self.memos = {memo["text"]: memo["extraction"] for memo in workload.get("memos", [])}
+        self.memos_by_fingerprint = {memo_fingerprint(text): extraction for text, extraction in self.memos.items()}
+        self.questions = {question["question"]: question for question in workload.get("questions", [])}
+        self.cards = {card["card_id"]: card for card in workload.get("cards", [])}
+        self.cards_by_phone = {card["extraction"]["phone"]: card["extraction"] for card in self.cards.values()}
+
+    def chat(self, request: dict) -> dict:
+        messages = request.get("messages") or [{}]
+        system, user = messages[0].get("content", ""), messages[-1].get("content", "")
+        if "multiple independent memos" in system:
+            memos = json.loads(user)
+            content = {"memos": [{"id": memo["id"], **self._memo(memo["text"])} for memo in memos]}
+        elif "extracts entities and relationships" in system:
+            content = self._memo(user)
+        elif "Cypher" in system:
+            question = self.questions.get(user)
+            return chat_response(question["cypher"] if question else CHAT_CONTENT)
+        elif "query results into natural language" in system:
+            question = self.questions.get(user.partition("\n\n")[0].removeprefix("Question: "))
+            return chat_response(question["answer"] if question else "관련 정보를 찾을 수 없습니다.")
+        elif "business card" in system:
+            content = next((card for phone, card in self._phones(user) if card), {})
+        else:
+            return chat_response()
+        return chat_response(json.dumps(content, ensure_ascii=False))
+
+    def document_parse(self, raw: bytes) -> dict:
+        match = re.search(rb"card-id:(\d+);", raw)
+        card = self.cards.get(int(match.group(1))) if match else None
+        return card["document_parse"] if card else DOCUMENT_PARSE_RESPONSE
+
+    def _memo(self, text: str) -> dict:
+        extraction = self.memos.get(text) or self.memos_by_fingerprint.get(memo_fingerprint(text))
+        return extraction or {"entities": [], "relationships": [], "business_related": False}
+
+    def _phones(self, text: str):
+        for phone in re.findall(r"01\d-\d{3,4}-\d{4}", text):
+            yield phone, self.cards_by_phone.get(phone)
+
+
+def start_fake_upstage(port: int = 0, latency: float = 0.0, rate_limit_ratio: float = 0.0,
+                       error_ratio: float = 0.0, retry_after: float = 0, seed: int = 0,
+                       latency_fn=None, chat_response_fn=None, stream_chunk_delay: float = 0.02,
+                       document_parse_fn=None):
+    """
+    가짜 Upstage 서버를 백그라운드 스레드에서 시작합니다.
+    latency_fn(path)를 지정하면 요청 경로별로 지연 시간을 정할 수 있습니다.
+    chat_response_fn(request)를 지정하면 요청 본문(JSON)에 따라 Solar Pro 응답을 만들 수 있습니다.
+    document_parse_fn(raw_body)를 지정하면 업로드된 멀티파트 본문에 따라 Document Parse 응답을 만들 수 있습니다.
+    스트리밍 요청("stream": true)에는 stream_chunk_delay 간격으로 청크를 전송합니다.
+
+    Returns:
+        (server, base_url) - base_url은 UPSTAGE_BASE_URL에 그대로 사용할 수 있는 형태
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeUpstageHandler)
+    server.daemon_threads = True
+    server.latency_fn = latency_fn or (lambda path: latency)
+    server.chat_response_fn = chat_response_fn or (lambda request: chat_response())
+    server.document_parse_fn = document_parse_fn or (lambda raw: DOCUMENT_PARSE_RESPONSE)
+    server.stream_chunk_delay = stream_chunk_delay
+    server.rate_limit_ratio = rate_limit_ratio
+    server.error_ratio = error_ratio
+    server.retry_after = retry_after
+    server.random = random.Random(seed)
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.injected = {"429": 0, "503": 0}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.2, help="응답 지연 (초)")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--error-ratio", type=float, default=0.0, help="503 응답 비율")
+    parser.add_argument("--retry-after", type=float, default=1, help="429 응답의 Retry-After (초)")
+    args = parser.parse_args()
+
+    server, base_url = start_fake_upstage(args.port, args.latency, args.rate_limit_ratio,
+                                          args.error_ratio, args.retry_after)
+    print(f"Fake Upstage API listening on {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
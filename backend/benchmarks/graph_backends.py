@@ -0,0 +1,187 @@
+"""
+/memo와 /save-contact 라우트를 그래프 저장소별(memory, neo4j)로 실행하여
+애플리케이션 쪽 처리 시간과 데이터베이스 시간을 나눠 측정합니다.
+
+Solar Pro는 지연 없이 고정된 추출 결과를 돌려주는 스텁으로 대체하고(LLM 시간 제외),
+ASGI 앱에 동시 요청을 보내 라우트별 처리량과 p50/p99 지연을 출력합니다.
+- db ms/req: neo4j_query_seconds 합계 (memory 저장소는 0)
+- app ms/req: 평균 지연 - db ms/req (라우팅, 검증, 이름 정규화, 쿼리 조립, 직렬화, 로깅)
+memory 저장소의 지연은 거의 전부 애플리케이션 쪽 비용이므로, 두 저장소의 차이가 데이터베이스 왕복 비용입니다.
+측정 전에 엔티티/관계가 없는 메모도 저장되는지(쿼리가 유효한 Cypher로 끝나는지) 확인합니다.
+Neo4j에 연결할 수 없으면 neo4j는 건너뜁니다. neo4j 저장소는 실제로 데이터를 쓰므로 버려도 되는 데이터베이스에서 실행하세요.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.graph_backends --requests 500 --concurrency 20
+    NEO4J_URI=bolt://localhost:7687 python -m benchmarks.graph_backends --backends memory neo4j
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.workloads import generate_korean_names
+
+COMPANIES = ["ABC상사", "한빛전자", "대한물산", "미래건설", "푸른바이오"]
+
+
+class StubUpstageService:
+    """메모마다 다른 인물/회사/이벤트를 추출한 것처럼 즉시 응답합니다."""
+
+    def __init__(self, names: list):
+        self.names = names
+        self.calls = 0
+
+    async def solar_pro(self, messages, **kwargs):
+        index = self.calls
+        self.calls += 1
+        name, company = self.names[index % len(self.names)], COMPANIES[index % len(COMPANIES)]
+        event = f"{company} 미팅 {index % 50}"
+        extraction = {
+            "entities": [
+                {"type": "Person", "name": name, "title": "과장"},
+                {"type": "Company", "name": company},
+                {"type": "Event", "name": event, "date": "2026-02-02T14:00:00"},
+            ],
+            "relationships": [
+                {"from": name, "to": company, "type": "WORKS_AT"},
+                {"from": name, "to": event, "type": "ATTENDED"},
+            ],
+            "business_related": True,
+        }
+        return {"choices": [{"message": {"role": "assistant", "content": json.dumps(extraction, ensure_ascii=False)}}]}
+
+    async def evict_cached_response(self, messages):
+        pass
+
+
+def metric_sum(histogram) -> float:
+    """히스토그램의 모든 레이블 합계(초)를 더합니다."""
+    return sum(series[-1] for series in histogram.values.values())
+
+
+async def create_store(backend: str):
+    """그래프 저장소를 만들고 연결합니다. 연결할 수 없으면 None을 반환합니다."""
+    if backend == "memory":
+        from app.services.memory_graph import InMemoryGraphStore
+        store = InMemoryGraphStore()
+        await store.connect()
+        return store
+
+    from app.services.neo4j_service import Neo4jService
+    store = Neo4jService()
+    try:
+        # connect()의 재시도를 기다리지 않고 한 번만 시도
+        await asyncio.wait_for(Neo4jService.connect.retry_with(stop=lambda state: True, reraise=True)(store), timeout=10)
+    except Exception as e:
+        print(f"[neo4j] skipped: cannot connect to {store.uri} ({type(e).__name__}: {e})")
+        await store.close()
+        return None
+    return store
+
+
+def check_empty_memo_graph_query():
+    """엔티티와 관계가 없는 메모의 저장 쿼리가 WITH로 끝나지 않는지(유효한 Cypher인지) 확인합니다."""
+    from app.services.neo4j_service import Neo4jService
+
+    memo = {"id": "memo_empty", "text": "", "timestamp": "2026-02-04T10:00:00", "business_related": False}
+    query, parameters = Neo4jService._build_memo_graph_query(memo, [], [])
+    last_clause = query.splitlines()[-1]
+    assert last_clause.startswith("RETURN"), f"memo graph query must end with RETURN: {query!r}"
+    assert set(parameters) == {"memo"}, parameters
+
+
+async def run_route(client, path: str, payloads: list, concurrency: int) -> dict:
+    from app.core import metrics
+
+    latencies = []
+    queue = iter(payloads)
+    db_before = metric_sum(metrics.neo4j_query_seconds)
+
+    async def worker():
+        for payload in queue:
+            start = time.perf_counter()
+            response = await client.post(path, json=payload)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    mean_ms = sum(latencies) / len(latencies) * 1000
+    db_ms = (metric_sum(metrics.neo4j_query_seconds) - db_before) / len(latencies) * 1000
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "db_ms": db_ms,
+        "app_ms": mean_ms - db_ms,
+    }
+
+
+async def run_backend(backend: str, args) -> dict:
+    import httpx
+    from app.main import app
+    from app.api import dependencies
+
+    store = await create_store(backend)
+    if store is None:
+        return None
+
+    names = generate_korean_names(args.requests, seed=args.seed)
+    upstage_service = StubUpstageService(names)
+    app.dependency_overrides[dependencies.get_upstage_service] = lambda: upstage_service
+    app.dependency_overrides[dependencies.get_neo4j_service] = lambda: store
+
+    memos = [{"text": f"{name} 과장과 {COMPANIES[i % len(COMPANIES)]}에서 미팅"} for i, name in enumerate(names)]
+    contacts = [
+        {
+            "person_data": {"name": name, "title": "대리", "phone": f"010-{i // 10000:04d}-{i % 10000:04d}"},
+            "company_data": {"name": COMPANIES[i % len(COMPANIES)]},
+        }
+        for i, name in enumerate(names)
+    ]
+
+    results = {}
+    try:
+        # 엔티티/관계가 없는 메모도 저장되어야 함 (neo4j에서는 실제 쿼리 실행으로 확인)
+        await store.save_memo_graph(
+            {"id": "memo_empty", "text": "", "timestamp": "2026-02-04T10:00:00", "business_related": False}, [], []
+        )
+        # lifespan을 실행하지 않으므로 저장소와 Upstage 스텁만으로 처리됨
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            results["/memo"] = await run_route(client, "/api/memo", memos, args.concurrency)
+            results["/save-contact"] = await run_route(client, "/api/save-contact", contacts, args.concurrency)
+    finally:
+        app.dependency_overrides.clear()
+        await store.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="라우트별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--backends", nargs="+", default=["memory", "neo4j"], choices=["memory", "neo4j"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # 일괄 추출 프롬프트는 스텁이 흉내 내지 않으므로 메모를 하나씩 추출하고, 로그 출력이 측정에 섞이지 않도록 설정
+    os.environ["MEMO_BATCH_ENABLED"] = "false"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    check_empty_memo_graph_query()
+    print(f"{'backend':<8}{'route':<15}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'db ms/req':>11}{'app ms/req':>12}")
+    for backend in args.backends:
+        results = asyncio.run(run_backend(backend, args))
+        for route, result in (results or {}).items():
+            print(
+                f"{backend:<8}{route:<15}{result['throughput']:>9.1f}{result['p50_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                f"{result['db_ms']:>11.2f}{result['app_ms']:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+`import app.main`에 걸리는 시간을 python -X importtime으로 측정합니다.
+
+새 인터프리터에서 app.main을 여러 번 import하여 누적 import 시간의 중앙값과,
+가장 오래 걸린 모듈, 무거운 외부 모듈(neo4j 드라이버, httpx, langchain)의 import 여부를 출력합니다.
+--baseline-ref를 지정하면 해당 git 커밋의 backend를 임시 디렉터리에 풀어 같은 방식으로 측정하고 비교합니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.import_time --runs 5
+    python -m benchmarks.import_time --runs 5 --baseline-ref HEAD~1
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from io import BytesIO
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import 여부를 확인할 무거운 외부 모듈
+HEAVY_MODULES = ("neo4j", "httpx", "langchain_upstage", "langchain_core")
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure_once(backend_dir: str, workdir: str) -> dict:
+    """새 인터프리터에서 app.main을 import하고 {모듈: 누적 시간(us)}을 반환합니다. (최상위 import 기준)"""
+    env = {
+        **os.environ,
+        "UPSTAGE_API_KEY": os.environ.get("UPSTAGE_API_KEY", "fake-key"),
+        "PYTHONPATH": backend_dir,
+        # 이전 버전은 import 시점에 SQLite 파일을 만들므로 임시 디렉터리에서 실행
+        "MEMO_QUEUE_SQLITE_PATH": os.path.join(workdir, "memo_jobs.db"),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2))
+    return modules
+
+
+def measure(backend_dir: str, runs: int) -> tuple:
+    """runs번 측정하여 (app.main 누적 시간 중앙값 ms, 마지막 측정의 모듈별 누적 시간)을 반환합니다."""
+    totals = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(runs):
+            modules = measure_once(backend_dir, workdir)
+            totals.append(modules["app.main"] / 1000)
+    return statistics.median(totals), modules
+
+
+def extract_ref(ref: str, target: str) -> str:
+    """git 커밋의 backend 디렉터리를 target에 풀고 경로를 반환합니다."""
+    repo_root = subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    archive = subprocess.run(["git", "archive", ref, "backend"], cwd=repo_root, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(target)
+    return os.path.join(target, "backend")
+
+
+def report(name: str, total_ms: float, modules: dict, top: int):
+    print(f"[{name}] import app.main: {total_ms:.0f} ms (median)")
+    loaded = [module for module in HEAVY_MODULES if module in modules]
+    print(f"  heavy modules imported: {', '.join(loaded) if loaded else 'none'}")
+    slowest = sorted(
+        ((module, us) for module, us in modules.items() if module.startswith("app.")),
+        key=lambda item: item[1], reverse=True,
+    )[:top]
+    for module, us in slowest:
+        print(f"  {us / 1000:>8.1f} ms  {module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="출력할 app 모듈 수 (누적 시간 순)")
+    parser.add_argument("--baseline-ref", help="비교할 git 커밋 (예: HEAD~1)")
+    args = parser.parse_args()
+
+    current_ms, modules = measure(BACKEND_DIR, args.runs)
+    report("current", current_ms, modules, args.top)
+
+    if args.baseline_ref:
+        with tempfile.TemporaryDirectory() as target:
+            baseline_ms, baseline_modules = measure(extract_ref(args.baseline_ref, target), args.runs)
+        report(args.baseline_ref, baseline_ms, baseline_modules, args.top)
+        print(f"reduction: {baseline_ms - current_ms:.0f} ms ({1 - current_ms / baseline_ms:.0%})")
+
+
+if __name__ == "__main__":
+    main()
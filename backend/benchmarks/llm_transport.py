@@ -0,0 +1,148 @@
+"""
+Solar Pro 호출 경로별 호출당 Python 오버헤드를 측정합니다.
+
+네트워크를 빼고 클라이언트 쪽 비용만 비교하기 위해 httpx.MockTransport가 즉시 고정 응답을 돌려주게 하고,
+UpstageService.solar_pro(use_cache=False)를 순차로 호출하여 호출당 평균/p99 시간(us)을 출력합니다.
+- httpx: httpx 클라이언트로 직접 POST + JSON 파싱 (기준선)
+- direct: DirectTransport (재시도 정책, 지표, 로깅 포함)
+- sampled: LLM_TRACE_SAMPLE_RATE 비율만 LangChainTransport, 나머지는 DirectTransport
+- langchain: 모든 호출이 LangChainTransport (메시지 변환, ChatUpstage 콜백 포함)
+langchain-upstage가 설치되어 있지 않으면 sampled/langchain은 건너뜁니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.llm_transport --calls 2000 --messages 4 --sample-rate 0.1
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+CHAT_RESPONSE = {
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "solar-pro",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": 'MATCH (p:Person {name: "김성길"}) RETURN p.phone'},
+            "finish_reason": "stop",
+        }
+    ],
+    "usage": {"prompt_tokens": 120, "completion_tokens": 20, "total_tokens": 140},
+}
+
+
+def mock_client():
+    import httpx
+
+    body = json.dumps(CHAT_RESPONSE).encode()
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+    )
+    return httpx.AsyncClient(transport=transport)
+
+
+def build_messages(count: int) -> list:
+    messages = [{"role": "system", "content": "당신은 Neo4j Cypher 쿼리 생성기입니다. " * 20}]
+    for i in range(count - 1):
+        role = "user" if i % 2 == 0 else "assistant"
+        messages.append({"role": role, "content": f"김성길 과장의 전화번호를 알려줘 ({i})"})
+    return messages
+
+
+def load_langchain_transport(base_url: str):
+    """MockTransport를 쓰는 ChatUpstage로 LangChainTransport를 만듭니다. 설치되어 있지 않으면 None."""
+    try:
+        from langchain_upstage import ChatUpstage
+        from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+    except ImportError:
+        return None
+    from app.services.llm_transport import LangChainTransport
+    from app.services.upstage import SOLAR_PRO_MODEL
+
+    chat_upstage = ChatUpstage(
+        api_key="fake-key", model=SOLAR_PRO_MODEL, base_url=f"{base_url}/solar",
+        max_retries=0, http_async_client=mock_client(),
+    )
+    return LangChainTransport(chat_upstage, {"system": SystemMessage, "user": HumanMessage, "assistant": AIMessage})
+
+
+async def measure(call, calls: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        await call()
+    durations = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await call()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    return {
+        "mean_us": sum(durations) / len(durations) * 1e6,
+        "p99_us": durations[min(len(durations) - 1, int(len(durations) * 0.99))] * 1e6,
+    }
+
+
+async def run(args) -> dict:
+    from app.services.upstage import UpstageService
+
+    messages = build_messages(args.messages)
+    service = UpstageService()
+    await service.client.aclose()
+    service.client = mock_client()
+    url = f"{service.base_url}/solar/chat/completions"
+
+    async def raw_httpx():
+        response = await service.client.post(url, json={"model": "solar-pro", "messages": messages})
+        response.raise_for_status()
+        return response.json()
+
+    async def solar_pro():
+        return await service.solar_pro(messages, use_cache=False)
+
+    results = {"httpx": await measure(raw_httpx, args.calls, args.warmup)}
+
+    service.traced_transport = None
+    results["direct"] = await measure(solar_pro, args.calls, args.warmup)
+
+    langchain_transport = load_langchain_transport(service.base_url)
+    if langchain_transport is None:
+        results["sampled"] = results["langchain"] = None
+    else:
+        service.traced_transport = langchain_transport
+        service.trace_sample_rate = args.sample_rate
+        results["sampled"] = await measure(solar_pro, args.calls, args.warmup)
+        service.trace_sample_rate = 1.0
+        results["langchain"] = await measure(solar_pro, args.calls, args.warmup)
+
+    await service.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=4, help="호출당 메시지 수 (system 포함)")
+    parser.add_argument("--sample-rate", type=float, default=0.1, help="sampled 모드의 LangChain 경로 비율")
+    args = parser.parse_args()
+
+    # 응답 캐시와 로그 출력이 측정에 섞이지 않도록 서비스 import 전에 설정
+    os.environ.setdefault("UPSTAGE_API_KEY", "fake-key")
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    results = asyncio.run(run(args))
+    baseline = results["httpx"]["mean_us"]
+    print(f"{'transport':>10}{'mean us':>10}{'p99 us':>10}{'overhead us':>13}")
+    for name, result in results.items():
+        if result is None:
+            print(f"{name:>10}  skipped (langchain-upstage not installed)")
+            continue
+        overhead = result["mean_us"] - baseline
+        print(f"{name:>10}{result['mean_us']:>10.1f}{result['p99_us']:>10.1f}{overhead:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+로깅 방식별 요청 처리량을 측정합니다.
+
+OCR 응답(수백 KB)을 받아 처리하는 엔드포인트를 흉내 낸 FastAPI 앱에 동시 요청을 보내고
+- off: 로깅 없음
+- legacy: 기존 방식. 로거별 StreamHandler로 응답 본문 전체를 INFO에서 이벤트 루프 스레드가 직접 씀
+- queue: app.core.logger 파이프라인. INFO에는 상태와 크기만, 본문은 DEBUG 표본으로 (백그라운드 스레드가 씀)
+의 처리량(req/s)과 p99 지연을 비교합니다.
+출력 대상은 컨테이너 stdout 파이프처럼 쓰기마다 대역폭만큼 시간이 걸리는 느린 스트림입니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.logging_overhead --requests 500 --concurrency 20 --payload-kb 300 --sink-mbps 50
+    LOG_LEVEL=DEBUG LOG_PAYLOAD_SAMPLE_RATE=0.1 python -m benchmarks.logging_overhead   # 본문 표본 기록 포함
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+
+class SlowSink:
+    """쓰기마다 (바이트 수 / 대역폭)만큼 블로킹되는 출력 스트림입니다."""
+
+    def __init__(self, mbps: float):
+        self.bytes_per_second = mbps * 1024 * 1024
+        self.written = 0
+
+    def write(self, text: str):
+        size = len(text.encode("utf-8"))
+        time.sleep(size / self.bytes_per_second)
+        self.written += size
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def build_app(mode: str, payload: dict, sink: SlowSink):
+    """모드별 로깅을 하는 OCR 흉내 엔드포인트 하나짜리 앱을 만듭니다."""
+    from fastapi import FastAPI
+    from app.core.logger import get_logger, debug_payload
+
+    if mode == "legacy":
+        logger = logging.getLogger("benchmarks.legacy")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        logger.addHandler(handler)
+    else:
+        logger = get_logger("benchmarks.queue")
+
+    body = json.dumps(payload, ensure_ascii=False)
+    app = FastAPI()
+
+    @app.post("/ocr")
+    async def ocr():
+        if mode == "legacy":
+            logger.info(f"Document Digitization API Response Status: 200, Body: {body}")
+        elif mode == "queue":
+            logger.info(f"Document Digitization API Response Status: 200, {len(body)} bytes")
+            debug_payload(logger, "Document Digitization API response body", body=body)
+        # 응답 파싱 (실제 핸들러가 하는 일의 대역)
+        elements = json.loads(body)["elements"]
+        return {"elements": len(elements)}
+
+    return app
+
+
+async def run_mode(mode: str, args, payload: dict, sink: SlowSink) -> dict:
+    import httpx
+
+    app = build_app(mode, payload, sink)
+    latencies = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def request():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/ocr")
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(request() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "throughput": args.requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--payload-kb", type=int, default=300, help="OCR 응답 본문 크기 (KB)")
+    parser.add_argument("--sink-mbps", type=float, default=50.0, help="로그 출력 대역폭 (MB/s)")
+    args = parser.parse_args()
+
+    from app.core import logger as app_logger
+
+    sink = SlowSink(args.sink_mbps)
+    # 다른 app 모듈보다 먼저 설정해야 파이프라인 출력이 느린 스트림으로 감
+    app_logger.configure_logging(stream=sink)
+
+    line = {"category": "paragraph", "content": {"html": "<p>김성길 과장 | ABC상사 | 010-2222-1234</p>"}}
+    line_size = len(json.dumps(line, ensure_ascii=False))
+    payload = {"elements": [line] * (args.payload_kb * 1024 // line_size)}
+
+    print(f"{'mode':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'log MB':>10}")
+    for mode in ("off", "legacy", "queue"):
+        written_before = sink.written
+        result = asyncio.run(run_mode(mode, args, payload, sink))
+        if mode == "queue":
+            # 백그라운드 스레드가 아직 쓰는 중인 기록까지 포함하여 출력량 집계
+            app_logger._listener.stop()
+            app_logger._listener.start()
+        written = (sink.written - written_before) / 1024 / 1024
+        print(f"{mode:>8}{result['throughput']:>10.1f}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}{written:>10.2f}")
+    print(f"dropped log records: {app_logger.get_dropped_count()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+메모 추출 마이크로 배치(MemoExtractionBatcher)의 배치 크기별 토큰/지연 절감 효과를 측정합니다.
+
+가짜 Upstage 서버가 메모 추출 LLM을 흉내 냅니다.
+- 지연: 요청당 고정 지연(프롬프트 처리 + 네트워크) + 출력 메모당 생성 지연
+- 토큰: 입력/출력 문자 수로 추정 (한국어/JSON 혼합 기준 약 2.5자당 1토큰, 상대 비교용)
+메모들을 한꺼번에 제출(붙여 넣은 회의록을 문단별로 나눈 상황)하고 배치 크기별로
+LLM 호출 수, 메모당 입력/출력 토큰, 메모당 평균 지연, 전체 처리 시간을 비교합니다.
+--llm-concurrency로 동시 LLM 호출 수를 제한하면(요청 한도, 큐 워커 수) 배치의 지연 절감 효과를 볼 수 있습니다.
+제한이 없으면 단일 호출을 모두 병렬로 보내므로 메모당 지연은 배치가 더 깁니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.memo_batching --memos 32 --batch-sizes 1 2 4 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from benchmarks.fake_upstage import chat_response, start_fake_upstage
+
+CHARS_PER_TOKEN = 2.5
+
+MEMO_EXTRACTION = {
+    "entities": [
+        {"type": "Person", "name": "김성길", "title": "과장"},
+        {"type": "Company", "name": "ABC상사"},
+        {"type": "Event", "name": "미팅", "date": "2026-02-02T14:00:00"},
+    ],
+    "relationships": [
+        {"from": "김성길", "to": "ABC상사", "type": "WORKS_AT"},
+        {"from": "김성길", "to": "미팅", "type": "ATTENDED"},
+    ],
+    "business_related": True,
+}
+
+
+def make_fake_llm(per_memo_latency: float):
+    """단일/일괄 추출 요청에 맞는 응답을 만들고, 추정 토큰 수를 집계하는 가짜 Solar Pro 응답 함수를 만듭니다."""
+    usage = {"prompt_tokens": 0, "completion_tokens": 0}
+    lock = threading.Lock()
+
+    def respond(request: dict) -> dict:
+        user_content = request["messages"][-1]["content"]
+        try:
+            memos = json.loads(user_content)
+        except json.JSONDecodeError:
+            memos = None
+        if isinstance(memos, list):
+            content = json.dumps({"memos": [{"id": memo["id"], **MEMO_EXTRACTION} for memo in memos]}, ensure_ascii=False)
+            count = len(memos)
+        else:
+            content = json.dumps(MEMO_EXTRACTION, ensure_ascii=False)
+            count = 1
+        # 출력 길이에 비례하는 생성 지연 (서버 스레드에서 대기)
+        time.sleep(per_memo_latency * count)
+
+        prompt_chars = sum(len(message["content"]) for message in request["messages"])
+        response = chat_response(content)
+        response["usage"] = {
+            "prompt_tokens": round(prompt_chars / CHARS_PER_TOKEN),
+            "completion_tokens": round(len(content) / CHARS_PER_TOKEN),
+        }
+        with lock:
+            usage["prompt_tokens"] += response["usage"]["prompt_tokens"]
+            usage["completion_tokens"] += response["usage"]["completion_tokens"]
+        return response
+
+    return respond, usage
+
+
+async def run_burst(batcher, upstage_service, memos: int) -> tuple:
+    """memos개의 메모를 동시에 추출하고 (전체 시간, 메모별 지연 목록)을 반환합니다."""
+    latencies = []
+
+    async def extract(i: int):
+        start = time.perf_counter()
+        result = await batcher.extract(upstage_service, f"김성길 과장과 ABC상사에서 미팅 #{i} {time.time_ns()}", datetime.now())
+        assert result["business_related"], result
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(extract(i) for i in range(memos)))
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--memos", type=int, default=32)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--base-latency", type=float, default=0.5, help="요청당 고정 지연 (초)")
+    parser.add_argument("--per-memo-latency", type=float, default=0.4, help="출력 메모당 생성 지연 (초)")
+    parser.add_argument("--max-wait", type=float, default=0.1, help="배치 대기 시간 (초)")
+    parser.add_argument("--llm-concurrency", type=int, default=0, help="동시 LLM 호출 수 제한 (0이면 제한 없음)")
+    args = parser.parse_args()
+
+    respond, usage = make_fake_llm(args.per_memo_latency)
+    server, base_url = start_fake_upstage(latency=args.base_latency, chat_response_fn=respond)
+    # 설정은 import 시점에 읽으므로 앱 import 전에 환경 변수를 지정
+    os.environ["UPSTAGE_BASE_URL"] = base_url
+    os.environ.setdefault("UPSTAGE_API_KEY", "fake-key")
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    from app.services.memo_batcher import MemoExtractionBatcher
+    from app.services.memo_ingestion import extract_memo
+    from app.api import dependencies
+    upstage_service = dependencies.upstage_service()
+    upstage_service.traced_transport = None
+    if args.llm_concurrency:
+        # 요청 한도가 있는 환경을 흉내 내기 위해 동시 LLM 호출 수를 제한
+        solar_pro = upstage_service.solar_pro
+        semaphore = None
+
+        async def limited_solar_pro(messages, use_cache: bool = True):
+            nonlocal semaphore
+            semaphore = semaphore or asyncio.Semaphore(args.llm_concurrency)
+            async with semaphore:
+                return await solar_pro(messages, use_cache)
+
+        upstage_service.solar_pro = limited_solar_pro
+
+    async def run_all():
+        # 공유 커넥션 풀이 하나의 이벤트 루프에 묶이므로 모든 측정을 같은 루프에서 실행
+        print(f"{'batch':>6}{'LLM calls':>11}{'in tok/memo':>13}{'out tok/memo':>14}"
+              f"{'mean ms/memo':>14}{'total s':>9}{'fallbacks':>11}")
+        baseline = None
+        for batch_size in args.batch_sizes:
+            batcher = MemoExtractionBatcher(extract_memo, max_batch_size=batch_size, max_wait=args.max_wait)
+            calls_before = server.request_count
+            usage_before = dict(usage)
+            elapsed, latencies = await run_burst(batcher, upstage_service, args.memos)
+            calls = server.request_count - calls_before
+            prompt_tokens = (usage["prompt_tokens"] - usage_before["prompt_tokens"]) / args.memos
+            completion_tokens = (usage["completion_tokens"] - usage_before["completion_tokens"]) / args.memos
+            mean_latency = sum(latencies) / len(latencies) * 1000
+            print(f"{batch_size:>6}{calls:>11}{prompt_tokens:>13.0f}{completion_tokens:>14.0f}"
+                  f"{mean_latency:>14.0f}{elapsed:>9.2f}{batcher.stats['fallbacks']:>11}")
+            if baseline is None:
+                baseline = prompt_tokens + completion_tokens
+            else:
+                saved = 1 - (prompt_tokens + completion_tokens) / baseline
+                print(f"{'':>6}  -> total tokens per memo: {saved:.0%} fewer vs batch size {args.batch_sizes[0]}")
+
+    asyncio.run(run_all())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+메모 목록(/api/memos) 커서 페이지네이션의 페이지 깊이별 지연을 측정합니다. 실행 중인 Neo4j가 필요합니다.
+
+벤치마크용 Memo 노드(id가 bench_memo_로 시작)를 UNWIND로 적재한 뒤, 같은 페이지를
+- cursor: list_memos()의 keyset 커서 (timestamp 인덱스 범위 탐색)
+- skip: ORDER BY m.timestamp DESC SKIP $skip LIMIT $limit (기존 오프셋 방식)
+으로 가져와 페이지 깊이별 지연을 비교합니다. 커서 방식은 깊이와 관계없이 일정해야 합니다.
+마지막에 첫 페이지 쿼리의 PROFILE에서 전체 정렬(Sort/Top) 연산자가 없는지 확인합니다.
+
+실행 (backend 디렉터리에서):
+    NEO4J_URI=bolt://localhost:7687 python -m benchmarks.memo_pagination --memos 1000000 --depths 0 100 10000 50000
+    (적재한 노드는 --cleanup으로 삭제)
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+
+async def load_memos(service, memos: int):
+    """bench_memo_ Memo 노드를 1분 간격 timestamp로 적재합니다. 이미 적재되어 있으면 건너뜁니다."""
+    async with service.driver.session() as session:
+        result = await session.run("MATCH (m:Memo) WHERE m.id STARTS WITH 'bench_memo_' RETURN count(m) AS count")
+        existing = (await result.single())["count"]
+        if existing >= memos:
+            return
+        start_time = datetime(2020, 1, 1)
+        for start in range(existing, memos, 10000):
+            rows = [
+                {"id": f"bench_memo_{i:08d}", "timestamp": (start_time + timedelta(minutes=i)).isoformat(),
+                 "business_related": i % 3 != 0}
+                for i in range(start, min(start + 10000, memos))
+            ]
+            await session.run(
+                "UNWIND $rows AS row MERGE (m:Memo {id: row.id}) "
+                "SET m.text = 'benchmark memo', m.timestamp = datetime(row.timestamp), "
+                "m.business_related = row.business_related",
+                rows=rows,
+            )
+
+
+async def measure_depth(service, depth: int, limit: int, repeat: int) -> tuple:
+    """depth번째 메모에서 시작하는 페이지를 커서/SKIP 방식으로 가져오는 평균 지연(ms)을 반환합니다."""
+    # depth 위치의 커서는 측정 대상이 아니므로 SKIP으로 한 번만 구함
+    cursor = None
+    if depth:
+        async with service.driver.session() as session:
+            result = await session.run(
+                "MATCH (m:Memo) WHERE m.timestamp IS NOT NULL "
+                "WITH m ORDER BY m.timestamp DESC, m.id DESC SKIP $skip LIMIT 1 "
+                "RETURN m.id AS id, m.timestamp AS timestamp",
+                skip=depth - 1,
+            )
+            record = await result.single()
+        from app.services.neo4j_service import encode_memo_cursor
+        cursor = encode_memo_cursor(record["timestamp"].isoformat(), record["id"])
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await service.list_memos(limit=limit, cursor=cursor)
+    cursor_ms = (time.perf_counter() - start) / repeat * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        async with service.driver.session() as session:
+            result = await session.run(
+                "MATCH (m:Memo) RETURN m.id AS id, m.text AS text, m.timestamp AS timestamp "
+                "ORDER BY m.timestamp DESC SKIP $skip LIMIT $limit",
+                skip=depth, limit=limit,
+            )
+            [record async for record in result]
+    skip_ms = (time.perf_counter() - start) / repeat * 1000
+    return cursor_ms, skip_ms
+
+
+async def first_page_operators(service, limit: int) -> set:
+    """첫 페이지 쿼리 PROFILE의 연산자 이름들을 반환합니다."""
+    async with service.driver.session() as session:
+        result = await session.run(
+            "PROFILE MATCH (m:Memo) WHERE m.timestamp IS NOT NULL "
+            "WITH m ORDER BY m.timestamp DESC, m.id DESC LIMIT $limit RETURN m.id",
+            limit=limit,
+        )
+        summary = await result.consume()
+
+    operators = set()
+    plans = [summary.profile]
+    while plans:
+        plan = plans.pop()
+        operators.add(plan["operatorType"].split("@")[0])
+        plans.extend(plan.get("children", []))
+    return operators
+
+
+async def run(args):
+    from app.services.neo4j_service import Neo4jService
+
+    service = Neo4jService()
+    await service.connect()
+    try:
+        start = time.perf_counter()
+        await load_memos(service, args.memos)
+        print(f"load: {args.memos} memos ready in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'depth':>10}{'cursor ms':>12}{'skip ms':>12}")
+        for depth in args.depths:
+            cursor_ms, skip_ms = await measure_depth(service, depth, args.limit, args.repeat)
+            print(f"{depth:>10}{cursor_ms:>12.2f}{skip_ms:>12.2f}")
+
+        operators = await first_page_operators(service, args.limit)
+        print(f"first page operators: {', '.join(sorted(operators))}")
+        # 인덱스 순서를 쓰면 timestamp가 같은 메모끼리만 정렬하는 PartialTop/PartialSort가 됨
+        full_sort = operators & {"Sort", "Top"}
+        print("full sort avoided" if not full_sort else f"WARNING: first page performs a full {', '.join(full_sort)}")
+
+        if args.cleanup:
+            async with service.driver.session() as session:
+                await session.run(
+                    "MATCH (m:Memo) WHERE m.id STARTS WITH 'bench_memo_' "
+                    "CALL { WITH m DETACH DELETE m } IN TRANSACTIONS OF 10000 ROWS"
+                )
+    finally:
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--memos", type=int, default=1000000)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 100, 10000, 100000])
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--cleanup", action="store_true", help="측정 후 벤치마크 메모 삭제")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+메모 로컬 전처리(MemoPreprocessor)의 LLM 호출 회피율과 프롬프트 절감량을 재생 코퍼스로 측정합니다.
+
+연락처를 메모리 그래프 저장소에 미리 저장한 뒤, 코퍼스의 메모마다 전처리를 실행하여 보고합니다.
+- 로컬 추출률: LLM을 호출하지 않고 추출한 메모 비율 (= LLM 호출 회피율)
+- 날짜 정규화율: 상대 날짜/시각을 절대값으로 바꾼 메모 비율
+- 날짜 규칙 생략률: 추출 프롬프트에서 날짜 변환 규칙을 뺀 메모 비율
+- 프롬프트 절감: LLM으로 가는 메모의 단일 추출 프롬프트 글자 수 변화
+- 전처리 지연: 메모당 p50/p99 (이름 찾기 + 날짜 정규화 + 로컬 추출)
+코퍼스는 workloads.generate_memos로 생성하거나 --corpus로 지정합니다.
+(e2e --save-workload로 기록한 워크로드 파일, 또는 메모 문자열의 JSON 배열)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.memo_preprocess --graph-size 10k --memos 2000
+    python -m benchmarks.memo_preprocess --corpus workload-10k.json --show 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+
+from benchmarks.workloads import GRAPH_SIZES, generate_contacts, generate_memos
+
+
+def load_corpus(path: str):
+    """(메모 텍스트 목록, 연락처 목록 또는 None)을 반환합니다."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return [memo["text"] for memo in data["memos"]], data.get("contacts")
+    return [memo if isinstance(memo, str) else memo["text"] for memo in data], None
+
+
+async def run(args, memos: list, contacts: list):
+    from app.services.memo_ingestion import build_extraction_messages
+    from app.services.memo_preprocessor import MemoPreprocessor
+    from app.services.memory_graph import InMemoryGraphStore
+
+    store = InMemoryGraphStore()
+    await store.connect()
+    await store.save_contacts([
+        {"name": contact["name"], "properties": {"title": contact["title"]}, "company": contact["company"]}
+        for contact in contacts
+    ])
+    start = time.perf_counter()
+    await store.find_mentions("")  # 오토마톤 첫 빌드
+    build_seconds = time.perf_counter() - start
+
+    preprocessor = MemoPreprocessor()
+    now = datetime(2026, 2, 4, 10, 0)
+    latencies = []
+    chars_before = chars_after = llm_memos = 0
+    examples = []
+    for text in memos:
+        start = time.perf_counter()
+        annotation = await preprocessor.annotate(store, text, now)
+        latencies.append(time.perf_counter() - start)
+        if annotation["extraction"]:
+            if len(examples) < args.show:
+                examples.append((text, annotation["extraction"]))
+            continue
+        llm_memos += 1
+        chars_before += sum(len(m["content"]) for m in build_extraction_messages(text, now))
+        chars_after += sum(len(m["content"]) for m in build_extraction_messages(annotation["text"], now, annotation["date_rules"]))
+
+    stats = preprocessor.get_metrics()
+    latencies.sort()
+    count = len(memos)
+    print(f"names indexed: {len(store.name_index)} (automaton build {build_seconds * 1000:.0f} ms)")
+    print(f"memos: {count}")
+    print(f"extracted locally (LLM calls avoided): {stats['local_extractions']} ({stats['local_extractions'] / count:.1%})")
+    print(f"datetimes normalized: {stats['datetimes_normalized'] / count:.1%}")
+    print(f"date rules omitted: {stats['date_rules_omitted'] / count:.1%}")
+    if llm_memos:
+        print(f"prompt chars per LLM-bound memo: {chars_before / llm_memos:.0f} -> {chars_after / llm_memos:.0f} "
+              f"({(chars_after - chars_before) / chars_before:+.1%})")
+    print(f"preprocess latency: p50 {latencies[count // 2] * 1e6:.0f} us, "
+          f"p99 {latencies[min(count - 1, int(count * 0.99))] * 1e6:.0f} us")
+    for text, extraction in examples:
+        print(f"\n{text}\n  -> {json.dumps(extraction, ensure_ascii=False)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graph-size", default="1k", help="미리 저장할 연락처 수 (1k, 10k, 100k 또는 숫자)")
+    parser.add_argument("--memos", type=int, default=1000, help="생성할 메모 수 (--corpus가 없을 때)")
+    parser.add_argument("--corpus", help="재생할 워크로드 파일 또는 메모 문자열의 JSON 배열")
+    parser.add_argument("--show", type=int, default=0, help="출력할 로컬 추출 예시 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    graph_size = GRAPH_SIZES.get(args.graph_size) or int(args.graph_size)
+    memos, contacts = load_corpus(args.corpus) if args.corpus else (None, None)
+    contacts = contacts or generate_contacts(graph_size, args.seed)
+    memos = memos or [memo["text"] for memo in generate_memos(contacts, args.memos, args.seed)]
+    asyncio.run(run(args, memos, contacts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+메모 백그라운드 수집 큐(/api/memo/jobs)의 지속 처리량(memos/second)을 측정합니다.
+
+가짜 Upstage 서버가 메모 추출 LLM 호출에 지연을 주입하고, Neo4j 쓰기는 고정 지연을 주는 스텁을 사용합니다.
+워커 수별로 메모를 API로 한꺼번에 제출한 뒤 모든 작업이 완료될 때까지의 시간을 측정하며,
+제출 요청 자체의 지연(작업 ID를 받기까지)도 함께 보고합니다.
+캐시 효과를 배제하기 위해 메모 텍스트는 모두 다르고 LLM 캐시는 끕니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.memo_queue --memos 200 --concurrency 1 4 8 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.fake_upstage import chat_response, start_fake_upstage
+
+MEMO_JSON = json.dumps({
+    "entities": [
+        {"type": "Person", "name": "김성길", "title": "과장"},
+        {"type": "Company", "name": "ABC상사"},
+        {"type": "Event", "name": "미팅", "date": "2026-02-02T14:00:00"},
+    ],
+    "relationships": [
+        {"from": "김성길", "to": "ABC상사", "type": "WORKS_AT"},
+        {"from": "김성길", "to": "미팅", "type": "ATTENDED"},
+    ],
+    "business_related": True,
+}, ensure_ascii=False)
+
+
+class StubNeo4j:
+    """메모 저장에 고정 지연을 주는 Neo4j 스텁입니다."""
+
+    def __init__(self, write_latency: float):
+        self.write_latency = write_latency
+        self.saved = set()
+
+    async def resolve_entity_names(self, entities: list, names: list = ()) -> dict:
+        return {}
+
+    async def find_mentions(self, text: str) -> list:
+        return []
+
+    async def save_memo_graph(self, memo: dict, entities: list, relationships: list, labels: dict = None):
+        await asyncio.sleep(self.write_latency)
+        self.saved.add(memo["id"])
+
+
+def percentile(values: list, ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+async def run_sustained(app, memo_queue, handler, memos: int, concurrency: int) -> tuple:
+    """워커 concurrency개로 메모 memos개를 처리하고 (처리 시간, 제출 지연 목록)을 반환합니다."""
+    memo_queue.concurrency = concurrency
+    memo_queue.start(handler)
+    transport = httpx.ASGITransport(app=app)
+    submit_latencies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        job_ids = []
+        for i in range(memos):
+            submit_start = time.perf_counter()
+            response = await client.post("/api/memo/jobs", json={"text": f"김성길 과장과 미팅 {concurrency}-{i} {time.time_ns()}"})
+            submit_latencies.append(time.perf_counter() - submit_start)
+            job_ids.append(response.json()["job_id"])
+
+        while memo_queue.get_metrics()["jobs"]["queued"] or memo_queue.get_metrics()["jobs"]["running"]:
+            await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - start
+    await memo_queue.stop()
+
+    statuses = [(await memo_queue.get(job_id))["status"] for job_id in job_ids]
+    assert statuses.count("succeeded") == memos, statuses
+    return elapsed, submit_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--memos", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="메모 추출 LLM 지연 (초)")
+    parser.add_argument("--write-latency", type=float, default=0.02, help="Neo4j 메모 저장 지연 (초)")
+    args = parser.parse_args()
+
+    server, base_url = start_fake_upstage(
+        latency=args.llm_latency,
+        chat_response_fn=lambda request: chat_response(MEMO_JSON),
+    )
+    workdir = tempfile.mkdtemp()
+    # 설정은 import 시점에 읽으므로 앱 import 전에 환경 변수를 지정
+    os.environ["UPSTAGE_BASE_URL"] = base_url
+    os.environ.setdefault("UPSTAGE_API_KEY", "fake-key")
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.environ["MEMO_QUEUE_SQLITE_PATH"] = os.path.join(workdir, "memo_jobs.db")
+    from app.api import dependencies
+    from app.api.routes import router
+    from app.services import memo_ingestion
+    from fastapi import FastAPI
+    upstage_service = dependencies.upstage_service()
+    upstage_service.traced_transport = None
+    memo_queue = dependencies.memo_queue()
+
+    # Neo4j 연결 없이 라우터만 사용 (워커는 측정마다 직접 시작)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    neo4j = StubNeo4j(args.write_latency)
+    memo_queue.poll_interval = 0.05
+
+    async def handler(job: dict) -> dict:
+        return await memo_ingestion.ingest_memo(upstage_service, neo4j, job["text"], memo_id=job["memo_id"])
+
+    async def run_all():
+        # 공유 커넥션 풀이 하나의 이벤트 루프에 묶이므로 모든 측정을 같은 루프에서 실행
+        print(f"{'workers':>8}{'seconds':>10}{'memos/s':>10}{'submit p50 ms':>15}{'submit p99 ms':>15}")
+        for concurrency in args.concurrency:
+            elapsed, submits = await run_sustained(app, memo_queue, handler, args.memos, concurrency)
+            print(f"{concurrency:>8}{elapsed:>10.2f}{args.memos / elapsed:>10.2f}"
+                  f"{percentile(submits, 0.5) * 1000:>15.2f}{percentile(submits, 0.99) * 1000:>15.2f}")
+        print(f"\nideal memos/s per worker: {1 / (args.llm_latency + args.write_latency):.2f}")
+
+    asyncio.run(run_all())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+질문 → Cypher 계획 캐시의 히트율과 지연 시간을 질문 기록 재생으로 측정합니다.
+
+가짜 Upstage 서버가 Cypher 생성 LLM을 흉내 내며(질문 유형별 규칙으로 Cypher 생성, 지연 주입),
+Neo4j는 실행된 쿼리만 기록하는 스텁을 사용합니다.
+같은 질문 기록을 계획 캐시 없이/있을 때 각각 재생하여 Cypher 생성 단계의 지연,
+LLM 호출 수, Neo4j가 컴파일해야 하는 서로 다른 쿼리 문자열 수를 비교합니다.
+질문 자체가 같은 경우의 효과를 배제하기 위해 LLM 응답 캐시는 끕니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.plan_cache --questions 500 --llm-latency 0.8
+    python -m benchmarks.plan_cache --replay questions.txt   # 한 줄에 질문 하나
+"""
+import argparse
+import asyncio
+import os
+import random
+import re
+import time
+
+from benchmarks.fake_upstage import chat_response, start_fake_upstage
+from benchmarks.workloads import generate_korean_names
+
+COMPANIES = ["ABC상사", "한빛전자", "우리은행", "새롬물산", "미래에셋", "다온테크", "누리소프트", "가람건설"]
+
+# 질문 유형별 (질문 형식, 규칙 기반 가짜 LLM이 생성하는 Cypher 형식, 가중치)
+QUESTION_TYPES = [
+    ("{name} 전화번호?", 'MATCH (p:Person) WHERE p.name CONTAINS "{name}" RETURN p.phone', 5),
+    ("{given}님 전화번호?", 'MATCH (p:Person) WHERE p.name CONTAINS "{given}" RETURN p.phone', 3),
+    ("{name} 이메일 알려줘", 'MATCH (p:Person) WHERE p.name CONTAINS "{name}" RETURN p.email', 2),
+    ("{company}에 누가 있지?", 'MATCH (p:Person)-[:WORKS_AT]->(c:Company {{name:"{company}"}}) RETURN p.name, p.title', 3),
+    ("{given}님과 뭘 해야하지?",
+     'MATCH (p:Person)-[:ATTENDED]->(e:Event) WHERE p.name CONTAINS "{given}" RETURN e.name, e.date ORDER BY e.date', 2),
+    ("최근에 누구 만났지?",
+     "MATCH (p:Person)-[:MENTIONED_IN]->(m:Memo) WHERE m.timestamp > datetime() - duration('P7D') "
+     "RETURN p.name, m.timestamp ORDER BY m.timestamp DESC", 1),
+    # 상대 날짜는 질문에 없는 리터럴로 변환되므로 캐시할 수 없음
+    ("내일 일정 뭐야?", 'MATCH (e:Event) WHERE e.date STARTS WITH "2026-02-02" RETURN e.name, e.date', 1),
+]
+
+
+def make_questions(count: int, seed: int = 0) -> list:
+    """질문 유형과 이름/회사를 무작위로 조합한 질문 기록을 만듭니다."""
+    rng = random.Random(seed)
+    names = generate_korean_names(200, seed)
+    weights = [weight for _, _, weight in QUESTION_TYPES]
+    questions = []
+    for _ in range(count):
+        question, _, _ = rng.choices(QUESTION_TYPES, weights)[0]
+        name = rng.choice(names)
+        questions.append(question.format(name=name, given=name[1:], company=rng.choice(COMPANIES)))
+    return questions
+
+
+def make_fake_llm():
+    """질문 유형 규칙에 따라 Cypher를 생성하는 가짜 Solar Pro 응답 함수를 만듭니다."""
+    rules = []
+    for question, cypher, _ in QUESTION_TYPES:
+        pattern = re.escape(question)
+        for slot in ("name", "given", "company"):
+            pattern = pattern.replace(re.escape("{" + slot + "}"), f"(?P<{slot}>\\S+?)")
+        rules.append((re.compile(f"^{pattern}$"), cypher))
+
+    def respond(request: dict) -> dict:
+        question = request["messages"][-1]["content"]
+        for pattern, cypher in rules:
+            match = pattern.match(question)
+            if match:
+                return chat_response(cypher.format(**match.groupdict()))
+        return chat_response('MATCH (n) WHERE n.name CONTAINS "?" RETURN n.name LIMIT 10')
+
+    return respond
+
+
+class RecordingNeo4j:
+    """실행된 쿼리 문자열만 기록하는 Neo4j 스텁입니다."""
+
+    def __init__(self):
+        self.queries = set()
+
+    async def run_bounded_query(self, query: str, parameters: dict = None, **kwargs):
+        self.queries.add(query)
+        return [{"p.phone": "010-0000-0000"}], False
+
+
+def percentile(values: list, ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+async def replay(graph_query, upstage_service, questions: list, cache_enabled: bool, server):
+    """질문 기록을 순서대로 재생하고 Cypher 생성 단계의 지연과 LLM 호출 수를 측정합니다."""
+    graph_query.plan_cache = graph_query.CypherPlanCache() if cache_enabled else None
+    neo4j = RecordingNeo4j()
+    llm_calls_before = server.request_count
+    latencies = {"hit": [], "miss": [], "uncacheable": [], "disabled": []}
+    start = time.perf_counter()
+    for question in questions:
+        plan_start = time.perf_counter()
+        query_plan = await graph_query.plan_cypher(upstage_service, question)
+        latencies[query_plan.cache_status].append(time.perf_counter() - plan_start)
+        await graph_query.execute_cypher(neo4j, query_plan)
+    elapsed = time.perf_counter() - start
+
+    all_latencies = [latency for values in latencies.values() for latency in values]
+    hits = len(latencies["hit"])
+    print(f"\n[plan cache {'on' if cache_enabled else 'off'}] {len(questions)} questions in {elapsed:.2f}s")
+    print(f"  LLM calls:               {server.request_count - llm_calls_before}")
+    print(f"  distinct Cypher texts:   {len(neo4j.queries)}")
+    if cache_enabled:
+        print(f"  hit rate:                {hits / len(questions):.1%} "
+              f"(miss {len(latencies['miss'])}, uncacheable {len(latencies['uncacheable'])})")
+    print(f"  {'stage':<14}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for status, values in [("all", all_latencies)] + list(latencies.items()):
+        if values:
+            print(f"  {status:<14}{len(values):>8}{percentile(values, 0.5) * 1000:>10.2f}"
+                  f"{percentile(values, 0.99) * 1000:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=500, help="생성할 질문 수")
+    parser.add_argument("--replay", help="재생할 질문 기록 파일 (지정하면 --questions 무시)")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="Cypher 생성 LLM 지연 (초)")
+    args = parser.parse_args()
+
+    if args.replay:
+        with open(args.replay, encoding="utf-8") as f:
+            questions = [line.strip() for line in f if line.strip()]
+    else:
+        questions = make_questions(args.questions)
+
+    server, base_url = start_fake_upstage(latency=args.llm_latency, chat_response_fn=make_fake_llm())
+    # 설정은 import 시점에 읽으므로 앱 import 전에 환경 변수를 지정
+    os.environ["UPSTAGE_BASE_URL"] = base_url
+    os.environ.setdefault("UPSTAGE_API_KEY", "fake-key")
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    from app.services import graph_query
+    from app.api import dependencies
+    upstage_service = dependencies.upstage_service()
+    upstage_service.traced_transport = None
+
+    async def run_all():
+        # 공유 커넥션 풀이 하나의 이벤트 루프에 묶이므로 모든 측정을 같은 루프에서 실행
+        await replay(graph_query, upstage_service, questions, cache_enabled=False, server=server)
+        await replay(graph_query, upstage_service, questions, cache_enabled=True, server=server)
+
+    asyncio.run(run_all())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
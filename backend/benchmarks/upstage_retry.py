@@ -0,0 +1,69 @@
+"""
+UpstageService의 커넥션 풀과 재시도 정책을 가짜 Upstage 서버로 검증합니다.
+
+지연과 429/503 오류를 주입한 서버에 동시 Solar Pro 호출을 보내고,
+성공률과 지연 시간, get_metrics()의 풀/재시도 통계를 출력합니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.upstage_retry --calls 200 --concurrency 20 --rate-limit-ratio 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.fake_upstage import start_fake_upstage
+
+
+async def run_calls(service, calls: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    messages = [{"role": "user", "content": "김성길 전화번호?"}]
+    results = {"ok": 0, "failed": 0}
+
+    async def call():
+        async with semaphore:
+            try:
+                await service.solar_pro(messages)
+                results["ok"] += 1
+            except Exception:
+                results["failed"] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+    metrics = service.get_metrics()
+    await service.close()
+    return results, elapsed, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.2)
+    parser.add_argument("--error-ratio", type=float, default=0.05)
+    parser.add_argument("--retry-after", type=float, default=0.1)
+    args = parser.parse_args()
+
+    server, base_url = start_fake_upstage(latency=args.latency, rate_limit_ratio=args.rate_limit_ratio,
+                                          error_ratio=args.error_ratio, retry_after=args.retry_after)
+    # 설정은 import 시점에 읽으므로 서비스 import 전에 환경 변수를 지정
+    os.environ["UPSTAGE_BASE_URL"] = base_url
+    os.environ.setdefault("UPSTAGE_API_KEY", "fake-key")
+    os.environ.setdefault("UPSTAGE_RETRY_BACKOFF", "0.05")
+    from app.services.upstage import UpstageService
+
+    service = UpstageService()
+    service.traced_transport = None  # 가짜 서버로 직접 HTTP 호출 경로만 검증
+    results, elapsed, metrics = asyncio.run(run_calls(service, args.calls, args.concurrency))
+    server.shutdown()
+
+    print(f"calls: {args.calls}, ok: {results['ok']}, failed: {results['failed']}, elapsed: {elapsed:.2f}s")
+    print(f"server requests: {server.request_count}, injected: {server.injected}")
+    print(json.dumps(metrics, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+벤치마크용 가상 데이터(한국어 이름, 연락처, 메모, 질문, 명함) 생성기입니다.
+
+build_workload()는 그래프 크기(연락처 수)와 요청 수에 맞는 워크로드를 만들며,
+각 요청에 대응하는 Solar Pro/Document Parse 응답(recorded)을 함께 담아 가짜 Upstage 서버가 재생할 수 있게 합니다.
+같은 seed면 같은 워크로드가 만들어지고, save_workload()/load_workload()로 JSON 파일에 기록해 커밋 간에 재사용할 수 있습니다.
+"""
+import json
+import random
+import hashlib
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송전홍유고문양손배백허남심노하곽성차주우구민류나진지엄채원천방공현함변염여추도소석선설마길위표명기반왕금옥육인맹제모탁국어은편용예경봉사부가복태목형피두감음빈동온호범좌"
+GIVEN_SYLLABLES = "민서지현수영준우진예하윤도연성재은혜주원경아태정희상동승유나가혁석채소다인리호시선규훈건빈미율찬결한솔별"
+
+# 그래프 크기 이름 -> 연락처 수
+GRAPH_SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+# 회사 이름 = 접두어 + 업종 (이메일 도메인은 로마자 표기)
+COMPANY_PREFIXES = [
+    ("한빛", "hanbit"), ("대한", "daehan"), ("미래", "mirae"), ("푸른", "pureun"), ("새롬", "saerom"),
+    ("동방", "dongbang"), ("태평", "taepyeong"), ("세종", "sejong"), ("삼한", "samhan"), ("우리", "woori"),
+    ("누리", "nuri"), ("가온", "gaon"), ("하늘", "haneul"), ("바른", "bareun"), ("으뜸", "eutteum"),
+    ("다온", "daon"), ("온누리", "onnuri"), ("한결", "hangyeol"), ("새한", "saehan"), ("청솔", "cheongsol"),
+]
+COMPANY_SUFFIXES = [
+    ("상사", "trading"), ("전자", "elec"), ("물산", "corp"), ("건설", "enc"), ("바이오", "bio"),
+    ("소프트", "soft"), ("통신", "telecom"), ("제약", "pharm"), ("식품", "food"), ("에너지", "energy"),
+    ("물류", "logis"), ("디자인", "design"), ("테크", "tech"), ("금융", "finance"), ("컨설팅", "consulting"),
+]
+TITLES = ["사원", "주임", "대리", "과장", "차장", "부장", "팀장", "실장", "이사", "상무", "전무", "대표"]
+
+PROJECTS = ["신규 물류 시스템", "AI 챗봇 도입", "스마트 팩토리", "ERP 전환", "해외 진출", "브랜드 리뉴얼", "클라우드 이전"]
+TOPICS = ["견적", "납품 일정", "계약 조건", "기술 검토", "파트너십", "가격 협상", "시제품 테스트"]
+MEMO_TEMPLATES = [
+    "{date} {time} {company} {name} {title}님과 {topic} 미팅. {project} 건으로 다음 주까지 자료 전달하기로 함.",
+    "{company} {name} {title} 만남. {project} 관련해서 {topic} 논의했고 {date}에 후속 회의 잡음.",
+    "오늘 {name} {title}님({company})이 연락 옴. {topic} 관련 {project} 제안서 요청.",
+    "{date} {company} 방문해서 {name} {title}님 뵘. {project} {topic} 정리 필요.",
+]
+# 알려진 이름, 직함, 상대 날짜, 만남을 나타내는 단어로만 이루어진 메모 (로컬 전처리로 LLM 없이 추출 가능)
+SIMPLE_MEMO_TEMPLATES = [
+    "오늘 {name} {title} 만남",
+    "내일 오후 {hour}시 {company} {name} {title}님과 미팅",
+    "{name} {title}님과 다음주 {weekday}요일 점심 약속",
+    "어제 {company} {name} {title} 면담",
+]
+PERSONAL_MEMOS = [
+    "퇴근길에 우유랑 계란 사기",
+    "주말에 부모님 댁 방문, 선물 챙기기",
+    "헬스장 PT 예약 변경하기",
+    "읽던 책 반납일이 금요일",
+]
+
+QUESTION_TEMPLATES = [
+    ("{name} 전화번호 알려줘", 'MATCH (p:Person {{name: "{name}"}}) RETURN p.phone', "{name}님의 전화번호는 {phone}입니다."),
+    ("{name} 이메일 주소가 뭐야?", 'MATCH (p:Person {{name: "{name}"}}) RETURN p.email', "{name}님의 이메일은 {email}입니다."),
+    ("{name}은 어느 회사에 다녀?", 'MATCH (p:Person {{name: "{name}"}})-[:WORKS_AT]->(c:Company) RETURN c.name',
+     "{name}님은 {company}에 다니고 있습니다."),
+    ("{company}에 다니는 사람은 누구야?",
+     'MATCH (p:Person)-[:WORKS_AT]->(c:Company {{name: "{company}"}}) RETURN p.name, p.title',
+     "{company}에는 {name} {title}님 등이 근무하고 있습니다."),
+]
+
+
+def generate_korean_names(count: int, seed: int = 0) -> list:
+    """성 1글자 + 이름 2글자로 이루어진 서로 다른 한국어 이름 count개를 생성합니다."""
+    rng = random.Random(seed)
+    names = set()
+    max_names = len(SURNAMES) * len(GIVEN_SYLLABLES) ** 2
+    if count > max_names:
+        raise ValueError(f"Cannot generate more than {max_names} distinct names")
+    while len(names) < count:
+        names.add(rng.choice(SURNAMES) + rng.choice(GIVEN_SYLLABLES) + rng.choice(GIVEN_SYLLABLES))
+    return sorted(names)
+
+
+def generate_companies(count: int, seed: int = 0) -> list:
+    """서로 다른 회사 count개를 (이름, 이메일 도메인)으로 생성합니다. 조합이 모자라면 지점 번호를 붙입니다."""
+    combos = [
+        (prefix + suffix, f"{prefix_roman}{suffix_roman}.co.kr")
+        for prefix, prefix_roman in COMPANY_PREFIXES for suffix, suffix_roman in COMPANY_SUFFIXES
+    ]
+    random.Random(seed).shuffle(combos)
+    companies = []
+    for i in range(count):
+        name, domain = combos[i % len(combos)]
+        branch = i // len(combos)
+        companies.append((f"{name}{branch + 1}지점", f"b{branch + 1}.{domain}") if branch else (name, domain))
+    return companies
+
+
+def generate_contacts(count: int, seed: int = 0) -> list:
+    """
+    연락처 count개를 생성합니다. 회사당 평균 20명이 근무합니다.
+
+    Returns:
+        [{"name", "title", "company", "phone", "email"}]
+    """
+    rng = random.Random(seed)
+    names = generate_korean_names(count, seed)
+    rng.shuffle(names)
+    companies = generate_companies(max(1, count // 20), seed)
+    contacts = []
+    for i, name in enumerate(names):
+        company, domain = companies[rng.randrange(len(companies))]
+        contacts.append({
+            "name": name,
+            "title": rng.choice(TITLES),
+            "company": company,
+            "phone": f"010-{1000 + i // 10000:04d}-{i % 10000:04d}",
+            "email": f"user{i}@{domain}",
+        })
+    return contacts
+
+
+def generate_memos(contacts: list, count: int, seed: int = 0, personal_ratio: float = 0.1,
+                   simple_ratio: float = 0.2) -> list:
+    """
+    연락처에 등장하는 사람/회사를 언급하는 메모 count개와 각 메모의 추출 결과를 생성합니다.
+    personal_ratio 비율은 개인 메모, simple_ratio 비율은 SIMPLE_MEMO_TEMPLATES의 단순한 메모입니다.
+
+    Returns:
+        [{"text", "extraction"}] - extraction은 메모 추출 LLM이 돌려줄 JSON
+    """
+    rng = random.Random(seed)
+    memos = []
+    for i in range(count):
+        if rng.random() < personal_ratio:
+            text = f"{rng.choice(PERSONAL_MEMOS)} ({i})"
+            memos.append({"text": text, "extraction": {"entities": [], "relationships": [], "business_related": False}})
+            continue
+        contact = contacts[rng.randrange(len(contacts))]
+        if rng.random() < simple_ratio:
+            text = rng.choice(SIMPLE_MEMO_TEMPLATES).format(
+                hour=rng.randint(1, 5), weekday=rng.choice("월화수목금"), **contact,
+            )
+            event = f"{contact['company']} 미팅 {i}"
+            memos.append({
+                "text": text,
+                "extraction": {
+                    "entities": [
+                        {"type": "Person", "name": contact["name"], "title": contact["title"]},
+                        {"type": "Company", "name": contact["company"]},
+                        {"type": "Event", "name": event},
+                    ],
+                    "relationships": [
+                        {"from": contact["name"], "to": contact["company"], "type": "WORKS_AT"},
+                        {"from": contact["name"], "to": event, "type": "ATTENDED"},
+                    ],
+                    "business_related": True,
+                },
+            })
+            continue
+        project = rng.choice(PROJECTS)
+        date = f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        hour = rng.randint(9, 18)
+        event = f"{contact['company']} {rng.choice(TOPICS)} 미팅 {i}"
+        text = rng.choice(MEMO_TEMPLATES).format(
+            date=date, time=f"{hour}시", company=contact["company"], name=contact["name"],
+            title=contact["title"], topic=rng.choice(TOPICS), project=project,
+        )
+        memos.append({
+            "text": text,
+            "extraction": {
+                "entities": [
+                    {"type": "Person", "name": contact["name"], "title": contact["title"]},
+                    {"type": "Company", "name": contact["company"]},
+                    {"type": "Event", "name": event, "date": f"{date}T{hour:02d}:00:00"},
+                    {"type": "Project", "name": project},
+                ],
+                "relationships": [
+                    {"from": contact["name"], "to": contact["company"], "type": "WORKS_AT"},
+                    {"from": contact["name"], "to": event, "type": "ATTENDED"},
+                    {"from": event, "to": project, "type": "DISCUSSED"},
+                ],
+                "business_related": True,
+            },
+        })
+    return memos
+
+
+def generate_questions(contacts: list, count: int, seed: int = 0) -> list:
+    """
+    연락처에 대한 자연어 질문 count개와 Cypher 생성/답변 생성 LLM의 응답을 생성합니다.
+
+    Returns:
+        [{"question", "cypher", "answer"}]
+    """
+    rng = random.Random(seed)
+    questions = []
+    for _ in range(count):
+        contact = contacts[rng.randrange(len(contacts))]
+        question, cypher, answer = rng.choice(QUESTION_TEMPLATES)
+        questions.append({
+            "question": question.format(**contact),
+            "cypher": cypher.format(**contact),
+            "answer": answer.format(**contact),
+        })
+    return questions
+
+
+def generate_business_cards(contacts: list, seed: int = 0) -> list:
+    """
+    연락처마다 명함 OCR(Document Parse) 응답과 명함 정보 추출 LLM 응답을 생성합니다.
+    명함 이미지는 card_image(card_id)로 만들며, 가짜 서버는 이미지에 포함된 card_id로 응답을 찾습니다.
+
+    Returns:
+        [{"card_id", "filename", "document_parse", "extraction"}]
+    """
+    rng = random.Random(seed)
+    cards = []
+    for card_id, contact in enumerate(contacts):
+        lines = [
+            contact["name"],
+            f"{contact['title']} | {contact['company']}",
+            f"M. {contact['phone']}<br>E. {contact['email']}",
+            f"서울특별시 {rng.choice(['강남구', '중구', '마포구', '영등포구', '성동구'])} {rng.randint(1, 300)}",
+        ]
+        cards.append({
+            "card_id": card_id,
+            "filename": f"card_{card_id:06d}.png",
+            "document_parse": {
+                "elements": [{"category": "paragraph", "content": {"html": f"<p>{line}</p>"}} for line in lines]
+            },
+            "extraction": {key: contact[key] for key in ("name", "title", "company", "phone", "email")},
+        })
+    return cards
+
+
+def card_image(card_id: int, size: int = 40 * 1024) -> bytes:
+    """card_id 표식을 담은 size바이트짜리 가짜 PNG 이미지를 만듭니다. (같은 card_id면 같은 내용)"""
+    header = b"\x89PNG\r\n\x1a\n" + f"card-id:{card_id};".encode("ascii")
+    filler = hashlib.sha256(header).digest()
+    return (header + filler * (size // len(filler) + 1))[:max(size, len(header))]
+
+
+def build_workload(graph_size: int, requests: int, seed: int = 0) -> dict:
+    """
+    그래프 크기와 시나리오별 요청 수에 맞는 워크로드를 생성합니다.
+
+    Returns:
+        graph_size, seed
+        contacts: 벤치마크 전에 그래프에 미리 저장할 연락처
+        memos, questions: /memo, /query 요청과 녹화된 LLM 응답
+        cards: /extract-business-card 요청용 명함 (녹화된 OCR/LLM 응답)
+        new_contacts: /save-contact 요청 본문 (그래프에 없는 새 연락처)
+    """
+    contacts = generate_contacts(graph_size + requests, seed)
+    existing, new = contacts[:graph_size], contacts[graph_size:]
+    return {
+        "graph_size": graph_size,
+        "seed": seed,
+        "contacts": existing,
+        "memos": generate_memos(existing, requests, seed),
+        "questions": generate_questions(existing, requests, seed),
+        "cards": generate_business_cards(new, seed),
+        "new_contacts": [
+            {
+                "person_data": {key: contact[key] for key in ("name", "title", "phone", "email")},
+                "company_data": {"name": contact["company"]},
+            }
+            for contact in new
+        ],
+    }
+
+
+def save_workload(workload: dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(workload, f, ensure_ascii=False)
+
+
+def load_workload(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)